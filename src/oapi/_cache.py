@@ -0,0 +1,713 @@
+"""
+This module provides an HTTP cache for `oapi.client.Client`, which stores
+responses to GET and HEAD requests and serves them for as long as they are
+fresh (per "Cache-Control" and "Expires" headers). Once a stored response
+is stale it is revalidated using "If-None-Match" and/or
+"If-Modified-Since" request headers, so that a "304 Not Modified" response
+can be served using the stored response body.
+
+Stored responses are held by a `Cache` backend: either a `MemoryCache` or
+a `FileCache`, both of which evict the least recently used responses once
+the total size of stored responses exceeds a maximum number of bytes.
+
+Responses to requests bearing credentials (such as an "Authorization"
+header) are stored under a key which includes a hash of those credentials,
+so that a cache shared by clients using different credentials never serves
+one client a response received by another. Responses marked
+"Cache-Control: private" are only stored for requests bearing credentials.
+Responses with a "Vary" header are stored under a key which also includes
+the request's values for the headers it names, so that each variant of a
+response (for each "Accept" header value, for example) is stored alongside
+the others.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import typing
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from http.client import HTTPResponse
+from pathlib import Path
+
+from oapi._transport import _ResponseSocket
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable
+    from email.message import Message
+    from urllib.request import Request
+
+# Methods which do not change the state of a resource, and so do not
+# invalidate stored responses
+_SAFE_METHODS: frozenset[str] = frozenset(("GET", "HEAD", "OPTIONS", "TRACE"))
+_CACHEABLE_METHODS: frozenset[str] = frozenset(("GET", "HEAD"))
+_CACHEABLE_STATUSES: frozenset[int] = frozenset((200, 203))
+# Headers which describe a single connection or message, so are not stored
+_UNSTORED_HEADERS: frozenset[str] = frozenset(
+    (
+        "connection",
+        "content-length",
+        "keep-alive",
+        "proxy-connection",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    )
+)
+# Request headers which convey credentials (`oapi.client.Client` adds the
+# header of an API key conveyed in a header)
+CREDENTIAL_HEADERS: tuple[str, ...] = (
+    "Authorization",
+    "Cookie",
+    "Proxy-Authorization",
+)
+# Headers from a "304 Not Modified" response which must not replace those
+# of the stored response
+_UNUPDATED_HEADERS: frozenset[str] = _UNSTORED_HEADERS | {
+    "content-encoding",
+    "content-range",
+    "content-type",
+}
+
+
+class Cache(ABC):
+    """
+    A base class for HTTP cache backends, which store serialized responses
+    (as `bytes`) by key, and evict the least recently used responses once
+    the total size of stored responses exceeds `max_size` bytes.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """
+        Parameters:
+            max_size: The maximum total number of bytes of stored
+                responses.
+        """
+        self.max_size: int = max_size
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """
+        Retrieve a stored response, or `None` if no response is stored for
+        `key`.
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None:
+        """
+        Store a response, evicting the least recently used responses as
+        needed. Responses larger than `max_size` are not stored.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Remove a stored response, if there is one.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Remove all stored responses.
+        """
+
+
+class MemoryCache(Cache):
+    """
+    A thread-safe HTTP cache backend which stores responses in memory.
+    """
+
+    def __init__(self, max_size: int = 64 * 1024 * 1024) -> None:
+        """
+        Parameters:
+            max_size: The maximum total number of bytes of stored
+                responses (64 MiB, by default).
+        """
+        super().__init__(max_size)
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            value: bytes | None = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._delete(key)
+            if len(value) > self.max_size:
+                return
+            self._entries[key] = value
+            self._size += len(value)
+            while self._size > self.max_size:
+                self._size -= len(self._entries.popitem(last=False)[1])
+
+    def _delete(self, key: str) -> None:
+        value: bytes | None = self._entries.pop(key, None)
+        if value is not None:
+            self._size -= len(value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._delete(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FileCache(Cache):
+    """
+    An HTTP cache backend which stores each response in a file, in a given
+    directory. Responses are written atomically, so a directory may be
+    shared by multiple clients (and processes). A file's modification time
+    is updated when it is read, so that eviction removes the least recently
+    used responses first.
+    """
+
+    def __init__(
+        self, directory: str | Path, max_size: int = 256 * 1024 * 1024
+    ) -> None:
+        """
+        Parameters:
+            directory: The directory in which to store responses. This is
+                created if it does not exist.
+            max_size: The maximum total number of bytes of stored
+                responses (256 MiB, by default).
+        """
+        super().__init__(max_size)
+        self.directory: Path = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock: threading.Lock = threading.Lock()
+        # This is an estimate: other clients may be using the same
+        # directory, so the actual size is measured before evicting
+        self._size: int = sum(size for _, size, _ in self._iter_files())
+
+    def _get_path(self, key: str) -> Path:
+        return self.directory / hashlib.sha256(key.encode()).hexdigest()
+
+    def _iter_files(self) -> typing.Iterable[tuple[float, int, Path]]:
+        """
+        Yield the modification time, size and path of each stored response.
+        """
+        entry: os.DirEntry
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".tmp"):
+                continue
+            try:
+                stat: os.stat_result = entry.stat()
+            except FileNotFoundError:
+                continue
+            yield stat.st_mtime, stat.st_size, Path(entry.path)
+
+    def get(self, key: str) -> bytes | None:
+        path: Path = self._get_path(key)
+        try:
+            value: bytes = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        path: Path = self._get_path(key)
+        self.delete(key)
+        if len(value) > self.max_size:
+            return
+        temporary_path: Path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        temporary_path.write_bytes(value)
+        os.replace(temporary_path, path)
+        with self._lock:
+            self._size += len(value)
+            if self._size > self.max_size:
+                self._evict()
+
+    def _evict(self) -> None:
+        files: list[tuple[float, int, Path]] = sorted(self._iter_files())
+        self._size = sum(size for _, size, _ in files)
+        size: int
+        path: Path
+        for _, size, path in files:
+            if self._size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            self._size -= size
+
+    def delete(self, key: str) -> None:
+        path: Path = self._get_path(key)
+        try:
+            size: int = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        with self._lock:
+            self._size = max(0, self._size - size)
+
+    def clear(self) -> None:
+        path: Path
+        for _, _, path in self._iter_files():
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._size = 0
+
+
+def _parse_cache_control(value: str | None) -> dict[str, str]:
+    """
+    Parse a "Cache-Control" header into a dictionary mapping (lower-case)
+    directive names to their values (an empty string for directives
+    without a value).
+    """
+    directives: dict[str, str] = {}
+    if value:
+        directive: str
+        for directive in value.split(","):
+            name, _, argument = directive.partition("=")
+            name = name.strip().lower()
+            if name:
+                directives[name] = argument.strip().strip('"')
+    return directives
+
+
+def _parse_seconds(value: str | None) -> int | None:
+    try:
+        return max(0, int(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _parse_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_request_header(request: Request, name: str) -> str | None:
+    return request.get_header(name.capitalize())
+
+
+def _get_request_cache_control(request: Request) -> dict[str, str]:
+    return _parse_cache_control(_get_request_header(request, "Cache-Control"))
+
+
+def _get_credentials_hash(
+    request: Request, credential_headers: Iterable[str]
+) -> str:
+    """
+    Get a hash of the credentials conveyed by a request's headers, or an
+    empty string if it conveys none.
+    """
+    credentials: list[str] = []
+    name: str
+    for name in credential_headers:
+        value: str | None = _get_request_header(request, name)
+        if value:
+            credentials.append(f"{name.lower()}: {value}")
+    if not credentials:
+        return ""
+    return hashlib.sha256("\n".join(credentials).encode()).hexdigest()
+
+
+def _get_cache_key(method: str, url: str, credentials_hash: str = "") -> str:
+    if credentials_hash:
+        return f"{method} {url} {credentials_hash}"
+    return f"{method} {url}"
+
+
+def _get_vary_key(key: str) -> str:
+    """
+    Get the key under which the header names from the "Vary" header of the
+    responses stored for `key` are stored.
+    """
+    return f"{key} vary"
+
+
+def _get_variant_key(
+    key: str, request: Request, vary_names: Iterable[str]
+) -> str:
+    """
+    Get the key under which the response to `request` is stored, for
+    responses varying by the request headers named in `vary_names`.
+    """
+    name: str
+    values: bytes = json.dumps(
+        [_get_request_header(request, name) for name in vary_names]
+    ).encode()
+    return f"{key} {hashlib.sha256(values).hexdigest()}"
+
+
+def _get_response_key(cache: Cache, request: Request, key: str) -> str:
+    """
+    Get the key under which a response to `request` would be stored, given
+    the key for its method, URL and credentials.
+    """
+    vary_names: bytes | None = cache.get(_get_vary_key(key))
+    if vary_names is None:
+        return key
+    try:
+        return _get_variant_key(key, request, json.loads(vary_names))
+    except (ValueError, TypeError):
+        return key
+
+
+class _CachedResponse:
+    """
+    A stored response.
+
+    Parameters:
+        status: The HTTP status code.
+        reason: The HTTP reason phrase.
+        headers: The response headers.
+        body: The response body (with any content-encoding still applied).
+        stored_at: The time (in seconds since the epoch) at which the
+            response was received (or last revalidated).
+        vary: The request header values (for each header named in the
+            response's "Vary" header) of the request to which this was the
+            response.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "body",
+        "headers",
+        "reason",
+        "status",
+        "stored_at",
+        "vary",
+    )
+
+    def __init__(
+        self,
+        status: int,
+        reason: str,
+        headers: list[tuple[str, str]],
+        body: bytes,
+        stored_at: float,
+        vary: dict[str, str | None],
+    ) -> None:
+        self.status: int = status
+        self.reason: str = reason
+        self.headers: list[tuple[str, str]] = headers
+        self.body: bytes = body
+        self.stored_at: float = stored_at
+        self.vary: dict[str, str | None] = vary
+
+    def get_header(self, name: str) -> str | None:
+        name = name.lower()
+        key: str
+        value: str
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return None
+
+    def __bytes__(self) -> bytes:
+        metadata: bytes = json.dumps(
+            {
+                "status": self.status,
+                "reason": self.reason,
+                "headers": self.headers,
+                "stored_at": self.stored_at,
+                "vary": self.vary,
+            }
+        ).encode()
+        return b"%s\n%s" % (metadata, self.body)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> _CachedResponse:
+        metadata: bytes
+        body: bytes
+        metadata, _, body = data.partition(b"\n")
+        values: dict[str, typing.Any] = json.loads(metadata)
+        return cls(
+            status=values["status"],
+            reason=values["reason"],
+            headers=[tuple(header) for header in values["headers"]],  # type: ignore[misc]
+            body=body,
+            stored_at=values["stored_at"],
+            vary=values["vary"],
+        )
+
+    def matches(self, request: Request) -> bool:
+        """
+        Determine if this response was received for a request with the same
+        values for all headers named in the response's "Vary" header.
+        """
+        name: str
+        value: str | None
+        return all(
+            _get_request_header(request, name) == value
+            for name, value in self.vary.items()
+        )
+
+    def get_freshness_lifetime(self) -> float:
+        """
+        Get the number of seconds, from the time it was generated, for
+        which the response is fresh.
+        """
+        cache_control: dict[str, str] = _parse_cache_control(
+            self.get_header("Cache-Control")
+        )
+        if "no-cache" in cache_control:
+            return 0
+        max_age: int | None = _parse_seconds(cache_control.get("max-age"))
+        if max_age is not None:
+            return max_age
+        expires: float | None = _parse_date(self.get_header("Expires"))
+        if expires is None:
+            return 0
+        return expires - (
+            _parse_date(self.get_header("Date")) or self.stored_at
+        )
+
+    def get_age(self) -> float:
+        """
+        Get the number of seconds since the response was generated.
+        """
+        return (_parse_seconds(self.get_header("Age")) or 0) + max(
+            0, time.time() - self.stored_at
+        )
+
+    def is_fresh(self, request: Request) -> bool:
+        request_cache_control: dict[str, str] = _get_request_cache_control(
+            request
+        )
+        if "no-cache" in request_cache_control:
+            return False
+        freshness_lifetime: float = self.get_freshness_lifetime()
+        max_age: int | None = _parse_seconds(
+            request_cache_control.get("max-age")
+        )
+        if max_age is not None:
+            freshness_lifetime = min(freshness_lifetime, max_age)
+        return self.get_age() < freshness_lifetime
+
+    def add_validators(self, request: Request) -> None:
+        """
+        Add conditional request headers, so that the server can respond
+        with "304 Not Modified" if the stored response is still valid.
+        """
+        etag: str | None = self.get_header("ETag")
+        if etag:
+            request.add_header("If-none-match", etag)
+        last_modified: str | None = self.get_header("Last-Modified")
+        if last_modified:
+            request.add_header("If-modified-since", last_modified)
+
+    def update(self, headers: Message) -> None:
+        """
+        Update the stored headers using those from a "304 Not Modified"
+        response, and reset the time at which the response was stored.
+        """
+        updated_headers: list[tuple[str, str]] = [
+            (key, value)
+            for key, value in headers.items()
+            if key.lower() not in _UNUPDATED_HEADERS
+        ]
+        updated_names: set[str] = {key.lower() for key, _ in updated_headers}
+        self.headers = [
+            (key, value)
+            for key, value in self.headers
+            if key.lower() not in updated_names
+        ] + updated_headers
+        self.stored_at = time.time()
+
+    def get_response(self, request: Request) -> HTTPResponse:
+        """
+        Create an `http.client.HTTPResponse` from the stored response.
+        """
+        lines: list[bytes] = [
+            f"HTTP/1.1 {self.status} {self.reason}".encode("latin-1")
+        ]
+        key: str
+        value: str
+        lines.extend(
+            f"{key}: {value}".encode("latin-1") for key, value in self.headers
+        )
+        lines.append(f"Content-Length: {len(self.body)}".encode("latin-1"))
+        response: HTTPResponse = HTTPResponse(
+            _ResponseSocket(  # type: ignore[arg-type]
+                b"\r\n".join(lines) + b"\r\n\r\n" + self.body
+            ),
+            method=request.get_method(),
+        )
+        response.begin()
+        response.url = request.full_url  # type: ignore[attr-defined]
+        # This is how `urllib.request` responses are presented
+        response.msg = response.reason  # type: ignore[assignment]
+        return response
+
+
+def get_cached_response(
+    cache: Cache,
+    request: Request,
+    credential_headers: Iterable[str] = CREDENTIAL_HEADERS,
+) -> _CachedResponse | None:
+    """
+    Retrieve a stored response matching `request` (and the credentials
+    conveyed by its `credential_headers`), if there is one (whether or not
+    it is fresh).
+    """
+    method: str = request.get_method()
+    if method not in _CACHEABLE_METHODS or (
+        "no-store" in _get_request_cache_control(request)
+    ):
+        return None
+    data: bytes | None = cache.get(
+        _get_response_key(
+            cache,
+            request,
+            _get_cache_key(
+                method,
+                request.full_url,
+                _get_credentials_hash(request, credential_headers),
+            ),
+        )
+    )
+    if data is None:
+        return None
+    try:
+        cached_response: _CachedResponse = _CachedResponse.from_bytes(data)
+    except (ValueError, KeyError, TypeError):
+        # This may have been written by an incompatible version
+        return None
+    return cached_response if cached_response.matches(request) else None
+
+
+def _is_storable(
+    request: Request, response: HTTPResponse, credentials_hash: str
+) -> bool:
+    if (
+        request.get_method() not in _CACHEABLE_METHODS
+        or response.status not in _CACHEABLE_STATUSES
+        or "no-store" in _get_request_cache_control(request)
+        # Redirected responses are not stored for the original URL
+        or getattr(response, "url", request.full_url) != request.full_url
+    ):
+        return False
+    cache_control: dict[str, str] = _parse_cache_control(
+        response.headers.get("Cache-Control")
+    )
+    if (
+        "no-store" in cache_control
+        or (response.headers.get("Vary", "").strip() == "*")
+        # Private responses are only stored under a key specific to the
+        # credentials with which they were requested
+        or ("private" in cache_control and not credentials_hash)
+    ):
+        return False
+    # A response is only worth storing if it can be served while fresh,
+    # or revalidated once stale
+    return bool(
+        "max-age" in cache_control
+        or "Expires" in response.headers
+        or "ETag" in response.headers
+        or "Last-Modified" in response.headers
+    )
+
+
+def store_response(
+    cache: Cache,
+    request: Request,
+    response: HTTPResponse,
+    credential_headers: Iterable[str] = CREDENTIAL_HEADERS,
+) -> HTTPResponse:
+    """
+    Store a response, if it is storable, returning a response which may be
+    read in place of the original (the body of a stored response will have
+    been read in full). If the request was for an unsafe method (such as
+    POST), any stored responses for the same URL (and either the same
+    credentials, or no credentials) are invalidated.
+    """
+    method: str = request.get_method()
+    credentials_hash: str = _get_credentials_hash(request, credential_headers)
+    key: str
+    if method not in _SAFE_METHODS:
+        if response.status < 400:
+            for cacheable_method in _CACHEABLE_METHODS:
+                for key in {
+                    _get_cache_key(cacheable_method, request.full_url),
+                    _get_cache_key(
+                        cacheable_method, request.full_url, credentials_hash
+                    ),
+                }:
+                    # Removing the "Vary" header names invalidates all
+                    # variants of a response
+                    cache.delete(_get_vary_key(key))
+                    cache.delete(key)
+        return response
+    if not _is_storable(request, response, credentials_hash):
+        return response
+    content_length: int | None = _parse_seconds(
+        response.headers.get("Content-Length")
+    )
+    if content_length is not None and content_length > cache.max_size:
+        return response
+    headers: Message = response.headers
+    vary_names: list[str] = [
+        name.strip() for name in headers.get("Vary", "").split(",")
+    ]
+    vary_names = [name for name in vary_names if name]
+    cached_response: _CachedResponse = _CachedResponse(
+        status=response.status,
+        reason=response.reason,
+        headers=[
+            (key, value)
+            for key, value in headers.items()
+            if key.lower() not in _UNSTORED_HEADERS
+        ],
+        # The body is read without decoding any content-encoding
+        body=HTTPResponse.read(response),
+        stored_at=time.time(),
+        vary={name: _get_request_header(request, name) for name in vary_names},
+    )
+    key = _get_cache_key(method, request.full_url, credentials_hash)
+    if vary_names:
+        # Each variant of a response (such as for each "Accept" header
+        # value) is stored under its own key, alongside the others
+        cache.set(_get_vary_key(key), json.dumps(vary_names).encode())
+        cache.delete(key)
+        key = _get_variant_key(key, request, vary_names)
+    else:
+        cache.delete(_get_vary_key(key))
+    cache.set(key, bytes(cached_response))
+    return cached_response.get_response(request)
+
+
+def revalidate_response(
+    cache: Cache,
+    request: Request,
+    cached_response: _CachedResponse,
+    headers: Message,
+    credential_headers: Iterable[str] = CREDENTIAL_HEADERS,
+) -> HTTPResponse:
+    """
+    Update a stored response with the headers from a "304 Not Modified"
+    response, and return the stored response.
+    """
+    cached_response.update(headers)
+    key: str = _get_cache_key(
+        request.get_method(),
+        request.full_url,
+        _get_credentials_hash(request, credential_headers),
+    )
+    if cached_response.vary:
+        key = _get_variant_key(key, request, cached_response.vary)
+    cache.set(key, bytes(cached_response))
+    return cached_response.get_response(request)
@@ -0,0 +1,262 @@
+"""
+This module provides a circuit breaker for `oapi.client.Client`, which
+stops requests from being sent to a host (or operation) while requests to
+it are failing, so that callers fail fast (with an
+`oapi.errors.OAPICircuitOpenError`) rather than each waiting out a timeout
+on a dependency which is unavailable.
+
+A circuit is "closed" (requests are sent) until the rate of failures among
+the most recent requests reaches a threshold, at which point it "opens"
+(requests are refused). Once `reset_timeout` seconds have elapsed, the
+circuit is "half-open": a limited number of trial requests are sent, and
+the circuit closes if they succeed, or opens again if any fail. Trials
+whose outcome is never recorded (such as those which were cancelled) are
+given up on after another `reset_timeout` seconds, so that they cannot
+leave the circuit half-open indefinitely.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import typing
+from collections import OrderedDict, deque
+from http.client import HTTPException
+from urllib.error import HTTPError
+
+from oapi._utilities import get_request_operation_key
+from oapi.errors import OAPICircuitOpenError
+
+if typing.TYPE_CHECKING:
+    from urllib.request import Request
+
+CircuitState = typing.Literal["closed", "open", "half-open"]
+
+
+def default_failure_hook(error: Exception) -> bool:
+    """
+    By default, connection errors, timeouts, and HTTP 5xx (server) errors
+    count as failures. Other HTTP errors (such as 404 NOT FOUND) indicate
+    the server is responding normally, so do not.
+    """
+    if isinstance(error, HTTPError):
+        return error.code >= 500
+    return isinstance(error, (OSError, HTTPException))
+
+
+class _Circuit:
+    __slots__: tuple[str, ...] = (
+        "half_open_calls",
+        "half_open_successes",
+        "half_opened_at",
+        "opened_at",
+        "outcomes",
+        "state",
+    )
+
+    def __init__(self, window_size: int) -> None:
+        self.state: CircuitState = "closed"
+        # `True` for each failed request
+        self.outcomes: deque[bool] = deque(maxlen=window_size)
+        self.opened_at: float = 0.0
+        self.half_open_calls: int = 0
+        self.half_open_successes: int = 0
+        self.half_opened_at: float = 0.0
+
+    def half_open(self, now: float) -> None:
+        self.state = "half-open"
+        self.half_opened_at = now
+        self.half_open_calls = 0
+        self.half_open_successes = 0
+
+    def open(self, now: float) -> None:
+        self.state = "open"
+        self.opened_at = now
+        self.outcomes.clear()
+
+    def close(self) -> None:
+        self.state = "closed"
+        self.outcomes.clear()
+
+
+class CircuitBreaker:
+    """
+    A thread-safe circuit breaker, keyed by host (or, if `per_operation` is
+    `True`, by host, method and operation), which may be shared by any
+    number of `oapi.client.Client` instances.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "_circuits",
+        "_lock",
+        "failure_hook",
+        "failure_rate_threshold",
+        "half_open_max_calls",
+        "max_circuits",
+        "minimum_number_of_calls",
+        "per_operation",
+        "reset_timeout",
+        "window_size",
+    )
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        minimum_number_of_calls: int = 10,
+        window_size: int = 20,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        *,
+        per_operation: bool = False,
+        failure_hook: typing.Callable[
+            [Exception], bool
+        ] = default_failure_hook,
+        max_circuits: int = 1024,
+    ) -> None:
+        """
+        Parameters:
+            failure_rate_threshold: The proportion (between 0 and 1) of
+                the most recent requests which must have failed for the
+                circuit to open.
+            minimum_number_of_calls: The minimum number of requests which
+                must have been recorded before the failure rate is
+                considered.
+            window_size: The number of most recent requests from which
+                the failure rate is calculated.
+            reset_timeout: The number of seconds for which an open circuit
+                refuses requests before permitting trial requests.
+            half_open_max_calls: The number of trial requests permitted
+                while the circuit is half-open, all of which must succeed for
+                the circuit to close.
+            per_operation: If `True`, there is a circuit for each method
+                and operation (the `operation` passed to
+                `oapi.client.Client.request`, or the path of a request made
+                without one), rather than for each host.
+            failure_hook: A function, accepting one argument (an
+                exception raised by a request), and returning a boolean value
+                indicating whether the error counts as a failure.
+            max_circuits: The maximum number of circuits retained. Once
+                this is exceeded, the least recently used circuits are
+                discarded.
+        """
+        self.failure_rate_threshold: float = failure_rate_threshold
+        self.minimum_number_of_calls: int = minimum_number_of_calls
+        self.window_size: int = window_size
+        self.reset_timeout: float = reset_timeout
+        self.half_open_max_calls: int = half_open_max_calls
+        self.per_operation: bool = per_operation
+        self.failure_hook: typing.Callable[[Exception], bool] = failure_hook
+        self.max_circuits: int = max_circuits
+        self._circuits: OrderedDict[tuple[str, ...], _Circuit] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def _get_key(self, request: Request) -> tuple[str, ...]:
+        if self.per_operation:
+            return get_request_operation_key(request)
+        return (request.host,)
+
+    def _get_circuit(self, key: tuple[str, ...]) -> _Circuit:
+        circuit: _Circuit | None = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit(self.window_size)
+            while len(self._circuits) > self.max_circuits:
+                self._circuits.popitem(last=False)
+        else:
+            self._circuits.move_to_end(key)
+        return circuit
+
+    def get_state(self, request: Request) -> CircuitState:
+        """
+        Get the state of the circuit through which `request` would be sent.
+        """
+        with self._lock:
+            circuit: _Circuit | None = self._circuits.get(
+                self._get_key(request)
+            )
+            if circuit is None:
+                return "closed"
+            if (circuit.state == "open") and (
+                time.monotonic() - circuit.opened_at >= self.reset_timeout
+            ):
+                return "half-open"
+            return circuit.state
+
+    def before(self, request: Request) -> None:
+        """
+        Raise an `oapi.errors.OAPICircuitOpenError` if the circuit for a
+        request is open (or is half-open, and has already permitted its
+        trial requests). Otherwise, the request may be sent, and its outcome
+        must then be passed to `after`.
+        """
+        key: tuple[str, ...] = self._get_key(request)
+        with self._lock:
+            circuit: _Circuit = self._get_circuit(key)
+            if circuit.state == "closed":
+                return
+            now: float = time.monotonic()
+            elapsed: float
+            if circuit.state == "open":
+                elapsed = now - circuit.opened_at
+                if elapsed < self.reset_timeout:
+                    raise OAPICircuitOpenError(
+                        key, self.reset_timeout - elapsed
+                    )
+                circuit.half_open(now)
+            if circuit.half_open_calls >= self.half_open_max_calls:
+                elapsed = now - circuit.half_opened_at
+                if elapsed < self.reset_timeout:
+                    raise OAPICircuitOpenError(
+                        key, self.reset_timeout - elapsed
+                    )
+                # The outcomes of the trial requests were never recorded,
+                # so permit new trial requests
+                circuit.half_open(now)
+            circuit.half_open_calls += 1
+
+    def after(self, request: Request, error: Exception | None = None) -> None:
+        """
+        Record the outcome of a request: either success, or the error it
+        raised.
+        """
+        failed: bool = error is not None and self.failure_hook(error)
+        key: tuple[str, ...] = self._get_key(request)
+        with self._lock:
+            circuit: _Circuit = self._get_circuit(key)
+            now: float = time.monotonic()
+            if circuit.state == "half-open":
+                if failed:
+                    circuit.open(now)
+                else:
+                    circuit.half_open_successes += 1
+                    if circuit.half_open_successes >= self.half_open_max_calls:
+                        circuit.close()
+            elif circuit.state == "closed":
+                circuit.outcomes.append(failed)
+                if (
+                    failed
+                    and len(circuit.outcomes) >= self.minimum_number_of_calls
+                    and (
+                        sum(circuit.outcomes) / len(circuit.outcomes)
+                        >= self.failure_rate_threshold
+                    )
+                ):
+                    circuit.open(now)
+
+    def release(self, request: Request) -> None:
+        """
+        Release a trial request permitted by `before` without recording an
+        outcome, for a request which was not sent (or which was
+        interrupted, such as by being cancelled).
+        """
+        key: tuple[str, ...] = self._get_key(request)
+        with self._lock:
+            circuit: _Circuit | None = self._circuits.get(key)
+            if (circuit is not None) and (circuit.state == "half-open"):
+                circuit.half_open_calls = max(circuit.half_open_calls - 1, 0)
+
+    def reset(self) -> None:
+        """
+        Close all circuits.
+        """
+        with self._lock:
+            self._circuits.clear()
@@ -0,0 +1,207 @@
+"""
+This module provides request body compression for `oapi.client.Client`.
+
+A `CompressionPolicy` compresses the body of each request which is at least
+`threshold` bytes in length, with a given content coding ("gzip",
+"deflate", "zstd" or "br") and compression level. The body is compressed
+incrementally, as it is sent (using "Transfer-Encoding: chunked"), so the
+compressed body is never held in memory in full.
+"""
+
+from __future__ import annotations
+
+import typing
+import zlib
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterator
+    from urllib.request import Request
+
+CONTENT_ENCODINGS: tuple[str, ...] = ("gzip", "deflate", "zstd", "br")
+
+
+class _Compressor(typing.Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class _BrotliCompressor:
+    def __init__(self, level: int | None) -> None:
+        try:
+            import brotlicffi as brotli  # type: ignore[import-not-found]
+        except ImportError:
+            import brotli  # type: ignore
+        self._compressor: typing.Any = (
+            brotli.Compressor(mode=brotli.MODE_TEXT)
+            if level is None
+            else brotli.Compressor(mode=brotli.MODE_TEXT, quality=level)
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        # `brotli` and `brotlicffi` name this method differently
+        if hasattr(self._compressor, "process"):
+            return self._compressor.process(data)  # type: ignore[no-any-return]
+        return self._compressor.compress(data)  # type: ignore[no-any-return]
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()  # type: ignore[no-any-return]
+
+
+def _get_compressor(
+    content_encoding: str, level: int | None, size: int = -1
+) -> _Compressor:
+    """
+    Get an incremental compressor for a content coding.
+
+    Parameters:
+        content_encoding:
+        level:
+        size: The size of the uncompressed content, if known (this is
+            written to the header of a zstd frame).
+    """
+    if content_encoding == "gzip":
+        return zlib.compressobj(
+            zlib.Z_DEFAULT_COMPRESSION if level is None else level,
+            zlib.DEFLATED,
+            16 + zlib.MAX_WBITS,
+        )
+    if content_encoding == "deflate":
+        return zlib.compressobj(
+            zlib.Z_DEFAULT_COMPRESSION if level is None else level
+        )
+    if content_encoding == "zstd":
+        import zstandard
+
+        return typing.cast(
+            "_Compressor",
+            (
+                zstandard.ZstdCompressor()
+                if level is None
+                else zstandard.ZstdCompressor(level=level)
+            ).compressobj(size=size),
+        )
+    if content_encoding == "br":
+        return _BrotliCompressor(level)
+    raise ValueError(content_encoding)
+
+
+class CompressedBody:
+    """
+    A request body which is compressed, in chunks, as it is iterated over.
+    Like the `bytes` it compresses, this can be iterated over more than
+    once (such as when a request is retried).
+
+    Attributes:
+        compressed_size: The number of compressed bytes yielded by the
+            most recent iteration.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "chunk_size",
+        "compressed_size",
+        "content_encoding",
+        "data",
+        "level",
+    )
+
+    def __init__(
+        self,
+        data: bytes,
+        content_encoding: str,
+        level: int | None = None,
+        chunk_size: int = 65536,
+    ) -> None:
+        self.data: bytes = data
+        self.content_encoding: str = content_encoding
+        self.level: int | None = level
+        self.chunk_size: int = chunk_size
+        self.compressed_size: int = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        view: memoryview = memoryview(self.data)
+        compressor: _Compressor = _get_compressor(
+            self.content_encoding, self.level, len(view)
+        )
+        chunk: bytes
+        start: int
+        self.compressed_size = 0
+        for start in range(0, len(view), self.chunk_size):
+            chunk = compressor.compress(view[start : start + self.chunk_size])  # type: ignore[arg-type]
+            if chunk:
+                self.compressed_size += len(chunk)
+                yield chunk
+        chunk = compressor.flush()
+        if chunk:
+            self.compressed_size += len(chunk)
+            yield chunk
+
+    def __bytes__(self) -> bytes:
+        return b"".join(self)
+
+
+class CompressionPolicy:
+    """
+    A policy for compressing request bodies, which may be shared by any
+    number of `oapi.client.Client` instances.
+
+    Only request bodies which are not already encoded (requests with a
+    "Content-Encoding" header are left as-is), and which are held in
+    memory (multipart request bodies are streamed, and typically consist
+    of files which are already compressed) are compressed.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "chunk_size",
+        "content_encoding",
+        "level",
+        "threshold",
+    )
+
+    def __init__(
+        self,
+        content_encoding: typing.Literal[
+            "gzip", "deflate", "zstd", "br"
+        ] = "gzip",
+        level: int | None = None,
+        threshold: int = 1024,
+        chunk_size: int = 65536,
+    ) -> None:
+        """
+        Parameters:
+            content_encoding: The content coding with which to compress
+                request bodies: "gzip" (the default), "deflate", "zstd"
+                (which requires the `zstandard` package) or "br" (which
+                requires the `brotli` or `brotlicffi` package).
+            level: The compression level (or, for "br", quality). If not
+                provided, the compression library's default is used.
+            threshold: The minimum number of bytes a request body must
+                have to be compressed. Compressing smaller bodies does not
+                reduce their size enough to be worthwhile.
+            chunk_size: The number of bytes of a request body compressed
+                at a time.
+        """
+        if content_encoding not in CONTENT_ENCODINGS:
+            raise ValueError(content_encoding)
+        self.content_encoding: str = content_encoding
+        self.level: int | None = level
+        self.threshold: int = threshold
+        self.chunk_size: int = chunk_size
+
+    def compress(self, request: Request) -> None:
+        """
+        Compress a request's body, if it is eligible for compression.
+        """
+        data: typing.Any = request.data
+        if (
+            (not isinstance(data, bytes))
+            or (len(data) < self.threshold)
+            or request.has_header("Content-encoding")
+        ):
+            return
+        # Setting `data` removes any "Content-Length" header, so that the
+        # body is sent using "Transfer-Encoding: chunked"
+        request.data = CompressedBody(  # type: ignore[assignment]
+            data, self.content_encoding, self.level, self.chunk_size
+        )
+        request.add_header("Content-encoding", self.content_encoding)
@@ -0,0 +1,246 @@
+"""
+This module provides `DNSCache`, an in-memory cache of host name
+resolutions for `oapi.client.Client` connections, so that each new
+connection to a host does not wait on a DNS lookup of its own.
+
+Resolutions are cached for a fixed time-to-live (the TTLs of DNS records
+are not exposed by `socket.getaddrinfo`), failed resolutions are cached
+(for a shorter time) so that an unresolvable host does not cause a lookup
+for every attempt at a request, and host names can be pinned to specific
+IP addresses--for example, to point a client at a local stand-in for a
+service, without editing "/etc/hosts" or the URL of the client (so that
+"Host" headers, and TLS server name indication and certificate
+verification, still use the original host name).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import threading
+import typing
+from time import monotonic
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+# (family, type, proto, canonname, sockaddr), as per `socket.getaddrinfo`
+_AddressInfo = tuple[typing.Any, ...]
+_Key = tuple[str, typing.Any, int, int, int, int]
+
+
+class _Entry:
+    __slots__: tuple[str, ...] = ("addresses", "error", "expires")
+
+    def __init__(
+        self,
+        expires: float,
+        addresses: list[_AddressInfo] | None = None,
+        error: socket.gaierror | None = None,
+    ) -> None:
+        self.expires: float = expires
+        self.addresses: list[_AddressInfo] | None = addresses
+        self.error: socket.gaierror | None = error
+
+
+def _get_overrides(
+    overrides: Mapping[str, str | Sequence[str]] | None,
+) -> dict[str, tuple[str, ...]]:
+    host: str
+    addresses: str | Sequence[str]
+    return {
+        host.lower(): (
+            (addresses,) if isinstance(addresses, str) else tuple(addresses)
+        )
+        for host, addresses in (overrides or {}).items()
+    }
+
+
+class DNSCache:
+    """
+    A thread-safe, in-memory cache of host name resolutions, which may be
+    shared by any number of clients.
+
+    Attributes:
+        ttl: The number of seconds for which a successful resolution is
+            cached.
+        negative_ttl: The number of seconds for which a failed resolution
+            (a `socket.gaierror`) is cached, and re-raised for subsequent
+            lookups of the same host. If this is 0, failed resolutions are
+            not cached.
+        overrides: A mapping of host names to the IP address (or
+            addresses) to which they are pinned. Pinned host names are
+            never looked up, and do not expire.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "_entries",
+        "_lock",
+        "negative_ttl",
+        "overrides",
+        "ttl",
+    )
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        negative_ttl: float = 5.0,
+        overrides: Mapping[str, str | Sequence[str]] | None = None,
+    ) -> None:
+        """
+        Parameters:
+            ttl:
+            negative_ttl:
+            overrides: A mapping of host names to the IP address, or a
+                sequence of IP addresses (to be tried in order), to which
+                each is pinned. For example:
+                `{"api.example.com": "127.0.0.1"}`.
+        """
+        self.ttl: float = ttl
+        self.negative_ttl: float = negative_ttl
+        self.overrides: dict[str, tuple[str, ...]] = _get_overrides(overrides)
+        self._entries: dict[_Key, _Entry] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def pin(self, host: str, addresses: str | Sequence[str]) -> None:
+        """
+        Pin a host name to an IP address, or to a sequence of IP addresses.
+        """
+        self.overrides.update(_get_overrides({host: addresses}))
+
+    def unpin(self, host: str) -> None:
+        """
+        Remove a host name's pinned IP address(es), if it has any.
+        """
+        self.overrides.pop(host.lower(), None)
+
+    def clear(self) -> None:
+        """
+        Discard all cached resolutions (pinned host names are retained).
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _get_override(
+        self,
+        key: _Key,
+    ) -> list[_AddressInfo] | None:
+        host: str
+        port: typing.Any
+        family: int
+        type_: int
+        protocol: int
+        flags: int
+        host, port, family, type_, protocol, flags = key
+        addresses: tuple[str, ...] | None = self.overrides.get(host.lower())
+        if addresses is None:
+            return None
+        address: str
+        return [
+            address_info
+            for address in addresses
+            for address_info in socket.getaddrinfo(
+                address,
+                port,
+                family,
+                type_,
+                protocol,
+                flags | socket.AI_NUMERICHOST,
+            )
+        ]
+
+    def _get(self, key: _Key) -> list[_AddressInfo] | None:
+        with self._lock:
+            entry: _Entry | None = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires <= monotonic():
+                del self._entries[key]
+                return None
+        if entry.error is not None:
+            raise socket.gaierror(*entry.error.args)
+        return entry.addresses
+
+    def _set(
+        self,
+        key: _Key,
+        addresses: list[_AddressInfo] | None = None,
+        error: socket.gaierror | None = None,
+    ) -> None:
+        ttl: float = self.ttl if error is None else self.negative_ttl
+        if ttl > 0:
+            with self._lock:
+                self._entries[key] = _Entry(
+                    monotonic() + ttl, addresses, error
+                )
+
+    def getaddrinfo(
+        self,
+        host: str,
+        port: typing.Any,
+        family: int = 0,
+        type: int = 0,
+        proto: int = 0,
+        flags: int = 0,
+    ) -> list[_AddressInfo]:
+        """
+        Resolve a host name (as does `socket.getaddrinfo`), returning a
+        cached resolution if there is one which has not expired.
+        """
+        key: _Key = (host, port, family, type, proto, flags)
+        addresses: list[_AddressInfo] | None = self._get_override(
+            key
+        ) or self._get(key)
+        if addresses is None:
+            try:
+                addresses = socket.getaddrinfo(*key)
+            except socket.gaierror as error:
+                self._set(key, error=error)
+                raise
+            self._set(key, addresses)
+        return addresses
+
+    async def async_getaddrinfo(
+        self,
+        host: str,
+        port: typing.Any,
+        family: int = 0,
+        type: int = 0,
+        proto: int = 0,
+        flags: int = 0,
+    ) -> list[_AddressInfo]:
+        """
+        Resolve a host name (as does `asyncio.loop.getaddrinfo`), returning
+        a cached resolution if there is one which has not expired.
+        """
+        key: _Key = (host, port, family, type, proto, flags)
+        addresses: list[_AddressInfo] | None = self._get_override(
+            key
+        ) or self._get(key)
+        if addresses is None:
+            try:
+                addresses = await asyncio.get_running_loop().getaddrinfo(
+                    host,
+                    port,
+                    family=family,
+                    type=type,
+                    proto=proto,
+                    flags=flags,
+                )
+            except socket.gaierror as error:
+                self._set(key, error=error)
+                raise
+            self._set(key, addresses)
+        return addresses
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __reduce__(
+        self,
+    ) -> tuple[
+        type[DNSCache], tuple[float, float, dict[str, tuple[str, ...]]]
+    ]:
+        # Cached resolutions expire per `time.monotonic`, which is not
+        # comparable between processes, so copies start out empty
+        return (type(self), (self.ttl, self.negative_ttl, self.overrides))
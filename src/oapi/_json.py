@@ -0,0 +1,220 @@
+"""
+This module provides pluggable JSON encoding and decoding for
+`oapi.client.Client`.
+
+A `JSONCodec` encodes to, and decodes from, `bytes` directly (avoiding
+the round trip through `str` incurred by `sob.serialize` and
+`sob.deserialize`), using [orjson](https://github.com/ijl/orjson),
+[msgspec](https://jcristharif.com/msgspec/),
+[ujson](https://github.com/ultrajson/ultrajson) or the standard library's
+`json` module. Because these libraries differ in the values they support
+(orjson, for example, does not support integers larger than 64 bits),
+anything a fast codec can't encode or decode is re-attempted using the
+standard library, so a codec only ever changes *how fast* JSON is
+processed, not *what* can be processed.
+"""
+
+from __future__ import annotations
+
+import json
+import typing
+from importlib import import_module
+
+import sob
+from sob.errors import DeserializeError
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable
+
+# The names of JSON codecs, in order of preference when a codec name of
+# "auto" is used
+JSON_CODEC_NAMES: tuple[str, ...] = ("orjson", "msgspec", "ujson", "json")
+
+
+def _dumps_json(value: typing.Any) -> bytes:
+    # This produces the same output as `sob.serialize`
+    return json.dumps(value).encode("utf-8")
+
+
+def _loads_json(data: bytes | str) -> typing.Any:
+    # Like `sob.deserialize`, control characters are permitted in strings
+    return json.loads(data, strict=False)
+
+
+def _dumps_ujson(value: typing.Any) -> bytes:
+    import ujson  # type: ignore
+
+    return ujson.dumps(  # type: ignore[no-any-return]
+        value, ensure_ascii=False, escape_forward_slashes=False
+    ).encode("utf-8")
+
+
+class JSONCodec:
+    """
+    A JSON encoder and decoder, which operates on `bytes`.
+
+    Instances of this class are usually obtained using
+    `oapi.client.get_json_codec`, however a codec can be created for any
+    JSON library by providing functions to encode and decode JSON.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "_decode_errors",
+        "_dumps",
+        "_encode_errors",
+        "_loads",
+        "name",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        dumps: Callable[[typing.Any], bytes],
+        loads: Callable[[bytes | str], typing.Any],
+        errors: tuple[type[Exception], ...] = (),
+    ) -> None:
+        """
+        Parameters:
+            name: A name by which to identify this codec.
+            dumps: A function which encodes JSON-serializable data
+                (`dict`, `list`, `str`, `int`, `float`, `bool` or `None`)
+                as UTF-8 encoded `bytes`. To be pickled, this must be a
+                module-level function.
+            loads: A function which decodes JSON from `bytes` or `str`.
+                To be pickled, this must be a module-level function.
+            errors: Exception types (in addition to `TypeError`,
+                `ValueError` and `OverflowError`) raised by `dumps` or
+                `loads` for values they can't encode or decode, which are
+                then re-attempted using the standard library.
+        """
+        self.name: str = name
+        self._dumps: Callable[[typing.Any], bytes] = dumps
+        self._loads: Callable[[bytes | str], typing.Any] = loads
+        self._encode_errors: tuple[type[Exception], ...] = (
+            TypeError,
+            ValueError,
+            OverflowError,
+            *errors,
+        )
+        self._decode_errors: tuple[type[Exception], ...] = (
+            ValueError,
+            OverflowError,
+            *errors,
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name!r})"
+
+    def dumps(self, value: typing.Any) -> bytes:
+        """
+        Encode a value as JSON.
+
+        Parameters:
+            value: JSON-serializable data, or an instance of `sob.Model`
+                (in which case, the model's serialization hooks are
+                applied).
+        """
+        if isinstance(value, sob.abc.Model):
+            hooks: sob.abc.Hooks | None = sob.read_model_hooks(value)
+            if hooks is not None and hooks.after_serialize is not None:
+                # This hook requires the serialized `str`
+                return sob.serialize(value).encode("utf-8")
+            model: sob.abc.Model = value
+            value = sob.marshal(model)
+            if hooks is not None and hooks.before_serialize is not None:
+                value = hooks.before_serialize(value)
+        if self._dumps is _dumps_json:
+            return _dumps_json(value)
+        try:
+            return self._dumps(value)
+        except self._encode_errors:
+            return _dumps_json(value)
+
+    def loads(self, data: bytes | str) -> typing.Any:
+        """
+        Decode JSON.
+
+        Parameters:
+            data: UTF-8 encoded JSON `bytes`, or a JSON `str`.
+        """
+        if self._loads is _loads_json:
+            return _loads_json(data)
+        try:
+            return self._loads(data)
+        except self._decode_errors:
+            return _loads_json(data)
+
+    def deserialize(
+        self,
+        data: str | bytes | sob.abc.Readable | None,
+        coerce_unparseable: type[str | bytes] | None = None,
+    ) -> typing.Any:
+        """
+        Decode JSON read from `data`, as `sob.deserialize` would (raising a
+        `sob.errors.DeserializeError` if the data cannot be parsed).
+
+        Parameters:
+            data: JSON `str` or `bytes`, or a file-like object (such as an
+                HTTP response) from which JSON can be read.
+            coerce_unparseable: If `str` or `bytes` are provided, and
+                the data provided cannot be parsed as JSON, it will be
+                returned as the specified type. If `None` (the default),
+                an error will be raised if the data cannot be parsed as
+                JSON.
+        """
+        if isinstance(data, sob.abc.Readable):
+            data = data.read()
+        if not isinstance(data, (str, bytes)):
+            raise TypeError(data)
+        try:
+            return self.loads(data)
+        except ValueError as error:
+            if coerce_unparseable is None:
+                raise DeserializeError(
+                    data=data, message=str(error)
+                ) from error
+            if isinstance(data, bytes) and issubclass(coerce_unparseable, str):
+                return str(data, encoding="utf-8", errors="replace")
+            return data
+
+
+def _get_json_codec(name: str) -> JSONCodec:
+    if name == "json":
+        return JSONCodec("json", _dumps_json, _loads_json)
+    module: typing.Any = import_module(
+        "msgspec.json" if name == "msgspec" else name
+    )
+    if name == "orjson":
+        return JSONCodec("orjson", module.dumps, module.loads)
+    if name == "msgspec":
+        msgspec: typing.Any = import_module("msgspec")
+        return JSONCodec(
+            "msgspec",
+            module.encode,
+            module.decode,
+            (msgspec.EncodeError, msgspec.DecodeError),
+        )
+    if name == "ujson":
+        return JSONCodec("ujson", _dumps_ujson, module.loads)
+    raise ValueError(name)
+
+
+def get_json_codec(name: str = "auto") -> JSONCodec:
+    """
+    Get a JSON codec by name.
+
+    Parameters:
+        name: "orjson", "msgspec", "ujson", "json" (the standard library)
+            or "auto" (the default), in which case the first of these
+            which is installed is used.
+    """
+    if name != "auto":
+        if name not in JSON_CODEC_NAMES:
+            raise ValueError(name)
+        return _get_json_codec(name)
+    for name_ in JSON_CODEC_NAMES:
+        try:
+            return _get_json_codec(name_)
+        except ImportError:
+            pass
+    raise ValueError(name)
@@ -0,0 +1,190 @@
+"""
+This module provides bounded-concurrency batch execution for
+`oapi.client.Client.map` and `oapi.client.AsyncClient.map`.
+
+Argument sets are read lazily, so no more than `concurrency` calls are
+pending at any one time (however many argument sets there are), and each
+result (or error) is yielded as soon as it is available, rather than once
+all calls have completed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import typing
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from contextvars import copy_context
+from functools import partial
+
+if typing.TYPE_CHECKING:
+    from collections.abc import (
+        AsyncIterator,
+        Awaitable,
+        Callable,
+        Iterable,
+        Iterator,
+        Mapping,
+    )
+    from concurrent.futures import Executor, Future
+
+
+def call_method(
+    client: typing.Any,
+    method: str | Callable[..., typing.Any],
+    kwargs: Mapping[str, typing.Any],
+) -> typing.Any:
+    """
+    Call a client method, or a function accepting the client as its first
+    argument, with keyword arguments.
+    """
+    return (
+        getattr(client, method)
+        if isinstance(method, str)
+        else partial(method, client)
+    )(**kwargs)
+
+
+def iter_map(
+    get_executor: Callable[[], Executor],
+    call: Callable[[Mapping[str, typing.Any]], typing.Any],
+    kwargs: Iterable[Mapping[str, typing.Any]],
+    concurrency: int,
+    *,
+    ordered: bool = True,
+    return_exceptions: bool = False,
+) -> Iterator[typing.Any]:
+    """
+    Call `call` with each of the given argument sets, using the executor
+    returned by `get_executor`, and yield the results.
+
+    Parameters:
+        get_executor: A function returning the executor to which each
+            call is submitted. This is called for each submission, so that
+            an executor which is shut down (by `oapi.client.Client.close`,
+            for example) while calls are pending can be replaced.
+        call:
+        kwargs: An iterable of keyword argument mappings.
+        concurrency: The maximum number of pending calls.
+        ordered: If `True`, results are yielded in the order of the
+            argument sets. If `False`, results are yielded in the order in
+            which the calls complete.
+        return_exceptions: If `True`, errors are yielded in place of
+            results. If `False`, the first error is raised (and pending
+            calls which have not started are cancelled).
+    """
+    kwargs_iterator: Iterator[Mapping[str, typing.Any]] = iter(kwargs)
+    # Pending calls, in the order of their argument sets
+    pending: deque[Future[typing.Any]] = deque()
+
+    def submit() -> bool:
+        kwargs_: Mapping[str, typing.Any]
+        for kwargs_ in kwargs_iterator:
+            # Calls are made in a copy of the current context, so that they
+            # are subject to any enclosing `oapi.client.Deadline`
+            try:
+                future_: Future[typing.Any] = get_executor().submit(
+                    copy_context().run, call, kwargs_
+                )
+            except RuntimeError:
+                # The executor was shut down after it was retrieved, so
+                # submit the call to its replacement
+                future_ = get_executor().submit(
+                    copy_context().run, call, kwargs_
+                )
+            pending.append(future_)
+            return True
+        return False
+
+    future: Future[typing.Any]
+    try:
+        while len(pending) < concurrency and submit():
+            pass
+        while pending:
+            if ordered:
+                future = pending.popleft()
+            else:
+                done: set[Future[typing.Any]] = wait(
+                    pending, return_when=FIRST_COMPLETED
+                ).done
+                future = next(
+                    future_ for future_ in pending if future_ in done
+                )
+                pending.remove(future)
+            error: BaseException | None = future.exception()
+            # Start the next call before yielding, so calls proceed while
+            # the result is being consumed
+            submit()
+            if error is None:
+                yield future.result()
+            elif return_exceptions:
+                yield error
+            else:
+                raise error
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def aiter_map(
+    call: Callable[[Mapping[str, typing.Any]], Awaitable[typing.Any]],
+    kwargs: Iterable[Mapping[str, typing.Any]],
+    concurrency: int,
+    *,
+    ordered: bool = True,
+    return_exceptions: bool = False,
+) -> AsyncIterator[typing.Any]:
+    """
+    Await `call` with each of the given argument sets, in concurrent tasks,
+    and yield the results.
+
+    Parameters:
+        call:
+        kwargs: An iterable of keyword argument mappings.
+        concurrency: The maximum number of pending calls.
+        ordered: If `True`, results are yielded in the order of the
+            argument sets. If `False`, results are yielded in the order in
+            which the calls complete.
+        return_exceptions: If `True`, errors are yielded in place of
+            results. If `False`, the first error is raised (and pending
+            calls are cancelled).
+    """
+    kwargs_iterator: Iterator[Mapping[str, typing.Any]] = iter(kwargs)
+    # Pending calls, in the order of their argument sets
+    pending: deque[asyncio.Future[typing.Any]] = deque()
+
+    def submit() -> bool:
+        kwargs_: Mapping[str, typing.Any]
+        for kwargs_ in kwargs_iterator:
+            pending.append(asyncio.ensure_future(call(kwargs_)))
+            return True
+        return False
+
+    task: asyncio.Future[typing.Any]
+    try:
+        while len(pending) < concurrency and submit():
+            pass
+        while pending:
+            if ordered:
+                task = pending.popleft()
+                await asyncio.wait((task,))
+            else:
+                done: set[asyncio.Future[typing.Any]] = (
+                    await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                )[0]
+                task = next(task_ for task_ in pending if task_ in done)
+                pending.remove(task)
+            error: BaseException | None = task.exception()
+            submit()
+            if error is None:
+                yield task.result()
+            elif return_exceptions:
+                yield error
+            else:
+                raise error
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,343 @@
+"""
+This module provides request lifecycle metrics for `oapi.client.Client`.
+
+A client's `metrics` hook is passed counters and observations (for latency
+histograms) labelled with the operation (the operation ID, or the name of
+the generated client method) of each request:
+
+- "requests_total": A counter of requests, by HTTP method and status class
+  ("2xx", "3xx", "4xx", "5xx", or "error" if no response was received).
+  Retried requests are counted once.
+- "retries_total": A counter of retried attempts, by HTTP method.
+- "request_bytes_total" and "response_bytes_total": Counters of the bytes
+  sent and received, by encoding: "identity" (before compression, or after
+  decompression) or "encoded" (as transmitted).
+- "request_duration_seconds": A histogram of the time from when a request
+  is made until response headers are received (including any retries), by
+  HTTP method.
+- "phase_duration_seconds": A histogram of the time spent in each phase of
+  a request, by phase: "assembly" (formatting, serializing, compressing and
+  authenticating a request), "network" (sending a request and receiving the
+  response headers), "receive" (receiving, and decoding, the response
+  body) and "unmarshal" (deserializing and unmarshalling the response).
+
+`MetricsAggregator` aggregates these in-process, and renders them in the
+Prometheus text exposition format.
+"""
+
+from __future__ import annotations
+
+import threading
+import typing
+from bisect import bisect_left
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# The default upper bounds (in seconds) of latency histogram buckets
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_HELP: dict[str, str] = {
+    "requests_total": "Requests, by method and status class.",
+    "retries_total": "Retried request attempts.",
+    "request_bytes_total": "Request body bytes sent, by encoding.",
+    "response_bytes_total": "Response body bytes received, by encoding.",
+    "request_duration_seconds": (
+        "Time from making a request until response headers are received, "
+        "including retries."
+    ),
+    "phase_duration_seconds": "Time spent in each phase of a request.",
+}
+
+_Labels = tuple[tuple[str, str], ...]
+
+
+def get_status_class(status: int) -> str:
+    """
+    Get the class ("2xx", "3xx", "4xx" or "5xx") of an HTTP status code, or
+    "error" if no status code was received (`status` is 0).
+    """
+    if not status:
+        return "error"
+    return f"{status // 100}xx"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _represent_labels(labels: _Labels) -> str:
+    if not labels:
+        return ""
+    name: str
+    value: str
+    return "{{{}}}".format(
+        ",".join(
+            f'{name}="{_escape_label_value(value)}"' for name, value in labels
+        )
+    )
+
+
+def _represent_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _get_labels(operation: str, labels: dict[str, str]) -> _Labels:
+    return (("operation", operation), *sorted(labels.items()))
+
+
+class Metrics:
+    """
+    A metrics hook for `oapi.client.Client`. This base class discards all
+    metrics: sub-classes override `increment` and `observe` in order to
+    record them (such as by forwarding them to a metrics library).
+    """
+
+    __slots__: tuple[str, ...] = ()
+
+    def increment(
+        self,
+        name: str,
+        operation: str,
+        value: float = 1,
+        **labels: str,
+    ) -> None:
+        """
+        Increment a counter.
+
+        Parameters:
+            name: The name of the counter, such as "requests_total".
+            operation: The operation ID (or name of the client method) of
+                the request, or an empty string for requests not made by
+                an operation method.
+            value: The amount by which to increment the counter.
+            **labels: Additional labels, such as `method="GET"`.
+        """
+
+    def observe(
+        self,
+        name: str,
+        operation: str,
+        value: float,
+        **labels: str,
+    ) -> None:
+        """
+        Observe a value (a duration, in seconds) for a histogram.
+
+        Parameters:
+            name: The name of the histogram, such as
+                "request_duration_seconds".
+            operation: The operation ID (or name of the client method) of
+                the request, or an empty string for requests not made by
+                an operation method.
+            value: The value observed.
+            **labels: Additional labels, such as `phase="network"`.
+        """
+
+
+class _Histogram:
+    __slots__: tuple[str, ...] = ("bucket_counts", "count", "sum")
+
+    def __init__(self, number_of_buckets: int) -> None:
+        self.bucket_counts: list[int] = [0] * number_of_buckets
+        self.count: int = 0
+        self.sum: float = 0.0
+
+
+class MetricsAggregator(Metrics):
+    """
+    A thread-safe, in-process aggregator of client metrics, which can
+    render them in the Prometheus text exposition format (for serving from
+    a "/metrics" endpoint, or writing to a node exporter's textfile
+    directory). A single aggregator may be shared by any number of
+    clients.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "_counters",
+        "_histograms",
+        "_lock",
+        "buckets",
+        "namespace",
+    )
+
+    def __init__(
+        self,
+        namespace: str = "oapi_client",
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """
+        Parameters:
+            namespace: A prefix for the name of each rendered metric.
+            buckets: The upper bounds of histogram buckets, in ascending
+                order (a "+Inf" bucket is always included).
+        """
+        self.namespace: str = namespace
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self._counters: dict[str, dict[_Labels, float]] = {}
+        self._histograms: dict[str, dict[_Labels, _Histogram]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def increment(
+        self,
+        name: str,
+        operation: str,
+        value: float = 1,
+        **labels: str,
+    ) -> None:
+        key: _Labels = _get_labels(operation, labels)
+        with self._lock:
+            counters: dict[_Labels, float] = self._counters.setdefault(
+                name, {}
+            )
+            counters[key] = counters.get(key, 0) + value
+
+    def observe(
+        self,
+        name: str,
+        operation: str,
+        value: float,
+        **labels: str,
+    ) -> None:
+        key: _Labels = _get_labels(operation, labels)
+        # Only the first bucket with an upper bound >= the value is
+        # incremented here: buckets are made cumulative when rendered
+        index: int = bisect_left(self.buckets, value)
+        with self._lock:
+            histograms: dict[_Labels, _Histogram] = (
+                self._histograms.setdefault(name, {})
+            )
+            histogram: _Histogram | None = histograms.get(key)
+            if histogram is None:
+                histogram = histograms[key] = _Histogram(len(self.buckets) + 1)
+            histogram.bucket_counts[index] += 1
+            histogram.count += 1
+            histogram.sum += value
+
+    def get_count(self, name: str, operation: str, **labels: str) -> float:
+        """
+        Get the value of a counter, or the number of values observed for a
+        histogram.
+
+        Parameters:
+            name:
+            operation:
+            **labels: All additional labels of the counter or histogram.
+        """
+        key: _Labels = _get_labels(operation, labels)
+        with self._lock:
+            if name in self._histograms:
+                histogram: _Histogram | None = self._histograms[name].get(key)
+                return 0 if histogram is None else histogram.count
+            return self._counters.get(name, {}).get(key, 0)
+
+    def get_sum(self, name: str, operation: str, **labels: str) -> float:
+        """
+        Get the sum of the values observed for a histogram.
+
+        Parameters:
+            name:
+            operation:
+            **labels: All additional labels of the histogram.
+        """
+        key: _Labels = _get_labels(operation, labels)
+        with self._lock:
+            histogram: _Histogram | None = self._histograms.get(name, {}).get(
+                key
+            )
+            return 0.0 if histogram is None else histogram.sum
+
+    def clear(self) -> None:
+        """
+        Discard all metrics.
+        """
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def _iter_counter_lines(
+        self, name: str, counters: dict[_Labels, float]
+    ) -> Iterable[str]:
+        metric_name: str = f"{self.namespace}_{name}"
+        if name in _HELP:
+            yield f"# HELP {metric_name} {_HELP[name]}"
+        yield f"# TYPE {metric_name} counter"
+        labels: _Labels
+        value: float
+        for labels, value in sorted(counters.items()):
+            yield (
+                f"{metric_name}{_represent_labels(labels)} "
+                f"{_represent_value(value)}"
+            )
+
+    def _iter_histogram_lines(
+        self, name: str, histograms: dict[_Labels, _Histogram]
+    ) -> Iterable[str]:
+        metric_name: str = f"{self.namespace}_{name}"
+        if name in _HELP:
+            yield f"# HELP {metric_name} {_HELP[name]}"
+        yield f"# TYPE {metric_name} histogram"
+        labels: _Labels
+        histogram: _Histogram
+        for labels, histogram in sorted(
+            histograms.items(), key=lambda item: item[0]
+        ):
+            cumulative_count: int = 0
+            upper_bound: float
+            bucket_count: int
+            for upper_bound, bucket_count in zip(
+                (*self.buckets, float("inf")),
+                histogram.bucket_counts,
+                strict=True,
+            ):
+                cumulative_count += bucket_count
+                bucket_labels: _Labels = (
+                    *labels,
+                    ("le", _represent_value(upper_bound)),
+                )
+                yield (
+                    f"{metric_name}_bucket{_represent_labels(bucket_labels)}"
+                    f" {cumulative_count}"
+                )
+            yield (
+                f"{metric_name}_sum{_represent_labels(labels)} "
+                f"{_represent_value(histogram.sum)}"
+            )
+            yield (
+                f"{metric_name}_count{_represent_labels(labels)} "
+                f"{histogram.count}"
+            )
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+        (version 0.0.4).
+        """
+        lines: list[str] = []
+        with self._lock:
+            name: str
+            for name in sorted(self._counters):
+                lines.extend(
+                    self._iter_counter_lines(name, self._counters[name])
+                )
+            for name in sorted(self._histograms):
+                lines.extend(
+                    self._iter_histogram_lines(name, self._histograms[name])
+                )
+        return "".join(f"{line}\n" for line in lines)
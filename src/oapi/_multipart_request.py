@@ -4,13 +4,19 @@ multipart requests, to support passing instances of sob models to the `data`
 parameter/property for `urllib.request.Request`, and to support casting
 requests as `str` or `bytes` (typically for debugging purposes and/or to aid in
 producing non-language-specific API documentation).
+
+The body of a `MultipartRequest` is streamed: parts holding a (binary,
+seekable) file are read in chunks as the request is sent, rather than being
+read into memory, and the request's "Content-Length" is calculated from the
+size of each part.
 """
 
 from __future__ import annotations
 
 import collections
-import random
-import string
+import os
+import secrets
+import weakref
 from collections.abc import (
     ItemsView,
     Iterable,
@@ -23,6 +29,23 @@ from urllib.request import Request as _Request  # type: ignore
 
 import sob
 
+# The number of bytes read from a file at a time, when streaming it
+_CHUNK_SIZE: int = 65536
+
+
+def _is_streamable(file: sob.abc.Readable) -> bool:
+    """
+    Determine if a file can be streamed: it must be seekable (so that its
+    size can be determined, and it can be re-read if a request is retried),
+    and must be opened in binary mode.
+    """
+    try:
+        return bool(file.seekable()) and isinstance(  # type: ignore
+            file.read(0), bytes
+        )
+    except (AttributeError, OSError):
+        return False
+
 
 class Headers:
     """
@@ -132,7 +155,7 @@ class Headers:
             self._dict.__setitem__(key, value)
 
     def _get_content_length(self) -> int:
-        return len(self.request.data or b"")
+        return self.request.get_data_length()
 
     def _get_boundary(self) -> str:
         boundary: str = ""
@@ -169,7 +192,14 @@ class Headers:
             yield "Content-type"
 
     def __contains__(self, key: str) -> bool:  # type: ignore
-        return self._dict.__contains__(key.capitalize())
+        key = key.capitalize()
+        if key == "Content-length":
+            # Consistent with `__iter__`, so that `urllib` does not use
+            # "Transfer-Encoding: chunked" for a streamed body
+            return (type(self.request) is not Part) or self._dict.__contains__(
+                key
+            )
+        return self._dict.__contains__(key)
 
     def items(self) -> ItemsView[str, str]:  # type: ignore
         for key in self.__iter__():
@@ -213,6 +243,9 @@ class Data:
         self._bytes: bytes | None = None
         self._headers: Headers | None = None
         self._data: bytes | None = None
+        self._file: sob.abc.Readable | None = None
+        self._file_position: int = 0
+        self._file_length: int = 0
         self.headers = headers  # type: ignore
         self.data = data  # type: ignore
 
@@ -222,7 +255,7 @@ class Data:
 
     @headers.setter
     def headers(self, headers: Mapping[str, str] | Headers | None) -> None:
-        self._bytes = None
+        self.clear_bytes()
         if headers is None:
             headers = Headers({}, self)
         elif isinstance(headers, Headers):
@@ -233,6 +266,8 @@ class Data:
 
     @property  # type: ignore
     def data(self) -> bytes | None:
+        if self._file is not None:
+            return b"".join(self.iter_data())
         return self._data
 
     @data.setter
@@ -240,7 +275,21 @@ class Data:
         self,
         data: sob.abc.MarshallableTypes,
     ) -> None:
-        self._bytes = None
+        self.clear_bytes()
+        self._file = None
+        if isinstance(data, sob.abc.Readable):
+            if _is_streamable(data):
+                # Binary, seekable files are streamed, so only their
+                # position and size are recorded
+                self._file = data
+                self._file_position = data.tell()
+                self._file_length = (
+                    data.seek(0, os.SEEK_END) - self._file_position
+                )
+                data.seek(self._file_position)
+                self._data = None
+                return
+            data = data.read()
         if data is not None:
             if (data is not None) and not (isinstance(data, (str, bytes))):
                 data = sob.serialize(data)
@@ -252,22 +301,73 @@ class Data:
     def data(self) -> None:
         self.data = None
 
+    def iter_data(self) -> Iterator[bytes]:
+        """
+        Yield the data in chunks, reading a file (if the data is a file)
+        from its original position each time this is called, so that the
+        data can be sent more than once (such as when a request is
+        retried). The file is returned to its original position afterwards,
+        so that a part created from the same file (such as for the next
+        attempt at a request) also starts from that position.
+        """
+        if self._file is None:
+            if self._data:
+                yield self._data
+            return
+        self._file.seek(self._file_position)
+        try:
+            remaining: int = self._file_length
+            while remaining > 0:
+                chunk: bytes = self._file.read(  # type: ignore
+                    min(_CHUNK_SIZE, remaining)
+                )
+                if not chunk:
+                    message: str = (
+                        f"{self._file!r} ended {remaining} bytes before its "
+                        "expected length"
+                    )
+                    raise ValueError(message)
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            self._file.seek(self._file_position)
+
+    def get_data_length(self) -> int:
+        """
+        Get the length (in bytes) of the data, without reading it.
+        """
+        if self._file is not None:
+            return self._file_length
+        return len(self._data or b"")
+
+    def _get_head(self) -> bytes:
+        """
+        Get this part's headers, followed by a blank line.
+        """
+        head: bytes = b""
+        if self.headers is not None:
+            key: str
+            value: str
+            for key, value in self.headers.items():
+                head += bytes(f"{key}: {value}\r\n", encoding="utf-8")
+        return head + b"\r\n"
+
     def clear_bytes(self) -> None:
         self._bytes = None
 
+    def _has_data(self) -> bool:
+        return (self._file is not None) or (self._data is not None)
+
     def __bytes__(self) -> bytes:
-        if self._bytes is None:
-            lines: list[bytes] = []
-            if self.headers is not None:
-                key: str
-                value: str
-                for key, value in self.headers.items():
-                    lines.append(bytes(f"{key}: {value}", encoding="utf-8"))
-            lines.append(b"")
-            if self.data is not None:
-                lines.append(self.data)
-            self._bytes = b"\r\n".join(lines) + b"\r\n"
-        return self._bytes
+        if self._bytes is not None:
+            return self._bytes
+        value: bytes = self._get_head()
+        if self._has_data():
+            value += b"".join(self.iter_data()) + b"\r\n"
+        # Files are not held in memory
+        if self._file is None:
+            self._bytes = value
+        return value
 
     def __str__(self) -> str:
         return (
@@ -296,59 +396,52 @@ class Part(Data):
         """
         self._boundary: bytes | None = None
         self._parts: Parts | None = None
+        # The parts of which this is one, the caches of which must be
+        # cleared along with this part's
+        self._parents: weakref.WeakSet[Part] = weakref.WeakSet()
+        # The serialized headers, the length of the data, and (if no part
+        # is a streamed file) the serialized multipart body are cached
+        # until headers or parts (or the parts of those parts) are modified
+        self._head: bytes | None = None
+        self._length: int | None = None
+        self._body: bytes | None = None
         self.parts = parts  # type: ignore
         Data.__init__(self, data=data, headers=headers)
 
     @property  # type: ignore
     def boundary(self) -> bytes:
         """
-        Calculates a boundary which is not contained in any of the request
-        parts.
+        A random boundary. This has 128 bits of entropy, so (like the
+        boundaries generated by other HTTP clients) is assumed not to be
+        contained in any of the request parts, rather than the parts being
+        scanned for it (which would require reading every part in full).
         """
         if self._boundary is None:
-            part: Part
-            data: bytes = b"\r\n".join(
-                [self._data or b""]
-                + [bytes(part) for part in (self.parts or ())]
-            )
-            boundary: bytes = b"".join(
-                bytes(
-                    random.choice(  # noqa: S311
-                        string.digits + string.ascii_letters
-                    ),
-                    encoding="utf-8",
-                )
-                for _index in range(16)
-            )
-            while boundary in data:
-                boundary += bytes(
-                    random.choice(  # noqa: S311
-                        string.digits + string.ascii_letters
-                    ),
-                    encoding="utf-8",
-                )
-            self._boundary = boundary
+            self._boundary = bytes(secrets.token_hex(16), encoding="ascii")
         return self._boundary
 
     @boundary.deleter
     def boundary(self) -> None:
         self._boundary = None
+        # The boundary is included in the headers and the body
+        self.clear_bytes()
+
+    def clear_bytes(self) -> None:
+        Data.clear_bytes(self)
+        self._head = None
+        self._length = None
+        self._body = None
+        # The serialized body and length of each multipart body containing
+        # this part are no longer valid
+        parent: Part
+        for parent in tuple(self._parents):
+            parent.clear_bytes()
 
     @property  # type: ignore
     def data(self) -> bytes | None:
-        data: bytes | None
         if self.parts:
-            part: Part
-            data = b"%s\r\n--%s--" % (
-                (b"\r\n--%s\r\n" % self.boundary).join(
-                    [self._data or b""]
-                    + [bytes(part).rstrip() for part in self.parts]
-                ),
-                self.boundary,
-            )
-        else:
-            data = self._data
-        return data
+            return b"".join(self.iter_data())
+        return Data.data.__get__(self)  # type: ignore
 
     @data.setter
     def data(
@@ -357,6 +450,71 @@ class Part(Data):
     ) -> None:
         Data.data.__set__(self, data)  # type: ignore
 
+    def iter_data(self) -> Iterator[bytes]:
+        """
+        Yield the data in chunks. For a multipart body, this is the
+        (optional) preamble, followed by each part's headers and data,
+        preceded by a delimiter.
+        """
+        if not self.parts:
+            yield from Data.iter_data(self)
+        elif self._body is not None:
+            yield self._body
+        elif self._is_streamed():
+            yield from self._iter_multipart_data()
+        else:
+            self._body = b"".join(self._iter_multipart_data())
+            yield self._body
+
+    def _is_streamed(self) -> bool:
+        """
+        Determine if this part's data, or that of any of its parts, is
+        streamed from a file.
+        """
+        part: Part
+        return (self._file is not None) or any(
+            part._is_streamed() for part in (self.parts or ())
+        )
+
+    def _iter_multipart_data(self) -> Iterator[bytes]:
+        delimiter: bytes = b"\r\n--%s\r\n" % self.boundary
+        if self._data:
+            yield self._data
+        part: Part
+        for part in self.parts or ():
+            yield delimiter
+            yield part._get_head()
+            yield from part.iter_data()
+        yield b"\r\n--%s--" % self.boundary
+
+    def get_data_length(self) -> int:
+        """
+        Get the length (in bytes) of the data, without reading any files.
+        """
+        if not self.parts:
+            return Data.get_data_length(self)
+        if self._length is None:
+            part: Part
+            self._length = (
+                len(self._data or b"")
+                + sum(
+                    len(part._get_head()) + part.get_data_length()
+                    for part in self.parts
+                )
+                + (len(self.parts) * (len(self.boundary) + 6))
+                + len(self.boundary)
+                + 6
+            )
+        return self._length
+
+    def _get_head(self) -> bytes:
+        if self._head is None:
+            self._head = Data._get_head(self)
+        return self._head
+
+    def _has_data(self) -> bool:
+        return bool(self.parts) or Data._has_data(self)
+
     @property  # type: ignore
     def parts(self) -> Parts | None:
         return self._parts
@@ -367,45 +525,57 @@ class Part(Data):
             parts = Parts([], request=self)
         elif isinstance(parts, Parts):
             parts.request = self
+            parts._adopt(parts)
         else:
             parts = Parts(parts, request=self)
-        self._boundary = None
         self._parts = parts
+        del self.boundary
 
 
 class Parts:
     def __init__(self, items: Sequence[Part], request: Part) -> None:
         self._list: list[Part] = list(items)
         self.request = request
+        self._adopt(self._list)
+
+    def _adopt(self, items: Iterable[Part]) -> None:
+        """
+        Record `request` as the parent of each of `items`, so that
+        modifying a part clears the cached body of the request.
+        """
+        item: Part
+        for item in items:
+            item._parents.add(self.request)
+
+    def _reset_request(self) -> None:
+        del self.request.boundary
 
     def append(self, item: Part) -> None:
-        self.request._boundary = None  # noqa: SLF001
-        self.request._bytes = None  # noqa: SLF001
+        self._reset_request()
+        self._adopt((item,))
         self._list.append(item)
 
     def clear(self) -> None:
-        self.request._boundary = None  # noqa: SLF001
-        self.request._bytes = None  # noqa: SLF001
+        self._reset_request()
         self._list.clear()
 
     def extend(self, items: Iterable[Part]) -> None:
-        self.request._boundary = None  # noqa: SLF001
-        self.request._bytes = None  # noqa: SLF001
+        self._reset_request()
+        items = tuple(items)
+        self._adopt(items)
         self._list.extend(items)
 
     def reverse(self) -> None:
-        self.request._boundary = None  # noqa: SLF001
-        self.request._bytes = None  # noqa: SLF001
+        self._reset_request()
         self._list.reverse()
 
     def __delitem__(self, key: int) -> None:
-        self.request._boundary = None  # noqa: SLF001
-        self.request._bytes = None  # noqa: SLF001
+        self._reset_request()
         self._list.__delitem__(key)
 
     def __setitem__(self, key: int, value: Part) -> None:
-        self.request._boundary = None  # noqa: SLF001
-        self.request._bytes = None  # noqa: SLF001
+        self._reset_request()
+        self._adopt((value,))
         self._list.__setitem__(key, value)
 
     def __iter__(self) -> Iterator[Part]:
@@ -449,11 +619,36 @@ class Request(Data, _Request):  # type: ignore
         )
 
 
+class MultipartBody:
+    """
+    The body of a `MultipartRequest`: an iterable of `bytes` chunks, which
+    (unlike a generator) can be iterated over more than once, and which has
+    a length.
+    """
+
+    __slots__: tuple[str, ...] = ("part",)
+
+    def __init__(self, part: Part) -> None:
+        self.part: Part = part
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self.part.iter_data()
+
+    def __len__(self) -> int:
+        return self.part.get_data_length()
+
+    def __bytes__(self) -> bytes:
+        return b"".join(self)
+
+
 class MultipartRequest(Part, Request):  # type: ignore
     """
     A sub-class of `Request` which adds a property (and initialization
     parameter) to hold the `parts` of a multipart request.
 
+    The request's `data` is a `MultipartBody`, which is streamed when the
+    request is sent.
+
     https://www.w3.org/Protocols/rfc1341/7_2_Multipart.html
     """
 
@@ -477,3 +672,16 @@ class MultipartRequest(Part, Request):  # type: ignore
             unverifiable=unverifiable,
             method=method,
         )
+
+    @property  # type: ignore
+    def data(self) -> MultipartBody | bytes | None:  # type: ignore
+        if self.parts:
+            return MultipartBody(self)
+        return Part.data.__get__(self)  # type: ignore
+
+    @data.setter  # type: ignore[override]
+    def data(
+        self,
+        data: sob.abc.MarshallableTypes,
+    ) -> None:
+        Data.data.__set__(self, data)  # type: ignore
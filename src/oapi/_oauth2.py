@@ -0,0 +1,491 @@
+"""
+This module provides thread-safe management of OAuth2 access tokens for
+`oapi.client.Client`.
+
+A token is obtained only once when it is needed (however many threads need
+it at the same moment), and is refreshed in a background thread shortly
+before it expires, so that requests are not delayed while a new token is
+obtained. If a token was issued with a refresh token, the refresh token is
+used to obtain its replacement.
+
+Tokens (and OpenID Connect discovery documents) can also be shared between
+clients using an `OAuth2TokenStore`: either a `MemoryOAuth2TokenStore`,
+for clients in one process, or a `FileOAuth2TokenStore`, for clients in
+any number of processes on a host (such as the workers of a
+`multiprocessing` pool), so that one token is obtained, and used, by all
+of them.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import time
+import typing
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # Windows
+    fcntl = None  # type: ignore
+    import msvcrt
+
+if typing.TYPE_CHECKING:
+    import collections.abc
+
+
+class OAuth2Token:
+    """
+    An OAuth2 access token.
+
+    Parameters:
+        access_token: The access token.
+        token_type: The token type (typically "Bearer").
+        expires_at: The time (in seconds since the epoch) at which the
+            token expires.
+        issued_at: The time (in seconds since the epoch) at which the
+            token was issued.
+        refresh_token: A refresh token, with which a new access token
+            can be obtained, if one was issued.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "access_token",
+        "expires_at",
+        "issued_at",
+        "refresh_token",
+        "token_type",
+    )
+
+    def __init__(
+        self,
+        access_token: str,
+        token_type: str = "Bearer",
+        expires_at: float = float("inf"),
+        issued_at: float | None = None,
+        refresh_token: str | None = None,
+    ) -> None:
+        self.access_token: str = access_token
+        self.token_type: str = token_type
+        self.expires_at: float = expires_at
+        self.issued_at: float = time.time() if issued_at is None else issued_at
+        self.refresh_token: str | None = refresh_token
+
+    @classmethod
+    def from_response_data(
+        cls,
+        data: collections.abc.Mapping[str, typing.Any],
+        refresh_token: str | None = None,
+    ) -> OAuth2Token:
+        """
+        Create a token from the (deserialized) JSON data of a token
+        endpoint response.
+
+        Parameters:
+            data: The response data.
+            refresh_token: The refresh token used to obtain this token, if
+                any. This is retained if the response does not include a new
+                refresh token.
+        """
+        issued_at: float = time.time()
+        expires_in: typing.Any = data.get("expires_in")
+        return cls(
+            access_token=data["access_token"],
+            token_type=data.get("token_type", "Bearer"),
+            # A token without an expiration is treated as never expiring
+            expires_at=(
+                float("inf")
+                if expires_in is None
+                else issued_at + int(expires_in) - 1
+            ),
+            issued_at=issued_at,
+            refresh_token=data.get("refresh_token", refresh_token),
+        )
+
+    @property
+    def authorization(self) -> str:
+        """
+        The value for an "Authorization" header.
+        """
+        return f"{self.token_type} {self.access_token}"
+
+    def is_expired(self, now: float | None = None) -> bool:
+        return (time.time() if now is None else now) >= self.expires_at
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        return {
+            "access_token": self.access_token,
+            "token_type": self.token_type,
+            "expires_at": self.expires_at,
+            "issued_at": self.issued_at,
+            "refresh_token": self.refresh_token,
+        }
+
+    @classmethod
+    def from_dict(
+        cls, data: collections.abc.Mapping[str, typing.Any]
+    ) -> OAuth2Token:
+        return cls(**data)
+
+    def get_refresh_at(self, skew: float) -> float:
+        """
+        Get the time at which the token should be refreshed: `skew` seconds
+        before it expires or, if its lifetime is no longer than `skew`,
+        half-way through its lifetime.
+        """
+        lifetime: float = self.expires_at - self.issued_at
+        return self.expires_at - (skew if skew < lifetime else lifetime / 2)
+
+
+class OAuth2TokenManager:
+    """
+    A thread-safe holder for an OAuth2 access token, which obtains a token
+    only once (per expiration) no matter how many threads request it at
+    once, and which refreshes the token in a background thread `skew`
+    seconds before it expires.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "_lock",
+        "key",
+        "refresh_token",
+        "request_token",
+        "skew",
+        "store",
+        "token",
+    )
+
+    def __init__(
+        self,
+        request_token: typing.Callable[[], OAuth2Token],
+        refresh_token: typing.Callable[[OAuth2Token], OAuth2Token]
+        | None = None,
+        skew: float = 60.0,
+        store: OAuth2TokenStore | None = None,
+        key: str = "",
+    ) -> None:
+        """
+        Parameters:
+            request_token: A function which obtains a new token.
+            refresh_token: A function which obtains a new token using the
+                refresh token of an existing token.
+            skew: The number of seconds before a token expires at which it
+                should be refreshed (in the background).
+            store: A token store, through which tokens are shared with
+                other token managers (in this, or other, processes).
+            key: The key under which tokens are held in `store` (see
+                `get_token_key`).
+        """
+        self.request_token: typing.Callable[[], OAuth2Token] = request_token
+        self.refresh_token: (
+            typing.Callable[[OAuth2Token], OAuth2Token] | None
+        ) = refresh_token
+        self.skew: float = skew
+        self.store: OAuth2TokenStore | None = store
+        self.key: str = key
+        self.token: OAuth2Token | None = None
+        # This lock is held while a token is being obtained
+        self._lock: threading.Lock = threading.Lock()
+
+    def _obtain_token(self, token: OAuth2Token | None) -> OAuth2Token:
+        if self.store is None:
+            return self._request_token(token)
+        # Only one process obtains a token at a time, and a token obtained
+        # by another process (while this one was waiting) is used, if it
+        # is not yet due to be refreshed
+        with self.store.lock(self.key):
+            stored_token: OAuth2Token | None = self.store.get_token(self.key)
+            if stored_token is not None:
+                if time.time() < stored_token.get_refresh_at(self.skew):
+                    return stored_token
+                # The stored token's refresh token is the most recent
+                token = stored_token
+            token = self._request_token(token)
+            self.store.set_token(self.key, token)
+            return token
+
+    def _request_token(self, token: OAuth2Token | None) -> OAuth2Token:
+        if (
+            (token is not None)
+            and token.refresh_token
+            and (self.refresh_token is not None)
+        ):
+            try:
+                return self.refresh_token(token)
+            except (OSError, ValueError, KeyError):
+                # The refresh token may have expired or been revoked, in
+                # which case a new token is requested
+                pass
+        return self.request_token()
+
+    def _refresh_token_in_background(self) -> None:
+        # If a token is already being obtained, there is nothing to do
+        if not self._lock.acquire(blocking=False):
+            return
+
+        def refresh_token() -> None:
+            try:
+                token: OAuth2Token | None = self.token
+                if (token is not None) and (
+                    time.time() < token.get_refresh_at(self.skew)
+                ):
+                    return
+                self.token = self._obtain_token(token)
+            except (OSError, ValueError, KeyError):
+                # The current token remains valid until it expires, at
+                # which time the token will be obtained in the foreground
+                # (raising any error)
+                pass
+            finally:
+                self._lock.release()
+
+        threading.Thread(target=refresh_token, daemon=True).start()
+
+    def get_token(self) -> OAuth2Token:
+        """
+        Get a valid token, obtaining one if there is none or it has
+        expired.
+        """
+        token: OAuth2Token | None = self.token
+        now: float = time.time()
+        if (token is not None) and not token.is_expired(now):
+            if now >= token.get_refresh_at(self.skew):
+                self._refresh_token_in_background()
+            return token
+        with self._lock:
+            # Another thread may have obtained a token while this one was
+            # waiting for the lock
+            token = self.token
+            if (token is None) or token.is_expired():
+                token = self.token = self._obtain_token(token)
+            return token
+
+    def clear(self) -> None:
+        """
+        Discard the current token (including any held in the store).
+        """
+        self.token = None
+        if self.store is not None:
+            self.store.delete_token(self.key)
+
+
+def get_token_key(
+    token_url: str,
+    client_id: str | None,
+    scope: str | tuple[str, ...] | None = None,
+    username: str | None = None,
+) -> str:
+    """
+    Get the key under which tokens obtained from `token_url`, for a given
+    client ID, scope and (for the password flow) username, are stored.
+    """
+    if isinstance(scope, tuple):
+        scope = " ".join(sorted(scope))
+    return json.dumps([token_url, client_id, scope, username])
+
+
+class OAuth2TokenStore(ABC):
+    """
+    A base class for stores which share OAuth2 tokens, and OpenID Connect
+    discovery documents, between clients.
+    """
+
+    def __init__(self, document_max_age: float = 24 * 60 * 60) -> None:
+        """
+        Parameters:
+            document_max_age: The number of seconds for which an OpenID
+                Connect discovery document is stored (one day, by default).
+        """
+        self.document_max_age: float = document_max_age
+
+    @abstractmethod
+    def get_token(self, key: str) -> OAuth2Token | None:
+        """
+        Retrieve a stored token, or `None` if there is no unexpired token
+        stored for `key`.
+        """
+
+    @abstractmethod
+    def set_token(self, key: str, token: OAuth2Token) -> None:
+        """
+        Store a token.
+        """
+
+    @abstractmethod
+    def delete_token(self, key: str) -> None:
+        """
+        Remove a stored token, if there is one.
+        """
+
+    @abstractmethod
+    def lock(self, key: str) -> typing.ContextManager[typing.Any]:
+        """
+        Return a context manager which holds an exclusive lock on `key`
+        (for as long as a token is being obtained).
+        """
+
+    @abstractmethod
+    def get_document(self, url: str) -> dict[str, typing.Any] | None:
+        """
+        Retrieve a stored OpenID Connect discovery document, or `None` if
+        no document is stored for `url`, or it is older than
+        `document_max_age`.
+        """
+
+    @abstractmethod
+    def set_document(self, url: str, document: dict[str, typing.Any]) -> None:
+        """
+        Store an OpenID Connect discovery document.
+        """
+
+
+class MemoryOAuth2TokenStore(OAuth2TokenStore):
+    """
+    A thread-safe token store, which shares tokens between the clients in
+    one process.
+    """
+
+    def __init__(self, document_max_age: float = 24 * 60 * 60) -> None:
+        super().__init__(document_max_age)
+        self._tokens: dict[str, OAuth2Token] = {}
+        self._documents: dict[str, tuple[float, dict[str, typing.Any]]] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def get_token(self, key: str) -> OAuth2Token | None:
+        token: OAuth2Token | None = self._tokens.get(key)
+        if (token is None) or token.is_expired():
+            return None
+        return token
+
+    def set_token(self, key: str, token: OAuth2Token) -> None:
+        self._tokens[key] = token
+
+    def delete_token(self, key: str) -> None:
+        self._tokens.pop(key, None)
+
+    def lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock: threading.Lock | None = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def get_document(self, url: str) -> dict[str, typing.Any] | None:
+        stored_at: float
+        document: dict[str, typing.Any]
+        stored_at, document = self._documents.get(url, (0.0, {}))
+        if time.time() - stored_at >= self.document_max_age:
+            return None
+        return document
+
+    def set_document(self, url: str, document: dict[str, typing.Any]) -> None:
+        self._documents[url] = (time.time(), document)
+
+
+@contextlib.contextmanager
+def _lock_file(path: Path) -> collections.abc.Iterator[None]:
+    """
+    Hold an exclusive (advisory) lock on a file, creating it if needed.
+    """
+    with path.open("a+b") as file:
+        if fcntl is None:  # pragma: no cover
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class FileOAuth2TokenStore(OAuth2TokenStore):
+    """
+    A token store which stores each token (and discovery document) as a
+    JSON file in a given directory, so that tokens are shared between the
+    clients in every process on a host which uses the same directory.
+
+    Files are written atomically, and are readable only by their owner.
+    While a token is being obtained, a lock file is held, so that one
+    process obtains a token while any others wait for it.
+    """
+
+    def __init__(
+        self, directory: str | Path, document_max_age: float = 24 * 60 * 60
+    ) -> None:
+        """
+        Parameters:
+            directory: The directory in which to store tokens. This is
+                created (readable only by its owner) if it does not exist.
+            document_max_age: The number of seconds for which an OpenID
+                Connect discovery document is stored (one day, by default).
+        """
+        super().__init__(document_max_age)
+        self.directory: Path = Path(directory)
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    def _get_path(self, key: str, suffix: str) -> Path:
+        return self.directory / (
+            hashlib.sha256(key.encode()).hexdigest() + suffix
+        )
+
+    def _read(self, path: Path) -> typing.Any:
+        try:
+            return json.loads(path.read_bytes())
+        except (FileNotFoundError, ValueError):
+            # A file which cannot be parsed is treated as missing
+            return None
+
+    def _write(self, path: Path, data: typing.Any) -> None:
+        temporary_path: Path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        file_descriptor: int = os.open(
+            temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+        )
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(json.dumps(data).encode())
+        os.replace(temporary_path, path)
+
+    def get_token(self, key: str) -> OAuth2Token | None:
+        data: typing.Any = self._read(self._get_path(key, ".token.json"))
+        if not isinstance(data, dict):
+            return None
+        token: OAuth2Token = OAuth2Token.from_dict(data)
+        if token.is_expired():
+            return None
+        return token
+
+    def set_token(self, key: str, token: OAuth2Token) -> None:
+        self._write(self._get_path(key, ".token.json"), token.to_dict())
+
+    def delete_token(self, key: str) -> None:
+        self._get_path(key, ".token.json").unlink(missing_ok=True)
+
+    def lock(self, key: str) -> typing.ContextManager[typing.Any]:
+        return _lock_file(self._get_path(key, ".lock"))
+
+    def get_document(self, url: str) -> dict[str, typing.Any] | None:
+        path: Path = self._get_path(url, ".document.json")
+        try:
+            age: float = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        if age >= self.document_max_age:
+            return None
+        document: typing.Any = self._read(path)
+        return document if isinstance(document, dict) else None
+
+    def set_document(self, url: str, document: dict[str, typing.Any]) -> None:
+        self._write(self._get_path(url, ".document.json"), document)
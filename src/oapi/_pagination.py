@@ -0,0 +1,253 @@
+"""
+This module provides pagination for `oapi.client.Client`.
+
+A `Pagination` describes how the next page of a paginated operation is
+requested:
+
+- "link": By following the URL in the response's `Link: <...>; rel="next"`
+  header. Only links with the same origin (scheme, host and port) as the
+  current page are followed, so that the client's credentials are never
+  sent to a different host.
+- "cursor": By passing a cursor (or "next token"), read from the response,
+  as a query parameter.
+- "page": By incrementing a page number query parameter, until a page with
+  no items is returned.
+- "offset": By incrementing an offset query parameter by the number of
+  items in each page, until a page with no items is returned.
+"""
+
+from __future__ import annotations
+
+import re
+import typing
+from urllib.parse import parse_qsl, urljoin, urlsplit
+from warnings import warn
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Iterable
+    from email.message import Message
+    from urllib.parse import SplitResult
+
+# Matches each link in a "Link" header (per RFC 8288), capturing the target
+# and parameters
+_LINK: re.Pattern = re.compile(r"<([^>]*)>((?:\s*;\s*[^,;]+)*)")
+_LINK_REL: re.Pattern = re.compile(
+    r';\s*rel\s*=\s*(?:"([^"]*)"|([^\s;,]+))', re.IGNORECASE
+)
+
+_DEFAULT_PARAMETERS: dict[str, str] = {
+    "link": "",
+    "cursor": "cursor",
+    "page": "page",
+    "offset": "offset",
+}
+
+
+def get_next_link(headers: Message | None) -> str | None:
+    """
+    Get the target of the `rel="next"` link in a response's "Link"
+    header(s), if there is one.
+    """
+    if headers is None:
+        return None
+    value: str
+    for value in headers.get_all("Link") or ():
+        matched: re.Match
+        for matched in _LINK.finditer(value):
+            rel: re.Match | None = _LINK_REL.search(matched.group(2))
+            if rel and "next" in (rel.group(1) or rel.group(2)).split():
+                return matched.group(1)
+    return None
+
+
+def _get_origin(url: str) -> tuple[str, str, int | None]:
+    """
+    Get the scheme, host and port of a URL.
+    """
+    split_url: SplitResult = urlsplit(url)
+    return (
+        split_url.scheme,
+        split_url.hostname or "",
+        split_url.port or {"http": 80, "https": 443}.get(split_url.scheme),
+    )
+
+
+def _get_path_keys(path: str) -> tuple[str, ...]:
+    return tuple(key for key in path.split("/") if key)
+
+
+def _get_query_items(
+    query: typing.Any,
+) -> list[tuple[str, typing.Any]]:
+    if not query:
+        return []
+    if isinstance(query, str):
+        return parse_qsl(query, keep_blank_values=True)
+    if isinstance(query, typing.Mapping):
+        return list(query.items())
+    return list(query)
+
+
+class Pagination:
+    """
+    A description of how a paginated operation's pages are requested, and
+    where the items in each page are found. This is used by
+    `oapi.client.Client.iter_pages` (and the "iter_" methods generated
+    for paginated operations by `oapi.client.ClientModule`).
+    """
+
+    __slots__: tuple[str, ...] = (
+        "cursor",
+        "items",
+        "parameter",
+        "prefetch",
+        "start",
+        "style",
+    )
+
+    def __init__(
+        self,
+        style: typing.Literal["link", "cursor", "page", "offset"],
+        *,
+        items: str = "",
+        parameter: str | None = None,
+        cursor: str = "next_cursor",
+        start: int = 1,
+        prefetch: int = 1,
+    ) -> None:
+        """
+        Parameters:
+            style: "link", "cursor", "page" or "offset".
+            items: The "/"-separated path (of JSON property names) to the
+                array of items in each page. If this is an empty string (the
+                default), each page *is* an array of items.
+            parameter: The query parameter by which the cursor, page number
+                or offset is conveyed. This defaults to "cursor", "page" or
+                "offset" (respective to the `style`).
+            cursor: For the "cursor" style, the "/"-separated path (of JSON
+                property names) to the next page's cursor in each page.
+                When a page has no cursor, it is the last page.
+            start: For the "page" style, the number of the first page (if
+                the initial request does not specify a page number).
+            prefetch: The maximum number of pages to request ahead of those
+                being consumed. If this is 0, each page is only requested
+                once the preceding page has been consumed.
+        """
+        if style not in _DEFAULT_PARAMETERS:
+            raise ValueError(style)
+        self.style: str = style
+        self.items: str = items
+        self.parameter: str = parameter or _DEFAULT_PARAMETERS[style]
+        self.cursor: str = cursor
+        self.start: int = start
+        self.prefetch: int = prefetch
+
+    def _iter_keyword_arguments(self) -> Iterable[tuple[str, typing.Any]]:
+        """
+        Yield the keyword arguments with which this pagination would be
+        re-created (excluding those with default values).
+        """
+        if self.items:
+            yield "items", self.items
+        if self.parameter != _DEFAULT_PARAMETERS[self.style]:
+            yield "parameter", self.parameter
+        if self.style == "cursor" and self.cursor != "next_cursor":
+            yield "cursor", self.cursor
+        if self.start != 1:
+            yield "start", self.start
+        if self.prefetch != 1:
+            yield "prefetch", self.prefetch
+
+    def __repr__(self) -> str:
+        parameters: list[str] = [repr(self.style)]
+        name: str
+        value: typing.Any
+        for name, value in self._iter_keyword_arguments():
+            parameters.append(f"{name}={value!r}")
+        return f"{type(self).__name__}({', '.join(parameters)})"
+
+    def get_items(self, page: typing.Any) -> Iterable[typing.Any]:
+        """
+        Get the items in a page (which may be deserialized JSON, or an
+        unmarshalled model).
+        """
+        key: str
+        for key in _get_path_keys(self.items):
+            if page is None:
+                break
+            try:
+                page = page[key]
+            except KeyError:
+                return ()
+        return page or ()
+
+    def _get_cursor(self, data: typing.Any) -> typing.Any:
+        key: str
+        for key in _get_path_keys(self.cursor):
+            if not isinstance(data, dict):
+                return None
+            data = data.get(key)
+        return data
+
+    def get_next_request(
+        self,
+        path: str,
+        url: str,
+        kwargs: dict[str, typing.Any],
+        headers: Message | None,
+        data: typing.Any,
+    ) -> tuple[str, dict[str, typing.Any]] | None:
+        """
+        Get the path (or URL) and keyword arguments (for
+        `oapi.client.Client.request`) with which to request the next
+        page, or `None` if this is the last page.
+
+        Parameters:
+            path: The path (or URL) with which the current page was
+                requested.
+            url: The URL of the current page.
+            kwargs: The keyword arguments with which the current page was
+                requested.
+            headers: The headers of the response for the current page.
+            data: The deserialized JSON of the current page.
+        """
+        if self.style == "link":
+            link: str | None = get_next_link(headers)
+            if not link:
+                return None
+            link = urljoin(url, link)
+            if _get_origin(link) != _get_origin(url):
+                # The request for the next page would carry the client's
+                # credentials, so it is not sent to another origin
+                warn(
+                    f"The next page link, {link}, is not on the same origin "
+                    f"as the current page, {url}, so was not followed",
+                    stacklevel=2,
+                )
+                return None
+            # The link conveys the query, so it replaces any query arguments
+            return link, {
+                key: value for key, value in kwargs.items() if key != "query"
+            }
+        value: typing.Any
+        query: list[tuple[str, typing.Any]] = _get_query_items(
+            kwargs.get("query")
+        )
+        current: typing.Any = dict(query).get(self.parameter)
+        if self.style == "cursor":
+            value = self._get_cursor(data)
+            if value in (None, ""):
+                return None
+        else:
+            number_of_items: int = len(tuple(self.get_items(data)))
+            if not number_of_items:
+                return None
+            if self.style == "page":
+                value = (self.start if current is None else int(current)) + 1
+            else:
+                value = (0 if current is None else int(current)) + (
+                    number_of_items
+                )
+        query = [item for item in query if item[0] != self.parameter]
+        query.append((self.parameter, value))
+        return path, {**kwargs, "query": tuple(query)}
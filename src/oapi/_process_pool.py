@@ -0,0 +1,176 @@
+"""
+This module provides a process pool executor for `oapi.client.Client`,
+for fanning out CPU-heavy work (such as unmarshalling large responses)
+across processes.
+
+The client is pickled once, when the executor is created, and unpickled
+once in each worker process (re-establishing its connections, and
+refreshing its OAuth2 token when needed, in that process). Each task then
+conveys only a method name (or function) and its arguments.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import pickle
+import typing
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+
+if typing.TYPE_CHECKING:
+    import multiprocessing.context
+    from collections.abc import Callable, Iterable, Iterator
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+    from oapi.client import Client
+
+# The client of a worker process, unpickled by `_initialize_worker`
+_client: typing.Any = None
+
+
+def _initialize_worker(
+    client_state: bytes,
+    initializer: Callable[..., object] | None,
+    initargs: tuple[typing.Any, ...],
+) -> None:
+    global _client
+    _client = pickle.loads(client_state)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _call(
+    method: str | Callable[..., typing.Any],
+    args: tuple[typing.Any, ...],
+    kwargs: dict[str, typing.Any],
+) -> typing.Any:
+    result: typing.Any = (
+        getattr(_client, method)(*args, **kwargs)
+        if isinstance(method, str)
+        else method(_client, *args, **kwargs)
+    )
+    # Run the coroutines returned by `oapi.client.AsyncClient` methods
+    if asyncio.iscoroutine(result):
+        result = asyncio.run(result)
+    return result
+
+
+def _call_positional(
+    method: str | Callable[..., typing.Any], *args: typing.Any
+) -> typing.Any:
+    return _call(method, args, {})
+
+
+class ClientProcessPoolExecutor:
+    """
+    An executor which calls methods of an `oapi.client.Client` (or
+    functions accepting the client as their first argument) in a pool of
+    worker processes, each with its own copy of the client. Instances of
+    this class are obtained using `oapi.client.Client.process_pool`.
+
+    Methods (or functions) and their arguments must be pickleable, as must
+    their return values. Methods of an `oapi.client.AsyncClient` are run to
+    completion in the worker process.
+    """
+
+    __slots__: tuple[str, ...] = ("_executor",)
+
+    def __init__(
+        self,
+        client: Client,
+        max_workers: int | None = None,
+        *,
+        mp_context: multiprocessing.context.BaseContext | None = None,
+        initializer: Callable[..., object] | None = None,
+        initargs: tuple[typing.Any, ...] = (),
+    ) -> None:
+        """
+        Parameters:
+            client:
+            max_workers: The maximum number of worker processes. If not
+                provided, this defaults to the number of processors.
+            mp_context: A multiprocessing context with which to start
+                worker processes.
+            initializer: A function to call in each worker process once
+                the client has been unpickled.
+            initargs: Arguments to pass to the `initializer`.
+        """
+        self._executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers,
+            mp_context=mp_context,
+            initializer=_initialize_worker,
+            initargs=(pickle.dumps(client), initializer, initargs),
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.shutdown()
+
+    def submit(
+        self,
+        method: str | Callable[..., typing.Any],
+        /,
+        *args: typing.Any,
+        **kwargs: typing.Any,
+    ) -> Future[typing.Any]:
+        """
+        Call a client method in a worker process.
+
+        Parameters:
+            method: The name of a client method, or a (module-level)
+                function which accepts the client as its first argument.
+            *args: Positional arguments for the method.
+            **kwargs: Keyword arguments for the method.
+        """
+        return self._executor.submit(_call, method, args, kwargs)
+
+    def map(
+        self,
+        method: str | Callable[..., typing.Any],
+        /,
+        *iterables: Iterable[typing.Any],
+        timeout: float | None = None,
+        chunksize: int = 1,
+    ) -> Iterator[typing.Any]:
+        """
+        Call a client method in worker processes, for each item of the
+        given iterables (as `map` would), yielding results (in order) as
+        they become available.
+
+        Parameters:
+            method: The name of a client method, or a (module-level)
+                function which accepts the client as its first argument.
+            *iterables: Iterables of positional arguments for the method.
+            timeout: The maximum number of seconds to wait for each
+                result.
+            chunksize: The number of calls to send to a worker process at
+                a time. For a large number of short calls, a larger chunk
+                size reduces the overhead of inter-process communication.
+        """
+        return self._executor.map(
+            partial(_call_positional, method),
+            *iterables,
+            timeout=timeout,
+            chunksize=chunksize,
+        )
+
+    def shutdown(
+        self, wait: bool = True, *, cancel_futures: bool = False
+    ) -> None:
+        """
+        Shut down the worker processes.
+
+        Parameters:
+            wait: If `True`, wait for pending calls to complete.
+            cancel_futures: If `True`, cancel calls which have not started.
+        """
+        self._executor.shutdown(wait, cancel_futures=cancel_futures)
@@ -0,0 +1,310 @@
+"""
+This module provides a client-side rate limiter for `oapi.client.Client`,
+which paces requests using a token bucket per host (or per operation), so
+that requests are delayed *before* a server would reject them with an
+HTTP 429 (TOO MANY REQUESTS) response.
+
+Each bucket adapts to the rate limit a server advertises in its response
+headers:
+
+- "RateLimit-Limit", "RateLimit-Remaining" and "RateLimit-Reset" (or the
+  combined "RateLimit" header), per the IETF "RateLimit header fields for
+  HTTP" draft
+- "X-RateLimit-Limit", "X-RateLimit-Remaining" and "X-RateLimit-Reset"
+  (where the reset may be either a number of seconds or a UNIX timestamp)
+- "Retry-After", for HTTP 429 and 503 responses
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+import time
+import typing
+from collections import OrderedDict
+
+from oapi._utilities import get_request_operation_key, parse_retry_after
+from oapi.errors import OAPITimeoutError
+
+if typing.TYPE_CHECKING:
+    from email.message import Message
+    from urllib.request import Request
+
+_NUMBER_PATTERN: re.Pattern = re.compile(r"\d+(?:\.\d+)?")
+# "X-RateLimit-Reset" values larger than this are UNIX timestamps, rather
+# than a number of seconds
+_TIMESTAMP_THRESHOLD: int = 10**9
+
+
+def _parse_number(value: str | None) -> float | None:
+    """
+    Parse the first number in a header value (rate-limit headers may list
+    several limits, such as "100, 100;w=60, 1000;w=3600", in which case the
+    first is the one nearest to being exhausted).
+    """
+    if not value:
+        return None
+    match: re.Match | None = _NUMBER_PATTERN.search(value)
+    return float(match.group()) if match else None
+
+
+def _get_rate_limit_header(
+    headers: Message, name: str, combined: dict[str, str]
+) -> float | None:
+    value: str | None = headers.get(f"RateLimit-{name}") or headers.get(
+        f"X-RateLimit-{name}"
+    )
+    if value is None:
+        value = combined.get(name.lower())
+    return _parse_number(value)
+
+
+# Parameter names used in combined "RateLimit" headers, by draft version
+_COMBINED_RATE_LIMIT_PARAMETERS: dict[str, str] = {
+    "limit": "limit",
+    "remaining": "remaining",
+    "reset": "reset",
+    "r": "remaining",
+    "t": "reset",
+}
+
+
+def _parse_combined_rate_limit(value: str | None) -> dict[str, str]:
+    """
+    Parse a combined "RateLimit" header (such as
+    "limit=100, remaining=50, reset=5" or '"default";r=50;t=5') into a
+    dictionary mapping "limit", "remaining" and "reset" to their values.
+    """
+    parameters: dict[str, str] = {}
+    if value:
+        parameter: str
+        for parameter in re.split(r"[,;]", value):
+            name, _, argument = parameter.partition("=")
+            name = _COMBINED_RATE_LIMIT_PARAMETERS.get(
+                name.strip().lower(), ""
+            )
+            if name:
+                parameters.setdefault(name, argument.strip())
+    return parameters
+
+
+class _TokenBucket:
+    """
+    A token bucket, from which each request takes a token. Tokens are
+    replenished at `rate` tokens per second, up to `capacity`. A rate of 0
+    means requests are not limited (unless the bucket is blocked).
+    """
+
+    __slots__: tuple[str, ...] = (
+        "blocked_until",
+        "capacity",
+        "rate",
+        "tokens",
+        "updated_at",
+    )
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self.tokens: float = capacity
+        self.updated_at: float = time.monotonic()
+        self.blocked_until: float = 0.0
+
+    def _refill(self, now: float) -> None:
+        if self.rate and self.tokens < self.capacity:
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.updated_at) * self.rate,
+            )
+        self.updated_at = now
+
+    def reserve(self, now: float, expiry: float | None = None) -> float:
+        """
+        Take a token, returning the number of seconds to wait before it
+        may be used, or raise an `oapi.errors.OAPITimeoutError` (without
+        taking a token) if the wait would not end before `expiry` (a
+        `time.monotonic` value).
+        """
+        self._refill(now)
+        delay: float = max(0.0, self.blocked_until - now)
+        tokens: float = self.tokens
+        if self.rate:
+            tokens -= 1
+            if tokens < 0:
+                delay = max(delay, -tokens / self.rate)
+        if delay and (expiry is not None) and (now + delay >= expiry):
+            message: str = (
+                f"timed out: the rate limit would delay the request for "
+                f"{delay:.3f} seconds"
+            )
+            raise OAPITimeoutError(message)
+        self.tokens = tokens
+        return delay
+
+    def block(self, now: float, seconds: float) -> None:
+        """
+        Delay all requests until `seconds` from now.
+        """
+        self._refill(now)
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = min(self.tokens, 0.0)
+
+    def pace(self, now: float, remaining: float, reset: float) -> None:
+        """
+        Spread the `remaining` requests a server will allow evenly over the
+        `reset` seconds until its limit is replenished.
+        """
+        self._refill(now)
+        if remaining < 1:
+            self.block(now, reset)
+            return
+        self.rate = remaining / reset
+        self.tokens = min(self.tokens, remaining)
+
+
+class RateLimiter:
+    """
+    A thread-safe, client-side rate limiter, which may be shared by any
+    number of `oapi.client.Client` instances.
+
+    Requests are paced using a token bucket per host (or, if
+    `per_operation` is `True`, per host, method and operation). Each bucket
+    starts with the given `rate` and `burst`, and adapts to the rate limits
+    advertised by the server in its response headers, spreading the
+    requests a server will allow evenly over the time until its limit is
+    reset. When a server responds with a "Retry-After" header (for HTTP
+    429 or 503 responses), all requests to the bucket are delayed until the
+    time indicated.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "_buckets",
+        "_lock",
+        "burst",
+        "max_buckets",
+        "per_operation",
+        "rate",
+    )
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        burst: float = 1.0,
+        *,
+        per_operation: bool = False,
+        max_buckets: int = 1024,
+    ) -> None:
+        """
+        Parameters:
+            rate: The maximum number of requests per second, per bucket,
+                before the server's rate limit is known. If this is 0 (the
+                default), requests are not paced until a server advertises a
+                rate limit.
+            burst: The number of requests which may be made at once,
+                without pacing.
+            per_operation: If `True`, requests are paced separately for
+                each method and operation (the `operation` passed to
+                `oapi.client.Client.request`, or the path of a request made
+                without one), rather than for each host.
+            max_buckets: The maximum number of buckets retained. Once this
+                is exceeded, the least recently used buckets are discarded.
+        """
+        self.rate: float = rate
+        self.burst: float = burst
+        self.per_operation: bool = per_operation
+        self.max_buckets: int = max_buckets
+        self._buckets: OrderedDict[tuple[str, ...], _TokenBucket] = (
+            OrderedDict()
+        )
+        self._lock: threading.Lock = threading.Lock()
+
+    def _get_key(self, request: Request) -> tuple[str, ...]:
+        if self.per_operation:
+            return get_request_operation_key(request)
+        return (request.host,)
+
+    def _get_bucket(self, key: tuple[str, ...]) -> _TokenBucket:
+        bucket: _TokenBucket | None = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _TokenBucket(
+                self.rate, max(self.burst, 1.0)
+            )
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def reserve(self, request: Request, expiry: float | None = None) -> float:
+        """
+        Reserve capacity for a request, returning the number of seconds to
+        wait before sending it.
+
+        Parameters:
+            request:
+            expiry: A `time.monotonic` value (such as the deadline of a
+                call) by which the request must be sent. If the wait would
+                not end before this, no capacity is reserved, and an
+                `oapi.errors.OAPITimeoutError` is raised.
+        """
+        key: tuple[str, ...] = self._get_key(request)
+        with self._lock:
+            return self._get_bucket(key).reserve(time.monotonic(), expiry)
+
+    def wait(self, request: Request, expiry: float | None = None) -> None:
+        """
+        Block until a request may be sent (see `reserve`).
+        """
+        delay: float = self.reserve(request, expiry)
+        if delay:
+            time.sleep(delay)
+
+    async def async_wait(
+        self, request: Request, expiry: float | None = None
+    ) -> None:
+        """
+        Wait (without blocking the event loop) until a request may be sent
+        (see `reserve`).
+        """
+        delay: float = self.reserve(request, expiry)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def update(self, request: Request, status: int, headers: Message) -> None:
+        """
+        Adapt to the rate limit advertised in a response's headers.
+        """
+        retry_after: float | None = (
+            parse_retry_after(headers.get("Retry-After"))
+            if status in (429, 503)
+            else None
+        )
+        combined: dict[str, str] = _parse_combined_rate_limit(
+            headers.get("RateLimit")
+        )
+        remaining: float | None = _get_rate_limit_header(
+            headers, "Remaining", combined
+        )
+        reset: float | None = _get_rate_limit_header(
+            headers, "Reset", combined
+        )
+        if retry_after is None and (remaining is None or not reset):
+            return
+        if reset and reset > _TIMESTAMP_THRESHOLD:
+            reset = max(0.0, reset - time.time())
+        key: tuple[str, ...] = self._get_key(request)
+        with self._lock:
+            bucket: _TokenBucket = self._get_bucket(key)
+            now: float = time.monotonic()
+            if retry_after is not None:
+                bucket.block(now, retry_after)
+            elif remaining is not None and reset:
+                bucket.pace(now, remaining, reset)
+
+    def clear(self) -> None:
+        """
+        Forget all rate limits learned from server responses.
+        """
+        with self._lock:
+            self._buckets.clear()
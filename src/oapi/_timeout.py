@@ -0,0 +1,187 @@
+"""
+This module provides `Timeout`, which sets separate limits on the time an
+`oapi.client.Client` will wait to establish a connection, to receive data,
+and for each attempt at a request in total, and `Deadline`, which limits
+the time spent on all calls (including any retries) made within its
+context.
+
+Deadlines are expressed as a `time.monotonic` value (an "expiry")
+internally, so that they are unaffected by changes to the system clock.
+"""
+
+from __future__ import annotations
+
+import socket
+import typing
+from contextvars import ContextVar
+from time import monotonic
+
+from oapi.errors import OAPITimeoutError
+
+if typing.TYPE_CHECKING:
+    from contextvars import Token
+
+    from typing_extensions import Self
+
+_expiry: ContextVar[float | None] = ContextVar("_expiry", default=None)
+
+
+class Timeout:
+    """
+    Limits (in seconds) on the time a client will wait for a request. A
+    limit of `None` defers to the system default socket timeout (for
+    `connect` and `read`), or imposes no limit (for `total`).
+
+    Attributes:
+        connect: The maximum time to wait to establish a connection
+            (including the TLS handshake, for HTTPS connections).
+        read: The maximum time to wait for a response to be sent, or for
+            data to be received, once connected. For synchronous clients,
+            this applies to each individual socket operation. For
+            asynchronous clients, this applies to the exchange as a whole.
+        total: The maximum time for an attempt at a request, from when it
+            is assembled until the response body has been read in full. A
+            response which is trickled slowly enough to evade the `read`
+            timeout is still bound by this limit. Each retry is a new
+            attempt, with its own `total` timeout: use
+            `oapi.client.Deadline` to limit the time spent on a call,
+            including retries.
+    """
+
+    __slots__: tuple[str, ...] = ("connect", "read", "total")
+
+    def __init__(
+        self,
+        connect: float | None = None,
+        read: float | None = None,
+        total: float | None = None,
+    ) -> None:
+        """
+        Parameters:
+            connect:
+            read:
+            total:
+        """
+        self.connect: float | None = connect
+        self.read: float | None = read
+        self.total: float | None = total
+
+    def get_expiry(self, expiry: float | None = None) -> float | None:
+        """
+        Get the `time.monotonic` value at which an attempt starting now will
+        have timed out, per the `total` timeout or the given `expiry`
+        (whichever is sooner), or `None` if neither are set.
+        """
+        if self.total is None:
+            return expiry
+        return get_earliest(expiry, monotonic() + self.total)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(connect={self.connect!r}, "
+            f"read={self.read!r}, total={self.total!r})"
+        )
+
+
+def get_timeout(timeout: float | Timeout | None) -> Timeout:
+    """
+    Get a `Timeout` from a timeout argument: either a `Timeout`, or a
+    number of seconds to use as both the connect and read timeouts (0, or
+    `None`, deferring to the system default socket timeout).
+    """
+    if isinstance(timeout, Timeout):
+        return timeout
+    return Timeout(timeout or None, timeout or None)
+
+
+def get_earliest(expiry: float | None, other: float | None) -> float | None:
+    """
+    Get the earlier of two expiries (either of which may be `None`).
+    """
+    if expiry is None:
+        return other
+    if other is None:
+        return expiry
+    return min(expiry, other)
+
+
+def get_remaining(expiry: float) -> float:
+    """
+    Get the number of seconds until `expiry`, raising an
+    `oapi.errors.OAPITimeoutError` if it has passed.
+    """
+    remaining: float = expiry - monotonic()
+    if remaining <= 0:
+        raise OAPITimeoutError
+    return remaining
+
+
+def clip_timeout(timeout: float | None, expiry: float | None) -> float | None:
+    """
+    Clip a socket timeout (where `None` defers to the system default) so
+    that it does not extend beyond `expiry`.
+    """
+    if expiry is None:
+        return timeout
+    remaining: float = get_remaining(expiry)
+    if timeout is None:
+        timeout = socket.getdefaulttimeout()
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def get_deadline_expiry(seconds: float = 0.0) -> float | None:
+    """
+    Get the expiry of a call with a deadline `seconds` from now (unless
+    `seconds` is 0), made within the current `Deadline` context (if any),
+    or `None` if the call has no deadline.
+    """
+    expiry: float | None = _expiry.get()
+    if not seconds:
+        return expiry
+    return get_earliest(expiry, monotonic() + seconds)
+
+
+class Deadline:
+    """
+    A context manager which limits the time spent on all client calls made
+    within its context, including retries, to `seconds` from when the
+    context is entered. For example:
+
+    ```python
+    with oapi.client.Deadline(0.5):
+        pet = client.get_pet(pet_id=1)
+        owner = client.get_owner(owner_id=pet.owner_id)
+    ```
+
+    No attempt at a request is started after the deadline, retries are not
+    attempted if the backoff delay preceding them would not end before the
+    deadline, and the timeouts of each attempt are clipped so that it
+    cannot run beyond the deadline. An `oapi.errors.OAPITimeoutError` is
+    raised if the deadline has passed before a request is attempted, or
+    while its response body is being read (an attempt cut short by a
+    clipped socket timeout raises the same error as any other timeout).
+
+    Deadlines can be nested, but a nested deadline cannot extend an
+    enclosing one. A deadline applies to the current thread, or to the
+    current `asyncio` task (and the tasks it creates).
+
+    Attributes:
+        seconds: The number of seconds until the deadline.
+    """
+
+    __slots__: tuple[str, ...] = ("_tokens", "seconds")
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds: float = seconds
+        self._tokens: list[Token[float | None]] = []
+
+    def __enter__(self) -> Self:
+        self._tokens.append(
+            _expiry.set(
+                get_earliest(_expiry.get(), monotonic() + self.seconds)
+            )
+        )
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        _expiry.reset(self._tokens.pop())
@@ -0,0 +1,122 @@
+"""
+This module provides `RequestTiming`, a breakdown of the time spent in each
+phase of an HTTP exchange, which is passed to a `oapi.client.Client`'s
+`timing_hook`.
+
+Timing records are only created for clients with a `timing_hook`, so
+clients without one incur no overhead.
+"""
+
+from __future__ import annotations
+
+_PHASES: tuple[str, ...] = (
+    "assembly",
+    "dns",
+    "connect",
+    "tls",
+    "write",
+    "wait",
+    "download",
+    "decompression",
+    "unmarshal",
+)
+
+
+class RequestTiming:
+    """
+    The time (in seconds) spent in each phase of an HTTP exchange. An
+    instance of this class is passed to a client's `timing_hook` once the
+    response has been read (and, if it is read by
+    `oapi.client.Client.unmarshal_response`, unmarshalled), or once the
+    request has failed.
+
+    Phases which did not occur (such as resolving the host and connecting,
+    when a pooled connection is re-used) have a duration of 0.
+
+    Attributes:
+        method: The HTTP method.
+        url: The request URL.
+        operation: The operation ID (or name of the client method) of the
+            request, or an empty string for requests not made by an
+            operation method.
+        status: The response status code, or 0 if no response was received.
+        error: The error raised, if the request failed.
+        reused_connection: Whether the request was sent over a pooled
+            connection which had already been established.
+        resumed_tls_session: Whether the TLS handshake of a new HTTPS
+            connection resumed a previously negotiated session (an
+            abbreviated handshake).
+        assembly: Formatting, serializing, compressing and authenticating
+            the request.
+        dns: Resolving the host name.
+        connect: Establishing the TCP connection.
+        tls: Performing the TLS handshake.
+        write: Sending the request.
+        wait: Waiting for the response headers, after the request was sent
+            (time-to-first-byte).
+        download: Receiving the response body (excluding decompression).
+        decompression: Decoding the response body (per its
+            "Content-Encoding").
+        unmarshal: Deserializing and unmarshalling the response body.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "assembly",
+        "connect",
+        "decompression",
+        "dns",
+        "download",
+        "error",
+        "method",
+        "operation",
+        "resumed_tls_session",
+        "reused_connection",
+        "status",
+        "tls",
+        "unmarshal",
+        "url",
+        "wait",
+        "write",
+    )
+
+    def __init__(self, method: str, url: str, operation: str = "") -> None:
+        self.method: str = method
+        self.url: str = url
+        self.operation: str = operation
+        self.status: int = 0
+        self.error: Exception | None = None
+        self.reused_connection: bool = False
+        self.resumed_tls_session: bool = False
+        self.assembly: float = 0.0
+        self.dns: float = 0.0
+        self.connect: float = 0.0
+        self.tls: float = 0.0
+        self.write: float = 0.0
+        self.wait: float = 0.0
+        self.download: float = 0.0
+        self.decompression: float = 0.0
+        self.unmarshal: float = 0.0
+
+    @property
+    def total(self) -> float:
+        """
+        The sum of the durations of all phases.
+        """
+        return sum(getattr(self, phase) for phase in _PHASES)
+
+    def as_dict(self) -> dict[str, float]:
+        """
+        Get the duration of each phase, by phase name, in the order in which
+        phases occur.
+        """
+        return {phase: getattr(self, phase) for phase in _PHASES}
+
+    def __repr__(self) -> str:
+        phases: str = ", ".join(
+            f"{phase}={duration:.6f}"
+            for phase, duration in self.as_dict().items()
+        )
+        return (
+            f"<{type(self).__name__} {self.method} {self.url} "
+            f"status={self.status} {phases}>"
+        )
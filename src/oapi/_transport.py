@@ -0,0 +1,1183 @@
+"""
+This module provides `urllib.request` handlers which keep HTTP/HTTPS
+connections alive between requests, drawing them from (and returning them
+to) a per-host pool of idle `http.client` connections, so that consecutive
+requests to the same host do not each pay for a new TCP (and TLS)
+handshake.
+
+New HTTPS connections resume the last TLS session negotiated with their
+host (using the same SSL context), when there is one, skipping most of the
+TLS handshake. Handlers (and `open_async`) given an `oapi.client.DNSCache`
+resolve hosts using it when establishing new connections.
+
+It also provides `open_async`, which performs an HTTP/1.1 exchange over
+`asyncio` streams (drawn from an `AsyncConnectionPool`), for use by
+`oapi.client.AsyncClient`.
+
+Requests with a `timing` attribute (an `oapi.client.RequestTiming`) have
+the time spent resolving the host, connecting, performing the TLS
+handshake, sending the request and waiting for the response headers
+recorded in it. Requests with a `connect_timeout` attribute use that
+timeout to connect (and their `timeout` once connected), and requests
+with an `expiry` attribute (a `time.monotonic` value) have their timeouts
+clipped so that they cannot run beyond it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import selectors
+import socket
+import threading
+import typing
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from http.client import (
+    BadStatusLine,
+    HTTPConnection,
+    HTTPResponse,
+    HTTPSConnection,
+    IncompleteRead,
+    RemoteDisconnected,
+    parse_headers,
+)
+from time import monotonic, perf_counter
+from urllib.error import URLError
+from urllib.parse import urlsplit
+from urllib.request import HTTPHandler, HTTPSHandler, Request
+
+from oapi._compression import CompressedBody
+from oapi._multipart_request import MultipartBody
+from oapi._timeout import clip_timeout
+from oapi.errors import OAPITimeoutError
+
+if typing.TYPE_CHECKING:
+    import ssl
+    from collections.abc import Callable, Iterable, Iterator
+    from email.message import Message
+
+    from oapi._dns import DNSCache
+    from oapi._timing import RequestTiming
+
+_PoolKey = tuple[str, str]
+
+
+class _PooledHTTPResponse(HTTPResponse):
+    """
+    An HTTP response which hands its connection back to the pool from which
+    it was drawn once the response body has been fully consumed.
+    """
+
+    _release: Callable[[bool], None] | None = None
+
+    def _release_connection(self, *, reusable: bool) -> None:
+        release: Callable[[bool], None] | None = self._release
+        if release is not None:
+            self._release = None
+            release(reusable)
+
+    def _close_conn(self) -> None:
+        super()._close_conn()  # type: ignore[misc]
+        self._release_connection(reusable=True)
+
+    def close(self) -> None:
+        # If the response is closed before the body has been read
+        # in full, the unread remainder would corrupt the next response
+        # read from the same connection, so the connection cannot be
+        # re-used.
+        if (self.fp is not None) and not (
+            self.length == 0 and not self.chunked
+        ):
+            self._release_connection(reusable=False)
+        super().close()
+
+
+def _create_connection(
+    address: tuple[str, int],
+    timeout: float | None,
+    source_address: tuple[str, int] | None,
+    timing: RequestTiming | None = None,
+    dns_cache: DNSCache | None = None,
+) -> socket.socket:
+    """
+    Connect to the first reachable address for a host (as does
+    `socket.create_connection`), resolving the host using `dns_cache` (if
+    given), and adding the time spent resolving the host and connecting to
+    the `dns` and `connect` phases of `timing` (if given).
+    """
+    host: str
+    port: int
+    host, port = address
+    started: float = perf_counter() if timing else 0.0
+    addresses: list[tuple[typing.Any, ...]] = (
+        socket.getaddrinfo if dns_cache is None else dns_cache.getaddrinfo
+    )(host, port, 0, socket.SOCK_STREAM)
+    if timing is not None:
+        connecting: float = perf_counter()
+        timing.dns += connecting - started
+        started = connecting
+    error: OSError | None = None
+    family: int
+    type_: int
+    protocol: int
+    address_: typing.Any
+    try:
+        for family, type_, protocol, _, address_ in addresses:
+            socket_: socket.socket = socket.socket(family, type_, protocol)
+            try:
+                if timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:  # type: ignore[attr-defined]
+                    socket_.settimeout(timeout)
+                if source_address:
+                    socket_.bind(source_address)
+                socket_.connect(address_)
+            except OSError as error_:
+                socket_.close()
+                error = error_
+            else:
+                return socket_
+    finally:
+        if timing is not None:
+            timing.connect += perf_counter() - started
+    if error is None:
+        message: str = "getaddrinfo returns an empty list"
+        raise OSError(message)
+    raise error
+
+
+class _TimedConnectionMixin:
+    """
+    Records the time spent resolving the host, connecting, performing the
+    TLS handshake, sending the request and waiting for the response headers
+    in the connection's `timing` record, if it has one, and resolves the
+    host using the connection's `dns_cache`, if it has one.
+
+    A connection with a `connect_timeout` uses that (rather than its
+    `timeout`) when connecting, and a connection with an `expiry` (a
+    `time.monotonic` value) clips its timeouts so that no socket operation
+    can extend beyond it.
+    """
+
+    timing: RequestTiming | None = None
+    connect_timeout: float | None = None
+    expiry: float | None = None
+    dns_cache: DNSCache | None = None
+
+    def __init__(
+        self,
+        *args: typing.Any,
+        timing: RequestTiming | None = None,
+        connect_timeout: float | None = None,
+        expiry: float | None = None,
+        dns_cache: DNSCache | None = None,
+        **kwargs: typing.Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.timing = timing
+        self.connect_timeout = connect_timeout
+        self.expiry = expiry
+        self.dns_cache = dns_cache
+        self._create_connection: Callable[..., socket.socket] = (
+            self._create_timed_connection
+        )
+
+    def _get_timeout(self, timeout: typing.Any) -> float | None:
+        if timeout is socket._GLOBAL_DEFAULT_TIMEOUT:  # type: ignore[attr-defined]
+            timeout = None
+        return clip_timeout(timeout, self.expiry)
+
+    def _clip_socket_timeout(self) -> None:
+        sock: socket.socket | None = self.sock  # type: ignore[attr-defined]
+        if (self.expiry is not None) and (sock is not None):
+            sock.settimeout(self._get_timeout(self.timeout))  # type: ignore[attr-defined]
+
+    def _create_timed_connection(
+        self,
+        address: tuple[str, int],
+        timeout: typing.Any = socket._GLOBAL_DEFAULT_TIMEOUT,  # type: ignore[attr-defined]
+        source_address: tuple[str, int] | None = None,
+    ) -> socket.socket:
+        if self.connect_timeout is not None:
+            timeout = self.connect_timeout
+        if self.expiry is not None:
+            timeout = self._get_timeout(timeout)
+        if (self.timing is None) and (self.dns_cache is None):
+            return socket.create_connection(address, timeout, source_address)
+        return _create_connection(
+            address, timeout, source_address, self.timing, self.dns_cache
+        )
+
+    def connect(self) -> None:
+        timing: RequestTiming | None = self.timing
+        started: float = perf_counter()
+        connecting: float = timing.dns + timing.connect if timing else 0.0
+        super().connect()  # type: ignore[misc]
+        if (self.connect_timeout is not None) or (self.expiry is not None):
+            # The socket was created with the connect timeout: once
+            # connected, the (clipped) read timeout applies
+            self.sock.settimeout(self._get_timeout(self.timeout))  # type: ignore[attr-defined]
+        if (timing is not None) and isinstance(self, HTTPSConnection):
+            # The time not spent resolving the host or connecting was spent
+            # performing the TLS handshake
+            timing.tls += (perf_counter() - started) - (
+                timing.dns + timing.connect - connecting
+            )
+            timing.resumed_tls_session = bool(self.sock.session_reused)  # type: ignore[attr-defined]
+
+    def request(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        self._clip_socket_timeout()
+        timing: RequestTiming | None = self.timing
+        if timing is None:
+            super().request(*args, **kwargs)  # type: ignore[misc]
+            return
+        started: float = perf_counter()
+        # A connection is established (if needed) when the request is sent,
+        # but that is not part of sending the request
+        connecting: float = timing.dns + timing.connect + timing.tls
+        super().request(*args, **kwargs)  # type: ignore[misc]
+        timing.write += (perf_counter() - started) - (
+            timing.dns + timing.connect + timing.tls - connecting
+        )
+
+    def getresponse(self) -> HTTPResponse:
+        self._clip_socket_timeout()
+        timing: RequestTiming | None = self.timing
+        if timing is None:
+            return super().getresponse()  # type: ignore[misc, no-any-return]
+        started: float = perf_counter()
+        try:
+            return super().getresponse()  # type: ignore[misc, no-any-return]
+        finally:
+            timing.wait += perf_counter() - started
+
+
+class _TLSSessionCache:
+    """
+    A bounded cache of the most recently used TLS session for each host
+    and port, so that new connections can resume a session (skipping most
+    of the TLS handshake) rather than negotiating a new one.
+    """
+
+    __slots__: tuple[str, ...] = ("_lock", "_sessions", "size")
+
+    def __init__(self, size: int = 256) -> None:
+        self.size: int = size
+        self._sessions: OrderedDict[tuple[str, int], ssl.SSLSession] = (
+            OrderedDict()
+        )
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: tuple[str, int]) -> ssl.SSLSession | None:
+        with self._lock:
+            return self._sessions.get(key)
+
+    def set(self, key: tuple[str, int], session: ssl.SSLSession) -> None:
+        with self._lock:
+            self._sessions[key] = session
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.size:
+                self._sessions.popitem(last=False)
+
+
+# TLS sessions can only be resumed using the SSL context which created them,
+# so sessions are cached per context
+_tls_session_caches: weakref.WeakKeyDictionary[
+    ssl.SSLContext, _TLSSessionCache
+] = weakref.WeakKeyDictionary()
+_tls_session_caches_lock: threading.Lock = threading.Lock()
+
+
+def _get_tls_session_cache(context: ssl.SSLContext) -> _TLSSessionCache:
+    with _tls_session_caches_lock:
+        cache: _TLSSessionCache | None = _tls_session_caches.get(context)
+        if cache is None:
+            cache = _tls_session_caches[context] = _TLSSessionCache()
+        return cache
+
+
+class _HTTPSConnection(HTTPSConnection):
+    """
+    An HTTPS connection which resumes the last TLS session negotiated (using
+    the same SSL context) with its host, if there is one, and caches the
+    session it negotiates for re-use by subsequent connections.
+    """
+
+    def _get_tls_session_key(self) -> tuple[str, int]:
+        return (self._tunnel_host or self.host, self.port)  # type: ignore[attr-defined]
+
+    def connect(self) -> None:
+        # This mirrors `HTTPSConnection.connect`, but passes the cached
+        # session when wrapping the socket
+        HTTPConnection.connect(self)
+        context: ssl.SSLContext = self._context  # type: ignore[attr-defined]
+        key: tuple[str, int] = self._get_tls_session_key()
+        self.sock = context.wrap_socket(
+            self.sock,
+            server_hostname=key[0],
+            session=_get_tls_session_cache(context).get(key),
+        )
+
+    def _cache_tls_session(self) -> None:
+        # With TLS 1.3, session tickets are sent after the handshake, so
+        # the session is only cached once a response has been received
+        session: ssl.SSLSession | None = getattr(self.sock, "session", None)
+        if session is not None:
+            _get_tls_session_cache(self._context).set(  # type: ignore[attr-defined]
+                self._get_tls_session_key(), session
+            )
+
+    def getresponse(self) -> HTTPResponse:
+        response: HTTPResponse = super().getresponse()
+        self._cache_tls_session()
+        return response
+
+    def close(self) -> None:
+        # A connection which is not kept alive is closed as soon as the
+        # response is received
+        self._cache_tls_session()
+        super().close()
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, _HTTPSConnection):
+    pass
+
+
+class _PooledConnectionMixin:
+    """
+    Records the time at which a connection was established, so the pool can
+    retire connections which have outlived their maximum lifetime.
+    """
+
+    response_class: type[HTTPResponse] = _PooledHTTPResponse
+    created_at: float = 0.0
+
+    def connect(self) -> None:
+        super().connect()  # type: ignore[misc]
+        self.created_at = monotonic()
+
+
+class _PooledHTTPConnection(
+    _PooledConnectionMixin, _TimedConnectionMixin, HTTPConnection
+):
+    pass
+
+
+class _PooledHTTPSConnection(
+    _PooledConnectionMixin, _TimedConnectionMixin, _HTTPSConnection
+):
+    pass
+
+
+def _is_connection_dropped(connection: HTTPConnection) -> bool:
+    """
+    An idle connection should have nothing to read: if its socket is
+    readable, the server has either closed the connection or sent data we
+    did not ask for--either way it is not safe to re-use.
+    """
+    sock: socket.socket | None = connection.sock
+    if sock is None:
+        return True
+    # A selector is used rather than `select.select`, which cannot watch
+    # file descriptors numbered above `FD_SETSIZE` (usually 1024)
+    selector: selectors.BaseSelector
+    try:
+        with selectors.DefaultSelector() as selector:
+            selector.register(sock, selectors.EVENT_READ)
+            return bool(selector.select(0))
+    except (OSError, ValueError):
+        return True
+
+
+def _set_connection_timeout(
+    connection: HTTPConnection, timeout: float | object
+) -> None:
+    if timeout is socket._GLOBAL_DEFAULT_TIMEOUT:  # type: ignore[attr-defined] # noqa: SLF001
+        timeout = socket.getdefaulttimeout()
+    connection.timeout = timeout  # type: ignore[assignment]
+    if connection.sock is not None:
+        connection.sock.settimeout(timeout)  # type: ignore[arg-type]
+
+
+class _Connection(typing.Protocol):
+    def close(self) -> None: ...
+
+
+_ConnectionT = typing.TypeVar("_ConnectionT", bound=_Connection)
+
+
+class _BaseConnectionPool(ABC, typing.Generic[_ConnectionT]):
+    """
+    A thread-safe pool of idle connections, keyed by scheme and host.
+    """
+
+    def __init__(self, size: int = 10, lifetime: float = 300.0) -> None:
+        """
+        Parameters:
+            size: The maximum number of idle connections to retain
+                for each host. Connections released when the pool for a
+                host is full are closed.
+            lifetime: The maximum number of seconds for which a
+                connection will be re-used, measured from the time the
+                connection was established. If this is 0, connections are
+                re-used indefinitely.
+        """
+        self.size: int = size
+        self.lifetime: float = lifetime
+        self._idle: dict[_PoolKey, deque[_ConnectionT]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    @abstractmethod
+    def _is_closed(self, connection: _ConnectionT) -> bool:
+        """
+        Return `True` if the connection has been closed locally.
+        """
+
+    @abstractmethod
+    def _is_dropped(self, connection: _ConnectionT) -> bool:
+        """
+        Return `True` if the server has closed the connection (or the
+        connection has unread data, and so cannot be re-used).
+        """
+
+    def _is_expired(self, connection: _ConnectionT, now: float) -> bool:
+        return bool(self.lifetime) and (
+            now - getattr(connection, "created_at", 0.0) > self.lifetime
+        )
+
+    def acquire(self, key: _PoolKey) -> _ConnectionT | None:
+        """
+        Retrieve the most recently used, still-viable idle connection for
+        `key`, or `None` if there is no such connection.
+        """
+        now: float = monotonic()
+        discarded: list[_ConnectionT] = []
+        connection: _ConnectionT | None = None
+        with self._lock:
+            idle: deque[_ConnectionT] | None = self._idle.get(key)
+            while idle:
+                candidate: _ConnectionT = idle.pop()
+                if self._is_expired(candidate, now) or self._is_dropped(
+                    candidate
+                ):
+                    discarded.append(candidate)
+                else:
+                    connection = candidate
+                    break
+        for candidate in discarded:
+            candidate.close()
+        return connection
+
+    def release(
+        self,
+        key: _PoolKey,
+        connection: _ConnectionT,
+        *,
+        reusable: bool = True,
+    ) -> None:
+        """
+        Return a connection to the pool, or close it if it is not
+        `reusable`, the server has indicated it will close the connection,
+        the connection has exceeded its lifetime, or the pool for this host
+        is full.
+        """
+        if self._is_closed(connection):
+            return
+        if not reusable:
+            connection.close()
+            return
+        now: float = monotonic()
+        discarded: list[_ConnectionT] = [connection]
+        with self._lock:
+            idle: deque[_ConnectionT] = self._idle.setdefault(key, deque())
+            # Retire any idle connections which have outlived their lifetime
+            while idle and self._is_expired(idle[0], now):
+                discarded.append(idle.popleft())
+            if (len(idle) < self.size) and not self._is_expired(
+                connection, now
+            ):
+                idle.append(connection)
+                discarded.pop(0)
+        for connection_ in discarded:
+            connection_.close()
+
+    def clear(self) -> None:
+        """
+        Close all idle connections.
+        """
+        with self._lock:
+            idle: list[deque[_ConnectionT]] = list(self._idle.values())
+            self._idle.clear()
+        connections: deque[_ConnectionT]
+        for connections in idle:
+            while connections:
+                connections.pop().close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(map(len, self._idle.values()))
+
+
+class ConnectionPool(_BaseConnectionPool[HTTPConnection]):
+    """
+    A thread-safe pool of idle `http.client` HTTP/HTTPS connections, keyed by
+    scheme and host.
+    """
+
+    def _is_closed(self, connection: HTTPConnection) -> bool:
+        return connection.sock is None
+
+    def _is_dropped(self, connection: HTTPConnection) -> bool:
+        return _is_connection_dropped(connection)
+
+
+def _get_request_headers(request: Request) -> dict[str, str]:
+    headers: dict[str, str] = dict(request.unredirected_hdrs)
+    headers.update(
+        {
+            key: value
+            for key, value in request.headers.items()
+            if key not in headers
+        }
+    )
+    return {name.title(): value for name, value in headers.items()}
+
+
+# Methods for which sending a request more than once has the same effect as
+# sending it once (per RFC 9110, section 9.2.2), and which can therefore be
+# safely re-sent when it is not known whether the server received them
+_IDEMPOTENT_METHODS: frozenset[str] = frozenset(
+    ("GET", "HEAD", "OPTIONS", "TRACE", "PUT", "DELETE")
+)
+
+
+def _is_replayable(request: Request) -> bool:
+    return request.get_method() in _IDEMPOTENT_METHODS and (
+        request.data is None
+        or isinstance(
+            request.data, (bytes, bytearray, CompressedBody, MultipartBody)
+        )
+    )
+
+
+def _is_stale_connection_error(error: Exception) -> bool:
+    if isinstance(error, URLError) and isinstance(error.reason, Exception):
+        error = error.reason
+    return isinstance(error, (ConnectionError, BadStatusLine))
+
+
+class _KeepAliveHandlerMixin:
+    """
+    This overrides `urllib.request.AbstractHTTPHandler.do_open`, which
+    forces "Connection: close" on every request, in order to keep
+    connections open and re-use them.
+    """
+
+    connection_pool: ConnectionPool
+    dns_cache: DNSCache | None
+    _debuglevel: int | None
+
+    def _keep_alive_open(  # noqa: C901
+        self,
+        http_class: type[HTTPConnection],
+        request: Request,
+        **connection_kwargs: typing.Any,
+    ) -> HTTPResponse:
+        host: str = request.host
+        if not host:
+            message: str = "no host given"
+            raise URLError(message)
+        if request._tunnel_host:  # type: ignore[attr-defined] # noqa: SLF001
+            # Tunneled (proxied) connections are not pooled
+            return self.do_open(  # type: ignore[attr-defined, no-any-return]
+                http_class,
+                request,
+                **connection_kwargs,
+                **_get_connection_kwargs(request),
+            )
+        key: _PoolKey = (request.type, host)
+        headers: dict[str, str] = _get_request_headers(request)
+        timing: RequestTiming | None = getattr(request, "timing", None)
+        while True:
+            connection: HTTPConnection | None = self.connection_pool.acquire(
+                key
+            )
+            reused: bool = connection is not None
+            if connection is None:
+                connection = http_class(
+                    host, timeout=request.timeout, **connection_kwargs
+                )
+                if self._debuglevel:
+                    connection.set_debuglevel(self._debuglevel)
+            else:
+                _set_connection_timeout(connection, request.timeout)
+            if timing is not None:
+                timing.reused_connection = reused
+            # Only record timing for, and apply the connect timeout and
+            # expiry of, this request (pooled connections outlive it)
+            connection.timing = timing  # type: ignore[attr-defined]
+            connection.connect_timeout = getattr(  # type: ignore[attr-defined]
+                request, "connect_timeout", None
+            )
+            connection.expiry = getattr(request, "expiry", None)  # type: ignore[attr-defined]
+            try:
+                try:
+                    connection.request(
+                        request.get_method(),
+                        request.selector,
+                        request.data,  # type: ignore[arg-type]
+                        headers,
+                        encode_chunked=request.has_header("Transfer-encoding"),
+                    )
+                except OSError as error:
+                    raise URLError(error) from error
+                response: HTTPResponse = connection.getresponse()
+            except Exception as error:
+                connection.close()
+                # A pooled connection may have been closed by the server
+                # while idle--if so, transparently retry the request (if
+                # it is idempotent: the server may have acted on it)
+                if (
+                    reused
+                    and _is_replayable(request)
+                    and _is_stale_connection_error(error)
+                ):
+                    continue
+                raise
+            finally:
+                connection.timing = None  # type: ignore[attr-defined]
+                connection.connect_timeout = None  # type: ignore[attr-defined]
+                connection.expiry = None  # type: ignore[attr-defined]
+            break
+        response.url = request.get_full_url()
+        response.msg = response.reason  # type: ignore[assignment]
+        if isinstance(response, _PooledHTTPResponse):
+            pool: ConnectionPool = self.connection_pool
+            pooled_connection: HTTPConnection = connection
+
+            def release(reusable: bool) -> None:  # noqa: FBT001
+                pool.release(key, pooled_connection, reusable=reusable)
+
+            response._release = release  # noqa: SLF001
+        return response
+
+
+class KeepAliveHTTPHandler(_KeepAliveHandlerMixin, HTTPHandler):
+    """
+    A `urllib.request.HTTPHandler` which re-uses pooled connections.
+    """
+
+    def __init__(
+        self,
+        connection_pool: ConnectionPool | None = None,
+        debuglevel: int | None = None,
+        dns_cache: DNSCache | None = None,
+    ) -> None:
+        HTTPHandler.__init__(self, debuglevel=debuglevel or 0)
+        self.connection_pool: ConnectionPool = (
+            ConnectionPool() if connection_pool is None else connection_pool
+        )
+        self.dns_cache: DNSCache | None = dns_cache
+
+    def http_open(self, req: Request) -> HTTPResponse:
+        return self._keep_alive_open(
+            _PooledHTTPConnection, req, dns_cache=self.dns_cache
+        )
+
+
+class KeepAliveHTTPSHandler(_KeepAliveHandlerMixin, HTTPSHandler):
+    """
+    A `urllib.request.HTTPSHandler` which re-uses pooled connections.
+    """
+
+    def __init__(
+        self,
+        connection_pool: ConnectionPool | None = None,
+        debuglevel: int | None = None,
+        context: ssl.SSLContext | None = None,
+        dns_cache: DNSCache | None = None,
+    ) -> None:
+        HTTPSHandler.__init__(
+            self, debuglevel=debuglevel or 0, context=context
+        )
+        self.connection_pool: ConnectionPool = (
+            ConnectionPool() if connection_pool is None else connection_pool
+        )
+        self.dns_cache: DNSCache | None = dns_cache
+
+    def https_open(self, req: Request) -> HTTPResponse:
+        return self._keep_alive_open(
+            _PooledHTTPSConnection,
+            req,
+            context=self._context,  # type: ignore[attr-defined]
+            dns_cache=self.dns_cache,
+        )
+
+
+def _get_connection_kwargs(request: Request) -> dict[str, typing.Any]:
+    return {
+        "timing": getattr(request, "timing", None),
+        "connect_timeout": getattr(request, "connect_timeout", None),
+        "expiry": getattr(request, "expiry", None),
+    }
+
+
+class TimedHTTPHandler(HTTPHandler):
+    """
+    A `urllib.request.HTTPHandler` which records the timing of requests
+    with a `timing` record, and applies the `connect_timeout` and `expiry`
+    of requests which have them (without pooling connections).
+    """
+
+    def __init__(
+        self,
+        debuglevel: int | None = None,
+        dns_cache: DNSCache | None = None,
+    ) -> None:
+        HTTPHandler.__init__(self, debuglevel=debuglevel or 0)
+        self.dns_cache: DNSCache | None = dns_cache
+
+    def http_open(self, req: Request) -> HTTPResponse:
+        return self.do_open(  # type: ignore[no-any-return]
+            _TimedHTTPConnection,
+            req,
+            dns_cache=self.dns_cache,
+            **_get_connection_kwargs(req),
+        )
+
+
+class TimedHTTPSHandler(HTTPSHandler):
+    """
+    A `urllib.request.HTTPSHandler` which records the timing of requests
+    with a `timing` record, and applies the `connect_timeout` and `expiry`
+    of requests which have them (without pooling connections).
+    """
+
+    def __init__(
+        self,
+        debuglevel: int | None = None,
+        context: ssl.SSLContext | None = None,
+        dns_cache: DNSCache | None = None,
+    ) -> None:
+        HTTPSHandler.__init__(
+            self, debuglevel=debuglevel or 0, context=context
+        )
+        self.dns_cache: DNSCache | None = dns_cache
+
+    def https_open(self, req: Request) -> HTTPResponse:
+        return self.do_open(  # type: ignore[no-any-return]
+            _TimedHTTPSConnection,
+            req,
+            context=self._context,  # type: ignore[attr-defined]
+            dns_cache=self.dns_cache,
+            **_get_connection_kwargs(req),
+        )
+
+
+class _AsyncConnection:
+    """
+    An `asyncio` stream connection.
+    """
+
+    __slots__: tuple[str, ...] = ("created_at", "reader", "socket", "writer")
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        socket_: socket.socket,
+    ) -> None:
+        self.reader: asyncio.StreamReader = reader
+        self.writer: asyncio.StreamWriter = writer
+        self.socket: socket.socket = socket_
+        self.created_at: float = monotonic()
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except RuntimeError:
+            # The event loop has been closed, so the transport cannot be
+            # closed gracefully
+            self.socket.close()
+
+
+class AsyncConnectionPool(_BaseConnectionPool[_AsyncConnection]):
+    """
+    A pool of idle `asyncio` stream connections, keyed by scheme and host.
+    Stream connections are bound to the event loop in which they were
+    established, so a pool must only be used within a single event loop.
+    """
+
+    def _is_closed(self, connection: _AsyncConnection) -> bool:
+        return connection.writer.is_closing()
+
+    def _is_dropped(self, connection: _AsyncConnection) -> bool:
+        # The event loop reads from idle connections eagerly, so a
+        # connection closed by the server will have reached EOF
+        return connection.writer.is_closing() or connection.reader.at_eof()
+
+
+class _RequestSocket:
+    """
+    A stand-in for a socket, which captures the bytes an
+    `http.client.HTTPConnection` sends.
+    """
+
+    def __init__(self) -> None:
+        self.data: bytearray = bytearray()
+
+    def sendall(self, data: bytes) -> None:
+        self.data += data
+
+
+class _ResponseSocket:
+    """
+    A stand-in for a socket, from which an `http.client.HTTPResponse` can
+    parse a response which has already been received in full.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        self._data: bytes = data
+
+    def makefile(self, *args: typing.Any, **kwargs: typing.Any) -> io.BytesIO:  # noqa: ARG002
+        return io.BytesIO(self._data)
+
+
+def _serialize_request(request: Request, *, body: bool = True) -> bytes:
+    """
+    Serialize a request exactly as `http.client.HTTPConnection` would
+    send it.
+
+    Parameters:
+        request:
+        body: If `False`, only the request line and headers are
+            serialized.
+    """
+    connection: HTTPConnection = HTTPConnection(request.host)
+    request_socket: _RequestSocket = _RequestSocket()
+    connection.sock = request_socket
+    connection.request(
+        request.get_method(),
+        request.selector,
+        request.data if body else None,  # type: ignore[arg-type]
+        _get_request_headers(request),
+        encode_chunked=request.has_header("Transfer-encoding"),
+    )
+    return bytes(request_socket.data)
+
+
+async def _read_chunked_body(
+    reader: asyncio.StreamReader, data: bytearray
+) -> None:
+    """
+    Read a chunked response body (as-is, without decoding it) into `data`.
+    """
+    while True:
+        line: bytes = await reader.readline()
+        data += line
+        size: int = int(line.split(b";", 1)[0].strip() or b"0", 16)
+        if not size:
+            # Read any trailers, up to the terminating blank line
+            while line not in (b"\r\n", b"\n", b""):
+                line = await reader.readline()
+                data += line
+            return
+        # Read the chunk, and its trailing CRLF
+        data += await reader.readexactly(size + 2)
+
+
+async def _read_body(
+    reader: asyncio.StreamReader,
+    data: bytearray,
+    method: str,
+    status: int,
+    headers: Message,
+) -> None:
+    """
+    Read a response body (as-is, without decoding it) into `data`.
+    """
+    if method == "HEAD" or status in (204, 304) or (100 <= status < 200):  # noqa: PLR2004
+        return
+    content_length: str | None = headers.get("Content-Length")
+    try:
+        if "chunked" in headers.get("Transfer-Encoding", "").lower():
+            await _read_chunked_body(reader, data)
+        elif content_length is not None:
+            data += await reader.readexactly(int(content_length))
+        else:
+            # The response body is terminated by closing the connection
+            data += await reader.read()
+    except asyncio.IncompleteReadError as error:
+        raise IncompleteRead(bytes(data) + error.partial) from error
+
+
+async def _read_response(
+    reader: asyncio.StreamReader,
+    method: str,
+    timing: RequestTiming | None = None,
+) -> HTTPResponse:
+    """
+    Receive a complete HTTP response, then parse it using
+    `http.client.HTTPResponse`.
+    """
+    started: float = perf_counter() if timing else 0.0
+    data: bytearray = bytearray()
+    status: int
+    while True:
+        try:
+            head: bytes = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as error:
+            if data or error.partial:
+                raise IncompleteRead(bytes(data) + error.partial) from error
+            message: str = "Remote end closed connection without response"
+            raise RemoteDisconnected(message) from error
+        data += head
+        status_line: list[bytes] = head.split(b"\r\n", 1)[0].split(None, 2)
+        if len(status_line) < 2 or not status_line[1].isdigit():  # noqa: PLR2004
+            raise BadStatusLine(str(head.split(b"\r\n", 1)[0], "latin-1"))
+        status = int(status_line[1])
+        # Skip "100 Continue" responses, as does `http.client`
+        if status != 100:  # noqa: PLR2004
+            break
+    headers = parse_headers(io.BytesIO(head.partition(b"\r\n")[2]))
+    if timing is None:
+        await _read_body(reader, data, method, status, headers)
+    else:
+        received: float = perf_counter()
+        timing.wait += received - started
+        try:
+            await _read_body(reader, data, method, status, headers)
+        finally:
+            timing.download += perf_counter() - received
+    response: HTTPResponse = HTTPResponse(
+        _ResponseSocket(bytes(data)),  # type: ignore[arg-type]
+        method=method,
+    )
+    response.begin()
+    return response
+
+
+async def _connect_socket(
+    host: str,
+    port: int,
+    timing: RequestTiming | None = None,
+    dns_cache: DNSCache | None = None,
+) -> socket.socket:
+    """
+    Connect a non-blocking socket to the first reachable address for `host`
+    (resolving it using `dns_cache`, if given).
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    error: OSError | None = None
+    family: int
+    type_: int
+    protocol: int
+    address: typing.Any
+    started: float = perf_counter() if timing else 0.0
+    addresses: list[tuple[typing.Any, ...]] = await (
+        loop.getaddrinfo if dns_cache is None else dns_cache.async_getaddrinfo
+    )(host, port, type=socket.SOCK_STREAM)
+    if timing is not None:
+        connecting: float = perf_counter()
+        timing.dns += connecting - started
+        started = connecting
+    try:
+        for family, type_, protocol, _, address in addresses:
+            socket_: socket.socket = socket.socket(family, type_, protocol)
+            try:
+                socket_.setblocking(False)  # noqa: FBT003
+                await loop.sock_connect(socket_, address)
+            except OSError as error_:
+                socket_.close()
+                error = error_
+            except BaseException:
+                socket_.close()
+                raise
+            else:
+                return socket_
+    finally:
+        if timing is not None:
+            timing.connect += perf_counter() - started
+    if error is None:
+        message: str = "getaddrinfo returned an empty list"
+        raise OSError(message)
+    raise error
+
+
+async def _open_connection(
+    request: Request,
+    timeout: float | None,
+    ssl_context: ssl.SSLContext | None,
+    dns_cache: DNSCache | None = None,
+) -> _AsyncConnection:
+    host: str = request.host
+    parse_result = urlsplit(f"//{host}")
+    hostname: str = parse_result.hostname or host
+    secure: bool = request.type == "https"
+    port: int = parse_result.port or (443 if secure else 80)
+
+    timing: RequestTiming | None = getattr(request, "timing", None)
+    connect_timeout: float | None = getattr(request, "connect_timeout", None)
+    if connect_timeout is not None:
+        timeout = connect_timeout
+    timeout = clip_timeout(timeout, getattr(request, "expiry", None))
+
+    async def open_connection() -> _AsyncConnection:
+        socket_: socket.socket = await _connect_socket(
+            hostname, port, timing, dns_cache
+        )
+        started: float = perf_counter() if timing else 0.0
+        try:
+            reader: asyncio.StreamReader
+            writer: asyncio.StreamWriter
+            reader, writer = await asyncio.open_connection(
+                sock=socket_,
+                ssl=(ssl_context or True) if secure else None,
+                server_hostname=hostname if secure else None,
+            )
+        except BaseException:
+            socket_.close()
+            raise
+        finally:
+            if secure and (timing is not None):
+                timing.tls += perf_counter() - started
+        return _AsyncConnection(reader, writer, socket_)
+
+    try:
+        return await asyncio.wait_for(open_connection(), timeout)
+    except (OSError, asyncio.TimeoutError) as error:
+        raise URLError(error) from error
+
+
+def _iter_chunked(body: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Frame a request body using "Transfer-Encoding: chunked".
+    """
+    chunk: bytes
+    for chunk in body:
+        if chunk:
+            yield b"%X\r\n%b\r\n" % (len(chunk), chunk)
+    yield b"0\r\n\r\n"
+
+
+async def _exchange(
+    connection: _AsyncConnection,
+    payload: bytes,
+    method: str,
+    body: Iterable[bytes] = (),
+    timing: RequestTiming | None = None,
+) -> HTTPResponse:
+    started: float = perf_counter() if timing else 0.0
+    try:
+        connection.writer.write(payload)
+        chunk: bytes
+        for chunk in body:
+            await connection.writer.drain()
+            connection.writer.write(chunk)
+        await connection.writer.drain()
+    except OSError as error:
+        raise URLError(error) from error
+    finally:
+        if timing is not None:
+            timing.write += perf_counter() - started
+    return await _read_response(connection.reader, method, timing)
+
+
+async def open_async(
+    request: Request,
+    connection_pool: AsyncConnectionPool,
+    *,
+    timeout: float | None = None,
+    ssl_context: ssl.SSLContext | None = None,
+    dns_cache: DNSCache | None = None,
+) -> HTTPResponse:
+    """
+    Send a request and receive its response, in full, over a connection
+    drawn from (and then returned to) `connection_pool`. No
+    redirect-following, cookie processing or error handling is performed:
+    the response is returned regardless of its status.
+
+    Parameters:
+        request: A request which has already been pre-processed by the
+            request processors of a `urllib.request.OpenerDirector` (so
+            that it has "Host", "Content-length", etc. headers).
+        connection_pool:
+        timeout: The maximum number of seconds to wait to establish a
+            connection (unless the request has a `connect_timeout`), and
+            (separately) to wait for the response to be received in full.
+            If the request has an `expiry`, these are clipped so as not to
+            extend beyond it.
+        ssl_context: The SSL context to use for HTTPS connections.
+        dns_cache: An `oapi.client.DNSCache` with which to resolve the
+            host, when a new connection is needed.
+    """
+    if not request.host:
+        message: str = "no host given"
+        raise URLError(message)
+    key: _PoolKey = (request.type, request.host)
+    # Multipart and compressed bodies are streamed (they can be iterated
+    # over again if the request is replayed), rather than being serialized
+    body: Iterable[bytes] = ()
+    chunked: bool = False
+    if isinstance(request.data, (CompressedBody, MultipartBody)):
+        body = request.data
+        chunked = request.has_header("Transfer-encoding")
+        payload: bytes = _serialize_request(request, body=False)
+    else:
+        payload = _serialize_request(request)
+    method: str = request.get_method()
+    timing: RequestTiming | None = getattr(request, "timing", None)
+    response: HTTPResponse
+    while True:
+        connection: _AsyncConnection | None = connection_pool.acquire(key)
+        reused: bool = connection is not None
+        if timing is not None:
+            timing.reused_connection = reused
+        if connection is None:
+            connection = await _open_connection(
+                request, timeout, ssl_context, dns_cache
+            )
+        try:
+            exchange_timeout: float | None = clip_timeout(
+                timeout, getattr(request, "expiry", None)
+            )
+        except OAPITimeoutError:
+            connection_pool.release(key, connection, reusable=True)
+            raise
+        try:
+            response = await asyncio.wait_for(
+                _exchange(
+                    connection,
+                    payload,
+                    method,
+                    _iter_chunked(body) if chunked else body,
+                    timing,
+                ),
+                exchange_timeout,
+            )
+        except BaseException as error:
+            connection.close()
+            # A pooled connection may have been closed by the server
+            # while idle--if so, transparently retry the request (which,
+            # having been serialized, or having a re-iterable body, can
+            # always be replayed, if its method is idempotent)
+            if (
+                reused
+                and method in _IDEMPOTENT_METHODS
+                and isinstance(error, Exception)
+                and _is_stale_connection_error(error)
+            ):
+                continue
+            if isinstance(error, asyncio.TimeoutError):
+                message = "timed out"
+                raise TimeoutError(message) from error
+            raise
+        break
+    connection_pool.release(key, connection, reusable=not response.will_close)
+    response.url = request.get_full_url()
+    response.msg = response.reason  # type: ignore[assignment]
+    return response
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import functools
+import time
+from email.utils import parsedate_to_datetime
 from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
 from warnings import warn
 
 import sob
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Hashable, Iterable
+    from urllib.request import Request
 
 
 def rename_parameters(
@@ -124,3 +128,34 @@ def deprecated(
         return wrapper
 
     return decorating_function
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse the value of a "Retry-After" header (either a number of seconds
+    or an HTTP date), returning the number of seconds to wait.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def get_request_operation_key(request: Request) -> tuple[str, ...]:
+    """
+    Get a key identifying the operation a request is for: its host, method
+    and operation (as passed to `oapi.client.Client.request`), so that
+    requests for one operation share a key regardless of their path
+    parameters. Requests made without an operation are identified by their
+    path.
+    """
+    return (
+        request.host,
+        request.get_method(),
+        getattr(request, "operation", "") or urlsplit(request.full_url).path,
+    )
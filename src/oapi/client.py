@@ -1,17 +1,26 @@
 from __future__ import annotations
 
+import asyncio
 import builtins
+import codecs
 import collections.abc
+import contextlib
+import contextvars
 import copyreg
 import decimal
 import functools
 import gzip
 import inspect
 import json
+import multiprocessing.context
 import os
+import queue
+import random
 import re
 import shlex
+import socket
 import ssl
+import string
 import sys
 import threading
 import time
@@ -19,12 +28,13 @@ import typing
 import zlib
 from base64 import b64encode
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from http.client import HTTPException, HTTPResponse
 from http.cookiejar import CookieJar
 from itertools import chain
-from logging import Logger, getLogger
+from logging import INFO, Logger, getLogger
 from pathlib import Path
 from re import Match, Pattern
 from ssl import SSLError
@@ -41,7 +51,7 @@ from urllib.parse import (
 from urllib.parse import urlencode as _urlencode
 from urllib.request import (
     HTTPCookieProcessor,
-    HTTPSHandler,
+    HTTPRedirectHandler,
     OpenerDirector,
     Request,
     build_opener,
@@ -56,12 +66,64 @@ except ImportError:
 
 import sob
 
+from oapi._cache import (
+    CREDENTIAL_HEADERS,
+    Cache,
+    FileCache,  # noqa: F401
+    MemoryCache,  # noqa: F401
+    _CachedResponse,
+    get_cached_response,
+    revalidate_response,
+    store_response,
+)
+from oapi._circuit_breaker import CircuitBreaker
+from oapi._compression import CompressedBody, CompressionPolicy
+from oapi._dns import DNSCache
+from oapi._json import JSON_CODEC_NAMES, JSONCodec, get_json_codec
+from oapi._map import aiter_map, call_method, iter_map
+from oapi._metrics import (
+    DEFAULT_BUCKETS,  # noqa: F401
+    Metrics,
+    MetricsAggregator,  # noqa: F401
+    get_status_class,
+)
 from oapi._multipart_request import MultipartRequest, Part
+from oapi._oauth2 import (
+    FileOAuth2TokenStore,  # noqa: F401
+    MemoryOAuth2TokenStore,  # noqa: F401
+    OAuth2Token,
+    OAuth2TokenManager,
+    OAuth2TokenStore,
+    get_token_key,
+)
+from oapi._pagination import Pagination
+from oapi._process_pool import ClientProcessPoolExecutor
+from oapi._rate_limit import RateLimiter
+from oapi._timeout import (
+    Deadline,  # noqa: F401
+    Timeout,
+    clip_timeout,
+    get_deadline_expiry,
+    get_remaining,
+    get_timeout,
+)
+from oapi._timing import RequestTiming
+from oapi._transport import (
+    AsyncConnectionPool,
+    ConnectionPool,
+    KeepAliveHTTPHandler,
+    KeepAliveHTTPSHandler,
+    TimedHTTPHandler,
+    TimedHTTPSHandler,
+    open_async,
+)
 from oapi._utilities import (
     deprecated,
     get_type_format_property,
     iter_distinct,
+    parse_retry_after,
 )
+from oapi.errors import OAPITimeoutError
 from oapi.oas.model import (
     Encoding,
     Header,
@@ -94,6 +156,35 @@ _lru_cache: typing.Callable[
 
 # region Client ABC
 
+
+@_lru_cache()
+def _get_init_parameter_names(client_type: type) -> frozenset[str]:
+    """
+    Get the names of the keyword parameters of a client class's `__init__`
+    method (this is cached, since clients are unpickled often--such as once
+    per worker process).
+    """
+    parameters: tuple[tuple[str, inspect.Parameter], ...] = tuple(
+        inspect.signature(client_type.__init__).parameters.items()  # type: ignore[misc]
+    )[1:]
+    item: tuple[str, inspect.Parameter]
+    return frozenset(
+        map(
+            _get_first,
+            filter(
+                lambda item: (
+                    item[1].kind
+                    not in (
+                        inspect.Parameter.VAR_POSITIONAL,
+                        inspect.Parameter.POSITIONAL_ONLY,
+                    )
+                ),
+                parameters,
+            ),
+        )
+    )
+
+
 URLENCODE_SAFE: str = "|;,/=+[]."
 _ITEMIZED_TYPES: tuple[
     type[collections.abc.Mapping],
@@ -518,18 +609,10 @@ def format_argument_value(  # noqa: C901
 
     See: https://swagger.io/docs/specification/serialization/
     """
-    if multipart and (
-        isinstance(value, (bytes, sob.abc.Readable))
-        or (
-            value
-            and (not isinstance(value, str))
-            and isinstance(value, collections.abc.Sequence)
-            and isinstance(value[0], (bytes, sob.abc.Readable))
-        )
-    ):
+    if multipart and _is_binary_argument_value(value):
         # For multipart requests, we don't apply any formatting to `bytes`
         # objects, as they will be sent in binary format
-        return value
+        return value  # type: ignore[return-value]
     if isinstance(value, sob.abc.Model):
         value = sob.marshal(value)  # type: ignore
     if style == "simple":
@@ -551,6 +634,119 @@ def format_argument_value(  # noqa: C901
     raise ValueError(style)
 
 
+def _is_binary_argument_value(
+    value: sob.abc.MarshallableTypes | typing.IO[bytes],
+) -> bool:
+    return isinstance(value, (bytes, sob.abc.Readable)) or bool(
+        value
+        and (not isinstance(value, str))
+        and isinstance(value, collections.abc.Sequence)
+        and isinstance(value[0], (bytes, sob.abc.Readable))
+    )
+
+
+_ARGUMENT_VALUE_FORMATTERS: dict[str, typing.Callable[..., typing.Any]] = {
+    "simple": _format_simple_argument_value,
+    "label": _format_label_argument_value,
+    "form": _format_form_argument_value,
+    "spaceDelimited": _format_space_delimited_argument_value,
+    "pipeDelimited": _format_pipe_delimited_argument_value,
+}
+# These formatters require the parameter name
+_NAMED_ARGUMENT_VALUE_FORMATTERS: dict[
+    str, typing.Callable[..., typing.Any]
+] = {
+    "matrix": _format_matrix_argument_value,
+    "deepObject": _format_deep_object_argument_value,
+    "dotObject": _format_dot_object_argument_value,
+}
+
+
+def get_argument_formatter(
+    name: str,
+    style: str,
+    *,
+    explode: bool = False,
+    multipart: bool = False,
+) -> typing.Callable[
+    [sob.abc.MarshallableTypes | typing.IO[bytes]], typing.Any
+]:
+    """
+    Get a function which formats an argument value exactly as
+    `format_argument_value` would, given the same parameters, but with the
+    `style` resolved in advance (rather than on every call).
+
+    Parameters:
+        name: The parameter name.
+        style: The parameter style.
+        explode:
+        multipart: Indicates the argument will be part of a
+            multipart request
+    """
+    format_: typing.Callable[..., typing.Any]
+    if style in _NAMED_ARGUMENT_VALUE_FORMATTERS:
+        format_ = functools.partial(
+            _NAMED_ARGUMENT_VALUE_FORMATTERS[style], name, explode=explode
+        )
+    elif style in _ARGUMENT_VALUE_FORMATTERS:
+        format_ = functools.partial(
+            _ARGUMENT_VALUE_FORMATTERS[style], explode=explode
+        )
+    else:
+        raise ValueError(style)
+
+    def format_argument_value(
+        value: sob.abc.MarshallableTypes | typing.IO[bytes],
+    ) -> typing.Any:
+        if multipart and _is_binary_argument_value(value):
+            return value
+        if isinstance(value, sob.abc.Model):
+            value = sob.marshal(value)  # type: ignore
+        return format_(value)
+
+    return format_argument_value
+
+
+def _get_request_data(request: Request) -> bytes:
+    """
+    Get a request's data, decoded per any "Content-encoding" header.
+    """
+    if isinstance(request.data, CompressedBody):
+        # Represent the uncompressed data, rather than compressing it only
+        # to decompress it again
+        return request.data.data
+    data: bytes = (
+        request.data
+        if isinstance(request.data, bytes)
+        else (
+            request.data.read()  # type: ignore
+            if isinstance(request.data, sob.abc.Readable)
+            else (
+                b"".join(request.data) if request.data else b""  # type: ignore
+            )
+        )
+    )
+    content_encoding: str | None = request.headers.get(
+        "Content-encoding", None
+    )
+    if data and content_encoding:
+        data = _decode_content(data, content_encoding)
+    return data
+
+
+def _get_request_body_sizes(request: Request) -> tuple[int, int] | None:
+    """
+    Get the size of a (sent) request's body before and after compression,
+    or `None` if the request has no body of a known size.
+    """
+    if isinstance(request.data, CompressedBody):
+        return len(request.data.data), request.data.compressed_size
+    if isinstance(request.data, collections.abc.Sized):
+        size: int = len(request.data)
+        return size, size
+    return None
+
+
 def get_request_curl(
     request: Request,
     options: str = "-i",
@@ -570,9 +766,6 @@ def get_request_curl(
     content_type: str | None = request.headers.get("Content-type", None)
     if content_type:
         content_type = content_type.lower()
-    content_encoding: str | None = request.headers.get(
-        "Content-encoding", None
-    )
     is_json: bool = bool(
         content_type == "application/json"
         or (
@@ -591,19 +784,7 @@ def get_request_curl(
             value = "***"
         return "-H {}".format(shlex.quote(f"{key}: {value}"))
 
-    data: bytes = (
-        request.data
-        if isinstance(request.data, bytes)
-        else (
-            request.data.read()  # type: ignore
-            if isinstance(request.data, sob.abc.Readable)
-            else (
-                b"".join(request.data) if request.data else b""  # type: ignore
-            )
-        )
-    )
-    if data and content_encoding:
-        data = _decode_content(data, content_encoding)
+    data: bytes = _get_request_data(request)
     repr_data: str = ""
     if data:
         try:
@@ -667,6 +848,45 @@ def _represent_http_response(
     return f"{response.geturl()}\n{response.getcode()}\n{headers}{body}"
 
 
+def _set_response_read_hook(
+    response: HTTPResponse,
+    hook: typing.Callable[[HTTPResponse, bytes], None] | None = None,
+    finished: typing.Callable[[HTTPResponse, int, int], None] | None = None,
+    timing: RequestTiming | None = None,
+    expiry: float | None = None,
+) -> None:
+    """
+    Decode encoded content (per the response's "Content-encoding" header)
+    incrementally, as a response is read, and pass the response and each
+    (decoded) chunk read to `hook`. If the response has no encoded content,
+    and neither `hook`, `finished` nor `expiry` are provided, the response
+    is left untouched.
+
+    Parameters:
+        response:
+        hook:
+        finished: A function to call once the response has been read in
+            full, with the response, the number of bytes received, and the
+            number of bytes after decoding.
+        timing: A timing record to which the time spent decoding the
+            response is added.
+        expiry: A `time.monotonic` value by which the response must be
+            read in full.
+    """
+    content_encoding: str | None = (
+        response.headers.get("Content-encoding") if response.headers else None
+    )
+    reader: _DecodingResponseReader = _DecodingResponseReader(
+        response, content_encoding, hook, finished, expiry, timing
+    )
+    if not (reader.decoding or hook or finished or (expiry is not None)):
+        return
+    response.read = reader.read  # type: ignore[method-assign]
+    response.read1 = reader.read1  # type: ignore[method-assign]
+    response.readinto = reader.readinto  # type: ignore[method-assign, assignment]
+    response.readline = reader.readline  # type: ignore[method-assign]
+
+
 def _set_response_callback(
     response: HTTPResponse, callback: typing.Callable = print
 ) -> None:
@@ -674,22 +894,75 @@ def _set_response_callback(
     Perform a callback on an HTTP response at the time it is read
     """
 
-    @functools.wraps(response.read)
-    def response_read(amt: int | None = None) -> bytes:
-        data: bytes = HTTPResponse.read(response, amt)
-        if response.headers:
-            content_encoding: str | None = response.headers.get(
-                "Content-encoding"
-            )
-            if data and content_encoding:
-                data = _decode_content(
-                    data,
-                    content_encoding,
-                )
+    def hook(response: HTTPResponse, data: bytes) -> None:
         callback(_represent_http_response(response, data))
-        return data
 
-    response.read = response_read  # type: ignore
+    _set_response_read_hook(response, hook)
+
+
+@dataclass
+class RequestEvent:
+    """
+    An instance of this class is passed to a client's `event_hook` before
+    each request is sent. Text representations of the request are only
+    rendered when (and if) accessed.
+
+    Attributes:
+        request: The request to be sent.
+        curl_options: Command-line options for the `curl` representation
+            of the request.
+    """
+
+    request: Request
+    curl_options: str = "-i"
+
+    @functools.cached_property
+    def curl(self) -> str:
+        """
+        A `curl` command which would submit this request.
+        """
+        return get_request_curl(self.request, options=self.curl_options)
+
+
+@dataclass
+class ResponseEvent:
+    """
+    An instance of this class is passed to a client's `event_hook` each time
+    (part of) a response is read. Text representations of the response are
+    only rendered when (and if) accessed.
+
+    Attributes:
+        response: The response being read.
+        data: The (decoded) data returned by this read.
+    """
+
+    response: HTTPResponse
+    data: bytes
+
+    @functools.cached_property
+    def text(self) -> str:
+        """
+        A representation of the response URL, status, headers and the data
+        read.
+        """
+        return _represent_http_response(self.response, self.data)
+
+
+def _append_http_error_response_text(error: HTTPError) -> None:
+    """
+    Append a representation of the response to an HTTP error's
+    exception text.
+    """
+    error_response: HTTPResponse | None = getattr(error, "file", None)
+    if error_response is not None:
+        sob.errors.append_exception_text(
+            error,
+            "\n\n{}".format(
+                _censor_long_json_strings(
+                    _represent_http_response(error_response)
+                )
+            ),
+        )
 
 
 def default_retry_hook(error: Exception) -> bool:
@@ -702,6 +975,15 @@ def default_retry_hook(error: Exception) -> bool:
     )
 
 
+def _warn_retry(attempt_number: int, logger: Logger | None) -> None:
+    warning_message: str = (
+        f"Attempt # {attempt_number!s}:\n{sob.errors.get_exception_text()}"
+    )
+    warn(warning_message, stacklevel=3)
+    if logger is not None:
+        logger.warning(warning_message)
+
+
 def retry(
     errors: tuple[type[Exception], ...] | type[Exception] = Exception,
     retry_hook: typing.Callable[[Exception], bool] = default_retry_hook,
@@ -728,28 +1010,20 @@ def retry(
     """
 
     def decorating_function(function: typing.Callable) -> typing.Callable:
-        attempt_number: int = 1
-
         @functools.wraps(function)
         def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
-            nonlocal attempt_number
-            nonlocal number_of_attempts
-            if number_of_attempts - attempt_number:
+            # Attempts are counted per call, so that concurrent and
+            # successive calls do not share a retry allowance
+            attempt_number: int = 1
+            while number_of_attempts - attempt_number > 0:
                 try:
                     return function(*args, **kwargs)
                 except errors as error:
                     if not retry_hook(error):
                         raise
-                    warning_message: str = (
-                        f"Attempt # {attempt_number!s}:\n"
-                        f"{sob.errors.get_exception_text()}"
-                    )
-                    warn(warning_message, stacklevel=2)
-                    if logger is not None:
-                        logger.warning(warning_message)
+                    _warn_retry(attempt_number, logger)
                     sleep(2**attempt_number)
                     attempt_number += 1
-                    return wrapper(*args, **kwargs)
             return function(*args, **kwargs)
 
         return wrapper
@@ -831,6 +1105,424 @@ def _decode_content(data: bytes, content_encoding: str) -> bytes:
     return data
 
 
+class _Readable(typing.Protocol):
+    def read(self, size: int, /) -> bytes: ...
+
+
+class _MultiMemberDecoder:
+    """
+    Incrementally read and decompress zlib-compressed content (gzip or
+    "deflate") from a source. Gzip content may (per the format) consist of
+    multiple concatenated members.
+
+    Each read returns no more than `size` bytes: input which has not yet
+    been decompressed is carried over to the next read, so memory use does
+    not depend on how compressible the content is.
+    """
+
+    def __init__(
+        self,
+        source: _Readable,
+        get_decompressor: typing.Callable[[], typing.Any],
+        *,
+        multiple_members: bool = True,
+    ) -> None:
+        self._source: _Readable = source
+        self._get_decompressor: typing.Callable[[], typing.Any] = (
+            get_decompressor
+        )
+        self._decompressor: typing.Any = get_decompressor()
+        self._multiple_members: bool = multiple_members
+        # Input which has not yet been decompressed
+        self._input: bytes = b""
+        # Whether the last read may have left output pending (because
+        # it returned as much as was asked for)
+        self._limited: bool = False
+        self._eof: bool = False
+
+    def _decompress(self, size: int) -> bytes:
+        decompressed: bytes = self._decompressor.decompress(self._input, size)
+        self._limited = (not self._decompressor.eof) and (
+            len(decompressed) >= size
+        )
+        self._input = (
+            self._decompressor.unused_data
+            if self._decompressor.eof
+            else self._decompressor.unconsumed_tail
+        )
+        return decompressed
+
+    def read(self, size: int) -> bytes:
+        while not self._eof:
+            if not (self._input or self._limited):
+                self._input = self._source.read(_DECODING_CHUNK_SIZE)
+                if not self._input:
+                    self._eof = True
+                    return self._decompressor.flush()  # type: ignore[no-any-return]
+            if self._decompressor.eof:
+                if not self._multiple_members:
+                    # Anything following the end of the content is ignored
+                    self._input = b""
+                    continue
+                # Start decompressing the next member
+                self._decompressor = self._get_decompressor()
+            decompressed: bytes = self._decompress(size)
+            if decompressed:
+                return decompressed
+        return b""
+
+
+class _DeflateDecoder(_MultiMemberDecoder):
+    """
+    Incrementally read and decompress "deflate" content, which is
+    *supposed* to be zlib-wrapped, but is sent by some servers as raw
+    deflate data.
+    """
+
+    def __init__(self, source: _Readable) -> None:
+        super().__init__(source, zlib.decompressobj, multiple_members=False)
+        self._started: bool = False
+
+    def _decompress(self, size: int) -> bytes:
+        if self._started:
+            return super()._decompress(size)
+        decompressed: bytes
+        try:
+            decompressed = super()._decompress(size)
+        except zlib.error:
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            decompressed = super()._decompress(size)
+        self._started = True
+        return decompressed
+
+
+class _BrotliDecoder:
+    """
+    Incrementally read and decompress brotli content from a source,
+    returning no more than (approximately--brotli allocates output in
+    blocks) `size` bytes per read.
+    """
+
+    def __init__(self, source: _Readable) -> None:
+        try:
+            import brotlicffi as brotli  # type: ignore[import-not-found] # noqa: PLC0415
+        except ImportError:
+            import brotli  # type: ignore # noqa: PLC0415
+        self._source: _Readable = source
+        self._decompressor: typing.Any = brotli.Decompressor()
+        # `brotli` and `brotlicffi` name this method differently
+        self._process: typing.Callable[..., bytes] = (
+            self._decompressor.process
+            if hasattr(self._decompressor, "process")
+            else self._decompressor.decompress
+        )
+        self._input: bytes = b""
+        self._limited: bool = False
+
+    def read(self, size: int) -> bytes:
+        while True:
+            if not (self._input or self._limited):
+                self._input = self._source.read(_DECODING_CHUNK_SIZE)
+                if not self._input:
+                    return b""
+            # More input can only be passed to the decompressor once it
+            # has returned the output pending from previous input
+            data: bytes = b""
+            if self._decompressor.can_accept_more_data():
+                data, self._input = self._input, b""
+            decompressed: bytes = self._process(data, output_buffer_limit=size)
+            self._limited = (
+                len(decompressed) >= size
+                or not self._decompressor.can_accept_more_data()
+            )
+            if decompressed:
+                return decompressed
+
+
+def _get_decoder(content_encoding: str, source: _Readable) -> _Readable | None:
+    """
+    Get an incremental decoder which reads content encoded with a single
+    content coding from `source`, or `None` if the content coding is
+    "identity" (or is not recognized, in which case the content is passed
+    through as-is, as by `_decode_content`).
+    """
+    content_encoding = content_encoding.lower().strip()
+    if content_encoding == "gzip":
+        return _MultiMemberDecoder(
+            source, functools.partial(zlib.decompressobj, 16 + zlib.MAX_WBITS)
+        )
+    if content_encoding == "deflate":
+        return _DeflateDecoder(source)
+    if content_encoding == "zstd":
+        import zstandard  # noqa: PLC0415
+
+        # `zstandard` decompression objects cannot limit their output, but
+        # its stream readers (which pull input from their source) can
+        return zstandard.ZstdDecompressor().stream_reader(
+            source,  # type: ignore[arg-type]
+            read_size=_DECODING_CHUNK_SIZE,
+            read_across_frames=True,
+            closefd=False,
+        )
+    if content_encoding in ("br", "dcb", "dcz"):
+        return _BrotliDecoder(source)
+    return None
+
+
+class _ContentDecoder:
+    """
+    Incrementally read and decode content encoded with one or more content
+    codings (such as "gzip", or "gzip, br") from a source.
+
+    Each read returns no more than (approximately) `size` bytes, and no
+    more than that is decoded by any of the content codings' decoders
+    along the way, so memory use is bounded regardless of how compressible
+    the content is.
+    """
+
+    def __init__(self, content_encoding: str, source: _Readable) -> None:
+        self._reader: _Readable = source
+        # Content codings are listed in the order in which they were
+        # applied, so must be undone in reverse order
+        content_coding: str
+        for content_coding in reversed(content_encoding.split(",")):
+            self._reader = (
+                _get_decoder(content_coding, self._reader) or self._reader
+            )
+        self._decoding: bool = self._reader is not source
+
+    def __bool__(self) -> bool:
+        return self._decoding
+
+    def read(self, size: int) -> bytes:
+        """
+        Read and decode up to (approximately) `size` bytes, returning an
+        empty `bytes` object only once the content has been read in full.
+        """
+        return self._reader.read(size)
+
+
+def _get_response_socket(response: HTTPResponse) -> socket.socket | None:
+    """
+    Get the socket from which a response is read (the response's file is
+    a buffered reader wrapping a `socket.SocketIO`), or `None` if the
+    response is not being read from a socket (such as a cached response).
+    """
+    return getattr(getattr(response.fp, "raw", None), "_sock", None)
+
+
+class _RawResponseReader:
+    """
+    Reads the raw (encoded) content of a response on behalf of a
+    `_DecodingResponseReader`'s content decoder.
+    """
+
+    __slots__: tuple[str, ...] = ("_reader",)
+
+    def __init__(self, reader: _DecodingResponseReader) -> None:
+        self._reader: _DecodingResponseReader = reader
+
+    def read(self, size: int) -> bytes:
+        return self._reader._read_raw(size)
+
+
+class _DecodingResponseReader:
+    """
+    This replaces the read methods of an `http.client.HTTPResponse` in
+    order to decode encoded content incrementally (so that memory use is
+    proportional to the amount read, not to the size of the response),
+    to pass each chunk read to a hook, and/or to prevent reading the
+    response from extending beyond an expiry.
+    """
+
+    def __init__(
+        self,
+        response: HTTPResponse,
+        content_encoding: str | None = None,
+        hook: typing.Callable[[HTTPResponse, bytes], None] | None = None,
+        finished: (
+            typing.Callable[[HTTPResponse, int, int], None] | None
+        ) = None,
+        expiry: float | None = None,
+        timing: RequestTiming | None = None,
+    ) -> None:
+        self._response: HTTPResponse = response
+        self._expiry: float | None = expiry
+        # The socket from which the response is read (if any), and its
+        # (read) timeout, which is clipped before each read so that no read
+        # can extend beyond the expiry
+        self._socket: socket.socket | None = (
+            None if expiry is None else _get_response_socket(response)
+        )
+        self._timeout: float | None = (
+            None if self._socket is None else self._socket.gettimeout()
+        )
+        decoder: _ContentDecoder | None = (
+            _ContentDecoder(content_encoding, _RawResponseReader(self))
+            if content_encoding
+            else None
+        )
+        self._decoder: _ContentDecoder | None = decoder or None
+        self._timing: RequestTiming | None = timing
+        self._hook: typing.Callable[[HTTPResponse, bytes], None] | None = hook
+        self._finished_hook: (
+            typing.Callable[[HTTPResponse, int, int], None] | None
+        ) = finished
+        # Decoded data which has not yet been returned
+        self._buffer: bytearray = bytearray()
+        self._finished: bool = False
+        # The number of bytes received, and decoded
+        self._size: int = 0
+        self._decoded_size: int = 0
+        # The time spent receiving raw content (which, when a decoder
+        # pulls raw content, is excluded from the time spent decoding)
+        self._raw_time: float = 0.0
+
+    @property
+    def decoding(self) -> bool:
+        """
+        Whether the response has encoded content which is being decoded.
+        """
+        return self._decoder is not None
+
+    def _finish(self) -> None:
+        self._finished = True
+        if self._finished_hook is not None:
+            self._finished_hook(self._response, self._size, self._decoded_size)
+
+    def _read_raw(
+        self,
+        size: int | None = None,
+        read: typing.Callable[..., bytes] | None = None,
+    ) -> bytes:
+        """
+        Read from the raw response using an `http.client.HTTPResponse`
+        read method (by default, `HTTPResponse.read`--or, with an expiry,
+        `HTTPResponse.read1`, so that each read is a single receive, which
+        the clipped socket timeout can bound).
+        """
+        if read is None:
+            read = (
+                HTTPResponse.read
+                if (self._expiry is None) or (size is None)
+                else HTTPResponse.read1
+            )
+        args: tuple[int, ...] = () if size is None else (size,)
+        started: float = time.perf_counter() if self._timing else 0.0
+        data: bytes
+        if self._expiry is None:
+            data = read(self._response, *args)
+        else:
+            timeout: float | None = clip_timeout(self._timeout, self._expiry)
+            if self._socket is not None:
+                self._socket.settimeout(timeout)
+            try:
+                data = read(self._response, *args)
+            except TimeoutError as error:
+                # Distinguish the expiry from a read timeout
+                if time.monotonic() >= self._expiry:
+                    raise OAPITimeoutError from error
+                raise
+        if self._timing is not None:
+            self._raw_time += time.perf_counter() - started
+        self._size += len(data)
+        return data
+
+    def _decode(self, size: int) -> bytes:
+        """
+        Read and decode up to (approximately) `size` bytes.
+        """
+        if self._decoder is None:
+            raise ValueError(self._response)
+        if self._timing is None:
+            return self._decoder.read(size)
+        started: float = time.perf_counter()
+        raw_time: float = self._raw_time
+        try:
+            return self._decoder.read(size)
+        finally:
+            self._timing.decompression += (
+                time.perf_counter() - started - (self._raw_time - raw_time)
+            )
+
+    def _fill(
+        self, size: int, read: typing.Callable[..., bytes] | None = None
+    ) -> None:
+        """
+        Read (and decode) up to (approximately) `size`, but no more than
+        `_DECODING_CHUNK_SIZE`, bytes of the response into the buffer.
+        """
+        if not 0 < size < _DECODING_CHUNK_SIZE:
+            size = _DECODING_CHUNK_SIZE
+        data: bytes = (
+            self._read_raw(size, read)
+            if self._decoder is None
+            else self._decode(size)
+        )
+        if data:
+            self._decoded_size += len(data)
+            self._buffer += data
+        else:
+            self._finish()
+
+    def _return(self, data: bytes) -> bytes:
+        if self._hook is not None:
+            self._hook(self._response, data)
+        return data
+
+    def read(self, amt: int | None = None) -> bytes:
+        data: bytes
+        if amt is None or amt < 0:
+            if (self._decoder is not None) or (self._expiry is not None):
+                while not self._finished:
+                    self._fill(_DECODING_CHUNK_SIZE)
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            if not self._finished:
+                chunk: bytes = self._read_raw()
+                self._decoded_size += len(chunk)
+                data += chunk
+                self._finish()
+            return self._return(data)
+        while len(self._buffer) < amt and not self._finished:
+            self._fill(amt)
+        data = bytes(self._buffer[:amt])
+        del self._buffer[:amt]
+        return self._return(data)
+
+    def read1(self, n: int = -1) -> bytes:
+        while not (self._buffer or self._finished):
+            self._fill(n, HTTPResponse.read1)
+        if n < 0:
+            n = len(self._buffer)
+        data: bytes = bytes(self._buffer[:n])
+        del self._buffer[:n]
+        return self._return(data)
+
+    def readinto(self, b: bytearray | memoryview) -> int:
+        data: bytes = self.read(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+    def readline(self, limit: int = -1) -> bytes:
+        index: int = self._buffer.find(b"\n")
+        while index < 0 and not self._finished:
+            if 0 <= limit <= len(self._buffer):
+                break
+            start: int = len(self._buffer)
+            self._fill(_DECODING_CHUNK_SIZE)
+            index = self._buffer.find(b"\n", start)
+        size: int = len(self._buffer) if index < 0 else index + 1
+        if 0 <= limit < size:
+            size = limit
+        data: bytes = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return self._return(data)
+
+
+_DECODING_CHUNK_SIZE: int = 16384
+
+
 def _format_request_data(  # noqa: C901
     json: str | bytes | sob.abc.Model | None,
     data: (
@@ -838,6 +1530,7 @@ def _format_request_data(  # noqa: C901
         | collections.abc.Sequence[tuple[str, typing.Any]]
     ),
     content_encoding: str | None = None,
+    json_codec: JSONCodec | None = None,
 ) -> bytes | None:
     formatted_data: bytes | None = None
     if json:
@@ -847,9 +1540,13 @@ def _format_request_data(  # noqa: C901
                 "A request may only contain form data or JSON data, not both."
             )
             raise ValueError(message)
-        # Cast `data` as a `str`
+        # Cast `data` as a `str` (or, using a JSON codec, as `bytes`)
         if isinstance(json, sob.abc.Model):
-            json = sob.serialize(json)
+            json = (
+                sob.serialize(json)
+                if json_codec is None
+                else json_codec.dumps(json)
+            )
         # Convert `str` data to `bytes`
         if isinstance(json, str):
             formatted_data = bytes(json, encoding="utf-8")
@@ -936,36 +1633,342 @@ DEFAULT_RETRY_FOR_EXCEPTIONS: tuple[type[Exception], ...] = (
 )
 
 
-class SSLContext(ssl.SSLContext):
+class _CountedCall:
     """
-    This class is a wrapper for `ssl.SSLContext` which makes it possible to
-    connect to hosts which have an unverified SSL certificate.
+    A function (accepting no arguments) which counts the number of times it
+    is called, such as to count the attempts made by a `RetryPolicy`.
     """
 
-    def __new__(
-        cls,
-        *args: typing.Any,  # noqa: ARG004
-        **kwargs: typing.Any,  # noqa: ARG004
-    ) -> Self:
-        return super().__new__(cls, protocol=ssl.PROTOCOL_TLS_CLIENT)
+    __slots__: tuple[str, ...] = ("count", "function")
 
-    def __init__(
-        self,
-        check_hostname: bool = True,  # noqa: FBT001 FBT002
-    ) -> None:
-        if check_hostname:
-            self.load_default_certs()
-        else:
-            self.check_hostname: bool = False
-            self.verify_mode: ssl.VerifyMode = ssl.CERT_NONE
+    def __init__(self, function: typing.Callable[[], typing.Any]) -> None:
+        self.function: typing.Callable[[], typing.Any] = function
+        self.count: int = 0
+
+    def __call__(self) -> typing.Any:
+        self.count += 1
+        return self.function()
+
+
+def get_retry_after(error: Exception) -> float | None:
+    """
+    Get the number of seconds a server has asked a client to wait before
+    retrying a request (per a "Retry-After" header), if the error is an
+    HTTP 429 (TOO MANY REQUESTS) or 503 (SERVICE UNAVAILABLE) error.
+    """
+    if not (isinstance(error, HTTPError) and error.code in (429, 503)):
+        return None
+    return parse_retry_after(
+        error.headers.get("Retry-After") if error.headers else None
+    )
+
+
+class RetryPolicy:
+    """
+    A policy determining which failed requests are retried, and how long to
+    wait before each retry.
+
+    Delays follow "decorrelated jitter" exponential backoff: each delay is
+    chosen at random between `base_delay` and three times the previous
+    delay (capped at `max_delay`), so that clients which failed at the same
+    moment do not retry in lock-step. A delay requested by the server (in
+    the "Retry-After" header of an HTTP 429 or 503 response) is honored.
+
+    Retries draw from a token-bucket retry budget shared by all calls made
+    using the policy: each retry withdraws one token, and each successful
+    call deposits `budget_ratio` tokens (up to `budget`). When a service is
+    failing, the budget is soon exhausted, and failed requests are then no
+    longer retried, rather than multiplying the load on the service.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "_lock",
+        "_tokens",
+        "base_delay",
+        "budget",
+        "budget_ratio",
+        "deadline",
+        "errors",
+        "max_delay",
+        "number_of_attempts",
+        "retry_hook",
+    )
+
+    def __init__(
+        self,
+        number_of_attempts: int = 3,
+        *,
+        errors: tuple[type[Exception], ...] = DEFAULT_RETRY_FOR_ERRORS,
+        retry_hook: typing.Callable[[Exception], bool] = default_retry_hook,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        deadline: float = 0.0,
+        budget: float = 10.0,
+        budget_ratio: float = 0.1,
+    ) -> None:
+        """
+        Parameters:
+            number_of_attempts: The maximum number of times to attempt
+                a request, *including* the first attempt.
+            errors: A tuple of one or more exception types on which to
+                retry a request.
+            retry_hook: A function, accepting one argument (an Exception),
+                and returning a boolean value indicating whether to retry the
+                request (if retries have not been exhausted).
+            base_delay: The minimum number of seconds to wait before
+                retrying a request.
+            max_delay: The maximum number of seconds to wait before
+                retrying a request (unless the server requests a longer
+                delay using a "Retry-After" header).
+            deadline: The maximum number of seconds, measured from the
+                first attempt, within which a request may be retried. A retry
+                which could not begin before the deadline is not attempted.
+                If this is 0 (the default), there is no deadline.
+            budget: The maximum number of retry tokens. If this is 0,
+                retries are not limited by a budget.
+            budget_ratio: The number of retry tokens deposited for each
+                successful call.
+        """
+        self.number_of_attempts: int = number_of_attempts
+        self.errors: tuple[type[Exception], ...] = errors
+        self.retry_hook: typing.Callable[[Exception], bool] = retry_hook
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.deadline: float = deadline
+        self.budget: float = budget
+        self.budget_ratio: float = budget_ratio
+        self._tokens: float = budget
+        self._lock: threading.Lock = threading.Lock()
+
+    def _deposit(self) -> None:
+        if self.budget and self._tokens < self.budget:
+            with self._lock:
+                self._tokens = min(
+                    self.budget, self._tokens + self.budget_ratio
+                )
+
+    def _withdraw(self) -> bool:
+        """
+        Withdraw a token from the retry budget, returning `False` if the
+        budget is exhausted.
+        """
+        if not self.budget:
+            return True
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def get_delay(
+        self,
+        error: Exception,
+        attempt_number: int,
+        previous_delay: float = 0.0,
+        elapsed: float = 0.0,
+        remaining: float | None = None,
+    ) -> float | None:
+        """
+        Get the number of seconds to wait before retrying a failed attempt,
+        or `None` if the attempt should not be retried. A retry token is
+        withdrawn from the budget when a delay is returned.
+
+        Parameters:
+            error: The error raised by the failed attempt.
+            attempt_number: The number of the failed attempt, starting
+                with 1.
+            previous_delay: The delay preceding the failed attempt (0 for
+                the first attempt).
+            elapsed: The number of seconds since the first attempt began.
+            remaining: The number of seconds remaining until the call's
+                deadline, if it has one. The delay is clipped to end before
+                the deadline, and if the minimum delay (`base_delay`, or
+                the delay requested by the server) would not, the attempt
+                is not retried.
+        """
+        if (
+            attempt_number >= self.number_of_attempts
+            or not isinstance(error, self.errors)
+            or not self.retry_hook(error)
+        ):
+            return None
+        minimum_delay: float = min(self.base_delay, self.max_delay)
+        delay: float = min(
+            self.max_delay,
+            random.uniform(
+                self.base_delay, max(self.base_delay, previous_delay * 3)
+            ),
+        )
+        retry_after: float | None = get_retry_after(error)
+        if retry_after is not None:
+            minimum_delay = max(minimum_delay, retry_after)
+            delay = max(delay, retry_after)
+        if self.deadline and (elapsed + delay > self.deadline):
+            return None
+        if remaining is not None:
+            if minimum_delay >= remaining:
+                return None
+            if delay >= remaining:
+                delay = random.uniform(minimum_delay, remaining)
+        if not self._withdraw():
+            return None
+        return delay
+
+    def call(
+        self,
+        function: typing.Callable[[], typing.Any],
+        logger: Logger | None = None,
+        expiry: float | None = None,
+    ) -> typing.Any:
+        """
+        Call `function` (which accepts no arguments), retrying it in
+        accordance with this policy.
+
+        Parameters:
+            function: The function to call.
+            logger: A logger to which retried errors should be logged.
+            expiry: The call's deadline, as a `time.monotonic` value. No
+                attempt is started after this time (an
+                `oapi.errors.OAPITimeoutError` is raised if it has passed
+                before the first attempt), and retries are only attempted
+                if they can begin before it.
+        """
+        if expiry is not None:
+            get_remaining(expiry)
+        if self.number_of_attempts <= 1:
+            return function()
+        started: float = time.monotonic()
+        attempt_number: int = 1
+        delay: float = 0.0
+        while True:
+            try:
+                value: typing.Any = function()
+            except self.errors as error:
+                now: float = time.monotonic()
+                retry_delay: float | None = self.get_delay(
+                    error,
+                    attempt_number,
+                    delay,
+                    now - started,
+                    None if expiry is None else expiry - now,
+                )
+                if retry_delay is None:
+                    raise
+                _warn_retry(attempt_number, logger)
+                delay = retry_delay
+                sleep(delay)
+                attempt_number += 1
+            else:
+                self._deposit()
+                return value
+
+    async def async_call(
+        self,
+        function: typing.Callable[[], collections.abc.Awaitable[typing.Any]],
+        logger: Logger | None = None,
+        expiry: float | None = None,
+    ) -> typing.Any:
+        """
+        Await `function` (a function which accepts no arguments and returns
+        an awaitable), retrying it in accordance with this policy.
+
+        Parameters:
+            function: The function to call.
+            logger: A logger to which retried errors should be logged.
+            expiry: The call's deadline, as a `time.monotonic` value (see
+                `call`).
+        """
+        if expiry is not None:
+            get_remaining(expiry)
+        if self.number_of_attempts <= 1:
+            return await function()
+        started: float = time.monotonic()
+        attempt_number: int = 1
+        delay: float = 0.0
+        while True:
+            try:
+                value: typing.Any = await function()
+            except self.errors as error:
+                now: float = time.monotonic()
+                retry_delay: float | None = self.get_delay(
+                    error,
+                    attempt_number,
+                    delay,
+                    now - started,
+                    None if expiry is None else expiry - now,
+                )
+                if retry_delay is None:
+                    raise
+                _warn_retry(attempt_number, logger)
+                delay = retry_delay
+                await asyncio.sleep(delay)
+                attempt_number += 1
+            else:
+                self._deposit()
+                return value
+
+
+class SSLContext(ssl.SSLContext):
+    """
+    This class is a wrapper for `ssl.SSLContext` which makes it possible to
+    connect to hosts which have an unverified SSL certificate.
+    """
+
+    def __new__(
+        cls,
+        *args: typing.Any,  # noqa: ARG004
+        **kwargs: typing.Any,  # noqa: ARG004
+    ) -> Self:
+        return super().__new__(cls, protocol=ssl.PROTOCOL_TLS_CLIENT)
+
+    def __init__(
+        self,
+        check_hostname: bool = True,  # noqa: FBT001 FBT002
+    ) -> None:
+        if check_hostname:
+            self.load_default_certs()
+        else:
+            self.check_hostname: bool = False
+            self.verify_mode: ssl.VerifyMode = ssl.CERT_NONE
         super().__init__()
 
     def __reduce__(self) -> tuple:
         """
-        A pickled instance of this class will just be an entirely new
-        instance.
+        A pickled instance of this class is unpickled as the shared context
+        with the same verification settings (see `get_ssl_context`).
         """
-        return SSLContext, (self.check_hostname,)
+        return get_ssl_context, (self.check_hostname,)
+
+
+# Shared SSL contexts, by verification settings
+_ssl_contexts: dict[bool, SSLContext] = {}
+_ssl_contexts_lock: threading.Lock = threading.Lock()
+
+
+def get_ssl_context(check_hostname: bool = True) -> SSLContext:
+    """
+    Get a process-wide, shared `SSLContext` with the given verification
+    settings. Loading the default certificates for a context is costly (in
+    both time and memory), so clients share a context rather than each
+    creating their own. Sharing a context also allows TLS sessions to be
+    resumed by new connections to a host, regardless of which client
+    opened the connection which negotiated the session.
+
+    Because a shared context is used by all clients, it should not be
+    modified.
+
+    Parameters:
+        check_hostname: If `False`, neither the host name nor certificate
+            of a server are verified.
+    """
+    check_hostname = bool(check_hostname)
+    with _ssl_contexts_lock:
+        context: SSLContext | None = _ssl_contexts.get(check_hostname)
+        if context is None:
+            context = _ssl_contexts[check_hostname] = SSLContext(
+                check_hostname=check_hostname
+            )
+        return context
 
 
 def _get_file_name(file: typing.IO, default: str = "") -> str:
@@ -1002,6 +2005,7 @@ def _assemble_request(  # noqa: C901
             str,
         ],
     ],
+    json_codec: JSONCodec | None = None,
 ) -> Request:
     message: str
     if multipart:
@@ -1030,13 +2034,12 @@ def _assemble_request(  # noqa: C901
                 if "Content-disposition" not in part_headers:
                     filename: str = ""
                     if isinstance(datum, sob.abc.Readable):
+                        # The file is streamed (rather than read) when
+                        # the request is sent
                         filename = _get_file_name(
                             datum,  # type: ignore
                             name,
                         )
-                        datum = typing.cast(  # noqa: PLW2901
-                            "sob.abc.Readable", datum
-                        ).read()
                     repr_filename: str = (
                         f'; filename="{filename}"' if filename else ""
                     )
@@ -1044,7 +2047,7 @@ def _assemble_request(  # noqa: C901
                         f'form-data; name="{name}"{repr_filename}'
                     )
                 if "Content-type" not in part_headers:
-                    if isinstance(datum, bytes):
+                    if isinstance(datum, (bytes, sob.abc.Readable)):
                         part_headers["Content-type"] = (
                             "application/octet-stream"
                         )
@@ -1074,6 +2077,7 @@ def _assemble_request(  # noqa: C901
             json,
             data,
             content_encoding=headers.get("Content-encoding"),
+            json_codec=json_codec,
         ),
         method=method.upper(),
         headers=headers,
@@ -1084,37 +2088,468 @@ def _get_first(items: collections.abc.Iterable[typing.Any]) -> typing.Any:
     return next(iter(items))
 
 
+_JSON_WHITESPACE: Pattern = re.compile(r"[ \t\n\r]*")
+# Characters which can continue a JSON number (or an empty string, in
+# which case the number ends with the buffer)
+_JSON_NUMBER_CHARACTERS: tuple[str, ...] = ("", *"0123456789+-.eE")
+
+
+class _JSONArrayReader:
+    """
+    This class incrementally parses a JSON array from a file-like object,
+    holding only the text of the array item being parsed (plus whatever
+    was read along with it) in memory.
+    """
+
+    def __init__(
+        self, data: sob.abc.Readable | typing.IO, chunk_size: int
+    ) -> None:
+        self._data: sob.abc.Readable | typing.IO = data
+        self._chunk_size: int = chunk_size
+        self._text_decoder: codecs.IncrementalDecoder = (
+            codecs.getincrementaldecoder("utf-8-sig")()
+        )
+        self._json_decoder: json.JSONDecoder = json.JSONDecoder(strict=False)
+        self._buffer: str = ""
+        self._index: int = 0
+        self._eof: bool = False
+
+    def _error(self, message: str) -> sob.errors.DeserializeError:
+        return sob.errors.DeserializeError(
+            data=self._buffer[self._index : self._index + 80],
+            message=message,
+        )
+
+    def _read(self) -> None:
+        """
+        Read more text into the buffer, discarding text which has already
+        been parsed. The amount read grows with the amount of unparsed text,
+        so that a large item is not re-parsed once for each chunk it spans.
+        """
+        if self._eof:
+            raise self._error("Unexpected end of JSON data")
+        self._buffer = self._buffer[self._index :]
+        self._index = 0
+        chunk: str | bytes = self._data.read(
+            max(self._chunk_size, len(self._buffer))
+        )
+        if isinstance(chunk, str):
+            self._buffer += chunk
+        else:
+            self._buffer += self._text_decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            self._eof = True
+
+    def _next_character(self) -> str:
+        """
+        Skip whitespace, and return the next character without consuming
+        it (or an empty string at the end of the data).
+        """
+        while True:
+            self._index = _JSON_WHITESPACE.match(
+                self._buffer, self._index
+            ).end()  # type: ignore[union-attr]
+            if self._index < len(self._buffer) or self._eof:
+                return self._buffer[self._index : self._index + 1]
+            self._read()
+
+    def _expect(self, characters: str) -> str:
+        character: str = self._next_character()
+        if not (character and character in characters):
+            message: str = (
+                f"Expected one of {tuple(characters)!r}, not {character!r}"
+            )
+            raise self._error(message)
+        self._index += 1
+        return character
+
+    def _decode_item(self) -> sob.abc.JSONTypes:
+        while True:
+            try:
+                item: sob.abc.JSONTypes
+                end: int
+                item, end = self._json_decoder.raw_decode(
+                    self._buffer, self._index
+                )
+            except json.JSONDecodeError as error:
+                if self._eof:
+                    raise self._error(str(error)) from error
+            else:
+                # A number may have been truncated by the end of the
+                # buffer (part-way through an exponent, for example), so
+                # is only accepted once followed by a character which
+                # cannot continue it
+                if self._eof or not (
+                    isinstance(item, (int, float))
+                    and not isinstance(item, bool)
+                    and self._buffer[end : end + 1] in _JSON_NUMBER_CHARACTERS
+                ):
+                    self._index = end
+                    return item
+            self._read()
+
+    def __iter__(self) -> collections.abc.Iterator[sob.abc.JSONTypes]:
+        self._expect("[")
+        if self._next_character() == "]":
+            self._index += 1
+            return
+        while True:
+            self._next_character()
+            yield self._decode_item()
+            if self._expect(",]") == "]":
+                return
+
+
+def iter_json_array(
+    data: sob.abc.Readable | typing.IO,
+    chunk_size: int = _DECODING_CHUNK_SIZE,
+) -> collections.abc.Iterator[sob.abc.JSONTypes]:
+    """
+    Deserialize a JSON array incrementally, yielding each (deserialized)
+    item as soon as it has been read. Because only one item is parsed at
+    a time, memory use is proportional to the largest item in the array,
+    not to the size of the array.
+
+    Parameters:
+        data: A file-like object (such as an HTTP response) from which
+            a JSON array can be read.
+        chunk_size: The (minimum) number of bytes to read from `data`
+            at a time.
+    """
+    return iter(_JSONArrayReader(data, chunk_size))
+
+
+def iter_unmarshal_array(
+    data: sob.abc.Readable | typing.IO,
+    types: (
+        type[sob.abc.Array] | collections.abc.Iterable[type[sob.abc.Array]]
+    ) = (),
+    chunk_size: int = _DECODING_CHUNK_SIZE,
+) -> collections.abc.Iterator[typing.Any]:
+    """
+    Deserialize a JSON array incrementally, yielding each item, unmarshalled
+    as one of the item types of the array type(s) provided, as soon as it
+    has been read.
+
+    Parameters:
+        data: A file-like object (such as an HTTP response) from which
+            a JSON array can be read.
+        types: One or more sub-classes of `sob.Array`. Items will be
+            unmarshalled as one of these arrays' item types. If none
+            of the array types define item types, items are unmarshalled
+            without type information.
+        chunk_size: The (minimum) number of bytes to read from `data`
+            at a time.
+    """
+    if isinstance(types, type):
+        types = (types,)
+    item_types: list[type | sob.abc.Property] = []
+    array_type: type[sob.abc.Array]
+    for array_type in types:
+        meta: sob.abc.ArrayMeta | None = sob.read_array_meta(array_type)
+        if meta and meta.item_types:
+            item_types.extend(meta.item_types)
+    item: sob.abc.JSONTypes
+    for item in iter_json_array(data, chunk_size):
+        yield sob.unmarshal(item, types=item_types)
+
+
+class RequestTemplate:
+    """
+    A request template captures everything about an operation's request
+    which does not vary between calls: the path template (pre-split into
+    segments), the HTTP method, and a pre-bound formatter for each
+    parameter (with the parameter's style and explode settings resolved in
+    advance). Generated client classes compile a request template for each
+    operation once, when the class is created, so that assembling a
+    request on each call requires only formatting the argument values.
+
+    Calling a request template with argument values (in the same order
+    as the corresponding parameters were passed to the constructor)
+    returns keyword arguments for `Client.request`.
+
+    Parameters:
+        path: The path template, for example: "/pets/{id}".
+        method: The HTTP method.
+        path_parameters: A sequence of `(name, style, explode)` tuples
+            for each path parameter.
+        query_parameters: A sequence of `(name, style, explode)` tuples
+            for each query parameter.
+        header_parameters: A sequence of `(name, style, explode)` tuples
+            for each header parameter.
+        cookie_parameters: A sequence of `(name, style, explode)` tuples
+            for each cookie parameter.
+        data_parameters: A sequence of `(name, style, explode)` tuples
+            for each form data parameter.
+        multipart: If `True`, form data will be conveyed as a
+            multipart request.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "_cookie_formatters",
+        "_data_formatters",
+        "_header_formatters",
+        "_path_segments",
+        "_query_formatters",
+        "_unknown_path_parameters",
+        "method",
+        "multipart",
+        "path",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        method: str,
+        *,
+        path_parameters: collections.abc.Sequence[tuple[str, str, bool]] = (),
+        query_parameters: collections.abc.Sequence[tuple[str, str, bool]] = (),
+        header_parameters: collections.abc.Sequence[
+            tuple[str, str, bool]
+        ] = (),
+        cookie_parameters: collections.abc.Sequence[
+            tuple[str, str, bool]
+        ] = (),
+        data_parameters: collections.abc.Sequence[tuple[str, str, bool]] = (),
+        multipart: bool = False,
+    ) -> None:
+        self.path: str = path
+        self.method: str = method
+        self.multipart: bool = multipart
+        path_formatters: dict[
+            str, tuple[int, typing.Callable[[typing.Any], typing.Any]]
+        ] = {
+            name: (index, format_)
+            for index, ((name, _style, _explode), format_) in enumerate(
+                zip(
+                    path_parameters,
+                    self._get_formatters(path_parameters),
+                    strict=True,
+                )
+            )
+        }
+        fields: tuple[tuple[str, str | None], ...] = tuple(
+            (literal, name)
+            for literal, name, _format_spec, _conversion in (
+                string.Formatter().parse(path)
+            )
+        )
+        # Placeholders in the path for which there is no path parameter
+        # (an error in the OpenAPI document) raise a `KeyError` when the
+        # path is formatted, as would `str.format`, rather than when the
+        # template is created (which, for a generated client, would
+        # prevent the client module from being imported)
+        self._unknown_path_parameters: tuple[str, ...] = tuple(
+            name
+            for _literal, name in fields
+            if name and (name not in path_formatters)
+        )
+        # Each segment is a literal string, followed by the index and
+        # formatter of the path argument (if any) to insert after it
+        self._path_segments: tuple[
+            tuple[str, int, typing.Callable[[typing.Any], typing.Any] | None],
+            ...,
+        ] = tuple(
+            (literal, *path_formatters[name])
+            if name in path_formatters
+            else (literal, -1, None)
+            for literal, name in fields
+        )
+        self._query_formatters: tuple[
+            tuple[str, typing.Callable[[typing.Any], typing.Any]], ...
+        ] = self._get_named_formatters(query_parameters)
+        self._header_formatters: tuple[
+            tuple[str, typing.Callable[[typing.Any], typing.Any]], ...
+        ] = self._get_named_formatters(header_parameters)
+        self._cookie_formatters: tuple[
+            tuple[str, typing.Callable[[typing.Any], typing.Any]], ...
+        ] = self._get_named_formatters(cookie_parameters)
+        self._data_formatters: tuple[
+            tuple[str, typing.Callable[[typing.Any], typing.Any]], ...
+        ] = self._get_named_formatters(data_parameters, multipart=multipart)
+
+    @staticmethod
+    def _get_formatters(
+        parameters: collections.abc.Sequence[tuple[str, str, bool]],
+        *,
+        multipart: bool = False,
+    ) -> tuple[typing.Callable[[typing.Any], typing.Any], ...]:
+        name: str
+        style: str
+        explode: bool
+        return tuple(
+            get_argument_formatter(
+                name, style, explode=explode, multipart=multipart
+            )
+            for name, style, explode in parameters
+        )
+
+    @classmethod
+    def _get_named_formatters(
+        cls,
+        parameters: collections.abc.Sequence[tuple[str, str, bool]],
+        *,
+        multipart: bool = False,
+    ) -> tuple[tuple[str, typing.Callable[[typing.Any], typing.Any]], ...]:
+        return tuple(
+            zip(
+                (parameter[0] for parameter in parameters),
+                cls._get_formatters(parameters, multipart=multipart),
+                strict=True,
+            )
+        )
+
+    def _format_path(
+        self, arguments: collections.abc.Sequence[typing.Any]
+    ) -> str:
+        if self._unknown_path_parameters:
+            raise KeyError(self._unknown_path_parameters[0])
+        literal: str
+        index: int
+        format_: typing.Callable[[typing.Any], typing.Any] | None
+        return "".join(
+            f"{literal}{format_(arguments[index])}" if format_ else literal
+            for literal, index, format_ in self._path_segments
+        )
+
+    def __call__(
+        self,
+        path: collections.abc.Sequence[typing.Any] = (),
+        query: collections.abc.Sequence[typing.Any] = (),
+        headers: collections.abc.Sequence[typing.Any] = (),
+        cookies: collections.abc.Sequence[typing.Any] = (),
+        data: collections.abc.Sequence[typing.Any] = (),
+    ) -> dict[str, typing.Any]:
+        """
+        Get keyword arguments for `Client.request`.
+
+        Parameters:
+            path: Path parameter argument values.
+            query: Query parameter argument values.
+            headers: Header parameter argument values.
+            cookies: Cookie parameter argument values.
+            data: Form data parameter argument values.
+        """
+        name: str
+        format_: typing.Callable[[typing.Any], typing.Any]
+        value: typing.Any
+        request_kwargs: dict[str, typing.Any] = {
+            "path": self._format_path(path) if path else self.path,
+            "method": self.method,
+        }
+        if self._query_formatters:
+            # The query string is encoded here so that `Client.request`
+            # can use it as-is
+            request_kwargs["query"] = urlencode(
+                _remove_none(
+                    tuple(
+                        (name, format_(value))
+                        for (name, format_), value in zip(
+                            self._query_formatters, query, strict=True
+                        )
+                    )
+                )
+            )
+        if self._header_formatters or self._cookie_formatters:
+            request_headers: dict[str, typing.Any] = {
+                name: format_(value)
+                for (name, format_), value in zip(
+                    self._header_formatters, headers, strict=True
+                )
+            }
+            if self._cookie_formatters:
+                request_headers["Cookie"] = "; ".join(
+                    urlencode({name: format_(value)})
+                    for (name, format_), value in zip(
+                        self._cookie_formatters, cookies, strict=True
+                    )
+                )
+            request_kwargs["headers"] = request_headers
+        if self._data_formatters:
+            request_kwargs["data"] = {
+                name: format_(value)
+                for (name, format_), value in zip(
+                    self._data_formatters, data, strict=True
+                )
+            }
+        if self.multipart:
+            request_kwargs["multipart"] = True
+        return request_kwargs
+
+
+def get_response_types(
+    response: sob.abc.Readable,
+    status_types: collections.abc.Mapping[
+        int, tuple[type[sob.abc.Model] | sob.abc.Property, ...]
+    ],
+    default_types: tuple[type[sob.abc.Model] | sob.abc.Property, ...],
+) -> tuple[type[sob.abc.Model] | sob.abc.Property, ...]:
+    """
+    Get the types into which a response should be unmarshalled, based
+    on the response's HTTP status code. This allows a response to be
+    unmarshalled against the type(s) documented for its specific status
+    code, rather than probing all types documented for an operation.
+
+    Parameters:
+        response: An HTTP response.
+        status_types: A mapping of HTTP status codes to the type(s)
+            documented for responses with that status code.
+        default_types: The type(s) to use for status codes not found in
+            `status_types` (such as those documented by a range, like "2XX").
+    """
+    return status_types.get(getattr(response, "status", 0), default_types)
+
+
 class Client:
     """
     A base class for OpenAPI clients.
     """
 
     __slots__: tuple[str, ...] = (
+        "__connection_pool",
+        "__oauth2_token_manager",
         "__opener",
+        "__retry_policy",
+        "__thread_pool",
+        "__thread_pool_size",
         "_cookie_jar",
         "_oauth2_authorization_expires",
         "api_key",
         "api_key_in",
         "api_key_name",
         "bearer_token",
+        "cache",
+        "circuit_breaker",
+        "compression_policy",
+        "connection_pool_lifetime",
+        "connection_pool_size",
+        "dns_cache",
         "echo",
+        "event_hook",
         "headers",
+        "json_codec",
         "logger",
+        "metrics",
         "oauth2_authorization_url",
         "oauth2_client_id",
         "oauth2_client_secret",
         "oauth2_flows",
         "oauth2_password",
+        "oauth2_refresh_skew",
         "oauth2_refresh_url",
         "oauth2_scope",
+        "oauth2_token_store",
         "oauth2_token_url",
         "oauth2_username",
         "open_id_connect_url",
         "password",
+        "rate_limiter",
         "retry_for_errors",
         "retry_hook",
         "retry_number_of_attempts",
+        "retry_policy",
         "timeout",
+        "timing_hook",
         "url",
         "user",
         "verify_ssl_certificate",
@@ -1138,6 +2573,8 @@ class Client:
         oauth2_token_url: str | None = None,
         oauth2_scope: str | tuple[str, ...] | None = None,
         oauth2_refresh_url: str | None = None,
+        oauth2_refresh_skew: float = 60,
+        oauth2_token_store: OAuth2TokenStore | None = None,
         oauth2_flows: (
             tuple[
                 typing.Literal[
@@ -1161,7 +2598,7 @@ class Client:
             ("Accept", "application/json"),
             ("Content-type", "application/json"),
         ),
-        timeout: int = 0,
+        timeout: float | Timeout = 0,
         retry_number_of_attempts: int = 1,
         retry_for_errors: tuple[
             type[Exception], ...
@@ -1169,9 +2606,23 @@ class Client:
         retry_hook: typing.Callable[  # Force line-break retention
             [Exception], bool
         ] = default_retry_hook,
+        retry_policy: RetryPolicy | None = None,
         verify_ssl_certificate: bool = True,
         logger: Logger | None = None,
         echo: bool = False,
+        event_hook: (
+            typing.Callable[[RequestEvent | ResponseEvent], None] | None
+        ) = None,
+        connection_pool_size: int = 10,
+        connection_pool_lifetime: int = 300,
+        cache: Cache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        compression_policy: CompressionPolicy | None = None,
+        json_codec: JSONCodec | str = "json",
+        metrics: Metrics | None = None,
+        timing_hook: typing.Callable[[RequestTiming], None] | None = None,
+        dns_cache: DNSCache | None = None,
     ) -> None:
         """
         Parameters:
@@ -1198,6 +2649,17 @@ class Client:
                 [OAuth2 scopes](https://oauth.net/2/scope/)
             oauth2_refresh_url: The URL to be used for obtaining refresh
                 tokens for OAuth2 authentication.
+            oauth2_refresh_skew: The number of seconds before an OAuth2
+                token expires at which it is refreshed. Tokens are refreshed
+                in a background thread, using a refresh token (if one was
+                issued), so that requests are not delayed.
+            oauth2_token_store: An `oapi.client.OAuth2TokenStore`, such as
+                a `oapi.client.FileOAuth2TokenStore`, through which OAuth2
+                tokens (and OpenID Connect configurations) are shared with
+                other clients, including those in other processes. Tokens
+                are stored by token URL, client ID, scope and username, so
+                that one token is obtained (and re-used) for all clients
+                with the same credentials.
             oauth2_flows: A tuple containing one or more of the
                 following: "authorizationCode", "implicit", "password" and/or
                 "clientCredentials".
@@ -1210,8 +2672,9 @@ class Client:
                 where applicable, as will dynamically modified headers such as
                 content-length, authorization, cookie, etc.
             timeout: The number of seconds before a request will timeout
-                and throw an error. If this is 0 (the default), the system
-                default timeout will be used.
+                and throw an error, or an `oapi.client.Timeout` setting
+                separate connect, read and total timeouts. If this is 0 (the
+                default), the system default timeout will be used.
             retry_number_of_attempts: The number of times to retry
                 a request which results in an error.
             retry_for_errors: A tuple of one or more exception types
@@ -1222,6 +2685,10 @@ class Client:
                 request (if retries have not been exhausted). This hook applies
                 *only* for exceptions which are a sub-class of an exception
                 included in `retry_for_errors`.
+            retry_policy: An `oapi.client.RetryPolicy` determining
+                which failed requests are retried, and the delay before each
+                retry. If provided, this supersedes `retry_number_of_attempts`,
+                `retry_for_errors` and `retry_hook`.
             verify_ssl_certificate: If `True`, SSL certificates
                 are verified, per usual. If `False`, SSL certificates are *not*
                 verified.
@@ -1229,6 +2696,65 @@ class Client:
                 A `logging.Logger` to which requests should be logged.
             echo: If `True`, requests/responses are printed as
                 they occur.
+            event_hook: A function to which an
+                `oapi.client.RequestEvent` is passed before each request is
+                sent, and an `oapi.client.ResponseEvent` each time a response
+                is read. Requests and responses are only rendered as text
+                (for `echo`, `logger` or an `event_hook`) when needed.
+            connection_pool_size: The maximum number of idle
+                connections to keep alive, for re-use, per host. If this is
+                0, connections are not re-used, and a new connection is
+                established for every request.
+            connection_pool_lifetime: The maximum number of seconds
+                for which a connection will be re-used, measured from the time
+                the connection was established. If this is 0, connections are
+                re-used for as long as the server keeps them open.
+            cache: An `oapi.client.MemoryCache` or `oapi.client.FileCache`
+                in which to store responses to GET and HEAD requests. Stored
+                responses are served for as long as they are fresh (per their
+                "Cache-Control" or "Expires" headers), and revalidated using
+                their "ETag" or "Last-Modified" headers once stale. If this
+                is `None` (the default), responses are not cached.
+            rate_limiter: An `oapi.client.RateLimiter` by which to pace
+                requests, so that they are delayed before the server would
+                reject them with an HTTP 429 (TOO MANY REQUESTS) response. A
+                rate limiter may be shared by any number of clients.
+            circuit_breaker: An `oapi.client.CircuitBreaker` which,
+                while requests to a host are failing, refuses further requests
+                to that host (raising an `oapi.errors.OAPICircuitOpenError`)
+                rather than sending them. A circuit breaker may be shared by
+                any number of clients.
+            compression_policy: An `oapi.client.CompressionPolicy` by which
+                request bodies at or above a size threshold are compressed
+                (as they are sent) and sent with a "Content-Encoding" header.
+                Request bodies for which a "Content-Encoding" header has
+                already been set, and multipart request bodies, are not
+                compressed.
+            json_codec: The `oapi.client.JSONCodec` (or the name of a codec:
+                "orjson", "msgspec", "ujson", "json" or "auto") with which
+                to encode request bodies and decode responses. If this is
+                "json" (the default), the standard library is used. If this
+                is "auto", the fastest installed JSON library is used.
+            metrics: An `oapi.client.Metrics` hook (such as an
+                `oapi.client.MetricsAggregator`) to which request counts,
+                retries, bytes sent and received, and the latency of each
+                phase of a request are reported, by operation. If this is
+                `None` (the default), no metrics are recorded.
+            timing_hook: A function to which an `oapi.client.RequestTiming`
+                is passed for each request, once its response has been
+                read, breaking down the time spent resolving the host,
+                connecting, performing the TLS handshake, sending the
+                request, waiting for and downloading the response,
+                decompressing it, and unmarshalling it. If this is `None`
+                (the default), no timing is recorded.
+            dns_cache: An `oapi.client.DNSCache` with which to resolve host
+                names when establishing new connections, caching each
+                resolution for its time-to-live, and resolving any host
+                names pinned to specific IP addresses (such as a local
+                stand-in for a service, in tests) to those addresses. A DNS
+                cache may be shared by any number of clients. If this is
+                `None` (the default), host names are resolved for every new
+                connection.
         """
         message: str
         # Ensure the API key location is valid
@@ -1297,6 +2823,8 @@ class Client:
         self.oauth2_token_url: str | None = oauth2_token_url
         self.oauth2_scope: str | tuple[str, ...] | None = oauth2_scope
         self.oauth2_refresh_url: str | None = oauth2_refresh_url
+        self.oauth2_refresh_skew: float = oauth2_refresh_skew
+        self.oauth2_token_store: OAuth2TokenStore | None = oauth2_token_store
         self.oauth2_flows: (
             typing.Literal[
                 "authorizationCode",
@@ -1308,31 +2836,236 @@ class Client:
         ) = oauth2_flows  # type: ignore
         self.open_id_connect_url: str | None = open_id_connect_url
         self.headers: dict[str, str] = dict(headers)
-        self.timeout: int = timeout
+        self.timeout: float | Timeout = timeout
         self.retry_number_of_attempts: int = retry_number_of_attempts
         self.retry_for_errors: tuple[type[Exception], ...] = retry_for_errors
         self.retry_hook: typing.Callable[[Exception], bool] = retry_hook
+        self.retry_policy: RetryPolicy | None = retry_policy
         self.verify_ssl_certificate: bool = verify_ssl_certificate
         self.logger: Logger | None = logger
         self.echo: bool = echo
+        self.event_hook: (
+            typing.Callable[[RequestEvent | ResponseEvent], None] | None
+        ) = event_hook
+        self.connection_pool_size: int = connection_pool_size
+        self.connection_pool_lifetime: int = connection_pool_lifetime
+        self.cache: Cache | None = cache
+        self.rate_limiter: RateLimiter | None = rate_limiter
+        self.circuit_breaker: CircuitBreaker | None = circuit_breaker
+        self.compression_policy: CompressionPolicy | None = compression_policy
+        self.json_codec: JSONCodec = (
+            json_codec
+            if isinstance(json_codec, JSONCodec)
+            else get_json_codec(json_codec)
+        )
+        self.metrics: Metrics | None = metrics
+        self.timing_hook: typing.Callable[[RequestTiming], None] | None = (
+            timing_hook
+        )
+        self.dns_cache: DNSCache | None = dns_cache
         # Support for persisting cookies
         self._cookie_jar: CookieJar = CookieJar()
         self.__opener: OpenerDirector | None = None
+        self.__connection_pool: ConnectionPool | None = None
+        self.__retry_policy: RetryPolicy | None = None
+        self.__thread_pool: ThreadPoolExecutor | None = None
+        self.__thread_pool_size: int = 0
+        self.__oauth2_token_manager: OAuth2TokenManager = OAuth2TokenManager(
+            self._request_oauth2_token,
+            self._refresh_oauth2_token,
+            skew=oauth2_refresh_skew,
+            store=oauth2_token_store,
+        )
         self._oauth2_authorization_expires: int = 0
 
     @property
     def _opener(self) -> OpenerDirector:
         if self.__opener is None:
-            self.__opener = build_opener(
-                HTTPSHandler(
-                    context=SSLContext(
-                        check_hostname=self.verify_ssl_certificate
-                    )
-                ),
-                HTTPCookieProcessor(self._cookie_jar),
+            ssl_context: SSLContext = get_ssl_context(
+                self.verify_ssl_certificate
             )
+            if self.connection_pool_size:
+                self.__connection_pool = ConnectionPool(
+                    size=self.connection_pool_size,
+                    lifetime=self.connection_pool_lifetime,
+                )
+                self.__opener = build_opener(
+                    KeepAliveHTTPHandler(
+                        self.__connection_pool, dns_cache=self.dns_cache
+                    ),
+                    KeepAliveHTTPSHandler(
+                        self.__connection_pool,
+                        context=ssl_context,
+                        dns_cache=self.dns_cache,
+                    ),
+                    HTTPCookieProcessor(self._cookie_jar),
+                )
+            else:
+                self.__opener = build_opener(
+                    TimedHTTPHandler(dns_cache=self.dns_cache),
+                    TimedHTTPSHandler(
+                        context=ssl_context, dns_cache=self.dns_cache
+                    ),
+                    HTTPCookieProcessor(self._cookie_jar),
+                )
         return self.__opener
 
+    @property
+    def _retry_policy(self) -> RetryPolicy:
+        """
+        The retry policy to use, which is either `retry_policy` or (when
+        that is `None`) a policy derived from `retry_number_of_attempts`,
+        `retry_for_errors` and `retry_hook`.
+        """
+        if self.retry_policy is not None:
+            return self.retry_policy
+        if (self.__retry_policy is None) or (
+            (
+                self.__retry_policy.number_of_attempts,
+                self.__retry_policy.errors,
+                self.__retry_policy.retry_hook,
+            )
+            != (
+                self.retry_number_of_attempts,
+                self.retry_for_errors,
+                self.retry_hook,
+            )
+        ):
+            self.__retry_policy = RetryPolicy(
+                number_of_attempts=self.retry_number_of_attempts,
+                errors=self.retry_for_errors,
+                retry_hook=self.retry_hook,
+            )
+        return self.__retry_policy
+
+    def _get_thread_pool(self, max_workers: int) -> ThreadPoolExecutor:
+        """
+        Get the thread pool shared by calls to `map`, replacing it with a
+        larger pool if it has fewer than `max_workers` workers (calls
+        already submitted to the replaced pool are completed).
+        """
+        if (self.__thread_pool is None) or (
+            self.__thread_pool_size < max_workers
+        ):
+            if self.__thread_pool is not None:
+                self.__thread_pool.shutdown(wait=False)
+            self.__thread_pool = ThreadPoolExecutor(
+                max_workers, thread_name_prefix=type(self).__name__
+            )
+            self.__thread_pool_size = max_workers
+        return self.__thread_pool
+
+    def close(self) -> None:
+        """
+        Close any idle connections being kept alive for re-use, and shut
+        down the thread pool used by `map` (once pending calls complete).
+        The client remains usable: subsequent requests will establish new
+        connections, and calls to `map` (including any in progress) will
+        start a new thread pool.
+        """
+        if self.__connection_pool is not None:
+            self.__connection_pool.clear()
+        if self.__thread_pool is not None:
+            self.__thread_pool.shutdown(wait=False)
+            self.__thread_pool = None
+
+    def map(
+        self,
+        method: str | typing.Callable[..., typing.Any],
+        kwargs: collections.abc.Iterable[
+            collections.abc.Mapping[str, typing.Any]
+        ],
+        /,
+        concurrency: int | None = None,
+        *,
+        ordered: bool = True,
+        return_exceptions: bool = False,
+    ) -> collections.abc.Iterator[typing.Any]:
+        """
+        Call a client method once for each of the given sets of keyword
+        arguments, concurrently (in a thread pool shared by all calls to
+        this method), yielding each result as soon as it is available. For
+        example:
+
+        ```python
+        kwargs = ({"pet_id": pet_id} for pet_id in pet_ids)
+        for pet in client.map("get_pet", kwargs):
+            ...
+        ```
+
+        Argument sets are read lazily, so no more than `concurrency` calls
+        are pending at once. Each call is subject to this client's retry
+        policy, rate limiter and circuit breaker, as any other call would
+        be.
+
+        Parameters:
+            method: The name of a client method, or a function which
+                accepts the client as its first argument.
+            kwargs: An iterable of keyword argument mappings, one for
+                each call.
+            concurrency: The maximum number of concurrent calls. This
+                defaults to `connection_pool_size` (the number of
+                connections kept alive per host), or 10. The shared
+                thread pool is enlarged, if needed, to have at least this
+                many threads.
+            ordered: If `True` (the default), results are yielded in the
+                order of their argument sets. If `False`, results are
+                yielded in the order in which calls complete.
+            return_exceptions: If `True`, errors raised by calls are
+                yielded in place of their results. If `False` (the
+                default), the first error is raised, and calls which have
+                not started are cancelled.
+        """
+        # Build the opener before calls are made from other threads
+        self._opener  # noqa: B018
+        concurrency = concurrency or self.connection_pool_size or 10
+        return iter_map(
+            functools.partial(self._get_thread_pool, concurrency),
+            functools.partial(call_method, self, method),
+            kwargs,
+            concurrency,
+            ordered=ordered,
+            return_exceptions=return_exceptions,
+        )
+
+    def process_pool(
+        self,
+        max_workers: int | None = None,
+        *,
+        mp_context: multiprocessing.context.BaseContext | None = None,
+        initializer: typing.Callable[..., object] | None = None,
+        initargs: tuple[typing.Any, ...] = (),
+    ) -> ClientProcessPoolExecutor:
+        """
+        Get an executor which calls methods of this client (or functions
+        accepting this client as their first argument) in a pool of worker
+        processes. This client is pickled once, and unpickled once in each
+        worker process (where connections are established anew), so each
+        call conveys only its arguments and result. For example:
+
+        ```python
+        with client.process_pool() as pool:
+            for pets in pool.map("get_pets", range(1, 100)):
+                ...
+        ```
+
+        Parameters:
+            max_workers: The maximum number of worker processes. If not
+                provided, this defaults to the number of processors.
+            mp_context: A multiprocessing context with which to start
+                worker processes.
+            initializer: A function to call in each worker process once
+                the client has been unpickled.
+            initargs: Arguments to pass to the `initializer`.
+        """
+        return ClientProcessPoolExecutor(
+            self,
+            max_workers,
+            mp_context=mp_context,
+            initializer=initializer,
+            initargs=initargs,
+        )
+
     @classmethod
     def _resurrect_client(cls, *args: typing.Any) -> Client:
         """
@@ -1366,7 +3099,9 @@ class Client:
         return {
             slot: getattr(self, slot)
             for slot in filter(
-                lambda slot: slot != "__opener",
+                # Private (name-mangled) slots hold connections, etc.,
+                # which are re-created as needed
+                lambda slot: not slot.startswith("__"),
                 # Get all inherited slots
                 chain.from_iterable(
                     getattr(cls, "__slots__", ()) for cls in type(self).__mro__
@@ -1377,25 +3112,7 @@ class Client:
     def __setstate__(self, state: dict[str, typing.Any]) -> None:
         # Unpickle an instance of `oapi.client.Client` from a state dictionary
         # Determine which state keys are parameters for the `__init__` method
-        parameters: collections.abc.Iterable[tuple[str, inspect.Parameter]] = (
-            inspect.signature(
-                self.__init__  # type: ignore
-            ).parameters.items()
-        )
-        item: tuple[str, inspect.Parameter]
-        parameter_names: set[str] = set(
-            map(
-                _get_first,
-                filter(
-                    lambda item: item[1].kind
-                    not in (
-                        inspect.Parameter.VAR_POSITIONAL,
-                        inspect.Parameter.POSITIONAL_ONLY,
-                    ),
-                    parameters,
-                ),
-            )
-        )
+        parameter_names: frozenset[str] = _get_init_parameter_names(type(self))
         state_keys: set[str] = set(state.keys())
         kwargs: dict[str, typing.Any] = {}
         key: str
@@ -1454,7 +3171,9 @@ class Client:
                 tuple[str, collections.abc.MutableMapping[str, str]]
             ]
         ) = (),
-        timeout: int = 0,
+        timeout: float | Timeout = 0,
+        operation: str = "",
+        deadline: float = 0,
     ) -> sob.abc.Readable:
         """
         Construct and submit an HTTP request and return the response
@@ -1473,51 +3192,23 @@ class Client:
                 query string.
             headers:
             multipart_data_headers:
-            timeout:
+            timeout: The number of seconds before a request will timeout,
+                or an `oapi.client.Timeout`, overriding the client's
+                `timeout`.
+            operation: The operation ID (or name of the client method) by
+                which `metrics` are labelled.
+            deadline: The maximum number of seconds to spend on this call,
+                including retries. If this is 0 (the default), the call is
+                only limited by an enclosing `oapi.client.Deadline` context
+                (if any).
         """
         # For backwards compatibility...
         if isinstance(data, (str, bytes, sob.abc.Model)) or (data is None):
             json = data
             data = ()
-        request: typing.Callable[
-            [
-                str,
-                str,
-                str | bytes | sob.abc.Model | None,
-                collections.abc.Mapping[str, sob.abc.MarshallableTypes]
-                | collections.abc.Sequence[
-                    tuple[str, sob.abc.MarshallableTypes]
-                ],
-                collections.abc.Mapping[str, sob.abc.MarshallableTypes]
-                | collections.abc.Sequence[
-                    tuple[str, sob.abc.MarshallableTypes]
-                ]
-                | str,
-                collections.abc.Mapping[str, sob.abc.MarshallableTypes]
-                | collections.abc.Sequence[
-                    tuple[str, sob.abc.MarshallableTypes]
-                ],
-                bool,
-                collections.abc.Mapping[
-                    str, collections.abc.MutableMapping[str, str]
-                ]
-                | collections.abc.Sequence[
-                    tuple[str, collections.abc.MutableMapping[str, str]]
-                ],
-                int,
-            ],
-            sob.abc.Readable,
-        ] = self._request
-        # Wrap the _request method with a retry decorator if more
-        # than one attempt is specified in the config
-        if self.retry_number_of_attempts > 1:
-            request = retry(
-                errors=self.retry_for_errors,
-                number_of_attempts=self.retry_number_of_attempts,
-                retry_hook=self.retry_hook,
-                logger=self.logger,
-            )(self._request)
-        return request(
+        expiry: float | None = get_deadline_expiry(deadline)
+        function: typing.Callable[[], sob.abc.Readable] = functools.partial(
+            self._request,
             path,
             method,
             json,
@@ -1527,17 +3218,460 @@ class Client:
             multipart,
             multipart_data_headers,
             timeout,
+            operation,
+            expiry,
+        )
+        if self.metrics is None:
+            return self._retry_policy.call(
+                function, logger=self.logger, expiry=expiry
+            )
+        counted_function: _CountedCall = _CountedCall(function)
+        started: float = time.perf_counter()
+        status: int = 0
+        try:
+            response: sob.abc.Readable = self._retry_policy.call(
+                counted_function, logger=self.logger, expiry=expiry
+            )
+            status = getattr(response, "status", None) or 200
+        except HTTPError as error:
+            status = error.code
+            raise
+        finally:
+            self._record_request_metrics(
+                operation, method, started, counted_function.count, status
+            )
+        return response
+
+    def _read_page(
+        self,
+        pagination: Pagination,
+        path: str,
+        kwargs: dict[str, typing.Any],
+        response: sob.abc.Readable,
+    ) -> tuple[typing.Any, tuple[str, dict[str, typing.Any]] | None]:
+        """
+        Read a page, returning its deserialized JSON, and the path (or URL)
+        and keyword arguments with which to request the next page (or
+        `None`, if this is the last page).
+        """
+        with response:
+            data: typing.Any = self.json_codec.deserialize(response)
+        return data, pagination.get_next_request(
+            path,
+            getattr(response, "url", None) or f"{self.url or ''}{path}",
+            kwargs,
+            getattr(response, "headers", None),
+            data,
+        )
+
+    def _get_page(
+        self,
+        pagination: Pagination,
+        method: str,
+        request: tuple[str, dict[str, typing.Any]],
+    ) -> tuple[typing.Any, tuple[str, dict[str, typing.Any]] | None]:
+        path, kwargs = request
+        return self._read_page(
+            pagination, path, kwargs, self.request(path, method, **kwargs)
+        )
+
+    def _prefetch_pages(
+        self,
+        pagination: Pagination,
+        method: str,
+        request: tuple[str, dict[str, typing.Any]] | None,
+        pages: queue.Queue[tuple[typing.Any, BaseException | None] | None],
+        slots: threading.Semaphore,
+        stopped: threading.Event,
+    ) -> None:
+        """
+        Request pages, putting each in the `pages` queue (as a tuple of its
+        data and any error encountered requesting it) followed by `None`,
+        until the last page has been requested or iteration is `stopped`. A
+        slot is acquired before each page is requested, and released once
+        the page has been consumed (or when iteration stops).
+        """
+        data: typing.Any
+        try:
+            while request is not None:
+                slots.acquire()
+                if stopped.is_set():
+                    return
+                data, request = self._get_page(pagination, method, request)
+                pages.put((data, None))
+        except BaseException as error:  # noqa: BLE001
+            pages.put((None, error))
+        finally:
+            # However this thread ends, the consumer is not left waiting
+            pages.put(None)
+
+    def _iter_page_data(
+        self,
+        pagination: Pagination,
+        path: str,
+        method: str,
+        kwargs: dict[str, typing.Any],
+    ) -> collections.abc.Iterator[typing.Any]:
+        """
+        Yield the deserialized JSON of each page, requesting up to
+        `pagination.prefetch` pages ahead in a background thread.
+        """
+        request: tuple[str, dict[str, typing.Any]] | None = (path, kwargs)
+        data: typing.Any
+        if not pagination.prefetch:
+            while request is not None:
+                data, request = self._get_page(pagination, method, request)
+                yield data
+            return
+        pages: queue.Queue[tuple[typing.Any, BaseException | None] | None] = (
+            queue.Queue()
+        )
+        # One slot for the page being consumed, plus one for each page
+        # requested ahead of it
+        slots: threading.Semaphore = threading.Semaphore(
+            pagination.prefetch + 1
+        )
+        stopped: threading.Event = threading.Event()
+        # Pages are requested in a copy of the current context, so that
+        # they are subject to any enclosing `oapi.client.Deadline`
+        threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(
+                self._prefetch_pages,
+                pagination,
+                method,
+                request,
+                pages,
+                slots,
+                stopped,
+            ),
+            daemon=True,
+        ).start()
+        try:
+            page: tuple[typing.Any, BaseException | None] | None
+            while (page := pages.get()) is not None:
+                data, error = page
+                if error is not None:
+                    raise error
+                yield data
+                slots.release()
+        finally:
+            stopped.set()
+            # Wake the thread, if it is waiting for a slot, so that it ends
+            slots.release()
+
+    def iter_pages(
+        self,
+        pagination: Pagination,
+        types: tuple[type[sob.abc.Model] | sob.abc.Property, ...],
+        /,
+        path: str,
+        method: str,
+        **kwargs: typing.Any,
+    ) -> collections.abc.Iterator[typing.Any]:
+        """
+        Request each page of a paginated operation, and yield the items in
+        each page. Up to `pagination.prefetch` pages are requested ahead
+        (in a background thread) while the items of preceding pages are
+        being consumed.
+
+        Parameters:
+            pagination: An `oapi.client.Pagination` describing how pages
+                are requested, and where the items in each page are found.
+            types: The types as which to unmarshal each page.
+            path: The path (or URL) of the first page.
+            method:
+            **kwargs: Any other arguments for `oapi.client.Client.request`.
+        """
+        data: typing.Any
+        for data in self._iter_page_data(pagination, path, method, kwargs):
+            yield from pagination.get_items(
+                self._unmarshal_page(data, types, kwargs.get("operation", ""))
+            )
+
+    def _unmarshal_page(
+        self,
+        data: typing.Any,
+        types: tuple[type[sob.abc.Model] | sob.abc.Property, ...],
+        operation: str,
+    ) -> typing.Any:
+        """
+        Unmarshal a page's deserialized JSON, recording the "unmarshal" phase
+        (pages are deserialized as they are prefetched, so only unmarshalling
+        is recorded).
+        """
+        started: float = time.perf_counter()
+        page: typing.Any = sob.unmarshal(data, types=types)
+        self._observe_phase(operation, "unmarshal", started)
+        return page
+
+    def _is_echoed_or_logged(self) -> bool:
+        """
+        Determine whether requests/responses are to be printed or logged
+        (and therefore need to be rendered as text).
+        """
+        return self.echo or (
+            self.logger is not None and self.logger.isEnabledFor(INFO)
         )
 
     def _request_callback(self, request: Request) -> None:
+        echoed_or_logged: bool = self._is_echoed_or_logged()
+        if not (echoed_or_logged or self.event_hook):
+            return
         curl_options: str = "-i"
         if request.headers.get("Content-encoding", None):
             curl_options = f"{curl_options} --compressed"
         if not self.verify_ssl_certificate:
             curl_options = f"{curl_options} -k"
-        self._get_request_response_callback()(
-            get_request_curl(request, options=curl_options)
+        event: RequestEvent = RequestEvent(request, curl_options)
+        if self.event_hook is not None:
+            self.event_hook(event)
+        if echoed_or_logged:
+            self._get_request_response_callback()(event.curl)
+
+    def _get_response_read_hook(
+        self,
+    ) -> typing.Callable[[HTTPResponse, bytes], None] | None:
+        """
+        Get a hook to pass to `_set_response_read_hook`, or `None` if
+        responses are not to be echoed, logged, or passed to an
+        `event_hook`.
+        """
+        echoed_or_logged: bool = self._is_echoed_or_logged()
+        if not (echoed_or_logged or self.event_hook):
+            return None
+        event_hook: (
+            typing.Callable[[RequestEvent | ResponseEvent], None] | None
+        ) = self.event_hook
+        callback: typing.Callable[[str], None] | None = (
+            self._get_request_response_callback() if echoed_or_logged else None
+        )
+
+        def hook(response: HTTPResponse, data: bytes) -> None:
+            event: ResponseEvent = ResponseEvent(response, data)
+            if event_hook is not None:
+                event_hook(event)
+            if callback is not None:
+                callback(event.text)
+
+        return hook
+
+    def _get_response_finished_hook(
+        self, operation: str, timing: RequestTiming | None = None
+    ) -> typing.Callable[[HTTPResponse, int, int], None] | None:
+        """
+        Get a hook to pass to `_set_response_read_hook` (as `finished`),
+        which records the "receive" phase and the bytes received (if
+        `metrics` are recorded) and completes the `timing` record (if
+        there is one), or `None` if neither are needed.
+        """
+        metrics: Metrics | None = self.metrics
+        if metrics is None and timing is None:
+            return None
+        started: float = time.perf_counter()
+
+        def finished(
+            response: HTTPResponse,
+            size: int,
+            decoded_size: int,
+        ) -> None:
+            elapsed: float = time.perf_counter() - started
+            if metrics is not None:
+                metrics.observe(
+                    "phase_duration_seconds",
+                    operation,
+                    elapsed,
+                    phase="receive",
+                )
+                metrics.increment(
+                    "response_bytes_total",
+                    operation,
+                    decoded_size,
+                    encoding="identity",
+                )
+                metrics.increment(
+                    "response_bytes_total",
+                    operation,
+                    size,
+                    encoding="encoded",
+                )
+            if timing is not None:
+                timing.download += elapsed - timing.decompression
+                # If the response is being unmarshalled, the timing record
+                # is passed to the hook once that is done
+                unmarshalling: bool = (
+                    getattr(response, "timing", None) is not timing
+                )
+                if not unmarshalling:
+                    self._finish_timing(timing)
+
+        return finished
+
+    def _set_response_hooks(
+        self,
+        response: HTTPResponse,
+        operation: str = "",
+        timing: RequestTiming | None = None,
+        expiry: float | None = None,
+    ) -> None:
+        _set_response_read_hook(
+            response,
+            self._get_response_read_hook(),
+            self._get_response_finished_hook(operation, timing),
+            timing,
+            expiry,
+        )
+        if timing is not None:
+            timing.status = getattr(response, "status", None) or 200
+            response.timing = timing  # type: ignore[attr-defined]
+
+    def _start_timing(
+        self, request: Request, operation: str, started: float
+    ) -> RequestTiming | None:
+        """
+        Create a timing record for an (assembled) request, if the client
+        has a `timing_hook`, and attach it to the request (so that the
+        transport can record the time spent in each phase of the exchange).
+        """
+        if self.timing_hook is None:
+            return None
+        timing: RequestTiming = RequestTiming(
+            request.get_method(), request.full_url, operation
+        )
+        timing.assembly = time.perf_counter() - started
+        request.timing = timing  # type: ignore[attr-defined]
+        return timing
+
+    def _finish_timing(self, timing: RequestTiming) -> None:
+        if self.timing_hook is not None:
+            self.timing_hook(timing)
+
+    def _finish_failed_timing(
+        self, timing: RequestTiming, error: Exception
+    ) -> None:
+        timing.error = error
+        if isinstance(error, HTTPError):
+            timing.status = error.code
+        self._finish_timing(timing)
+
+    def _observe_phase(
+        self, operation: str, phase: str, started: float
+    ) -> None:
+        """
+        Record the time elapsed since `started` (per `time.perf_counter`)
+        for a phase of a request, if `metrics` are recorded.
+        """
+        if self.metrics is not None:
+            self.metrics.observe(
+                "phase_duration_seconds",
+                operation,
+                time.perf_counter() - started,
+                phase=phase,
+            )
+
+    def _record_request_sent(
+        self,
+        operation: str,
+        request: Request,
+        started: float,
+        error: Exception | None = None,
+    ) -> None:
+        """
+        Record the "network" phase of a request, and (if a response was
+        received) the bytes sent, if `metrics` are recorded.
+        """
+        if self.metrics is None:
+            return
+        self._observe_phase(operation, "network", started)
+        if error is not None and not isinstance(error, HTTPError):
+            return
+        sizes: tuple[int, int] | None = _get_request_body_sizes(request)
+        if sizes is not None:
+            self.metrics.increment(
+                "request_bytes_total",
+                operation,
+                sizes[0],
+                encoding="identity",
+            )
+            self.metrics.increment(
+                "request_bytes_total", operation, sizes[1], encoding="encoded"
+            )
+
+    def _record_request_metrics(
+        self,
+        operation: str,
+        method: str,
+        started: float,
+        number_of_attempts: int,
+        status: int,
+    ) -> None:
+        """
+        Record the outcome, number of retries, and duration of a request
+        (including any retries).
+        """
+        if self.metrics is None:
+            return
+        method = method.upper()
+        self.metrics.increment(
+            "requests_total",
+            operation,
+            method=method,
+            status_class=get_status_class(status),
+        )
+        if number_of_attempts > 1:
+            self.metrics.increment(
+                "retries_total",
+                operation,
+                number_of_attempts - 1,
+                method=method,
+            )
+        self.metrics.observe(
+            "request_duration_seconds",
+            operation,
+            time.perf_counter() - started,
+            method=method,
+        )
+
+    def unmarshal_response(
+        self,
+        response: sob.abc.Readable,
+        types: tuple[type[sob.abc.Model] | sob.abc.Property, ...] = (),
+        coerce_unparseable: type[str | bytes] | None = None,
+        operation: str = "",
+    ) -> typing.Any:
+        """
+        Read, deserialize (using the client's `json_codec`) and unmarshal a
+        response. If `metrics` are recorded, the time taken to deserialize
+        and unmarshal the response is recorded as the "unmarshal" phase of
+        the request.
+
+        Parameters:
+            response:
+            types: The types as which to unmarshal the response.
+            coerce_unparseable: If the response is not valid JSON, and this
+                is `str` or `bytes`, the response is returned as that type
+                rather than raising an error.
+            operation: The operation ID (or name of the client method) by
+                which `metrics` are labelled.
+        """
+        timing: RequestTiming | None = getattr(response, "timing", None)
+        if timing is not None:
+            # Defer passing the timing record to the `timing_hook` until
+            # the response has been unmarshalled
+            response.timing = None  # type: ignore[attr-defined]
+        data: str | bytes = response.read()
+        started: float = time.perf_counter()
+        value: typing.Any = sob.unmarshal(
+            self.json_codec.deserialize(
+                data, coerce_unparseable=coerce_unparseable
+            ),
+            types=types,
         )
+        self._observe_phase(operation, "unmarshal", started)
+        if timing is not None:
+            timing.unmarshal = time.perf_counter() - started
+            self._finish_timing(timing)
+        return value
 
     def _request_oauth2_password_authorization(
         self,
@@ -1573,7 +3707,7 @@ class Client:
         try:
             return self._opener.open(  # type: ignore
                 request,
-                timeout=self.timeout
+                timeout=get_timeout(self.timeout).read
                 or inspect.signature(OpenerDirector.open)
                 .parameters["timeout"]
                 .default,
@@ -1606,15 +3740,26 @@ class Client:
                         self.open_id_connect_url,
                     )
                 )
-                oidc_configuration: dict[str, typing.Any] = json.load(
-                    urlopen(  # noqa: S310
+                oidc_configuration: dict[str, typing.Any] | None = (
+                    self.oauth2_token_store.get_document(url)
+                    if self.oauth2_token_store is not None
+                    else None
+                )
+                if oidc_configuration is None:
+                    with urlopen(  # noqa: S310
                         url,
-                        timeout=self.timeout
+                        timeout=get_timeout(self.timeout).read
                         or inspect.signature(urlopen)
                         .parameters["timeout"]
                         .default,
-                    )
-                )
+                    ) as response:
+                        oidc_configuration = self.json_codec.loads(
+                            response.read()
+                        )
+                    if self.oauth2_token_store is not None:
+                        self.oauth2_token_store.set_document(
+                            url, oidc_configuration
+                        )
             except URLError as error:
                 sob.errors.append_exception_text(
                     error,
@@ -1666,7 +3811,7 @@ class Client:
         try:
             return self._opener.open(  # type: ignore
                 request,
-                timeout=self.timeout
+                timeout=get_timeout(self.timeout).read
                 or inspect.signature(OpenerDirector.open)
                 .parameters["timeout"]
                 .default,
@@ -1680,45 +3825,118 @@ class Client:
                 return self._request_oauth2_client_credentials_authorization()
             raise
 
-    def _get_oauth2_client_credentials_authorization(self) -> str:
-        if self._oauth2_authorization_expires < int(time.time()) or (
-            "Authorization" not in self.headers
-        ):
-            # If our authorization has expired, get a new token
-            with (
+    def _request_oauth2_refresh_token_authorization(
+        self, refresh_token: str
+    ) -> sob.abc.Readable:
+        message: str
+        token_url: str | None = self.oauth2_refresh_url or (
+            self._get_oauth2_token_url()
+        )
+        if token_url is None:
+            message = "No OAuth2 refresh or token URL was provided."
+            raise RuntimeError(message)
+        token_url = urljoin(self.url or "", token_url)
+        data_dict: dict[str, str | tuple[str, ...] | None] = {
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+            "client_id": self.oauth2_client_id,
+        }
+        if self.oauth2_client_secret is not None:
+            data_dict.update(client_secret=self.oauth2_client_secret)
+        if self.oauth2_scope is not None:
+            data_dict.update(scope=self.oauth2_scope)
+        request: Request = Request(
+            token_url,
+            headers={"Host": urlparse(token_url).netloc},
+            method="POST",
+            data=bytes(
+                urlencode(data_dict),
+                encoding="ascii",
+            ),
+        )
+        self._request_callback(request)
+        return self._opener.open(  # type: ignore
+            request,
+            timeout=get_timeout(self.timeout).read
+            or inspect.signature(OpenerDirector.open)
+            .parameters["timeout"]
+            .default,
+        )
+
+    def _read_oauth2_token(
+        self, response: sob.abc.Readable, refresh_token: str | None = None
+    ) -> OAuth2Token:
+        with response:
+            data: bytes | str = response.read()
+        return OAuth2Token.from_response_data(
+            self.json_codec.loads(data),
+            refresh_token=refresh_token,
+        )
+
+    def _request_oauth2_token(self) -> OAuth2Token:
+        """
+        Obtain a new OAuth2 token, using the client credentials flow if a
+        client secret was provided, otherwise the password flow.
+        """
+        if self.oauth2_client_id and self.oauth2_client_secret:
+            return self._read_oauth2_token(
                 self._request_oauth2_client_credentials_authorization()
-            ) as response:
-                data: bytes | str = response.read()
-                response_data: dict[str, str] = json.loads(
-                    data.decode("utf-8") if isinstance(data, bytes) else data
-                )
-                self._oauth2_authorization_expires = (
-                    int(time.time()) + int(response_data["expires_in"]) - 1
-                )
-                self.headers["Authorization"] = (
-                    f"{response_data['token_type']} "
-                    f"{response_data['access_token']}"
-                )
-        return self.headers["Authorization"]
+            )
+        return self._read_oauth2_token(
+            self._request_oauth2_password_authorization()
+        )
 
-    def _get_oauth2_password_authorization(self) -> str:
-        if self._oauth2_authorization_expires < int(time.time()) or (
-            "Authorization" not in self.headers
+    def _refresh_oauth2_token(self, token: OAuth2Token) -> OAuth2Token:
+        """
+        Obtain a new OAuth2 token using the refresh token of an existing
+        one.
+        """
+        if token.refresh_token is None:
+            raise ValueError(token)
+        return self._read_oauth2_token(
+            self._request_oauth2_refresh_token_authorization(
+                token.refresh_token
+            ),
+            refresh_token=token.refresh_token,
+        )
+
+    def _get_oauth2_authorization(self) -> str:
+        token_manager: OAuth2TokenManager = self.__oauth2_token_manager
+        token_manager.skew = self.oauth2_refresh_skew
+        token_manager.store = self.oauth2_token_store
+        if token_manager.store is not None:
+            token_manager.key = get_token_key(
+                urljoin(self.url or "", self._get_oauth2_token_url() or ""),
+                self.oauth2_client_id,
+                self.oauth2_scope,
+                None if self.oauth2_client_secret else self.oauth2_username,
+            )
+        authorization: str | None = self.headers.get("Authorization")
+        if (
+            (token_manager.token is None)
+            and authorization
+            and (self._oauth2_authorization_expires > time.time())
         ):
-            # If our authorization has expired, get a new token
-            with self._request_oauth2_password_authorization() as response:
-                data: bytes | str = response.read()
-                response_data: dict[str, str] = json.loads(
-                    data.decode("utf-8") if isinstance(data, bytes) else data
-                )
-                self._oauth2_authorization_expires = (
-                    int(time.time()) + int(response_data["expires_in"]) - 1
-                )
-                self.headers["Authorization"] = (
-                    f"{response_data['token_type']} "
-                    f"{response_data['access_token']}"
-                )
-        return self.headers["Authorization"]
+            # Re-use a token obtained before this client was pickled
+            token_type, _, access_token = authorization.partition(" ")
+            token_manager.token = OAuth2Token(
+                access_token,
+                token_type,
+                expires_at=self._oauth2_authorization_expires,
+            )
+        token: OAuth2Token = token_manager.get_token()
+        # These are retained so that the token is pickled with the client
+        self._oauth2_authorization_expires = int(
+            min(token.expires_at, sys.maxsize)
+        )
+        self.headers["Authorization"] = token.authorization
+        return token.authorization
+
+    def _get_oauth2_client_credentials_authorization(self) -> str:
+        return self._get_oauth2_authorization()
+
+    def _get_oauth2_password_authorization(self) -> str:
+        return self._get_oauth2_authorization()
 
     def _oauth2_authenticate_request(self, request: Request) -> None:
         if self.oauth2_client_id and self.oauth2_client_secret:
@@ -1807,6 +4025,17 @@ class Client:
                 raise RuntimeError(message)
             request.add_header(self.api_key_name, self.api_key)
 
+    def _uses_oauth2(self) -> bool:
+        return bool(
+            (self.oauth2_client_id and self.oauth2_client_secret)
+            or (
+                self.oauth2_client_id
+                and self.oauth2_username
+                and self.oauth2_password
+            )
+            or self.oauth2_flows
+        )
+
     def _authenticate_request(self, request: Request) -> None:
         """
         Determine the applicable authentication scheme and authenticate a
@@ -1835,36 +4064,28 @@ class Client:
         if self.api_key:
             self._api_key_authenticate_request(request)
         # OAuth2 Authentication schemes
-        if (
-            (self.oauth2_client_id and self.oauth2_client_secret)
-            or (
-                self.oauth2_client_id
-                and self.oauth2_username
-                and self.oauth2_password
-            )
-            or self.oauth2_flows
-        ):
+        if self._uses_oauth2():
             self._oauth2_authenticate_request(request)
 
-    def _request(  # noqa: C901
+    def _prepare_request(
         self,
         path: str,
         method: str,
-        json: str | bytes | sob.abc.Model | None = None,
+        json: str | bytes | sob.abc.Model | None,
         data: (
             collections.abc.Mapping[str, sob.abc.MarshallableTypes]
             | collections.abc.Sequence[tuple[str, sob.abc.MarshallableTypes]]
-        ) = (),
+        ),
         query: (
             collections.abc.Mapping[str, sob.abc.MarshallableTypes]
             | collections.abc.Sequence[tuple[str, sob.abc.MarshallableTypes]]
             | str
-        ) = (),
+        ),
         headers: (
             collections.abc.Mapping[str, sob.abc.MarshallableTypes]
             | collections.abc.Sequence[tuple[str, sob.abc.MarshallableTypes]]
-        ) = (),
-        multipart: bool = False,  # noqa: FBT001 FBT002
+        ),
+        multipart: bool,  # noqa: FBT001
         multipart_data_headers: (
             collections.abc.Mapping[
                 str, collections.abc.MutableMapping[str, str]
@@ -1872,23 +4093,25 @@ class Client:
             | collections.abc.Sequence[
                 tuple[str, collections.abc.MutableMapping[str, str]]
             ]
-        ) = (),
-        timeout: int = 0,
-    ) -> sob.abc.Readable:
+        ),
+    ) -> Request:
+        """
+        Assemble a request (prior to authentication).
+        """
         if query:
             if not isinstance(query, str):
                 query = _remove_none(query)
                 query = urlencode(query)
             if query:
                 path = f"{path}?{query}"
-        # Prepend the base URL, if the URL is relative
-        parse_result: ParseResult = urlparse(path)
-        if parse_result.scheme:
+        # Prepend the base URL, if the URL is relative (an absolute path
+        # can't have a scheme, so parsing is only needed for other paths)
+        if path[:1] == "/":
+            url = f"{self.url}{path}"
+        elif urlparse(path).scheme:
             url = path
         else:
-            if not path[0] == "/":
-                raise ValueError(path)
-            url = f"{self.url}{path}"
+            raise ValueError(path)
         request_headers: dict[str, str] = dict(self.headers)
         if headers:
             key: str
@@ -1905,7 +4128,7 @@ class Client:
                 }
             )
         # Assemble the request
-        request = _assemble_request(
+        request: Request = _assemble_request(
             url=url,
             method=method,
             headers=request_headers,
@@ -1913,41 +4136,758 @@ class Client:
             data=dict(data),
             multipart=multipart,
             multipart_data_headers=dict(multipart_data_headers),
+            json_codec=self.json_codec,
+        )
+        if self.compression_policy is not None:
+            self.compression_policy.compress(request)
+        return request
+
+    def _request(
+        self,
+        path: str,
+        method: str,
+        json: str | bytes | sob.abc.Model | None = None,
+        data: (
+            collections.abc.Mapping[str, sob.abc.MarshallableTypes]
+            | collections.abc.Sequence[tuple[str, sob.abc.MarshallableTypes]]
+        ) = (),
+        query: (
+            collections.abc.Mapping[str, sob.abc.MarshallableTypes]
+            | collections.abc.Sequence[tuple[str, sob.abc.MarshallableTypes]]
+            | str
+        ) = (),
+        headers: (
+            collections.abc.Mapping[str, sob.abc.MarshallableTypes]
+            | collections.abc.Sequence[tuple[str, sob.abc.MarshallableTypes]]
+        ) = (),
+        multipart: bool = False,  # noqa: FBT001 FBT002
+        multipart_data_headers: (
+            collections.abc.Mapping[
+                str, collections.abc.MutableMapping[str, str]
+            ]
+            | collections.abc.Sequence[
+                tuple[str, collections.abc.MutableMapping[str, str]]
+            ]
+        ) = (),
+        timeout: float | Timeout = 0,
+        operation: str = "",
+        expiry: float | None = None,
+    ) -> sob.abc.Readable:
+        started: float = time.perf_counter()
+        timeout_: Timeout = get_timeout(timeout or self.timeout)
+        # This attempt expires per its total timeout, or the call's
+        # deadline, whichever is sooner
+        expiry = timeout_.get_expiry(expiry)
+        request: Request = self._prepare_request(
+            path,
+            method,
+            json,
+            data,
+            query,
+            headers,
+            multipart,
+            multipart_data_headers,
         )
         # Authenticate the request
         self._authenticate_request(request)
-        # Assemble keyword arguments for passing to the opener
+        self._observe_phase(operation, "assembly", started)
+        timing: RequestTiming | None = self._start_timing(
+            request, operation, started
+        )
+        # Assemble keyword arguments for passing to the opener, and
+        # attributes for the transport
         open_kwargs: dict[str, typing.Any] = {}
-        if timeout:
-            open_kwargs.update(timeout=timeout)
-        elif self.timeout:
-            open_kwargs.update(timeout=self.timeout)
+        if timeout_.read is not None:
+            open_kwargs.update(timeout=timeout_.read)
+        if timeout_.connect is not None:
+            request.connect_timeout = timeout_.connect  # type: ignore[attr-defined]
+        if expiry is not None:
+            request.expiry = expiry  # type: ignore[attr-defined]
+        if operation:
+            request.operation = operation  # type: ignore[attr-defined]
         # Set request callback
         self._request_callback(request)
         # Process the request
         response: HTTPResponse
+        started = time.perf_counter()
         try:
-            response = self._opener.open(request, **open_kwargs)
-            # Add callback
-            _set_response_callback(
-                response, self._get_request_response_callback()
-            )
-        except HTTPError as error:
-            error_response: HTTPResponse | None = getattr(error, "file", None)
-            if error_response is not None:
-                sob.errors.append_exception_text(
-                    error,
-                    "\n\n{}".format(
-                        _censor_long_json_strings(
-                            _represent_http_response(error_response)
-                        )
-                    ),
+            if expiry is not None:
+                get_remaining(expiry)
+            response = self._open_request(request, **open_kwargs)
+        except Exception as error:
+            self._record_request_sent(operation, request, started, error)
+            if isinstance(error, HTTPError):
+                _append_http_error_response_text(error)
+            if timing is not None:
+                self._finish_failed_timing(timing, error)
+            raise
+        self._record_request_sent(operation, request, started)
+        # Add callbacks
+        self._set_response_hooks(response, operation, timing, expiry)
+        if not isinstance(response, sob.abc.Readable):
+            raise TypeError(response)
+        return response
+
+    @property
+    def _credential_headers(self) -> tuple[str, ...]:
+        """
+        The request headers which convey credentials, by a hash of which
+        cached responses are partitioned.
+        """
+        if self.api_key and (self.api_key_in == "header"):
+            return (*CREDENTIAL_HEADERS, self.api_key_name)
+        return CREDENTIAL_HEADERS
+
+    def _open_request(
+        self, request: Request, **open_kwargs: typing.Any
+    ) -> HTTPResponse:
+        """
+        Open a request, serving a fresh response from the cache (if there is
+        one), or revalidating a stale one.
+        """
+        if self.cache is None:
+            return self._send(request, **open_kwargs)
+        cached_response: _CachedResponse | None = get_cached_response(
+            self.cache, request, self._credential_headers
+        )
+        if cached_response is not None:
+            if cached_response.is_fresh(request):
+                return cached_response.get_response(request)
+            cached_response.add_validators(request)
+        response: HTTPResponse
+        try:
+            response = self._send(request, **open_kwargs)
+        except HTTPError as error:
+            if cached_response is None or error.code != 304:
+                raise
+            error.close()
+            return revalidate_response(
+                self.cache,
+                request,
+                cached_response,
+                error.headers,
+                self._credential_headers,
+            )
+        return store_response(
+            self.cache, request, response, self._credential_headers
+        )
+
+    def _send(
+        self, request: Request, **open_kwargs: typing.Any
+    ) -> HTTPResponse:
+        """
+        Open a request, if the circuit breaker (if there is one) permits it,
+        and after waiting for the rate limiter (if there is one). The
+        outcome is then recorded by the circuit breaker, and the rate
+        limiter adapts to the response headers.
+        """
+        if self.rate_limiter is None and self.circuit_breaker is None:
+            return self._opener.open(request, **open_kwargs)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before(request)
+        sent: bool = False
+        response: HTTPResponse
+        try:
+            if self.rate_limiter is not None:
+                self.rate_limiter.wait(
+                    request, getattr(request, "expiry", None)
                 )
+            sent = True
+            response = self._opener.open(request, **open_kwargs)
+        except BaseException as error:
+            self._after_send(request, error, sent=sent)
             raise
+        self._after_send(request)
+        if self.rate_limiter is not None:
+            self.rate_limiter.update(
+                request, response.status, response.headers
+            )
+        return response
+
+    def _after_send(
+        self,
+        request: Request,
+        error: BaseException | None = None,
+        *,
+        sent: bool = True,
+    ) -> None:
+        """
+        Record the outcome of a request with the circuit breaker (if there
+        is one). A request which was not sent, or which was interrupted
+        (such as by being cancelled), has no outcome, and only releases the
+        trial request it may have been permitted by a half-open circuit.
+        """
+        if self.circuit_breaker is not None:
+            if sent and ((error is None) or isinstance(error, Exception)):
+                self.circuit_breaker.after(request, error)
+            else:
+                self.circuit_breaker.release(request)
+        if (self.rate_limiter is not None) and isinstance(error, HTTPError):
+            self.rate_limiter.update(request, error.code, error.headers)
+
+
+class AsyncClient(Client):
+    """
+    A base class for OpenAPI clients which perform requests asynchronously,
+    using `asyncio`.
+
+    Requests are authenticated, retried, logged and echoed exactly as they
+    are by `oapi.client.Client`, but `AsyncClient.request` (and therefore
+    every operation method of a client module generated with
+    `asynchronous=True`) is a coroutine function. Responses are received in
+    full before being returned, so reading a response never blocks the
+    event loop. OAuth2 tokens, however, are obtained synchronously in a
+    worker thread.
+    """
+
+    __slots__: tuple[str, ...] = ("__async_connection_pool",)
+
+    @property
+    def _async_connection_pool(self) -> AsyncConnectionPool:
+        # Connections are bound to an event loop, so we need a new pool
+        # if this client is used by a different event loop
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        connection_pool: AsyncConnectionPool | None = getattr(
+            self, "_AsyncClient__async_connection_pool", None
+        )
+        if (connection_pool is None) or (
+            getattr(connection_pool, "loop", None) is not loop
+        ):
+            if connection_pool is not None:
+                connection_pool.clear()
+            connection_pool = AsyncConnectionPool(
+                size=self.connection_pool_size,
+                lifetime=self.connection_pool_lifetime,
+            )
+            connection_pool.loop = loop  # type: ignore[attr-defined]
+            self.__async_connection_pool = connection_pool
+        return connection_pool
+
+    @property
+    def _ssl_context(self) -> SSLContext:
+        return get_ssl_context(self.verify_ssl_certificate)
+
+    def close(self) -> None:
+        """
+        Close any idle connections being kept alive for re-use. The client
+        remains usable: subsequent requests will establish new connections.
+        """
+        super().close()
+        connection_pool: AsyncConnectionPool | None = getattr(
+            self, "_AsyncClient__async_connection_pool", None
+        )
+        if connection_pool is not None:
+            connection_pool.clear()
+
+    async def aclose(self) -> None:
+        """
+        Close any idle connections being kept alive for re-use. This
+        should be awaited in the event loop in which the client's requests
+        were performed, before that loop is closed.
+        """
+        self.close()
+        # Allow the event loop to finish closing the connections' transports
+        await asyncio.sleep(0)
+
+    async def request(  # type: ignore[override]
+        self,
+        path: str,
+        method: str,
+        *,
+        json: str | bytes | sob.abc.Model | None = None,
+        data: (
+            collections.abc.Mapping[str, sob.abc.MarshallableTypes]
+            | collections.abc.Sequence[tuple[str, sob.abc.MarshallableTypes]]
+        ) = (),
+        query: (
+            collections.abc.Mapping[str, sob.abc.MarshallableTypes]
+            | collections.abc.Sequence[tuple[str, sob.abc.MarshallableTypes]]
+            | str
+        ) = (),
+        headers: (
+            collections.abc.Mapping[str, sob.abc.MarshallableTypes]
+            | collections.abc.Sequence[tuple[str, sob.abc.MarshallableTypes]]
+        ) = (),
+        multipart: bool = False,
+        multipart_data_headers: (
+            collections.abc.Mapping[
+                str, collections.abc.MutableMapping[str, str]
+            ]
+            | collections.abc.Sequence[
+                tuple[str, collections.abc.MutableMapping[str, str]]
+            ]
+        ) = (),
+        timeout: float | Timeout = 0,
+        operation: str = "",
+        deadline: float = 0,
+    ) -> sob.abc.Readable:
+        """
+        Construct and submit an HTTP request and return the response
+        (an instance of `http.client.HTTPResponse`, the body of which has
+        already been received).
+
+        Parameters:
+            path: This is the path of the request, relative to the server
+                base URL
+            json: JSON data to be conveyed in the body of the request
+            data: Form data to be conveyed
+                in the body of the request
+            query: A dictionary from which to assemble the
+                query string.
+            headers:
+            multipart: If `True`, `data` should be conveyed
+                as a multipart request.
+            multipart_data_headers:
+            timeout: The number of seconds before a request will timeout,
+                or an `oapi.client.Timeout`, overriding the client's
+                `timeout`.
+            operation: The operation ID (or name of the client method) by
+                which `metrics` are labelled.
+            deadline: The maximum number of seconds to spend on this call,
+                including retries. If this is 0 (the default), the call is
+                only limited by an enclosing `oapi.client.Deadline` context
+                (if any).
+        """
+        # For backwards compatibility...
+        if isinstance(data, (str, bytes, sob.abc.Model)) or (data is None):
+            json = data
+            data = ()
+        expiry: float | None = get_deadline_expiry(deadline)
+        function: typing.Callable[
+            [], collections.abc.Awaitable[sob.abc.Readable]
+        ] = functools.partial(
+            self._async_request,
+            path,
+            method,
+            json,
+            data,
+            query,
+            headers,
+            multipart,
+            multipart_data_headers,
+            timeout,
+            operation,
+            expiry,
+        )
+        if self.metrics is None:
+            return await self._retry_policy.async_call(
+                function, logger=self.logger, expiry=expiry
+            )
+        counted_function: _CountedCall = _CountedCall(function)
+        started: float = time.perf_counter()
+        status: int = 0
+        try:
+            response: sob.abc.Readable = await self._retry_policy.async_call(
+                counted_function, logger=self.logger, expiry=expiry
+            )
+            status = getattr(response, "status", None) or 200
+        except HTTPError as error:
+            status = error.code
+            raise
+        finally:
+            self._record_request_metrics(
+                operation, method, started, counted_function.count, status
+            )
+        return response
+
+    async def _async_get_page(
+        self,
+        pagination: Pagination,
+        method: str,
+        request: tuple[str, dict[str, typing.Any]],
+    ) -> tuple[typing.Any, tuple[str, dict[str, typing.Any]] | None]:
+        path, kwargs = request
+        return self._read_page(
+            pagination,
+            path,
+            kwargs,
+            await self.request(path, method, **kwargs),
+        )
+
+    async def _aiter_page_data(
+        self,
+        pagination: Pagination,
+        path: str,
+        method: str,
+        kwargs: dict[str, typing.Any],
+    ) -> collections.abc.AsyncIterator[typing.Any]:
+        """
+        Yield the deserialized JSON of each page, requesting up to
+        `pagination.prefetch` pages ahead in a background task.
+        """
+        request: tuple[str, dict[str, typing.Any]] | None = (path, kwargs)
+        data: typing.Any
+        if not pagination.prefetch:
+            while request is not None:
+                data, request = await self._async_get_page(
+                    pagination, method, request
+                )
+                yield data
+            return
+        # Each page is queued as a tuple of its data and any error
+        # encountered requesting it, followed by `None` after the last page
+        pages: asyncio.Queue[tuple[typing.Any, Exception | None] | None] = (
+            asyncio.Queue()
+        )
+        # One slot for the page being consumed, plus one for each page
+        # requested ahead of it
+        slots: asyncio.Semaphore = asyncio.Semaphore(pagination.prefetch + 1)
+
+        async def prefetch(
+            request: tuple[str, dict[str, typing.Any]] | None,
+        ) -> None:
+            data: typing.Any
+            try:
+                while request is not None:
+                    await slots.acquire()
+                    data, request = await self._async_get_page(
+                        pagination, method, request
+                    )
+                    pages.put_nowait((data, None))
+            except Exception as error:  # noqa: BLE001
+                pages.put_nowait((None, error))
+                return
+            pages.put_nowait(None)
+
+        task: asyncio.Task = asyncio.create_task(prefetch(request))
+        try:
+            page: tuple[typing.Any, Exception | None] | None
+            while (page := await pages.get()) is not None:
+                data, error = page
+                if error is not None:
+                    raise error
+                yield data
+                slots.release()
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def iter_pages(  # type: ignore[override]
+        self,
+        pagination: Pagination,
+        types: tuple[type[sob.abc.Model] | sob.abc.Property, ...],
+        /,
+        path: str,
+        method: str,
+        **kwargs: typing.Any,
+    ) -> collections.abc.AsyncIterator[typing.Any]:
+        """
+        Request each page of a paginated operation, and yield the items in
+        each page. Up to `pagination.prefetch` pages are requested ahead
+        (in a background task) while the items of preceding pages are
+        being consumed.
+
+        Parameters:
+            pagination: An `oapi.client.Pagination` describing how pages
+                are requested, and where the items in each page are found.
+            types: The types as which to unmarshal each page.
+            path: The path (or URL) of the first page.
+            method:
+            **kwargs: Any other arguments for `oapi.client.Client.request`.
+        """
+        data: typing.Any
+        item: typing.Any
+        async for data in self._aiter_page_data(
+            pagination, path, method, kwargs
+        ):
+            for item in pagination.get_items(
+                self._unmarshal_page(data, types, kwargs.get("operation", ""))
+            ):
+                yield item
+
+    async def map(  # type: ignore[override]
+        self,
+        method: str | typing.Callable[..., typing.Any],
+        kwargs: collections.abc.Iterable[
+            collections.abc.Mapping[str, typing.Any]
+        ],
+        /,
+        concurrency: int | None = None,
+        *,
+        ordered: bool = True,
+        return_exceptions: bool = False,
+    ) -> collections.abc.AsyncIterator[typing.Any]:
+        """
+        Call a client method once for each of the given sets of keyword
+        arguments, concurrently (in tasks), yielding each result as soon as
+        it is available. For example:
+
+        ```python
+        kwargs = ({"pet_id": pet_id} for pet_id in pet_ids)
+        async for pet in client.map("get_pet", kwargs):
+            ...
+        ```
+
+        Argument sets are read lazily, so no more than `concurrency` calls
+        are pending at once. Each call is subject to this client's retry
+        policy, rate limiter and circuit breaker, as any other call would
+        be.
+
+        Parameters:
+            method: The name of a client method, or a coroutine function
+                which accepts the client as its first argument.
+            kwargs: An iterable of keyword argument mappings, one for
+                each call.
+            concurrency: The maximum number of concurrent calls. This
+                defaults to `connection_pool_size` (the number of
+                connections kept alive per host).
+            ordered: If `True` (the default), results are yielded in the
+                order of their argument sets. If `False`, results are
+                yielded in the order in which calls complete.
+            return_exceptions: If `True`, errors raised by calls are
+                yielded in place of their results. If `False` (the
+                default), the first error is raised, and pending calls are
+                cancelled.
+        """
+        result: typing.Any
+        async for result in aiter_map(
+            functools.partial(call_method, self, method),
+            kwargs,
+            concurrency or self.connection_pool_size or 10,
+            ordered=ordered,
+            return_exceptions=return_exceptions,
+        ):
+            yield result
+
+    async def _async_request(
+        self,
+        path: str,
+        method: str,
+        json: str | bytes | sob.abc.Model | None,
+        data: (
+            collections.abc.Mapping[str, sob.abc.MarshallableTypes]
+            | collections.abc.Sequence[tuple[str, sob.abc.MarshallableTypes]]
+        ),
+        query: (
+            collections.abc.Mapping[str, sob.abc.MarshallableTypes]
+            | collections.abc.Sequence[tuple[str, sob.abc.MarshallableTypes]]
+            | str
+        ),
+        headers: (
+            collections.abc.Mapping[str, sob.abc.MarshallableTypes]
+            | collections.abc.Sequence[tuple[str, sob.abc.MarshallableTypes]]
+        ),
+        multipart: bool,  # noqa: FBT001
+        multipart_data_headers: (
+            collections.abc.Mapping[
+                str, collections.abc.MutableMapping[str, str]
+            ]
+            | collections.abc.Sequence[
+                tuple[str, collections.abc.MutableMapping[str, str]]
+            ]
+        ),
+        timeout: float | Timeout,
+        operation: str = "",
+        expiry: float | None = None,
+    ) -> sob.abc.Readable:
+        started: float = time.perf_counter()
+        timeout_: Timeout = get_timeout(timeout or self.timeout)
+        # This attempt expires per its total timeout, or the call's
+        # deadline, whichever is sooner
+        expiry = timeout_.get_expiry(expiry)
+        request: Request = self._prepare_request(
+            path,
+            method,
+            json,
+            data,
+            query,
+            headers,
+            multipart,
+            multipart_data_headers,
+        )
+        # Authenticate the request. Obtaining an OAuth2 token requires a
+        # (synchronous) request of its own, so that is done in a thread.
+        if self._uses_oauth2():
+            await asyncio.to_thread(self._authenticate_request, request)
+        else:
+            self._authenticate_request(request)
+        self._observe_phase(operation, "assembly", started)
+        timing: RequestTiming | None = self._start_timing(
+            request, operation, started
+        )
+        # Set attributes for the transport
+        if timeout_.connect is not None:
+            request.connect_timeout = timeout_.connect  # type: ignore[attr-defined]
+        if expiry is not None:
+            request.expiry = expiry  # type: ignore[attr-defined]
+        if operation:
+            request.operation = operation  # type: ignore[attr-defined]
+        # Set request callback
+        self._request_callback(request)
+        # Process the request
+        response: HTTPResponse
+        started = time.perf_counter()
+        try:
+            if expiry is not None:
+                get_remaining(expiry)
+            response = await self._async_open_request(
+                request,
+                timeout=timeout_.read or socket.getdefaulttimeout(),
+            )
+        except Exception as error:
+            self._record_request_sent(operation, request, started, error)
+            if isinstance(error, HTTPError):
+                _append_http_error_response_text(error)
+            if timing is not None:
+                self._finish_failed_timing(timing, error)
+            raise
+        self._record_request_sent(operation, request, started)
+        # Add callbacks
+        self._set_response_hooks(response, operation, timing)
         if not isinstance(response, sob.abc.Readable):
             raise TypeError(response)
         return response
 
+    async def _async_open_request(
+        self, request: Request, timeout: float | None
+    ) -> HTTPResponse:
+        """
+        Open a request, serving a fresh response from the cache (if there is
+        one), or revalidating a stale one.
+        """
+        if self.cache is None:
+            return await self._async_send(request, timeout)
+        cached_response: _CachedResponse | None = get_cached_response(
+            self.cache, request, self._credential_headers
+        )
+        if cached_response is not None:
+            if cached_response.is_fresh(request):
+                return cached_response.get_response(request)
+            cached_response.add_validators(request)
+        response: HTTPResponse
+        try:
+            response = await self._async_send(request, timeout)
+        except HTTPError as error:
+            if cached_response is None or error.code != 304:
+                raise
+            error.close()
+            return revalidate_response(
+                self.cache,
+                request,
+                cached_response,
+                error.headers,
+                self._credential_headers,
+            )
+        return store_response(
+            self.cache, request, response, self._credential_headers
+        )
+
+    async def _async_send(
+        self, request: Request, timeout: float | None
+    ) -> HTTPResponse:
+        """
+        Open a request, if the circuit breaker (if there is one) permits it,
+        and after waiting for the rate limiter (if there is one). The
+        outcome is then recorded by the circuit breaker, and the rate
+        limiter adapts to the response headers.
+        """
+        if self.rate_limiter is None and self.circuit_breaker is None:
+            return await self._async_open(request, timeout)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before(request)
+        sent: bool = False
+        response: HTTPResponse
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.async_wait(
+                    request, getattr(request, "expiry", None)
+                )
+            sent = True
+            response = await self._async_open(request, timeout)
+        except BaseException as error:
+            self._after_send(request, error, sent=sent)
+            raise
+        self._after_send(request)
+        if self.rate_limiter is not None:
+            self.rate_limiter.update(
+                request, response.status, response.headers
+            )
+        return response
+
+    async def _async_open(
+        self, request: Request, timeout: float | None
+    ) -> HTTPResponse:
+        """
+        This mirrors `urllib.request.OpenerDirector.open`: requests are
+        pre-processed by the opener's request processors (which add
+        "Host", "Content-length", cookie and other headers), redirects are
+        followed, cookies are extracted from responses, and an `HTTPError`
+        is raised for any non-2xx response.
+        """
+        redirect_handler: HTTPRedirectHandler = HTTPRedirectHandler()
+        number_of_redirects: int = 0
+        while True:
+            protocol: str = request.type
+            if protocol not in ("http", "https"):
+                message: str = f"unknown url type: {protocol}"
+                raise URLError(message)
+            request.timeout = timeout  # type: ignore[attr-defined]
+            processor: typing.Any
+            for processor in self._opener.process_request.get(  # type: ignore[attr-defined]
+                protocol, ()
+            ):
+                request = getattr(processor, f"{protocol}_request")(request)
+            response: HTTPResponse = await open_async(
+                request,
+                self._async_connection_pool,
+                timeout=timeout,
+                ssl_context=self._ssl_context,
+                dns_cache=self.dns_cache,
+            )
+            self._cookie_jar.extract_cookies(response, request)
+            location: str | None = response.headers.get(
+                "Location"
+            ) or response.headers.get("URI")
+            if (
+                response.status in (301, 302, 303, 307, 308)
+                and location is not None
+            ):
+                location = urljoin(request.full_url, location)
+                if (
+                    number_of_redirects >= HTTPRedirectHandler.max_redirections
+                ) or (urlparse(location).scheme not in ("http", "https")):
+                    raise HTTPError(
+                        request.full_url,
+                        response.status,
+                        response.reason,
+                        response.headers,
+                        response,  # type: ignore[arg-type]
+                    )
+                # This raises an `HTTPError` if the redirect should not be
+                # followed
+                redirected_request: Request | None = (
+                    redirect_handler.redirect_request(
+                        request,
+                        response,
+                        response.status,
+                        response.reason,
+                        response.headers,
+                        location,
+                    )
+                )
+                if redirected_request is None:
+                    raise HTTPError(
+                        request.full_url,
+                        response.status,
+                        response.reason,
+                        response.headers,
+                        response,  # type: ignore[arg-type]
+                    )
+                response.close()
+                request = redirected_request
+                number_of_redirects += 1
+                continue
+            if not (200 <= response.status < 300):  # noqa: PLR2004
+                raise HTTPError(
+                    request.full_url,
+                    response.status,
+                    response.reason,
+                    response.headers,
+                    response,  # type: ignore[arg-type]
+                )
+            return response
+
 
 # For backwards compatibility
 CLIENT_SLOTS: tuple[str, ...] = Client.__slots__  # type: ignore
@@ -2136,107 +5076,15 @@ def _iter_parameters(
     )
 
 
-def _iter_sorted_parameters(
-    parameter_locations: _ParameterLocations,
-) -> collections.abc.Iterable[tuple[str, _Parameter]]:
-    item: tuple[str, _Parameter]
-    return sorted(
-        _iter_parameters(parameter_locations), key=lambda item: item[1].index
-    )
-
-
-def _iter_request_path_representation(
-    path: str, parameter_locations: _ParameterLocations
-) -> collections.abc.Iterable[str]:
-    path_representation: str = sob.utilities.represent(path)
-    if parameter_locations.path:
-        yield f"            {path_representation}.format(**{{"
-        name: str
-        parameter: _Parameter
-        for name, parameter in parameter_locations.path.items():
-            yield _represent_dictionary_parameter(
-                name, parameter, value_type="str"
-            )
-        yield "            }),"
-    else:
-        yield f"            {path_representation},"
-
-
-def _represent_dictionary_parameter(
-    name: str,
-    parameter: _Parameter,
-    *,
-    use_kwargs: bool = False,
-    multipart: bool = False,
-    value_type: str = "",
-) -> str:
-    represent_style: str = sob.utilities.represent(parameter.style)
-    # `parameter.name` is used as-is, unprefixed, even for `matrix`
-    # style: `_format_matrix_argument_value` already prepends the `;`
-    # delimiter(s) itself. Prefixing it here too would both produce a
-    # dict key that doesn't match the bare `{name}` path template
-    # placeholder (`KeyError` on `.format(**{...})`) and cause a
-    # doubled `;;name=value` delimiter in the formatted value.
-    parameter_name: str = parameter.name
-    if use_kwargs:
-        name = f'kwargs.get("{name}", None)'
-    represent_multipart_argument: str = ""
-    if multipart:
-        represent_multipart_argument = "                    multipart=True,\n"
-
-    return (
-        f'                "{parameter_name}": '
-        "{}oapi.client.format_argument_value(\n"
-        f'                    "{parameter_name}",\n'
-        f"                    {name},\n"
-        f"                    style={represent_style},\n"
-        f"                    explode={parameter.explode!r},\n"
-        f"{represent_multipart_argument}"
-        "                ){},"
-    ).format(f"{value_type}(" if value_type else "", ")" if value_type else "")
-
-
-def _iter_cookie_dictionary_parameter_representation(
-    names_parameters: dict[str, _Parameter],
-) -> collections.abc.Iterable[str]:
-    if names_parameters:
-        yield '                "Cookie": "; ".join(('
-        name: str
-        parameter: _Parameter
-        for name, parameter in names_parameters.items():
-            represent_style: str = sob.utilities.represent(parameter.style)
-            represent_explode: str = sob.utilities.represent(parameter.explode)
-            yield "                    oapi.client.urlencode({"
-            yield f'                        "{parameter.name}":'
-            yield "                        oapi.client.format_argument_value("
-            yield f'                            "{parameter.name}",'
-            yield f"                            {name},"
-            yield f"                            style={represent_style},"
-            yield f"                            explode={represent_explode}"
-            yield "                        ),"
-            yield "                    }),"
-        yield "                ))"
-
-
-def _iter_request_headers_representation(
-    parameter_locations: _ParameterLocations, *, use_kwargs: bool = False
-) -> collections.abc.Iterable[str]:
-    if parameter_locations.header or parameter_locations.cookie:
-        yield "            headers={"
-        if parameter_locations.header:
-            name: str
-            parameter: _Parameter
-            for name, parameter in parameter_locations.header.items():
-                yield _represent_dictionary_parameter(
-                    name, parameter, use_kwargs=use_kwargs
-                )
-        if parameter_locations.cookie:
-            yield from _iter_cookie_dictionary_parameter_representation(
-                parameter_locations.cookie
-            )
-        yield "            },"
-
-
+def _iter_sorted_parameters(
+    parameter_locations: _ParameterLocations,
+) -> collections.abc.Iterable[tuple[str, _Parameter]]:
+    item: tuple[str, _Parameter]
+    return sorted(
+        _iter_parameters(parameter_locations), key=lambda item: item[1].index
+    )
+
+
 def _iter_request_body_representation(
     parameter_locations: _ParameterLocations, *, use_kwargs: bool = False
 ) -> collections.abc.Iterable[str]:
@@ -2247,8 +5095,8 @@ def _iter_request_body_representation(
         yield (f"            json={name},")
 
 
-def _iter_request_query_representation(
-    parameter_locations: _ParameterLocations, *, use_kwargs: bool = False
+def _iter_request_querystring_representation(
+    parameter_locations: _ParameterLocations,
 ) -> collections.abc.Iterable[str]:
     message: str
     if parameter_locations.querystring:
@@ -2262,34 +5110,171 @@ def _iter_request_query_representation(
         yield "            query=("
         yield f"                {query},"
         yield "            ),"
-    elif parameter_locations.query:
-        yield "            query={"
-        name: str
+
+
+def _iter_request_template_locations(
+    parameter_locations: _ParameterLocations,
+) -> collections.abc.Iterable[tuple[str, str, dict[str, _Parameter]]]:
+    """
+    Yield a tuple for each parameter location used by a request template,
+    containing the corresponding `RequestTemplate` constructor keyword,
+    `RequestTemplate.__call__` keyword, and parameters.
+    """
+    yield from filter(
+        lambda item: item[2],
+        (
+            ("path_parameters", "path", parameter_locations.path),
+            ("query_parameters", "query", parameter_locations.query),
+            ("header_parameters", "headers", parameter_locations.header),
+            ("cookie_parameters", "cookies", parameter_locations.cookie),
+            ("data_parameters", "data", parameter_locations.form_data),
+        ),
+    )
+
+
+def _iter_request_template_representation(
+    attribute_name: str,
+    path: str,
+    method: str,
+    parameter_locations: _ParameterLocations,
+) -> collections.abc.Iterable[str]:
+    yield f"    {attribute_name}: typing.ClassVar["
+    yield "        oapi.client.RequestTemplate"
+    yield "    ] = oapi.client.RequestTemplate("
+    yield f"        {sob.utilities.represent(path)},"
+    yield f'        "{method.upper()}",'
+    keyword: str
+    names_parameters: dict[str, _Parameter]
+    for keyword, _, names_parameters in _iter_request_template_locations(
+        parameter_locations
+    ):
+        yield f"        {keyword}=("
         parameter: _Parameter
-        for name, parameter in parameter_locations.query.items():
-            yield _represent_dictionary_parameter(
-                name, parameter, use_kwargs=use_kwargs
+        for parameter in names_parameters.values():
+            represent_name: str = sob.utilities.represent(parameter.name)
+            represent_style: str = sob.utilities.represent(parameter.style)
+            yield (
+                f"            ({represent_name}, {represent_style}, "
+                f"{parameter.explode!r}),"
             )
-        yield "            },"
+        yield "        ),"
+    if parameter_locations.multipart:
+        yield "        multipart=True,"
+    yield "    )"
+    yield ""
 
 
-def _iter_request_form_data_representation(
+def _iter_request_template_arguments_representation(
+    attribute_name: str,
     parameter_locations: _ParameterLocations,
     *,
     use_kwargs: bool = False,
 ) -> collections.abc.Iterable[str]:
-    if parameter_locations.form_data:
-        yield "            data={"
+    yield f"            **self.{attribute_name}("
+    keyword: str
+    names_parameters: dict[str, _Parameter]
+    for _, keyword, names_parameters in _iter_request_template_locations(
+        parameter_locations
+    ):
+        yield f"                {keyword}=("
         name: str
-        parameter: _Parameter
-        for name, parameter in parameter_locations.form_data.items():
-            yield _represent_dictionary_parameter(
-                name,
-                parameter,
-                use_kwargs=use_kwargs,
-                multipart=parameter_locations.multipart,
+        for name in names_parameters:
+            yield (
+                f'                    kwargs.get("{name}", None),'
+                if use_kwargs
+                else f"                    {name},"
+            )
+        yield "                ),"
+    yield "            ),"
+
+
+# Query parameter names, and response property names, which (in
+# combination) indicate an operation uses cursor-based pagination
+_CURSOR_PARAMETER_NAMES: tuple[str, ...] = (
+    "cursor",
+    "page_token",
+    "pageToken",
+    "next_token",
+    "nextToken",
+    "continuation_token",
+    "continuationToken",
+    "starting_after",
+    "after",
+)
+_NEXT_CURSOR_PROPERTY_NAMES: tuple[str, ...] = (
+    "next_cursor",
+    "nextCursor",
+    "next_page_token",
+    "nextPageToken",
+    "next_token",
+    "nextToken",
+    "continuation_token",
+    "continuationToken",
+    "cursor",
+)
+
+
+def _is_schema_type(schema: Schema, type_: str) -> bool:
+    if isinstance(schema.type_, str):
+        return schema.type_ == type_
+    return type_ in (schema.type_ or ())
+
+
+def _iter_key_types(
+    type_: type | sob.abc.Property, key: str
+) -> collections.abc.Iterable[type | sob.abc.Property]:
+    """
+    Yield the types of the property (of an object type) with the given JSON
+    key.
+    """
+    if isinstance(type_, type) and issubclass(type_, sob.abc.Object):
+        meta: sob.abc.ObjectMeta | None = sob.read_object_meta(type_)
+        if meta and meta.properties:
+            name: str
+            property_: sob.abc.Property
+            for name, property_ in meta.properties.items():
+                if (property_.name or name) == key:
+                    if isinstance(property_, sob.abc.ArrayProperty):
+                        yield property_
+                    else:
+                        yield from property_.types or ()
+    elif isinstance(type_, sob.abc.Property) and not isinstance(
+        type_, sob.abc.ArrayProperty
+    ):
+        for property_type in type_.types or ():
+            yield from _iter_key_types(property_type, key)
+
+
+def _iter_array_item_types(
+    type_: type | sob.abc.Property,
+) -> collections.abc.Iterable[type | sob.abc.Property]:
+    if isinstance(type_, sob.abc.ArrayProperty):
+        yield from type_.item_types or ()
+    elif isinstance(type_, type) and issubclass(type_, sob.abc.Array):
+        meta: sob.abc.ArrayMeta | None = sob.read_array_meta(type_)
+        if meta and meta.item_types:
+            yield from meta.item_types
+    elif isinstance(type_, sob.abc.Property):
+        for property_type in type_.types or ():
+            yield from _iter_array_item_types(property_type)
+
+
+def _get_pagination_item_types(
+    type_: type | sob.abc.Property, items: str
+) -> tuple[type | sob.abc.Property, ...]:
+    """
+    Get the types of the items in a page, given the page's type and the
+    "/"-separated path (of JSON property names) to the page's items.
+    """
+    types: tuple[type | sob.abc.Property, ...] = (type_,)
+    key: str
+    for key in filter(None, items.split("/")):
+        types = tuple(
+            chain.from_iterable(
+                _iter_key_types(key_type, key) for key_type in types
             )
-        yield "            },"
+        )
+    return tuple(chain.from_iterable(map(_iter_array_item_types, types)))
 
 
 def _strip_def_decorators(source: str) -> str:
@@ -2321,7 +5306,7 @@ class ClientModule:
     document.
     """
 
-    def __init__(
+    def __init__(  # noqa: C901
         self,
         open_api: str | sob.abc.Readable | OpenAPI,
         model_path: str | Path,
@@ -2347,6 +5332,14 @@ class ClientModule:
         use_operation_id: bool = False,
         module_docstring: str | None = None,
         class_docstring: str | None = None,
+        asynchronous: bool = False,
+        iterable_array_responses: bool = False,
+        json_codec: str | None = None,
+        pagination: (
+            collections.abc.Mapping[str, Pagination]
+            | collections.abc.Sequence[tuple[str, Pagination]]
+        ) = (),
+        detect_pagination: bool = False,
     ) -> None:
         """
         Parameters:
@@ -2385,6 +5378,35 @@ class ClientModule:
                 constants, expressions, etc.
             module_docstring: A docstring to insert at the top of the module.
             class_docstring: A docstring to insert in the client class.
+            asynchronous: If `True`, operation methods will be
+                coroutine functions (`async def ...`), and the base class
+                will (by default) be `oapi.client.AsyncClient`.
+            iterable_array_responses: If `True`, for each operation
+                responding with a JSON array, an additional method
+                (named "iter_" + the operation method name) will be
+                generated, which parses the response incrementally and
+                yields each array item as soon as it has been read and
+                unmarshalled. This only applies to synchronous clients:
+                asynchronous clients receive each response in full before
+                it is parsed, so an item iterator would not reduce their
+                memory use.
+            json_codec: The name of the JSON codec the client should use
+                by default: "orjson", "msgspec", "ujson", "json" or "auto"
+                (see `oapi.client.get_json_codec`). If not provided, the
+                client will use the standard library (unless a codec is
+                passed when the client is initialized).
+            pagination: A mapping of operation method names (or
+                operation IDs) to an `oapi.client.Pagination` describing how
+                the operation's pages are requested. For each of these
+                operations, an additional method (named "iter_" + the
+                operation method name) will be generated, which requests
+                each page (prefetching subsequent pages in the background)
+                and yields the items in each page.
+            detect_pagination: If `True`, "iter_" methods will also be
+                generated for operations which appear to be paginated: GET
+                operations with a "cursor" (or similarly named) query
+                parameter and a next cursor response property, a "Link"
+                response header, or a "page" or "offset" query parameter.
         """
         message: str
         if isinstance(model_path, Path):
@@ -2438,8 +5460,31 @@ class ClientModule:
         self._init_parameter_defaults_source: dict[str, typing.Any] = dict(
             init_parameter_defaults_source
         )
+        if json_codec is not None:
+            if json_codec != "auto" and json_codec not in JSON_CODEC_NAMES:
+                raise ValueError(json_codec)
+            self._init_parameter_defaults.setdefault("json_codec", json_codec)
+            if (
+                self._include_init_parameters
+                and "json_codec" not in self._include_init_parameters
+            ):
+                self._include_init_parameters += ("json_codec",)
         self._resolver: Resolver = Resolver(open_api)
         self._model_path: str = model_path
+        if asynchronous:
+            if base_class is Client:
+                base_class = AsyncClient
+            elif not issubclass(base_class, AsyncClient):
+                message = (
+                    "An asynchronous client's base class must be a "
+                    "sub-class of `oapi.client.AsyncClient`, not "
+                    f"`{sob.utilities.get_qualified_name(base_class)}`."
+                )
+                raise TypeError(message)
+        self._asynchronous: bool = asynchronous
+        self._iterable_array_responses: bool = iterable_array_responses
+        self._pagination: dict[str, Pagination] = dict(pagination)
+        self._detect_pagination: bool = detect_pagination
         self._base_class: type[Client] = base_class
         self._class_name: str = class_name
         # This keeps track of used names in the global namespace
@@ -2459,8 +5504,15 @@ class ClientModule:
         } | set(
             filter(None, (imports,) if isinstance(imports, str) else imports)
         )
-        if "headers" not in self._iter_excluded_parameter_names():
-            # `collections.abc` is only referenced if `headers` is used
+        if (
+            (iterable_array_responses and not asynchronous)
+            or pagination
+            or detect_pagination
+            or ("headers" not in self._iter_excluded_parameter_names())
+        ):
+            # `collections.abc` is only referenced if `headers` is used,
+            # or for the return type of iterable array response and
+            # paginated methods
             self._imports.add("import collections.abc")
             self._names.add("collections")
         self.get_method_name_from_path_method_operation = (
@@ -2630,8 +5682,8 @@ class ClientModule:
         """
         Get a unique local name to use for the client base class
         """
-        if self._base_class is Client:
-            return f"{Client.__module__}.{Client.__name__}"
+        if self._base_class in (Client, AsyncClient):
+            return f"{self._base_class.__module__}.{self._base_class.__name__}"
         base_class_name: str = self._base_class.__name__
         while base_class_name in self._names:
             base_class_name = f"_{base_class_name}"
@@ -2642,7 +5694,7 @@ class ClientModule:
     def _get_client_base_class_import(
         self, client_module_path: str | Path
     ) -> str:
-        if self._base_class is Client:
+        if self._base_class in (Client, AsyncClient):
             return ""
         base_class_name: str = self._get_client_base_class_name()
         as_: str = (
@@ -3323,37 +6375,40 @@ class ClientModule:
         method: str,
         operation: Operation,
         parameter_locations: _ParameterLocations,
+        *,
+        iterable: bool = False,
+        pagination: Pagination | None = None,
     ) -> collections.abc.Iterable[str]:
         operation_response_types: tuple[
             type[sob.abc.Model] | sob.abc.Property, ...
         ] = tuple(self._iter_operation_response_types(operation))
+        request_arguments: collections.abc.Iterable[str] = (
+            self._iter_request_arguments_source(
+                path,
+                method,
+                operation,
+                parameter_locations,
+                iterable=iterable,
+            )
+        )
+        if pagination is not None:
+            yield from self._iter_paginated_response_source(
+                pagination, operation_response_types, request_arguments
+            )
+            yield ""
+            return
+        await_: str = "await " if self._asynchronous else ""
         if operation_response_types:
-            yield "        response: sob.abc.Readable = self.request("
+            yield f"        response: sob.abc.Readable = {await_}self.request("
         else:
-            yield "        self.request("
-        yield from _iter_request_path_representation(path, parameter_locations)
-        yield f'            method="{method.upper()}",'
-        # If more than 254 arguments are needed, we must use `**kwargs``
-        use_kwargs: bool = (
-            len(tuple(_iter_parameters(parameter_locations))) > 254  # noqa: PLR2004
-        )
-        yield from _iter_request_headers_representation(
-            parameter_locations, use_kwargs=use_kwargs
-        )
-        yield from _iter_request_query_representation(
-            parameter_locations, use_kwargs=use_kwargs
-        )
-        yield from _iter_request_form_data_representation(
-            parameter_locations,
-            use_kwargs=use_kwargs,
-        )
-        yield from _iter_request_body_representation(
-            parameter_locations, use_kwargs=use_kwargs
-        )
-        if parameter_locations.multipart:
-            yield "            multipart=True,"
+            yield f"        {await_}self.request("
+        yield from request_arguments
         yield "        )"
-        if operation_response_types:
+        if iterable:
+            yield from self._iter_iterable_array_response_source(
+                operation_response_types
+            )
+        elif operation_response_types:
             response_types_representation: str = ",\n                ".join(
                 iter_distinct(
                     map(self._represent_type, operation_response_types)
@@ -3361,13 +6416,13 @@ class ClientModule:
             )
             operation_response_type: type[sob.abc.Model] | sob.abc.Property
             deserialize_kwargs: str = (
-                ", coerce_unparseable=bytes"
+                "coerce_unparseable=bytes"
                 if any(
                     isinstance(operation_response_type, sob.abc.BytesProperty)
                     for operation_response_type in operation_response_types
                 )
                 else (
-                    ", coerce_unparseable=str"
+                    "coerce_unparseable=str"
                     if any(
                         isinstance(
                             operation_response_type, sob.abc.StringProperty
@@ -3377,14 +6432,386 @@ class ClientModule:
                     else ""
                 )
             )
-            yield "        return sob.unmarshal(  # type: ignore"
-            yield f"            sob.deserialize(response{deserialize_kwargs}),"
-            yield "            types=("
-            yield f"                {response_types_representation},"
-            yield "            )"
+            yield "        return self.unmarshal_response("
+            yield "            response,"
+            if self._get_operation_status_response_types(operation):
+                yield "            types=oapi.client.get_response_types("
+                yield "                response,"
+                yield (
+                    "                self."
+                    + self._get_status_response_types_attribute_name(
+                        path, method, operation
+                    )
+                    + ","
+                )
+                yield "                ("
+                yield from self._iter_types_tuple_source(
+                    operation_response_types, 20
+                )
+                yield "                ),"
+                yield "            ),"
+            else:
+                yield "            types=("
+                yield f"                {response_types_representation},"
+                yield "            ),"
+            if deserialize_kwargs:
+                yield f"            {deserialize_kwargs},"
+            operation_label: str = self._get_operation_label(
+                path, method, operation
+            )
+            yield (
+                "            operation="
+                f"{sob.utilities.represent(operation_label)},"
+            )
+            yield "        )"
+        yield ""
+
+    def _iter_request_arguments_source(
+        self,
+        path: str,
+        method: str,
+        operation: Operation,
+        parameter_locations: _ParameterLocations,
+        *,
+        iterable: bool = False,
+    ) -> collections.abc.Iterable[str]:
+        """
+        Yield the arguments passed to `oapi.client.Client.request` (or
+        `oapi.client.Client.iter_pages`) by an operation method.
+        """
+        # If more than 254 arguments are needed, we must use `**kwargs``
+        use_kwargs: bool = (
+            len(tuple(_iter_parameters(parameter_locations))) > 254  # noqa: PLR2004
+        )
+        if any(_iter_request_template_locations(parameter_locations)):
+            yield from _iter_request_template_arguments_representation(
+                self._get_request_template_attribute_name(
+                    path, method, operation
+                ),
+                parameter_locations,
+                use_kwargs=use_kwargs,
+            )
+        else:
+            yield f"            {sob.utilities.represent(path)},"
+            yield f'            method="{method.upper()}",'
+        yield from _iter_request_querystring_representation(
+            parameter_locations
+        )
+        yield from _iter_request_body_representation(
+            parameter_locations, use_kwargs=use_kwargs
+        )
+        operation_label: str = sob.utilities.represent(
+            self._get_operation_label(path, method, operation)
+        )
+        yield f"            operation={operation_label},"
+
+    def _get_operation_label(
+        self, path: str, method: str, operation: Operation
+    ) -> str:
+        """
+        Get the label by which an operation's requests are identified in
+        client `metrics`: the operation ID, or (if the operation has no
+        ID) the name of the client method.
+        """
+        return operation.operation_id or self._get_operation_method_name(
+            path, method, operation
+        )
+
+    def _iter_paginated_response_source(
+        self,
+        pagination: Pagination,
+        page_types: tuple[type[sob.abc.Model] | sob.abc.Property, ...],
+        request_arguments: collections.abc.Iterable[str],
+    ) -> collections.abc.Iterable[str]:
+        if self._asynchronous:
+            # Asynchronous generators cannot `yield from`
+            yield "        item: typing.Any"
+            yield "        async for item in self.iter_pages("
+        else:
+            yield "        yield from self.iter_pages("
+        yield "            oapi.client.Pagination("
+        yield f"                {sob.utilities.represent(pagination.style)},"
+        name: str
+        value: typing.Any
+        for name, value in pagination._iter_keyword_arguments():
+            yield f"                {name}={sob.utilities.represent(value)},"
+        yield "            ),"
+        yield "            ("
+        yield from self._iter_types_tuple_source(page_types, 16)
+        yield "            ),"
+        yield from request_arguments
+        if self._asynchronous:
+            yield "        ):"
+            yield "            yield item"
+        else:
             yield "        )"
+
+    def _get_operation_status_response_types(
+        self, operation: Operation
+    ) -> dict[int, tuple[type[sob.abc.Model] | sob.abc.Property, ...]]:
+        """
+        Map each explicit status code in the 200-299 range to the types
+        documented for responses with that status code (ranges, such as
+        "2XX", and "default" are not included). An empty mapping is
+        returned if the response types do not differ between status codes,
+        since there is then no need to dispatch on the status code.
+        """
+        status_types: dict[
+            int, tuple[type[sob.abc.Model] | sob.abc.Property, ...]
+        ] = {}
+        if operation.responses:
+            code: str
+            response: Response | Reference
+            for code, response in operation.responses.items():
+                if code.startswith("2") and code.isdigit():
+                    types: tuple[
+                        type[sob.abc.Model] | sob.abc.Property, ...
+                    ] = tuple(
+                        self._iter_response_types(
+                            self._resolve_response(response)
+                        )
+                    )
+                    if types:
+                        status_types[int(code)] = types
+        operation_response_types: set[str] = set(
+            map(
+                self._represent_type,
+                self._iter_operation_response_types(operation),
+            )
+        )
+        if all(
+            set(map(self._represent_type, types)) == operation_response_types
+            for types in status_types.values()
+        ):
+            return {}
+        return status_types
+
+    def _iter_types_tuple_source(
+        self,
+        types: collections.abc.Iterable[
+            type[sob.abc.Model] | sob.abc.Property
+        ],
+        indent: int,
+    ) -> collections.abc.Iterable[str]:
+        type_: str
+        for type_ in iter_distinct(map(self._represent_type, types)):
+            yield f"{' ' * indent}{type_},"
+
+    def _iter_status_response_types_source(
+        self,
+        attribute_name: str,
+        status_types: dict[
+            int, tuple[type[sob.abc.Model] | sob.abc.Property, ...]
+        ],
+    ) -> collections.abc.Iterable[str]:
+        yield f"    {attribute_name}: typing.ClassVar["
+        yield "        dict[int, tuple[typing.Any, ...]]"
+        yield "    ] = {"
+        status: int
+        types: tuple[type[sob.abc.Model] | sob.abc.Property, ...]
+        for status, types in status_types.items():
+            yield f"        {status}: ("
+            yield from self._iter_types_tuple_source(types, 12)
+            yield "        ),"
+        yield "    }"
         yield ""
 
+    def _iter_iterable_array_response_source(
+        self,
+        array_types: tuple[type[sob.abc.Model] | sob.abc.Property, ...],
+    ) -> collections.abc.Iterable[str]:
+        # The response is closed (releasing its connection) even if the
+        # items are not all consumed
+        yield "        with response:"
+        yield "            yield from oapi.client.iter_unmarshal_array("
+        yield "                response,"
+        yield "                types=("
+        array_type: str
+        for array_type in iter_distinct(
+            map(self._represent_type, array_types)
+        ):
+            yield f"                    {array_type},"
+        yield "                ),"
+        yield "            )"
+
+    def _get_pagination(
+        self,
+        path: str,
+        method: str,
+        operation: Operation,
+        path_item: PathItem,
+    ) -> Pagination | None:
+        """
+        Get the pagination for an operation, if the operation is paginated.
+        """
+        pagination: Pagination | None = self._pagination.get(
+            self._get_operation_method_name(path, method, operation)
+        )
+        if pagination is None and operation.operation_id:
+            pagination = self._pagination.get(operation.operation_id)
+        if pagination is None and self._detect_pagination:
+            pagination = self._detect_operation_pagination(
+                method, operation, path_item
+            )
+        return pagination
+
+    def _iter_operation_response_schemas(
+        self, operation: Operation
+    ) -> collections.abc.Iterable[Schema]:
+        response: Response | Reference
+        for code, response in (operation.responses or {}).items():
+            if not code.startswith("2"):
+                continue
+            resolved_response: Response = self._resolve_response(response)
+            if resolved_response.schema is not None:
+                yield self._resolve_schema(resolved_response.schema)
+            media_type: MediaType | Reference
+            for media_type in (resolved_response.content or {}).values():
+                resolved_media_type: MediaType = self._resolve_media_type(
+                    media_type
+                )
+                if resolved_media_type.schema is not None:
+                    yield self._resolve_schema(resolved_media_type.schema)
+
+    def _iter_operation_response_header_names(
+        self, operation: Operation
+    ) -> collections.abc.Iterable[str]:
+        response: Response | Reference
+        for code, response in (operation.responses or {}).items():
+            if code.startswith("2"):
+                yield from map(
+                    str.lower,
+                    self._resolve_response(response).headers or (),
+                )
+
+    def _get_schema_pagination_items(self, schema: Schema) -> str | None:
+        """
+        Get the path to the items in a page with the given schema: either
+        the page itself (if it is an array), or the page's only array
+        property.
+        """
+        if _is_schema_type(schema, "array"):
+            return ""
+        name: str
+        property_schema: Schema | Reference
+        array_property_names: tuple[str, ...] = tuple(
+            name
+            for name, property_schema in (schema.properties or {}).items()
+            if _is_schema_type(self._resolve_schema(property_schema), "array")
+        )
+        if len(array_property_names) == 1:
+            return array_property_names[0]
+        return None
+
+    def _get_schema_next_cursor(self, schema: Schema) -> str | None:
+        """
+        Get the path to the next page's cursor in a page with the given
+        schema (looking in the page's properties, and those of any object
+        properties).
+        """
+        properties: dict[str, Schema | Reference] = dict(
+            schema.properties or {}
+        )
+        name: str
+        for name in _NEXT_CURSOR_PROPERTY_NAMES:
+            if name in properties:
+                return name
+        property_schema: Schema | Reference
+        for property_name, property_schema in properties.items():
+            resolved_schema: Schema = self._resolve_schema(property_schema)
+            for name in _NEXT_CURSOR_PROPERTY_NAMES:
+                if name in (resolved_schema.properties or {}):
+                    return f"{property_name}/{name}"
+        return None
+
+    def _detect_operation_pagination(
+        self, method: str, operation: Operation, path_item: PathItem
+    ) -> Pagination | None:
+        """
+        Infer an operation's pagination from its parameters and responses.
+        """
+        if method.lower() != "get":
+            return None
+        schema: Schema | None = next(
+            iter(self._iter_operation_response_schemas(operation)), None
+        )
+        if schema is None:
+            return None
+        items: str | None = self._get_schema_pagination_items(schema)
+        if items is None:
+            return None
+        query_parameter_names: set[str] = {
+            parameter.name
+            for parameter in map(
+                self._resolve_parameter,
+                chain(operation.parameters or (), path_item.parameters or ()),
+            )
+            if parameter.in_ == "query" and parameter.name
+        }
+        cursor_parameter: str | None = next(
+            filter(
+                query_parameter_names.__contains__, _CURSOR_PARAMETER_NAMES
+            ),
+            None,
+        )
+        next_cursor: str | None = self._get_schema_next_cursor(schema)
+        if cursor_parameter and next_cursor:
+            return Pagination(
+                "cursor",
+                items=items,
+                parameter=cursor_parameter,
+                cursor=next_cursor,
+            )
+        if "link" in set(
+            self._iter_operation_response_header_names(operation)
+        ):
+            return Pagination("link", items=items)
+        style: typing.Literal["page", "offset"]
+        for style in ("page", "offset"):
+            if style in query_parameter_names:
+                return Pagination(style, items=items)
+        return None
+
+    def _iter_pagination_item_type_names(
+        self, operation: Operation, pagination: Pagination
+    ) -> collections.abc.Iterable[str]:
+        response_type: type[sob.abc.Model] | sob.abc.Property
+        for response_type in self._iter_operation_response_types(operation):
+            item_types: tuple[type | sob.abc.Property, ...] = (
+                _get_pagination_item_types(response_type, pagination.items)
+            )
+            if item_types:
+                yield from chain(*map(self._iter_type_names, item_types))
+            else:
+                yield "typing.Any"
+
+    def _is_array_operation(self, operation: Operation) -> bool:
+        """
+        Determine if all of an operation's successful responses are
+        JSON arrays.
+        """
+        response_types: tuple[type[sob.abc.Model] | sob.abc.Property, ...] = (
+            tuple(self._iter_operation_response_types(operation))
+        )
+        return bool(response_types) and all(
+            isinstance(response_type, type)
+            and issubclass(response_type, sob.abc.Array)
+            for response_type in response_types
+        )
+
+    def _iter_operation_array_item_type_names(
+        self, operation: Operation
+    ) -> collections.abc.Iterable[str]:
+        response_type: type[sob.abc.Model] | sob.abc.Property
+        for response_type in self._iter_operation_response_types(operation):
+            if not isinstance(response_type, type):
+                raise TypeError(response_type)
+            meta: sob.abc.Meta | None = sob.read_model_meta(response_type)
+            if isinstance(meta, sob.abc.ArrayMeta) and meta.item_types:
+                yield from chain(*map(self._iter_type_names, meta.item_types))
+            else:
+                yield "typing.Any"
+
     def _iter_operation_method_docstring(
         self, operation: Operation, parameter_locations: _ParameterLocations
     ) -> collections.abc.Iterable[str]:
@@ -3436,6 +6863,9 @@ class ClientModule:
         method: str,
         operation: Operation,
         path_item: PathItem,
+        *,
+        iterable: bool = False,
+        pagination: Pagination | None = None,
     ) -> collections.abc.Iterable[str]:
         # This dictionary will be passed to
         # `self._iter_operation_method_declaration()`
@@ -3448,8 +6878,37 @@ class ClientModule:
                 operation=operation,
                 path_item=path_item,
                 parameter_locations=parameter_locations,
+                iterable=iterable,
+                pagination=pagination,
             )
         )
+        if (not iterable) and any(
+            _iter_request_template_locations(parameter_locations)
+        ):
+            # The request template is compiled once, when the class is
+            # created, rather than on every call (and is shared by the
+            # operation's "iter_" method, if it has one)
+            yield from _iter_request_template_representation(
+                self._get_request_template_attribute_name(
+                    path, method, operation
+                ),
+                path,
+                method,
+                parameter_locations,
+            )
+        if (not iterable) and (pagination is None):
+            status_types: dict[
+                int, tuple[type[sob.abc.Model] | sob.abc.Property, ...]
+            ] = self._get_operation_status_response_types(operation)
+            if status_types:
+                # The mapping of status codes to response types is also
+                # built once, when the class is created
+                yield from self._iter_status_response_types_source(
+                    self._get_status_response_types_attribute_name(
+                        path, method, operation
+                    ),
+                    status_types,
+                )
         # Functions can only have up to 255 arguments
         # (one is taken by `self`, but 4 lines are not arguments)
         if len(operation_method_declaration) > 258:  # noqa: PLR2004
@@ -3472,7 +6931,48 @@ class ClientModule:
             method=method,
             operation=operation,
             parameter_locations=parameter_locations,
+            iterable=iterable,
+            pagination=pagination,
+        )
+
+    def _get_operation_method_name(
+        self,
+        path: str,
+        method: str,
+        operation: Operation,
+        *,
+        iterable: bool = False,
+    ) -> str:
+        method_name: str = self.get_method_name_from_path_method_operation(
+            path,
+            method,
+            (operation.operation_id if self.use_operation_id else None),
+        )
+        if iterable:
+            method_name = f"iter_{method_name}"
+        return method_name
+
+    def _get_request_template_attribute_name(
+        self,
+        path: str,
+        method: str,
+        operation: Operation,
+    ) -> str:
+        method_name: str = self._get_operation_method_name(
+            path, method, operation
+        )
+        return f"_{method_name}_request_template"
+
+    def _get_status_response_types_attribute_name(
+        self,
+        path: str,
+        method: str,
+        operation: Operation,
+    ) -> str:
+        method_name: str = self._get_operation_method_name(
+            path, method, operation
         )
+        return f"_{method_name}_status_response_types"
 
     def _get_request_body_json_parameter_source(
         self,
@@ -3632,11 +7132,36 @@ class ClientModule:
         resolved_parameter: Parameter = self._resolve_parameter(parameter)
         return resolved_parameter.name or ""
 
-    def _get_operation_response_type_hint(self, operation: Operation) -> str:
+    def _get_operation_response_type_hint(
+        self,
+        operation: Operation,
+        *,
+        iterable: bool = False,
+        pagination: Pagination | None = None,
+    ) -> str:
         response_type_hint: str = "None"
         response_types: tuple[type[sob.abc.Model] | sob.abc.Property, ...] = (
             tuple(self._iter_operation_response_types(operation))
         )
+        if iterable:
+            iterator: str = (
+                "collections.abc.AsyncIterator"
+                if self._asynchronous
+                else "collections.abc.Iterator"
+            )
+            item_type_names: tuple[str, ...] = tuple(
+                iter_distinct(
+                    self._iter_operation_array_item_type_names(operation)
+                    if pagination is None
+                    else self._iter_pagination_item_type_names(
+                        operation, pagination
+                    )
+                )
+            )
+            if len(item_type_names) > 1:
+                item_type_hint: str = "\n        | ".join(item_type_names)
+                return f"{iterator}[\n        {item_type_hint}\n    ]"
+            return f"{iterator}[{item_type_names[0]}]"
         if response_types:
             response_type_names: tuple[str, ...] = tuple(
                 iter_distinct(
@@ -3663,15 +7188,17 @@ class ClientModule:
         operation: Operation,
         path_item: PathItem,
         parameter_locations: _ParameterLocations,
+        *,
+        iterable: bool = False,
+        pagination: Pagination | None = None,
     ) -> collections.abc.Iterable[str]:
         parameter: Parameter
         previous_parameter_required: bool = True
-        method_name: str = self.get_method_name_from_path_method_operation(
-            path,
-            method,
-            (operation.operation_id if self.use_operation_id else None),
+        method_name: str = self._get_operation_method_name(
+            path, method, operation, iterable=iterable
         )
-        yield f"    def {method_name}("
+        async_: str = "async " if self._asynchronous else ""
+        yield f"    {async_}def {method_name}("
         yield "        self,"
         # Request Body
         request_body: RequestBody | None = None
@@ -3742,7 +7269,7 @@ class ClientModule:
             )
         # Response type hint
         response_type_hint: str = self._get_operation_response_type_hint(
-            operation
+            operation, iterable=iterable, pagination=pagination
         )
         yield f"    ) -> {response_type_hint}:"
 
@@ -3753,12 +7280,41 @@ class ClientModule:
         operation: Operation | Reference
         for name, operation in _iter_path_item_operations(path_item):
             try:
+                resolved_operation: Operation = self._resolve_operation(
+                    operation
+                )
                 yield from self._iter_operation_method_source(
                     path,
                     name,
-                    self._resolve_operation(operation),
+                    resolved_operation,
                     path_item=path_item,
                 )
+                pagination: Pagination | None = self._get_pagination(
+                    path, name, resolved_operation, path_item
+                )
+                if pagination is not None:
+                    # Paginated methods take precedence over iterable
+                    # array response methods, since both are named "iter_"
+                    yield from self._iter_operation_method_source(
+                        path,
+                        name,
+                        resolved_operation,
+                        path_item=path_item,
+                        iterable=True,
+                        pagination=pagination,
+                    )
+                elif (
+                    self._iterable_array_responses
+                    and not self._asynchronous
+                    and self._is_array_operation(resolved_operation)
+                ):
+                    yield from self._iter_operation_method_source(
+                        path,
+                        name,
+                        resolved_operation,
+                        path_item=path_item,
+                        iterable=True,
+                    )
             except Exception as error:
                 sob.errors.append_exception_text(
                     error,
@@ -3831,7 +7387,7 @@ class ClientModule:
             pattern: Pattern = re.compile(
                 f"(\\n\\s*{parameter_name}:"
                 r"(?:.|\n)*?=\s*)((?:.|\n)*?)"
-                r"(,?\n\s*(?:[\w_]+|\)):)"
+                r"(,?\n\s*(?:[\w_]+:|\)))"
             )
             matched: Match | None = pattern.search(init_declaration_source)
             if matched:
@@ -3893,7 +7449,11 @@ class ClientModule:
             (
                 r'(?:"|\b)('
                 "SSLContext|default_retry_hook|DEFAULT_RETRY_FOR_EXCEPTIONS|"
-                "DEFAULT_RETRY_FOR_ERRORS|Client"
+                "DEFAULT_RETRY_FOR_ERRORS|RequestEvent|ResponseEvent|Cache|"
+                "RetryPolicy|RateLimiter|CircuitBreaker|OAuth2TokenStore|"
+                "CompressionPolicy|JSONCodec|Metrics|RequestTiming|Timeout|"
+                "DNSCache|"
+                "Client"
                 r')(?:"|\b)'
             ),
             r"oapi.client.\1",
@@ -4048,6 +7608,14 @@ def write_client_module(
     use_operation_id: bool = False,
     module_docstring: str | None = None,
     class_docstring: str | None = None,
+    asynchronous: bool = False,
+    iterable_array_responses: bool = False,
+    json_codec: str | None = None,
+    pagination: (
+        collections.abc.Mapping[str, Pagination]
+        | collections.abc.Sequence[tuple[str, Pagination]]
+    ) = (),
+    detect_pagination: bool = False,
 ) -> None:
     """
     This function parses an Open API document and outputs a module defining
@@ -4092,6 +7660,32 @@ def write_client_module(
             constants, expressions, etc.
         module_docstring: A docstring to insert at the top of the module.
         class_docstring: A docstring to insert in the client class.
+        asynchronous: If `True`, operation methods will be
+            coroutine functions (`async def ...`), and the base class
+            will (by default) be `oapi.client.AsyncClient`.
+        iterable_array_responses: If `True`, for each operation
+            responding with a JSON array, an additional method
+            (named "iter_" + the operation method name) will be
+            generated, which parses the response incrementally and
+            yields each array item as soon as it has been read and
+            unmarshalled. This only applies to synchronous clients.
+        json_codec: The name of the JSON codec the client should use
+            by default: "orjson", "msgspec", "ujson", "json" or "auto"
+            (see `oapi.client.get_json_codec`). If not provided, the
+            client will use the standard library (unless a codec is
+            passed when the client is initialized).
+        pagination: A mapping of operation method names (or
+            operation IDs) to an `oapi.client.Pagination` describing how
+            the operation's pages are requested. For each of these
+            operations, an additional method (named "iter_" + the
+            operation method name) will be generated, which requests
+            each page (prefetching subsequent pages in the background)
+            and yields the items in each page.
+        detect_pagination: If `True`, "iter_" methods will also be
+            generated for operations which appear to be paginated: GET
+            operations with a "cursor" (or similarly named) query
+            parameter and a next cursor response property, a "Link"
+            response header, or a "page" or "offset" query parameter.
     """
     locals_: dict[str, typing.Any] = dict(locals())
     locals_.pop("client_path")
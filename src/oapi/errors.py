@@ -38,3 +38,41 @@ class OAPIDuplicateClassNameError(OAPIError):
     callback function can be provided, so this scenario is possible in that
     case.
     """
+
+
+class OAPICircuitOpenError(OAPIError):
+    """
+    This is an error raised by `oapi.client.Client` when a request is
+    refused, without being sent, because the circuit breaker for the
+    request's host (or operation) is open: recent requests have failed at a
+    rate exceeding the breaker's threshold.
+    """
+
+    def __init__(self, key: tuple[str, ...], retry_after: float) -> None:
+        """
+        Parameters:
+            key: The host (or host, method and path) for which the circuit
+                is open.
+            retry_after: The number of seconds before the circuit will
+                permit a trial request.
+        """
+        self.key: tuple[str, ...] = key
+        self.retry_after: float = retry_after
+        super().__init__(
+            f"The circuit for {' '.join(key)} is open: requests will be "
+            f"refused for {retry_after:.1f} more seconds"
+        )
+
+    def __reduce__(self) -> tuple[type, tuple[tuple[str, ...], float]]:
+        return type(self), (self.key, self.retry_after)
+
+
+class OAPITimeoutError(OAPIError, TimeoutError):
+    """
+    This is an error raised by `oapi.client.Client` when the total timeout
+    of an attempt at a request (see `oapi.client.Timeout`), or the deadline
+    of a call (see `oapi.client.Deadline`), elapses.
+    """
+
+    def __init__(self, message: str = "timed out") -> None:
+        super().__init__(message)
@@ -5,8 +5,10 @@ import importlib
 import importlib.util
 import os
 import shutil
+import ssl
 import subprocess
 import sys
+import typing
 import urllib.error
 import urllib.request
 from collections.abc import Callable, Iterator
@@ -47,10 +49,11 @@ def generated_module_loader(
 @pytest.fixture
 def generated_client_package(
     tmp_path: Path,
-) -> Iterator[Callable[[OpenAPI], tuple[ModuleType, ModuleType]]]:
+) -> Iterator[Callable[..., tuple[ModuleType, ModuleType]]]:
     """
     Generates a real `oapi.model`/`oapi.client` module pair from a real
-    `OpenAPI` document, writes them into a real, importable package (the
+    `OpenAPI` document (passing any additional keyword arguments on to
+    `ClientModule`), writes them into a real, importable package (the
     generated client module uses a package-relative `from . import
     model` import, so it cannot be loaded as a standalone file the way
     `generated_module_loader` loads single files), and returns
@@ -60,7 +63,9 @@ def generated_client_package(
     inserted_sys_path: str | None = None
 
     def load(
-        open_api: OpenAPI, package_name: str = "generated_client_pkg"
+        open_api: OpenAPI,
+        package_name: str = "generated_client_pkg",
+        **client_module_kwargs: typing.Any,
     ) -> tuple[ModuleType, ModuleType]:
         nonlocal inserted_sys_path
         package_dir: Path = tmp_path / package_name
@@ -69,9 +74,9 @@ def generated_client_package(
         model_path: Path = package_dir / "model.py"
         model_path.write_text(str(ModelModule(open_api)))
         client_path: Path = package_dir / "client.py"
-        ClientModule(open_api, model_path=str(model_path)).save(
-            str(client_path)
-        )
+        ClientModule(
+            open_api, model_path=str(model_path), **client_module_kwargs
+        ).save(str(client_path))
         if inserted_sys_path is None:
             sys.path.insert(0, str(tmp_path))
             inserted_sys_path = str(tmp_path)
@@ -93,6 +98,47 @@ def generated_client_package(
         sys.path.remove(inserted_sys_path)
 
 
+@pytest.fixture(scope="session")
+def server_ssl_context(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> ssl.SSLContext:
+    """
+    A server-side SSL context with a self-signed certificate for
+    "127.0.0.1", for use with `servers.http_test_server`. The certificate
+    is generated using the `openssl` command: if that is not installed,
+    tests depending on this fixture are skipped.
+    """
+    if shutil.which("openssl") is None:
+        pytest.skip("`openssl` is not installed.")
+    directory: Path = tmp_path_factory.mktemp("tls")
+    certificate: Path = directory / "certificate.pem"
+    key: Path = directory / "key.pem"
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=127.0.0.1",
+            "-keyout",
+            str(key),
+            "-out",
+            str(certificate),
+        ],
+        check=True,
+        capture_output=True,
+        timeout=60,
+    )
+    context: ssl.SSLContext = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certificate, key)
+    return context
+
+
 _COMPOSE_FILE: Path = Path(__file__).resolve().parent / "docker-compose.yml"
 
 
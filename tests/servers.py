@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import ssl
 import threading
+import time
 from collections.abc import Callable, Iterator, Mapping
 from contextlib import contextmanager
 from dataclasses import dataclass, field
@@ -15,6 +17,7 @@ class RecordedRequest:
     query: str
     headers: dict[str, str]
     body: bytes
+    client_address: tuple[str, int] = ("", 0)
 
 
 @dataclass
@@ -22,6 +25,9 @@ class Response:
     status: int = 200
     headers: dict[str, str] = field(default_factory=dict)
     body: bytes = b"{}"
+    # If set, the body is sent one byte at a time, at this interval (in
+    # seconds)
+    drip_interval: float = 0.0
 
 
 ResponseKey = tuple[str, str]
@@ -37,8 +43,11 @@ class HTTPTestServer(ThreadingHTTPServer):
         sequences: Mapping[ResponseKey, list[Response]] | None = None,
         handlers: Mapping[ResponseKey, ResponseHandler] | None = None,
         default_response: Response | None = None,
+        protocol_version: str = "HTTP/1.0",
+        ssl_context: ssl.SSLContext | None = None,
     ) -> None:
         self.requests: list[RecordedRequest] = []
+        self.ssl_context: ssl.SSLContext | None = ssl_context
         self._lock = threading.Lock()
         self.responses: dict[ResponseKey, Response] = dict(responses or {})
         self.sequences: dict[ResponseKey, list[Response]] = {
@@ -48,13 +57,25 @@ class HTTPTestServer(ThreadingHTTPServer):
             handlers or {}
         )
         self.default_response: Response = default_response or Response()
-        super().__init__(("127.0.0.1", 0), _RequestHandler)
+        # HTTP/1.1 keeps connections alive between requests, HTTP/1.0 closes
+        # them after each response
+        handler_class: type[_RequestHandler] = type(
+            "_RequestHandler",
+            (_RequestHandler,),
+            {"protocol_version": protocol_version},
+        )
+        super().__init__(("127.0.0.1", 0), handler_class)
+        if ssl_context is not None:
+            self.socket = ssl_context.wrap_socket(
+                self.socket, server_side=True
+            )
 
     @property
     def url(self) -> str:
         host, port = self.server_address[:2]
         host_str: str = host if isinstance(host, str) else host.decode()
-        return f"http://{host_str}:{port}"
+        scheme: str = "http" if self.ssl_context is None else "https"
+        return f"{scheme}://{host_str}:{port}"
 
     def record(self, request: RecordedRequest) -> None:
         with self._lock:
@@ -77,16 +98,31 @@ class HTTPTestServer(ThreadingHTTPServer):
 class _RequestHandler(BaseHTTPRequestHandler):
     server: HTTPTestServer
 
+    def _read_chunked_body(self) -> bytes:
+        chunks: list[bytes] = []
+        while True:
+            size = int(self.rfile.readline().split(b";", 1)[0].strip(), 16)
+            if not size:
+                # Skip any trailers, up to the terminating blank line
+                while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+
     def _handle(self) -> None:
         parsed = urlsplit(self.path)
         length = int(self.headers.get("Content-length") or 0)
         body = self.rfile.read(length) if length else b""
+        if self.headers.get("Transfer-encoding", "").lower() == "chunked":
+            body = self._read_chunked_body()
         request = RecordedRequest(
             method=self.command,
             path=parsed.path,
             query=parsed.query,
             headers=dict(self.headers.items()),
             body=body,
+            client_address=self.client_address[:2],
         )
         self.server.record(request)
         response = self.server.response_for(request)
@@ -96,9 +132,21 @@ class _RequestHandler(BaseHTTPRequestHandler):
         if "Content-length" not in response.headers:
             self.send_header("Content-length", str(len(response.body)))
         self.end_headers()
-        if response.body:
+        if response.drip_interval:
+            self._drip(response.body, response.drip_interval)
+        elif response.body:
             self.wfile.write(response.body)
 
+    def _drip(self, body: bytes, interval: float) -> None:
+        index: int
+        for index in range(len(body)):
+            time.sleep(interval)
+            try:
+                self.wfile.write(body[index : index + 1])
+            except OSError:
+                # The client has stopped reading
+                return
+
     def do_GET(self) -> None:  # noqa: N802
         self._handle()
 
@@ -124,12 +172,16 @@ def http_test_server(
     sequences: Mapping[ResponseKey, list[Response]] | None = None,
     handlers: Mapping[ResponseKey, ResponseHandler] | None = None,
     default_response: Response | None = None,
+    protocol_version: str = "HTTP/1.0",
+    ssl_context: ssl.SSLContext | None = None,
 ) -> Iterator[HTTPTestServer]:
     server = HTTPTestServer(
         responses=responses,
         sequences=sequences,
         handlers=handlers,
         default_response=default_response,
+        protocol_version=protocol_version,
+        ssl_context=ssl_context,
     )
     thread = threading.Thread(target=server.serve_forever, daemon=True)
     thread.start()
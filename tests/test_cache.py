@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import os
+import time
+from email.message import Message
+from http.client import HTTPResponse
+from pathlib import Path
+from urllib.request import Request
+
+import pytest
+
+from oapi._cache import (
+    Cache,
+    FileCache,
+    MemoryCache,
+    _CachedResponse,
+    _parse_cache_control,
+    get_cached_response,
+    store_response,
+)
+from oapi._transport import _ResponseSocket
+
+# region Cache backends
+
+
+@pytest.fixture(params=["memory", "file"])
+def cache(request: pytest.FixtureRequest, tmp_path: Path) -> Cache:
+    if request.param == "memory":
+        return MemoryCache(max_size=10)
+    return FileCache(tmp_path / "cache", max_size=10)
+
+
+def test_cache_stores_and_deletes_values(cache: Cache) -> None:
+    assert cache.get("a") is None
+    cache.set("a", b"123")
+    assert cache.get("a") == b"123"
+    cache.set("a", b"45")
+    assert cache.get("a") == b"45"
+    cache.delete("a")
+    assert cache.get("a") is None
+    cache.delete("a")
+
+
+def test_cache_evicts_the_least_recently_used_values(cache: Cache) -> None:
+    cache.set("a", b"1234")
+    if isinstance(cache, FileCache):
+        # Modification times are used to order files by use
+        os.utime(cache._get_path("a"), (time.time() - 2,) * 2)
+    cache.set("b", b"1234")
+    if isinstance(cache, FileCache):
+        os.utime(cache._get_path("b"), (time.time() - 1,) * 2)
+    assert cache.get("a") == b"1234"
+    cache.set("c", b"1234")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.get("c") == b"1234"
+
+
+def test_cache_does_not_store_values_larger_than_its_maximum_size(
+    cache: Cache,
+) -> None:
+    cache.set("a", b"1234")
+    cache.set("b", b"12345678901")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+
+
+def test_cache_clear(cache: Cache) -> None:
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.clear()
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+
+
+def test_cache_backends_must_implement_each_operation() -> None:
+    class IncompleteCache(Cache):
+        def get(self, key: str) -> bytes | None:
+            return None
+
+        def set(self, key: str, value: bytes) -> None:
+            pass
+
+    with pytest.raises(TypeError, match="clear"):
+        IncompleteCache(1024)  # type: ignore[abstract]
+
+
+def test_file_cache_is_shared_by_instances_using_one_directory(
+    tmp_path: Path,
+) -> None:
+    FileCache(tmp_path).set("a", b"123")
+    cache: FileCache = FileCache(tmp_path)
+    assert cache.get("a") == b"123"
+    assert cache._size == 3
+
+
+# endregion
+
+# region Stored responses
+
+
+def _response(
+    headers: str = "", body: bytes = b"{}", status: str = "200 OK"
+) -> HTTPResponse:
+    response: HTTPResponse = HTTPResponse(
+        _ResponseSocket(  # type: ignore[arg-type]
+            f"HTTP/1.1 {status}\r\n{headers}"
+            f"Content-Length: {len(body)}\r\n\r\n".encode()
+            + body
+        ),
+        method="GET",
+    )
+    response.begin()
+    return response
+
+
+def test_parse_cache_control() -> None:
+    assert _parse_cache_control('Max-Age=60, no-cache, private="a"') == {
+        "max-age": "60",
+        "no-cache": "",
+        "private": "a",
+    }
+    assert _parse_cache_control(None) == {}
+
+
+def test_cached_responses_round_trip_through_bytes() -> None:
+    cached_response: _CachedResponse = _CachedResponse(
+        status=200,
+        reason="OK",
+        headers=[("ETag", '"a"')],
+        body=b"\n{}\n",
+        stored_at=1.5,
+        vary={"Accept": None},
+    )
+    restored: _CachedResponse = _CachedResponse.from_bytes(
+        bytes(cached_response)
+    )
+    assert restored.headers == [("ETag", '"a"')]
+    assert restored.body == b"\n{}\n"
+    assert restored.stored_at == 1.5
+    assert restored.vary == {"Accept": None}
+
+
+def test_store_response_returns_a_readable_copy_of_the_response() -> None:
+    cache: MemoryCache = MemoryCache()
+    request: Request = Request("http://example.com/a")
+    response: HTTPResponse = store_response(
+        cache,
+        request,
+        _response(
+            "Cache-Control: max-age=60\r\nTransfer-Encoding: identity\r\n",
+            b'{"a": 1}',
+        ),
+    )
+    assert response.read() == b'{"a": 1}'
+    cached_response: _CachedResponse | None = get_cached_response(
+        cache, request
+    )
+    assert cached_response is not None
+    assert cached_response.is_fresh(request)
+    assert cached_response.get_header("Transfer-Encoding") is None
+    assert cached_response.get_response(request).read() == b'{"a": 1}'
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        "",
+        "Cache-Control: no-store, max-age=60\r\n",
+        "Cache-Control: max-age=60\r\nVary: *\r\n",
+    ],
+)
+def test_store_response_does_not_store_unstorable_responses(
+    headers: str,
+) -> None:
+    cache: MemoryCache = MemoryCache()
+    request: Request = Request("http://example.com/a")
+    store_response(cache, request, _response(headers)).read()
+    assert len(cache) == 0
+
+
+def test_store_response_does_not_store_error_responses() -> None:
+    cache: MemoryCache = MemoryCache()
+    request: Request = Request("http://example.com/a")
+    store_response(
+        cache,
+        request,
+        _response("Cache-Control: max-age=60\r\n", status="404 Not Found"),
+    )
+    assert len(cache) == 0
+
+
+def test_freshness_is_determined_by_max_age_or_expires() -> None:
+    request: Request = Request("http://example.com/a")
+    now: float = time.time()
+
+    def is_fresh(*headers: tuple[str, str]) -> bool:
+        return _CachedResponse(
+            200, "OK", list(headers), b"", now - 30, {}
+        ).is_fresh(request)
+
+    assert is_fresh(("Cache-Control", "max-age=60"))
+    assert not is_fresh(("Cache-Control", "max-age=60"), ("Age", "40"))
+    assert not is_fresh(("Cache-Control", "max-age=60, no-cache"))
+    assert is_fresh(("Expires", "Fri, 01 Jan 2100 00:00:00 GMT"))
+    assert not is_fresh(("Expires", "Thu, 01 Jan 1970 00:00:00 GMT"))
+    assert not is_fresh(("ETag", '"a"'))
+    assert not _CachedResponse(
+        200, "OK", [("Cache-Control", "max-age=60")], b"", now - 30, {}
+    ).is_fresh(
+        Request(
+            "http://example.com/a", headers={"Cache-Control": "max-age=10"}
+        )
+    )
+
+
+def test_stored_responses_only_match_requests_with_the_same_vary_headers() -> (
+    None
+):
+    cache: MemoryCache = MemoryCache()
+    store_response(
+        cache,
+        Request("http://example.com/a", headers={"Accept": "text/plain"}),
+        _response("Cache-Control: max-age=60\r\nVary: Accept\r\n"),
+    )
+    assert get_cached_response(
+        cache,
+        Request("http://example.com/a", headers={"Accept": "text/plain"}),
+    )
+    assert not get_cached_response(
+        cache,
+        Request("http://example.com/a", headers={"Accept": "text/html"}),
+    )
+
+
+def test_each_variant_of_a_response_is_stored_alongside_the_others() -> None:
+    cache: MemoryCache = MemoryCache()
+    accept: str
+    for accept in ("application/json", "application/xml"):
+        response: HTTPResponse = store_response(
+            cache,
+            Request("http://example.com/a", headers={"Accept": accept}),
+            _response(
+                "Cache-Control: max-age=60\r\nVary: Accept\r\n",
+                accept.encode(),
+            ),
+        )
+        assert response.read() == accept.encode()
+    for accept in ("application/json", "application/xml"):
+        cached_response: _CachedResponse | None = get_cached_response(
+            cache, Request("http://example.com/a", headers={"Accept": accept})
+        )
+        assert cached_response is not None
+        assert cached_response.body == accept.encode()
+    assert not get_cached_response(
+        cache, Request("http://example.com/a", headers={"Accept": "text/html"})
+    )
+    # An unsafe request invalidates every variant
+    store_response(
+        cache,
+        Request("http://example.com/a", method="POST"),
+        _response(""),
+    )
+    assert not get_cached_response(
+        cache,
+        Request("http://example.com/a", headers={"Accept": "application/xml"}),
+    )
+
+
+def test_stored_responses_only_match_requests_with_the_same_credentials() -> (
+    None
+):
+    cache: MemoryCache = MemoryCache()
+    store_response(
+        cache,
+        Request("http://example.com/a", headers={"Authorization": "Basic a"}),
+        _response("Cache-Control: max-age=60\r\n"),
+    )
+    assert get_cached_response(
+        cache,
+        Request("http://example.com/a", headers={"Authorization": "Basic a"}),
+    )
+    assert not get_cached_response(
+        cache,
+        Request("http://example.com/a", headers={"Authorization": "Basic b"}),
+    )
+    assert not get_cached_response(cache, Request("http://example.com/a"))
+    # Other headers may be designated as conveying credentials
+    assert not get_cached_response(
+        cache,
+        Request(
+            "http://example.com/a",
+            headers={"Authorization": "Basic a", "X-API-Key": "a"},
+        ),
+        ("Authorization", "X-API-Key"),
+    )
+
+
+def test_revalidation_headers_replace_stored_headers() -> None:
+    cached_response: _CachedResponse = _CachedResponse(
+        200,
+        "OK",
+        [("ETag", '"a"'), ("Content-Type", "application/json")],
+        b"{}",
+        0,
+        {},
+    )
+    headers: Message = Message()
+    headers["ETag"] = '"b"'
+    headers["Content-Type"] = "text/plain"
+    headers["Content-Length"] = "0"
+    cached_response.update(headers)
+    assert cached_response.get_header("ETag") == '"b"'
+    assert cached_response.get_header("Content-Type") == "application/json"
+    assert cached_response.get_header("Content-Length") is None
+    assert cached_response.stored_at > 0
+
+
+# endregion
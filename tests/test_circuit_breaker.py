@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import pickle
+import time
+from urllib.error import HTTPError, URLError
+from urllib.request import Request
+
+import pytest
+
+from oapi._circuit_breaker import CircuitBreaker, default_failure_hook
+from oapi.errors import OAPICircuitOpenError
+
+
+def _http_error(code: int) -> HTTPError:
+    return HTTPError("http://example.com", code, "error", None, None)  # type: ignore[arg-type]
+
+
+def test_default_failure_hook() -> None:
+    assert default_failure_hook(_http_error(500))
+    assert default_failure_hook(_http_error(503))
+    assert not default_failure_hook(_http_error(404))
+    assert not default_failure_hook(_http_error(429))
+    assert default_failure_hook(URLError("refused"))
+    assert default_failure_hook(TimeoutError())
+    assert not default_failure_hook(ValueError())
+
+
+def _trip(circuit_breaker: CircuitBreaker, request: Request) -> None:
+    for _ in range(circuit_breaker.minimum_number_of_calls):
+        circuit_breaker.before(request)
+        circuit_breaker.after(request, _http_error(500))
+
+
+def test_circuit_opens_when_the_failure_rate_reaches_its_threshold() -> None:
+    circuit_breaker: CircuitBreaker = CircuitBreaker(
+        failure_rate_threshold=0.5, minimum_number_of_calls=4
+    )
+    request: Request = Request("http://example.com/a")
+    for error in (None, _http_error(500), _http_error(500)):
+        circuit_breaker.before(request)
+        circuit_breaker.after(request, error)
+    # The minimum number of calls has not been reached
+    assert circuit_breaker.get_state(request) == "closed"
+    # Errors which are not failures do not open the circuit
+    circuit_breaker.before(request)
+    circuit_breaker.after(request, _http_error(404))
+    assert circuit_breaker.get_state(request) == "closed"
+    circuit_breaker.before(request)
+    circuit_breaker.after(request, URLError("refused"))
+    assert circuit_breaker.get_state(request) == "open"
+    with pytest.raises(OAPICircuitOpenError) as exception_info:
+        circuit_breaker.before(request)
+    assert exception_info.value.key == ("example.com",)
+    assert 0 < exception_info.value.retry_after <= 30
+    # Other hosts are unaffected
+    circuit_breaker.before(Request("http://example.org/a"))
+
+
+def test_circuits_are_keyed_by_operation() -> None:
+    circuit_breaker: CircuitBreaker = CircuitBreaker(
+        minimum_number_of_calls=2, per_operation=True
+    )
+    request: Request = Request("http://example.com/a")
+    _trip(circuit_breaker, request)
+    assert circuit_breaker.get_state(request) == "open"
+    assert circuit_breaker.get_state(Request("http://example.com/b")) == (
+        "closed"
+    )
+    circuit_breaker.reset()
+    assert circuit_breaker.get_state(request) == "closed"
+
+
+def test_circuits_for_one_operation_are_shared_by_its_paths() -> None:
+    circuit_breaker: CircuitBreaker = CircuitBreaker(
+        minimum_number_of_calls=10, per_operation=True
+    )
+    index: int
+    request: Request
+    for index in range(10):
+        request = Request(f"http://example.com/pets/{index}")
+        request.operation = "getPet"  # type: ignore[attr-defined]
+        circuit_breaker.before(request)
+        circuit_breaker.after(request, _http_error(500))
+    assert circuit_breaker.get_state(request) == "open"
+    assert len(circuit_breaker._circuits) == 1
+
+
+def test_least_recently_used_circuits_are_discarded() -> None:
+    circuit_breaker: CircuitBreaker = CircuitBreaker(
+        minimum_number_of_calls=2, per_operation=True, max_circuits=2
+    )
+    request: Request = Request("http://example.com/a")
+    _trip(circuit_breaker, request)
+    circuit_breaker.after(Request("http://example.com/b"))
+    # Using a circuit makes it the most recently used
+    assert circuit_breaker.get_state(request) == "open"
+    with pytest.raises(OAPICircuitOpenError):
+        circuit_breaker.before(request)
+    circuit_breaker.after(Request("http://example.com/c"))
+    assert len(circuit_breaker._circuits) == 2
+    assert circuit_breaker.get_state(request) == "open"
+    assert ("example.com", "GET", "/b") not in circuit_breaker._circuits
+
+
+def test_half_open_circuit_closes_after_successful_trials() -> None:
+    circuit_breaker: CircuitBreaker = CircuitBreaker(
+        minimum_number_of_calls=2, reset_timeout=0.05, half_open_max_calls=2
+    )
+    request: Request = Request("http://example.com/a")
+    _trip(circuit_breaker, request)
+    time.sleep(0.06)
+    assert circuit_breaker.get_state(request) == "half-open"
+    circuit_breaker.before(request)
+    circuit_breaker.before(request)
+    # Only `half_open_max_calls` trial requests are permitted at once
+    with pytest.raises(OAPICircuitOpenError):
+        circuit_breaker.before(request)
+    circuit_breaker.after(request)
+    assert circuit_breaker.get_state(request) == "half-open"
+    circuit_breaker.after(request)
+    assert circuit_breaker.get_state(request) == "closed"
+
+
+def test_half_open_circuit_reopens_after_a_failed_trial() -> None:
+    circuit_breaker: CircuitBreaker = CircuitBreaker(
+        minimum_number_of_calls=2, reset_timeout=0.05
+    )
+    request: Request = Request("http://example.com/a")
+    _trip(circuit_breaker, request)
+    time.sleep(0.06)
+    circuit_breaker.before(request)
+    circuit_breaker.after(request, TimeoutError())
+    assert circuit_breaker.get_state(request) == "open"
+    with pytest.raises(OAPICircuitOpenError):
+        circuit_breaker.before(request)
+
+
+def test_half_open_circuit_releases_trials_without_an_outcome() -> None:
+    circuit_breaker: CircuitBreaker = CircuitBreaker(
+        minimum_number_of_calls=2, reset_timeout=0.05
+    )
+    request: Request = Request("http://example.com/a")
+    _trip(circuit_breaker, request)
+    time.sleep(0.06)
+    circuit_breaker.before(request)
+    with pytest.raises(OAPICircuitOpenError) as exception_info:
+        circuit_breaker.before(request)
+    assert 0 < exception_info.value.retry_after <= 0.05
+    # A released trial (such as a cancelled request) permits another
+    circuit_breaker.release(request)
+    circuit_breaker.before(request)
+    assert circuit_breaker.get_state(request) == "half-open"
+    # A trial whose outcome is never recorded is given up on after the
+    # reset timeout
+    time.sleep(0.06)
+    circuit_breaker.before(request)
+    circuit_breaker.after(request)
+    assert circuit_breaker.get_state(request) == "closed"
+
+
+def test_circuit_open_error_is_pickleable() -> None:
+    error: OAPICircuitOpenError = pickle.loads(
+        pickle.dumps(OAPICircuitOpenError(("example.com",), 1.5))
+    )
+    assert error.key == ("example.com",)
+    assert error.retry_after == 1.5
+    assert "example.com" in str(error)
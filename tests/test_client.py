@@ -1,20 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import collections.abc
 import contextlib
 import decimal
 import gzip
+import http.client
 import inspect
 import io
 import json as json_module
 import logging
+import os
 import pickle
+import socket
+import ssl
 import tempfile
 import threading
+import time
 import typing
 import warnings
 import zlib
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date, datetime
 from email.message import Message
 from http.cookiejar import CookieJar
@@ -22,17 +29,39 @@ from logging import Logger, getLogger
 from pathlib import Path
 from types import ModuleType
 from urllib.error import HTTPError
+from urllib.parse import parse_qsl
 from urllib.request import OpenerDirector, Request, urlopen
 
 import pytest
 import sob
-from servers import Response, http_test_server
+from servers import RecordedRequest, Response, http_test_server
 
 from oapi._multipart_request import MultipartRequest, Part
+from oapi._transport import _ResponseSocket
 from oapi.client import (
+    _DECODING_CHUNK_SIZE,
     URLENCODE_SAFE,
+    AsyncClient,
+    CircuitBreaker,
     Client,
+    ClientModule,
+    CompressionPolicy,
+    Deadline,
+    DNSCache,
+    FileCache,
+    FileOAuth2TokenStore,
+    JSONCodec,
+    MemoryCache,
+    MetricsAggregator,
+    Pagination,
+    RateLimiter,
+    RequestEvent,
+    RequestTemplate,
+    RequestTiming,
+    ResponseEvent,
+    RetryPolicy,
     SSLContext,
+    Timeout,
     _assemble_request,
     _censor_long_json_strings,
     _decode_content,
@@ -61,14 +90,22 @@ from oapi.client import (
     _represent_http_response,
     _schema_defines_model,
     _set_response_callback,
+    _set_response_read_hook,
     _strip_def_decorators,
     default_retry_hook,
     format_argument_value,
+    get_argument_formatter,
     get_default_method_name_from_path_method_operation,
     get_request_curl,
+    get_ssl_context,
+    iter_json_array,
+    iter_unmarshal_array,
     retry,
     urlencode,
+    write_client_module,
 )
+from oapi.errors import OAPICircuitOpenError, OAPITimeoutError
+from oapi.model import ModelModule
 from oapi.oas.model import (
     OpenAPI,
     Operation,
@@ -551,6 +588,40 @@ def test_format_argument_value_multipart_bypasses_a_sequence_of_bytes() -> (
     )
 
 
+@pytest.mark.parametrize(
+    ("style", "value", "explode"),
+    [
+        ("simple", [1, 2], False),
+        ("simple", {"a": 1}, True),
+        ("label", [1, 2], True),
+        ("matrix", [1, 2], False),
+        ("form", [1, 2], True),
+        ("spaceDelimited", [1, 2], False),
+        ("pipeDelimited", [1, 2], False),
+        ("deepObject", {"a": {"b": 1}}, True),
+        ("dotObject", {"a": 1}, True),
+        ("simple", Reference({"$ref": "#/x"}), False),
+    ],
+)
+def test_get_argument_formatter_matches_format_argument_value(
+    style: str, value: typing.Any, explode: bool
+) -> None:
+    assert get_argument_formatter("id", style, explode=explode)(
+        value
+    ) == format_argument_value("id", value, style, explode=explode)
+
+
+def test_get_argument_formatter_rejects_an_unknown_style() -> None:
+    with pytest.raises(ValueError, match="bogus"):
+        get_argument_formatter("id", "bogus")
+
+
+def test_get_argument_formatter_multipart_bypasses_binary_values() -> None:
+    value: list[bytes] = [b"a", b"b"]
+    assert get_argument_formatter("id", "form", multipart=True)(value) is value
+    assert get_argument_formatter("id", "form")(value) == "YQ==,Yg=="
+
+
 # endregion
 
 # region Request/response assembly
@@ -1035,6 +1106,72 @@ def test_assemble_request_multipart_json_encodes_a_mapping_value() -> None:
     assert part.data == b'{"a": 1}'
 
 
+def test_request_template_formats_each_parameter_location() -> None:
+    template: RequestTemplate = RequestTemplate(
+        "/pets/{id}/{kind}.json",
+        "GET",
+        path_parameters=(("kind", "label", False), ("id", "simple", False)),
+        query_parameters=(("tags", "form", False), ("limit", "form", True)),
+        header_parameters=(("X-Trace", "simple", False),),
+        cookie_parameters=(("session", "form", True),),
+    )
+    assert template(
+        path=("dog", [1, 2]),
+        query=(["a", "b"], None),
+        headers=("abc",),
+        cookies=("xyz",),
+    ) == {
+        "path": "/pets/1,2/.dog.json",
+        "method": "GET",
+        "query": "tags=a,b",
+        "headers": {"X-Trace": "abc", "Cookie": "session=xyz"},
+    }
+
+
+def test_request_template_without_parameters_returns_the_path() -> None:
+    assert RequestTemplate("/pets", "GET")() == {
+        "path": "/pets",
+        "method": "GET",
+    }
+
+
+def test_request_template_reports_unknown_path_parameters_when_called() -> (
+    None
+):
+    # A path placeholder without a matching parameter is only an error
+    # once a request is made
+    template: RequestTemplate = RequestTemplate(
+        "/pets/{id}/{kind}",
+        "GET",
+        path_parameters=(("id", "simple", False),),
+    )
+    with pytest.raises(KeyError, match="kind"):
+        template(path=(1,))
+    # ...and, without any path parameters, the path is used as-is
+    assert RequestTemplate(
+        "/pets/{id}", "GET", query_parameters=(("limit", "form", True),)
+    )(query=(2,)) == {
+        "path": "/pets/{id}",
+        "method": "GET",
+        "query": "limit=2",
+    }
+
+
+def test_request_template_passes_binary_multipart_data_through() -> None:
+    template: RequestTemplate = RequestTemplate(
+        "/upload",
+        "POST",
+        data_parameters=(("file", "form", True), ("name", "form", True)),
+        multipart=True,
+    )
+    assert template(data=(b"binary", "x")) == {
+        "path": "/upload",
+        "method": "POST",
+        "data": {"file": b"binary", "name": "x"},
+        "multipart": True,
+    }
+
+
 # endregion
 
 # region Retry decorator and content encoding
@@ -1179,6 +1316,174 @@ def test_retry_logs_a_warning_when_a_logger_is_provided() -> None:
         logger.removeHandler(handler)
 
 
+def test_retry_counts_attempts_per_call(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("oapi.client.sleep", lambda seconds: None)
+    calls: list[int] = []
+
+    @retry(number_of_attempts=2, errors=ValueError, retry_hook=lambda e: True)
+    def fails_every_other_call() -> str:
+        calls.append(1)
+        if len(calls) % 2:
+            message: str = "fail"
+            raise ValueError(message)
+        return "ok"
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        assert fails_every_other_call() == "ok"
+        assert fails_every_other_call() == "ok"
+    assert len(calls) == 4
+
+
+def _http_error(code: int, retry_after: str | None = None) -> HTTPError:
+    headers: Message = Message()
+    if retry_after is not None:
+        headers["Retry-After"] = retry_after
+    return HTTPError("http://x", code, "error", headers, None)
+
+
+def test_retry_policy_delays_use_decorrelated_jitter() -> None:
+    policy: RetryPolicy = RetryPolicy(
+        number_of_attempts=10, base_delay=1, max_delay=5, budget=0
+    )
+    error: HTTPError = _http_error(500)
+    for _ in range(50):
+        assert policy.get_delay(error, 1) == 1
+        delay: float | None = policy.get_delay(error, 2, 1.5)
+        assert delay is not None
+        assert 1 <= delay <= 4.5
+        # Delays are capped at `max_delay`
+        delay = policy.get_delay(error, 3, 4)
+        assert delay is not None
+        assert 1 <= delay <= 5
+
+
+def test_retry_policy_does_not_retry_beyond_its_number_of_attempts() -> None:
+    policy: RetryPolicy = RetryPolicy(number_of_attempts=2)
+    assert policy.get_delay(_http_error(500), 1) is not None
+    assert policy.get_delay(_http_error(500), 2) is None
+    # Errors excluded by the retry hook are not retried
+    assert policy.get_delay(_http_error(404), 1) is None
+    assert policy.get_delay(ValueError("not retried"), 1) is None
+
+
+def test_retry_policy_honors_retry_after() -> None:
+    policy: RetryPolicy = RetryPolicy(base_delay=0, max_delay=1)
+    assert policy.get_delay(_http_error(429, "30"), 1) == 30
+    assert policy.get_delay(_http_error(503, "2"), 1) == 2
+    # "Retry-After" is only honored for 429 and 503 responses
+    assert policy.get_delay(_http_error(500, "30"), 1) == 0
+    delay: float | None = policy.get_delay(
+        _http_error(503, "Fri, 01 Jan 2100 00:00:00 GMT"), 1
+    )
+    assert delay is not None
+    assert delay > 1
+
+
+def test_retry_policy_does_not_retry_beyond_its_deadline() -> None:
+    policy: RetryPolicy = RetryPolicy(base_delay=1, max_delay=1, deadline=5)
+    assert policy.get_delay(_http_error(500), 1, elapsed=3) == 1
+    assert policy.get_delay(_http_error(500), 1, elapsed=4.5) is None
+    assert policy.get_delay(_http_error(429, "10"), 1) is None
+
+
+def test_retry_policy_clips_delays_to_the_time_remaining() -> None:
+    policy: RetryPolicy = RetryPolicy(base_delay=1, max_delay=10, budget=0)
+    error: HTTPError = _http_error(500)
+    for _ in range(50):
+        delay: float | None = policy.get_delay(error, 2, 4, remaining=2)
+        assert delay is not None
+        assert 1 <= delay < 2
+    # If the minimum delay would not end before the deadline, the attempt
+    # is not retried
+    assert policy.get_delay(error, 1, remaining=1) is None
+    assert policy.get_delay(_http_error(429, "5"), 1, remaining=3) is None
+
+
+def test_retry_policy_does_not_start_an_attempt_after_its_expiry() -> None:
+    policy: RetryPolicy = RetryPolicy()
+    calls: list[int] = []
+
+    def call() -> None:
+        calls.append(1)
+
+    async def async_call() -> None:
+        calls.append(1)
+
+    with pytest.raises(OAPITimeoutError):
+        policy.call(call, expiry=time.monotonic())
+    with pytest.raises(OAPITimeoutError):
+        asyncio.run(policy.async_call(async_call, expiry=time.monotonic()))
+    assert not calls
+    policy.call(call, expiry=time.monotonic() + 10)
+    assert len(calls) == 1
+
+
+def test_retry_policy_budget_is_withdrawn_by_retries_and_refilled(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("oapi.client.sleep", lambda seconds: None)
+    policy: RetryPolicy = RetryPolicy(budget=2, budget_ratio=0.5)
+    error: HTTPError = _http_error(500)
+    assert policy.get_delay(error, 1) is not None
+    assert policy.get_delay(error, 1) is not None
+    assert policy.get_delay(error, 1) is None
+    # Two successful calls deposit one token
+    assert policy.call(lambda: "ok") == "ok"
+    assert policy.call(lambda: "ok") == "ok"
+    assert policy.get_delay(error, 1) is not None
+    assert policy.get_delay(error, 1) is None
+
+
+def test_retry_policy_call_retries_until_success(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    sleep_calls: list[float] = []
+    monkeypatch.setattr("oapi.client.sleep", sleep_calls.append)
+    policy: RetryPolicy = RetryPolicy(
+        number_of_attempts=3, errors=(ValueError,), retry_hook=lambda e: True
+    )
+    calls: list[int] = []
+
+    def flaky() -> str:
+        calls.append(1)
+        if len(calls) < 3:
+            message: str = "fail"
+            raise ValueError(message)
+        return "ok"
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        assert policy.call(flaky) == "ok"
+    assert len(sleep_calls) == 2
+    assert sleep_calls[0] == 1
+    assert 1 <= sleep_calls[1] <= 3
+
+
+def test_retry_policy_async_call_retries_until_success() -> None:
+    policy: RetryPolicy = RetryPolicy(
+        errors=(ValueError,),
+        retry_hook=lambda e: True,
+        base_delay=0,
+        max_delay=0,
+    )
+    calls: list[int] = []
+
+    async def flaky() -> str:
+        calls.append(1)
+        if len(calls) < 2:
+            message: str = "fail"
+            raise ValueError(message)
+        return "ok"
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        assert asyncio.run(policy.async_call(flaky)) == "ok"
+    assert len(calls) == 2
+
+
 @pytest.mark.parametrize("encoding", ["gzip", "deflate", "zstd", "br"])
 def test_encode_and_decode_content_round_trip(encoding: str) -> None:
     data: bytes = b'{"hello": "world"}' * 50
@@ -1241,6 +1546,251 @@ def test_decode_content_comma_branch_reverses_a_real_encoding_chain() -> None:
     assert _decode_content(double_encoded, "gzip,deflate") == data
 
 
+def _encoded_response(
+    data: bytes, content_encoding: str
+) -> http.client.HTTPResponse:
+    body: bytes = _encode_content(data, content_encoding)
+    response: http.client.HTTPResponse = http.client.HTTPResponse(
+        _ResponseSocket(  # type: ignore[arg-type]
+            b"HTTP/1.1 200 OK\r\n"
+            + f"Content-Encoding: {content_encoding}\r\n".encode()
+            + f"Content-Length: {len(body)}\r\n\r\n".encode()
+            + body
+        )
+    )
+    response.begin()
+    return response
+
+
+_STREAMED_DATA: bytes = b"".join(
+    b'{"index": %d}\n' % index for index in range(20000)
+)
+
+
+@pytest.mark.parametrize(
+    "content_encoding", ("gzip", "deflate", "zstd", "br", "gzip, br")
+)
+def test_set_response_read_hook_decodes_content_incrementally(
+    content_encoding: str,
+) -> None:
+    response: http.client.HTTPResponse = _encoded_response(
+        _STREAMED_DATA, content_encoding
+    )
+    _set_response_read_hook(response)
+    chunks: list[bytes] = []
+    chunk: bytes = response.read(1000)
+    while chunk:
+        assert len(chunk) <= 1000
+        chunks.append(chunk)
+        chunk = response.read(1000)
+    assert b"".join(chunks) == _STREAMED_DATA
+
+
+def test_set_response_read_hook_decodes_raw_deflate_and_gzip_members() -> None:
+    response: http.client.HTTPResponse = http.client.HTTPResponse(
+        _ResponseSocket(  # type: ignore[arg-type]
+            b"HTTP/1.0 200 OK\r\nContent-Encoding: gzip\r\n\r\n"
+            + gzip.compress(b"[1, ")
+            + gzip.compress(b"2]")
+        )
+    )
+    response.begin()
+    _set_response_read_hook(response)
+    assert response.read() == b"[1, 2]"
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    response = http.client.HTTPResponse(
+        _ResponseSocket(  # type: ignore[arg-type]
+            b"HTTP/1.0 200 OK\r\nContent-Encoding: deflate\r\n\r\n"
+            + compressor.compress(b"[1, 2]")
+            + compressor.flush()
+        )
+    )
+    response.begin()
+    _set_response_read_hook(response)
+    assert response.read() == b"[1, 2]"
+
+
+def test_set_response_read_hook_supports_line_and_buffered_reads() -> None:
+    response: http.client.HTTPResponse = _encoded_response(
+        _STREAMED_DATA, "gzip"
+    )
+    _set_response_read_hook(response)
+    assert response.readline() == b'{"index": 0}\n'
+    assert next(iter(response)) == b'{"index": 1}\n'
+    buffer: bytearray = bytearray(5)
+    assert response.readinto(buffer) == 5
+    assert bytes(buffer) == b'{"ind'
+    assert response.read1(3) == b'ex"'
+    lines: list[bytes] = list(response)
+    assert lines[0] == b": 2}\n"
+    assert b"".join(lines) == _STREAMED_DATA[len(b'{"index": 0}\n' * 2) + 8 :]
+
+
+def test_set_response_read_hook_bounds_each_raw_read(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Reading a large compressed response in full only ever reads a bounded
+    amount of compressed data at a time, so that the compressed response
+    is never held in memory alongside the decoded response.
+    """
+    response: http.client.HTTPResponse = _encoded_response(
+        _STREAMED_DATA, "gzip"
+    )
+    _set_response_read_hook(response)
+    raw_read: Callable[..., bytes] = http.client.HTTPResponse.read
+    amounts: list[int | None] = []
+
+    def read(self: http.client.HTTPResponse, amt: int | None = None) -> bytes:
+        amounts.append(amt)
+        return raw_read(self, amt)
+
+    monkeypatch.setattr(http.client.HTTPResponse, "read", read)
+    assert b"".join(iter(lambda: response.read(65536), b"")) == _STREAMED_DATA
+    assert amounts
+    assert all(
+        amount is not None and amount <= _DECODING_CHUNK_SIZE
+        for amount in amounts
+    )
+
+
+@pytest.mark.parametrize(
+    "content_encoding", ("gzip", "deflate", "zstd", "br", "gzip, br")
+)
+def test_set_response_read_hook_bounds_decoded_output(
+    content_encoding: str,
+) -> None:
+    """
+    Highly compressed content is only decoded as it is read, rather than
+    each chunk of compressed data being decoded in full.
+    """
+    data: bytes = bytes(16 * 1024 * 1024)
+    response: http.client.HTTPResponse = _encoded_response(
+        data, content_encoding
+    )
+    _set_response_read_hook(response)
+    reader: typing.Any = response.read.__self__  # type: ignore[attr-defined]
+    size: int = 0
+    largest_buffer: int = 0
+    chunk: bytes = response.read(_DECODING_CHUNK_SIZE)
+    while chunk:
+        size += len(chunk)
+        largest_buffer = max(largest_buffer, len(reader._buffer))
+        chunk = response.read(_DECODING_CHUNK_SIZE)
+    assert size == len(data)
+    assert largest_buffer <= 4 * _DECODING_CHUNK_SIZE
+
+
+def test_set_response_read_hook_passes_decoded_chunks_to_the_hook() -> None:
+    response: http.client.HTTPResponse = _encoded_response(
+        _STREAMED_DATA, "gzip"
+    )
+    chunks: list[bytes] = []
+    _set_response_read_hook(
+        response, lambda response, data: chunks.append(data)
+    )
+    assert response.read(10) == _STREAMED_DATA[:10]
+    assert response.read() == _STREAMED_DATA[10:]
+    assert b"".join(chunks) == _STREAMED_DATA
+
+
+def test_set_response_read_hook_leaves_unencoded_responses_untouched() -> None:
+    response: http.client.HTTPResponse = _encoded_response(b"{}", "identity")
+    _set_response_read_hook(response)
+    assert "read" not in vars(response)
+    assert response.read() == b"{}"
+
+
+# endregion
+
+# region Incremental JSON array deserialization
+
+
+class _CountingReader(io.BytesIO):
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.bytes_read: int = 0
+
+    def read(self, size: int | None = -1) -> bytes:
+        data: bytes = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+@pytest.mark.parametrize("chunk_size", (1, 7, 16384))
+def test_iter_json_array_yields_each_item(chunk_size: int) -> None:
+    data: bytes = (
+        b'\xef\xbb\xbf [ 1, -2.5e3 , "a\\"]", {"b": [1, {}]},'
+        b' [], null, true, false, "\xc3\xa9" ] '
+    )
+    assert list(iter_json_array(io.BytesIO(data), chunk_size)) == [
+        1,
+        -2500.0,
+        'a"]',
+        {"b": [1, {}]},
+        [],
+        None,
+        True,
+        False,
+        "\u00e9",
+    ]
+    assert list(iter_json_array(io.BytesIO(b"[]"), chunk_size)) == []
+
+
+def test_iter_json_array_only_reads_what_is_needed_for_each_item() -> None:
+    data: bytes = json_module.dumps(
+        [{"index": index} for index in range(100000)]
+    ).encode()
+    reader: _CountingReader = _CountingReader(data)
+    items: collections.abc.Iterator[typing.Any] = iter_json_array(
+        reader, chunk_size=1024
+    )
+    assert next(items) == {"index": 0}
+    assert reader.bytes_read == 1024
+    assert sum(1 for _ in items) == 99999
+    assert reader.bytes_read == len(data)
+
+
+@pytest.mark.parametrize(
+    "data", (b"", b"{}", b"[1", b"[1,]", b"[1 2]", b"[1.]", b"[tru]")
+)
+def test_iter_json_array_raises_a_deserialize_error_for_invalid_data(
+    data: bytes,
+) -> None:
+    with pytest.raises(sob.errors.DeserializeError):
+        list(iter_json_array(io.BytesIO(data)))
+
+
+def test_iter_unmarshal_array_unmarshals_items_as_the_array_item_types() -> (
+    None
+):
+    class Item(sob.Object):
+        __slots__: tuple[str, ...] = ("name",)
+
+        def __init__(
+            self, _data: typing.Any = None, name: str | None = None
+        ) -> None:
+            self.name: str | None = name
+            super().__init__(_data)
+
+    sob.get_writable_object_meta(Item).properties = sob.Properties(
+        [("name", sob.StringProperty())]
+    )
+
+    class Items(sob.Array):
+        pass
+
+    sob.get_writable_array_meta(Items).item_types = sob.MutableTypes([Item])
+    items: list[typing.Any] = list(
+        iter_unmarshal_array(
+            io.BytesIO(b'[{"name": "a"}, {"name": "b"}]'), Items
+        )
+    )
+    assert all(isinstance(item, Item) for item in items)
+    assert [item.name for item in items] == ["a", "b"]
+    assert list(iter_unmarshal_array(io.BytesIO(b"[1, 2]"))) == [1, 2]
+
+
 # endregion
 
 # region Pickling helpers and SSLContext
@@ -1304,6 +1854,42 @@ def test_ssl_context_pickles_as_a_fresh_instance() -> None:
     assert unpickled is not context
 
 
+def test_get_ssl_context_shares_one_context_per_verification_setting() -> None:
+    context: SSLContext = get_ssl_context()
+    assert get_ssl_context() is context
+    assert get_ssl_context(True) is context
+    unverified: SSLContext = get_ssl_context(check_hostname=False)
+    assert unverified is not context
+    assert unverified.check_hostname is False
+    # Unpickled contexts are the shared context
+    assert pickle.loads(pickle.dumps(context)) is context
+    assert pickle.loads(pickle.dumps(SSLContext(False))) is unverified
+
+
+def test_clients_share_ssl_contexts_and_resume_tls_sessions(
+    server_ssl_context: ssl.SSLContext,
+) -> None:
+    timings: list[RequestTiming] = []
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b"{}")},
+        ssl_context=server_ssl_context,
+    ) as server:
+        # Each short-lived client opens a new connection, but only the
+        # first performs a full TLS handshake
+        for _ in range(2):
+            client: Client = Client(
+                url=server.url,
+                verify_ssl_certificate=False,
+                timing_hook=timings.append,
+            )
+            assert client.request("/foo", "GET").read() == b"{}"
+            client.close()
+    assert [timing.resumed_tls_session for timing in timings] == [
+        False,
+        True,
+    ]
+
+
 # endregion
 
 # region Client construction, validation, and pickling
@@ -1372,6 +1958,31 @@ def test_getstate_excludes_the_private_opener() -> None:
     assert state["user"] == "u"
 
 
+def test_getstate_excludes_the_private_connection_pool() -> None:
+    client: Client = Client(url="http://example.com", connection_pool_size=2)
+    client._opener  # noqa: B018
+    state: dict[str, object] = client.__getstate__()
+    assert "__connection_pool" not in state
+    assert state["connection_pool_size"] == 2
+    unpickled: Client = pickle.loads(pickle.dumps(client))
+    assert unpickled.connection_pool_size == 2
+
+
+def test_opener_without_a_connection_pool_closes_each_connection() -> None:
+    with http_test_server(
+        responses={("GET", "/foo"): Response(status=200, body=b"{}")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        client: Client = Client(url=server.url, connection_pool_size=0)
+        for _ in range(2):
+            with client.request("/foo", "GET") as response:
+                response.read()
+        assert (
+            len({request.client_address for request in server.requests}) == 2
+        )
+        assert server.requests[0].headers["Connection"] == "close"
+
+
 def test_setstate_reconstructs_a_client_via_init_kwargs() -> None:
     client: Client = Client(url="http://example.com", user="u", password="p")
     state: dict[str, object] = client.__getstate__()
@@ -1585,6 +2196,27 @@ def test_request_basic_get_returns_a_readable_response() -> None:
         assert server.requests[0].path == "/foo"
 
 
+def test_request_reuses_a_kept_alive_connection() -> None:
+    with http_test_server(
+        responses={("GET", "/foo"): Response(status=200, body=b"{}")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        client: Client = Client(url=server.url)
+        for _ in range(3):
+            with client.request("/foo", "GET") as response:
+                response.read()
+        assert (
+            len({request.client_address for request in server.requests}) == 1
+        )
+        client.close()
+        with client.request("/foo", "GET") as response:
+            response.read()
+        assert (
+            len({request.client_address for request in server.requests}) == 2
+        )
+        client.close()
+
+
 def test_request_data_kwarg_treated_as_json_for_backward_compat() -> None:
     """
     For backward compatibility, passing a `str`/`bytes`/`sob.abc.Model`
@@ -1746,6 +2378,65 @@ def test_request_retries_a_failing_request_until_it_succeeds() -> None:
         assert len(server.requests) == 2
 
 
+def test_request_retries_using_a_retry_policy() -> None:
+    with http_test_server(
+        sequences={
+            ("GET", "/flaky"): [
+                Response(status=503, headers={"Retry-After": "0"}, body=b""),
+                Response(status=200, body=b'{"ok": true}'),
+            ]
+        }
+    ) as server:
+        policy: RetryPolicy = RetryPolicy(base_delay=0, max_delay=0)
+        client: Client = Client(url=server.url, retry_policy=policy)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            with client.request("/flaky", "GET") as response:
+                data: bytes | str = response.read()
+        assert data == b'{"ok": true}'
+        assert len(server.requests) == 2
+        assert client._retry_policy is policy
+
+
+def test_request_retries_a_multipart_upload_with_the_whole_file() -> None:
+    with http_test_server(
+        sequences={
+            ("POST", "/upload"): [
+                Response(status=503, headers={"Retry-After": "0"}, body=b""),
+                Response(status=200, body=b'{"ok": true}'),
+            ]
+        }
+    ) as server:
+        client: Client = Client(
+            url=server.url,
+            retry_policy=RetryPolicy(base_delay=0, max_delay=0),
+        )
+        file: io.BytesIO = io.BytesIO(b"skipped" + b"x" * 1000)
+        file.seek(7)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            client.request(
+                "/upload", "POST", data={"file": file}, multipart=True
+            ).read()
+        assert len(server.requests) == 2
+        # Each attempt sends the file from its original position
+        recorded_request: RecordedRequest
+        for recorded_request in server.requests:
+            assert b"x" * 1000 in recorded_request.body
+            assert b"skipped" not in recorded_request.body
+        assert len(server.requests[0].body) == len(server.requests[1].body)
+        assert file.tell() == 7
+
+
+def test_request_derives_a_retry_policy_from_retry_attributes() -> None:
+    client: Client = Client(retry_number_of_attempts=2)
+    policy: RetryPolicy = client._retry_policy
+    assert policy.number_of_attempts == 2
+    assert client._retry_policy is policy
+    client.retry_number_of_attempts = 3
+    assert client._retry_policy.number_of_attempts == 3
+
+
 def test_request_does_not_retry_by_default() -> None:
     with http_test_server(
         sequences={
@@ -1777,6 +2468,55 @@ def test_request_echo_prints_the_curl_representation() -> None:
         assert "200" in output
 
 
+def test_request_renders_nothing_without_echo_logger_or_event_hook(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def fail(*args: typing.Any, **kwargs: typing.Any) -> str:
+        message: str = "Nothing should be rendered"
+        raise AssertionError(message)
+
+    monkeypatch.setattr("oapi.client.get_request_curl", fail)
+    monkeypatch.setattr("oapi.client._represent_http_response", fail)
+    logger: logging.Logger = logging.getLogger("test-client-quiet-logger")
+    logger.setLevel(logging.WARNING)
+    with http_test_server(
+        responses={
+            ("GET", "/foo"): Response(
+                status=200,
+                headers={"Content-encoding": "gzip"},
+                body=gzip.compress(b'{"ok": true}'),
+            )
+        }
+    ) as server:
+        for client in (
+            Client(url=server.url),
+            Client(url=server.url, logger=logger),
+        ):
+            with client.request("/foo", "GET") as response:
+                # Content is still decoded
+                assert response.read() == b'{"ok": true}'
+
+
+def test_request_passes_lazily_rendered_events_to_the_event_hook() -> None:
+    events: list[RequestEvent | ResponseEvent] = []
+    with http_test_server(
+        responses={("GET", "/foo"): Response(status=200, body=b'{"ok": true}')}
+    ) as server:
+        client: Client = Client(url=server.url, event_hook=events.append)
+        with client.request("/foo", "GET") as response:
+            response.read()
+    request_event, response_event = events
+    assert isinstance(request_event, RequestEvent)
+    assert isinstance(response_event, ResponseEvent)
+    # Nothing is rendered until accessed
+    assert "curl" not in vars(request_event)
+    assert "text" not in vars(response_event)
+    assert request_event.curl.startswith("curl -X GET -i")
+    assert request_event.request.full_url == f"{server.url}/foo"
+    assert response_event.data == b'{"ok": true}'
+    assert response_event.text.endswith('{"ok": true}')
+
+
 def test_request_multipart_succeeds_without_a_content_encoding_header() -> (
     None
 ):
@@ -1913,14 +2653,1625 @@ def test_get_request_response_callback_error_path_logs_and_appends_text() -> (
 
 # endregion
 
-# region Client OAuth2 flows and OIDC discovery
+# region AsyncClient
 
 
-def test_oauth2_password_flow_authenticates_and_caches_the_token() -> None:
+def test_async_client_request_returns_a_readable_response() -> None:
     with http_test_server(
-        responses={
-            ("POST", "/token"): Response(
-                status=200,
+        responses={("GET", "/foo"): Response(status=200, body=b'{"ok": true}')}
+    ) as server:
+        client: AsyncClient = AsyncClient(url=server.url)
+        response: sob.abc.Readable = asyncio.run(client.request("/foo", "GET"))
+        with response:
+            assert response.read() == b'{"ok": true}'
+        assert server.requests[0].method == "GET"
+        assert server.requests[0].path == "/foo"
+
+
+def test_async_client_sends_json_and_query() -> None:
+    with http_test_server(
+        responses={("POST", "/foo"): Response(status=200, body=b"{}")}
+    ) as server:
+        client: AsyncClient = AsyncClient(url=server.url)
+        asyncio.run(
+            client.request(
+                "/foo",
+                "POST",
+                json='{"a": 1}',
+                query={"b": 2},
+                headers={"X": "y"},
+            )
+        )
+        assert server.requests[0].body == b'{"a": 1}'
+        assert server.requests[0].query == "b=2"
+        assert server.requests[0].headers["X"] == "y"
+        assert server.requests[0].headers["Content-Length"] == "8"
+
+
+def test_async_client_runs_many_requests_concurrently_on_one_loop() -> None:
+    with http_test_server(
+        responses={("GET", "/foo"): Response(status=200, body=b"{}")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        client: AsyncClient = AsyncClient(url=server.url)
+
+        async def gather() -> list[sob.abc.Readable]:
+            try:
+                return await asyncio.gather(
+                    *(client.request("/foo", "GET") for _ in range(20))
+                )
+            finally:
+                await client.aclose()
+
+        responses: list[sob.abc.Readable] = asyncio.run(gather())
+        assert [response.read() for response in responses] == [b"{}"] * 20
+        assert len(server.requests) == 20
+
+
+def test_async_client_reuses_a_kept_alive_connection() -> None:
+    with http_test_server(
+        responses={("GET", "/foo"): Response(status=200, body=b"{}")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        client: AsyncClient = AsyncClient(url=server.url)
+
+        async def request_sequentially() -> None:
+            for _ in range(3):
+                await client.request("/foo", "GET")
+            await client.aclose()
+
+        asyncio.run(request_sequentially())
+        assert (
+            len({request.client_address for request in server.requests}) == 1
+        )
+
+
+def test_async_client_follows_redirects() -> None:
+    with http_test_server(
+        responses={
+            ("POST", "/old"): Response(
+                status=303, headers={"Location": "/new"}, body=b""
+            ),
+            ("GET", "/new"): Response(status=200, body=b'{"moved": true}'),
+        }
+    ) as server:
+        client: AsyncClient = AsyncClient(url=server.url)
+        response: sob.abc.Readable = asyncio.run(
+            client.request("/old", "POST", json=b"{}")
+        )
+        assert response.read() == b'{"moved": true}'
+        assert response.geturl() == f"{server.url}/new"  # type: ignore[attr-defined]
+        assert [request.method for request in server.requests] == [
+            "POST",
+            "GET",
+        ]
+
+
+def test_async_client_persists_cookies() -> None:
+    with http_test_server(
+        responses={
+            ("GET", "/login"): Response(
+                status=200, headers={"Set-Cookie": "session=abc; Path=/"}
+            ),
+            ("GET", "/foo"): Response(status=200),
+        }
+    ) as server:
+        client: AsyncClient = AsyncClient(url=server.url)
+
+        async def request_sequentially() -> None:
+            await client.request("/login", "GET")
+            await client.request("/foo", "GET")
+
+        asyncio.run(request_sequentially())
+        assert server.requests[1].headers["Cookie"] == "session=abc"
+
+
+def test_async_client_raises_an_http_error_with_the_response_text() -> None:
+    with http_test_server(
+        responses={("GET", "/foo"): Response(status=404, body=b"not here")}
+    ) as server:
+        client: AsyncClient = AsyncClient(url=server.url)
+        with pytest.raises(HTTPError) as excinfo:
+            asyncio.run(client.request("/foo", "GET"))
+        assert excinfo.value.code == 404
+        assert "not here" in str(excinfo.value)
+
+
+def test_async_client_retries_a_failing_request_until_it_succeeds() -> None:
+    with http_test_server(
+        sequences={
+            ("GET", "/flaky"): [
+                Response(status=500, body=b"err"),
+                Response(status=200, body=b'{"ok": true}'),
+            ]
+        }
+    ) as server:
+        client: AsyncClient = AsyncClient(
+            url=server.url,
+            retry_number_of_attempts=2,
+            retry_hook=lambda error: True,
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            response: sob.abc.Readable = asyncio.run(
+                client.request("/flaky", "GET")
+            )
+        assert response.read() == b'{"ok": true}'
+        assert len(server.requests) == 2
+
+
+def test_async_client_echo_prints_the_curl_and_response() -> None:
+    with http_test_server(
+        responses={("GET", "/foo"): Response(status=200, body=b'{"ok": true}')}
+    ) as server:
+        client: AsyncClient = AsyncClient(url=server.url, echo=True)
+        buffer: io.StringIO = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            asyncio.run(client.request("/foo", "GET")).read()
+        output: str = buffer.getvalue()
+        assert "curl" in output
+        assert '{"ok": true}' in output
+
+
+def test_async_client_is_pickleable() -> None:
+    with http_test_server(
+        responses={("GET", "/foo"): Response(status=200, body=b"{}")}
+    ) as server:
+        client: AsyncClient = AsyncClient(url=server.url)
+        asyncio.run(client.request("/foo", "GET"))
+        unpickled: AsyncClient = pickle.loads(pickle.dumps(client))
+        assert type(unpickled) is AsyncClient
+        assert unpickled.url == server.url
+        assert asyncio.run(unpickled.request("/foo", "GET")).read() == b"{}"
+
+
+# endregion
+
+# region Client response caching
+
+
+def _etag_handler(request: RecordedRequest) -> Response:
+    if request.headers.get("If-None-Match") == '"1"':
+        return Response(status=304, headers={"ETag": '"1"'}, body=b"")
+    return Response(headers={"ETag": '"1"'}, body=b'{"a": 1}')
+
+
+def test_client_serves_fresh_responses_from_its_cache() -> None:
+    with http_test_server(
+        responses={
+            ("GET", "/foo"): Response(
+                headers={"Cache-Control": "max-age=60"}, body=b'{"a": 1}'
+            )
+        }
+    ) as server:
+        client: Client = Client(url=server.url, cache=MemoryCache())
+        for _ in range(3):
+            assert client.request("/foo", "GET").read() == b'{"a": 1}'
+        assert len(server.requests) == 1
+        # A request for "no-cache" is revalidated
+        client.request(
+            "/foo", "GET", headers={"Cache-Control": "no-cache"}
+        ).read()
+        assert len(server.requests) == 2
+
+
+def test_client_revalidates_stale_responses_using_their_etag() -> None:
+    with http_test_server(handlers={("GET", "/foo"): _etag_handler}) as server:
+        client: Client = Client(url=server.url, cache=MemoryCache())
+        for _ in range(3):
+            response: sob.abc.Readable = client.request("/foo", "GET")
+            assert response.status == 200  # type: ignore[attr-defined]
+            assert response.read() == b'{"a": 1}'
+        assert len(server.requests) == 3
+        assert "If-None-Match" not in server.requests[0].headers
+        assert server.requests[2].headers["If-None-Match"] == '"1"'
+
+
+def test_client_revalidates_using_last_modified(tmp_path: Path) -> None:
+    last_modified: str = "Thu, 01 Jan 2026 00:00:00 GMT"
+
+    def handler(request: RecordedRequest) -> Response:
+        if request.headers.get("If-Modified-Since") == last_modified:
+            return Response(status=304, body=b"")
+        return Response(headers={"Last-Modified": last_modified})
+
+    with http_test_server(handlers={("GET", "/foo"): handler}) as server:
+        client: Client = Client(url=server.url, cache=FileCache(tmp_path))
+        assert client.request("/foo", "GET").read() == b"{}"
+        assert client.request("/foo", "GET").read() == b"{}"
+        # The cache directory may be shared with another client
+        client = Client(url=server.url, cache=FileCache(tmp_path))
+        assert client.request("/foo", "GET").read() == b"{}"
+        assert len(server.requests) == 3
+
+
+def test_clients_sharing_a_cache_do_not_share_authorized_responses(
+    tmp_path: Path,
+) -> None:
+    def handler(request: RecordedRequest) -> Response:
+        return Response(
+            headers={"Cache-Control": "max-age=60"},
+            body=json_module.dumps(
+                {"authorization": request.headers.get("Authorization")}
+            ).encode(),
+        )
+
+    with http_test_server(handlers={("GET", "/foo"): handler}) as server:
+        token: str
+        for token in ("a", "a", "b", "b"):
+            client: Client = Client(
+                url=server.url, bearer_token=token, cache=FileCache(tmp_path)
+            )
+            assert json_module.loads(client.request("/foo", "GET").read()) == {
+                "authorization": f"Bearer {token}"
+            }
+        # Each token's response is stored (and served) separately
+        assert len(server.requests) == 2
+        api_key_clients: list[Client] = [
+            Client(url=server.url, api_key=api_key, cache=FileCache(tmp_path))
+            for api_key in ("a", "b", "a")
+        ]
+        for client in api_key_clients:
+            client.request("/foo", "GET").read()
+        assert len(server.requests) == 4
+
+
+def test_client_only_caches_private_responses_for_authorized_requests() -> (
+    None
+):
+    with http_test_server(
+        responses={
+            ("GET", "/foo"): Response(
+                headers={"Cache-Control": "private, max-age=60"}
+            )
+        }
+    ) as server:
+        cache: MemoryCache = MemoryCache()
+        client: Client = Client(url=server.url, cache=cache)
+        for _ in range(2):
+            client.request("/foo", "GET").read()
+        assert len(server.requests) == 2
+        client = Client(url=server.url, bearer_token="a", cache=cache)
+        for _ in range(2):
+            client.request("/foo", "GET").read()
+        assert len(server.requests) == 3
+
+
+def test_client_caches_content_encoded_responses() -> None:
+    with http_test_server(
+        responses={
+            ("GET", "/foo"): Response(
+                headers={
+                    "Cache-Control": "max-age=60",
+                    "Content-Encoding": "gzip",
+                },
+                body=gzip.compress(b'{"a": 1}'),
+            )
+        }
+    ) as server:
+        client: Client = Client(url=server.url, cache=MemoryCache())
+        assert client.request("/foo", "GET").read() == b'{"a": 1}'
+        assert client.request("/foo", "GET").read() == b'{"a": 1}'
+        assert len(server.requests) == 1
+
+
+def test_client_cache_is_invalidated_by_unsafe_requests() -> None:
+    with http_test_server(
+        responses={
+            ("GET", "/foo"): Response(headers={"Cache-Control": "max-age=60"}),
+            ("POST", "/foo"): Response(),
+        }
+    ) as server:
+        client: Client = Client(url=server.url, cache=MemoryCache())
+        client.request("/foo", "GET").read()
+        client.request("/foo", "GET").read()
+        client.request("/foo", "POST", json="{}").read()
+        client.request("/foo", "GET").read()
+        assert [request.method for request in server.requests] == [
+            "GET",
+            "POST",
+            "GET",
+        ]
+
+
+def test_client_does_not_cache_responses_without_a_cache() -> None:
+    with http_test_server(
+        responses={
+            ("GET", "/foo"): Response(headers={"Cache-Control": "max-age=60"})
+        }
+    ) as server:
+        client: Client = Client(url=server.url)
+        client.request("/foo", "GET").read()
+        client.request("/foo", "GET").read()
+        assert len(server.requests) == 2
+
+
+def test_async_client_revalidates_stale_responses_using_their_etag() -> None:
+    with http_test_server(handlers={("GET", "/foo"): _etag_handler}) as server:
+        client: AsyncClient = AsyncClient(url=server.url, cache=MemoryCache())
+
+        async def request() -> str | bytes:
+            return (await client.request("/foo", "GET")).read()
+
+        assert asyncio.run(request()) == b'{"a": 1}'
+        assert asyncio.run(request()) == b'{"a": 1}'
+        assert server.requests[1].headers["If-None-Match"] == '"1"'
+
+
+def test_client_with_a_cache_is_pickleable() -> None:
+    client: Client = Client(cache=MemoryCache(max_size=1024))
+    unpickled: Client = pickle.loads(pickle.dumps(client))
+    assert isinstance(unpickled.cache, MemoryCache)
+    assert unpickled.cache.max_size == 1024
+
+
+# endregion
+
+# region Client rate limiting
+
+
+def test_client_rate_limiter_paces_requests_per_server_headers() -> None:
+    with http_test_server(
+        responses={
+            ("GET", "/foo"): Response(
+                headers={
+                    "RateLimit-Remaining": "20",
+                    "RateLimit-Reset": "1",
+                }
+            )
+        }
+    ) as server:
+        rate_limiter: RateLimiter = RateLimiter()
+        client: Client = Client(url=server.url, rate_limiter=rate_limiter)
+        client.request("/foo", "GET").read()
+        started: float = time.monotonic()
+        for _ in range(3):
+            client.request("/foo", "GET").read()
+        assert time.monotonic() - started >= 0.09
+        assert len(server.requests) == 4
+
+
+def test_client_rate_limiter_is_shared_and_honors_retry_after() -> None:
+    with http_test_server(
+        responses={
+            ("GET", "/foo"): Response(
+                status=429, headers={"Retry-After": "30"}, body=b""
+            )
+        }
+    ) as server:
+        rate_limiter: RateLimiter = RateLimiter()
+        client: Client = Client(url=server.url, rate_limiter=rate_limiter)
+        with pytest.raises(HTTPError):
+            client.request("/foo", "GET")
+        request: Request = Request(f"{server.url}/bar")
+        assert rate_limiter.reserve(request) > 29
+        other_client: AsyncClient = AsyncClient(
+            url=server.url, rate_limiter=rate_limiter
+        )
+        assert other_client.rate_limiter is rate_limiter
+
+
+def test_client_rate_limiter_does_not_wait_beyond_a_deadline() -> None:
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b"{}")}
+    ) as server:
+        # The server has asked for requests to be delayed by 30 seconds
+        rate_limiter: RateLimiter = RateLimiter()
+        headers: Message = Message()
+        headers["Retry-After"] = "30"
+        rate_limiter.update(Request(f"{server.url}/foo"), 429, headers)
+        client: Client = Client(url=server.url, rate_limiter=rate_limiter)
+        started: float = time.monotonic()
+        with Deadline(1), pytest.raises(OAPITimeoutError, match="rate"):
+            client.request("/foo", "GET")
+        async_client: AsyncClient = AsyncClient(
+            url=server.url, rate_limiter=rate_limiter
+        )
+        with pytest.raises(OAPITimeoutError, match="rate"):
+            asyncio.run(async_client.request("/foo", "GET", deadline=1))
+        assert time.monotonic() - started < 1
+        assert not server.requests
+
+
+def test_async_client_rate_limiter_adapts_to_server_headers() -> None:
+    with http_test_server(
+        responses={
+            ("GET", "/foo"): Response(
+                headers={
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": "30",
+                }
+            )
+        }
+    ) as server:
+        rate_limiter: RateLimiter = RateLimiter()
+        client: AsyncClient = AsyncClient(
+            url=server.url, rate_limiter=rate_limiter
+        )
+        asyncio.run(client.request("/foo", "GET")).read()
+        assert rate_limiter.reserve(Request(f"{server.url}/foo")) > 29
+
+
+# endregion
+
+# region Client circuit breaking
+
+
+def test_client_circuit_breaker_fails_fast_once_open() -> None:
+    with http_test_server(
+        responses={
+            ("GET", "/foo"): Response(status=503, body=b""),
+            ("GET", "/bar"): Response(status=200, body=b"{}"),
+        }
+    ) as server:
+        circuit_breaker: CircuitBreaker = CircuitBreaker(
+            minimum_number_of_calls=2
+        )
+        client: Client = Client(
+            url=server.url,
+            circuit_breaker=circuit_breaker,
+            retry_policy=RetryPolicy(5, base_delay=0, max_delay=0),
+        )
+        # Retries stop as soon as the circuit opens
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            with pytest.raises(OAPICircuitOpenError):
+                client.request("/foo", "GET")
+        # The circuit is open for the host, so requests are not sent
+        with pytest.raises(OAPICircuitOpenError):
+            client.request("/bar", "GET")
+        # The breaker is shared by other clients
+        with pytest.raises(OAPICircuitOpenError):
+            asyncio.run(
+                AsyncClient(
+                    url=server.url, circuit_breaker=circuit_breaker
+                ).request("/bar", "GET")
+            )
+        assert len(server.requests) == 2
+
+
+def test_client_circuit_breaker_keys_circuits_by_operation() -> None:
+    with http_test_server(
+        responses={
+            ("GET", f"/pets/{index}"): Response(status=500, body=b"")
+            for index in range(4)
+        }
+    ) as server:
+        circuit_breaker: CircuitBreaker = CircuitBreaker(
+            minimum_number_of_calls=3, per_operation=True
+        )
+        client: Client = Client(
+            url=server.url,
+            circuit_breaker=circuit_breaker,
+            retry_number_of_attempts=1,
+        )
+        index: int
+        for index in range(3):
+            with pytest.raises(HTTPError):
+                client.request(f"/pets/{index}", "GET", operation="getPet")
+        # Failures of one operation with different path parameters share a
+        # circuit
+        with pytest.raises(OAPICircuitOpenError):
+            client.request("/pets/3", "GET", operation="getPet")
+        assert len(server.requests) == 3
+
+
+def test_client_circuit_breaker_closes_after_a_successful_trial() -> None:
+    with http_test_server(
+        sequences={
+            ("GET", "/foo"): [
+                Response(status=500, body=b""),
+                Response(status=500, body=b""),
+                Response(status=200, body=b"{}"),
+            ]
+        }
+    ) as server:
+        circuit_breaker: CircuitBreaker = CircuitBreaker(
+            minimum_number_of_calls=2, reset_timeout=0.05
+        )
+        client: AsyncClient = AsyncClient(
+            url=server.url, circuit_breaker=circuit_breaker
+        )
+        for _ in range(2):
+            with pytest.raises(HTTPError):
+                asyncio.run(client.request("/foo", "GET"))
+        time.sleep(0.06)
+        assert asyncio.run(client.request("/foo", "GET")).read() == b"{}"
+        assert (
+            circuit_breaker.get_state(Request(f"{server.url}/foo")) == "closed"
+        )
+
+
+def test_client_circuit_breaker_releases_a_cancelled_trial() -> None:
+    with http_test_server(
+        sequences={
+            ("GET", "/foo"): [
+                Response(status=500, body=b""),
+                Response(status=500, body=b""),
+                Response(body=b"{}" * 10, drip_interval=0.05),
+                Response(status=200, body=b"{}"),
+            ]
+        }
+    ) as server:
+        circuit_breaker: CircuitBreaker = CircuitBreaker(
+            minimum_number_of_calls=2, reset_timeout=0.5
+        )
+        client: AsyncClient = AsyncClient(
+            url=server.url, circuit_breaker=circuit_breaker
+        )
+        for _ in range(2):
+            with pytest.raises(HTTPError):
+                asyncio.run(client.request("/foo", "GET"))
+        time.sleep(0.51)
+        # The trial request is cancelled before its outcome is known...
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(asyncio.wait_for(client.request("/foo", "GET"), 0.1))
+        # ...so the next request is permitted as a trial, rather than
+        # being refused
+        assert asyncio.run(client.request("/foo", "GET")).read() == b"{}"
+        assert (
+            circuit_breaker.get_state(Request(f"{server.url}/foo")) == "closed"
+        )
+
+
+# endregion
+
+# region Client request compression
+
+
+def test_client_compression_policy_compresses_large_request_bodies() -> None:
+    with http_test_server(
+        responses={("POST", "/foo"): Response(body=b"{}")}
+    ) as server:
+        client: Client = Client(
+            url=server.url,
+            compression_policy=CompressionPolicy(threshold=1024),
+        )
+        large: str = json_module.dumps({"items": list(range(1000))})
+        client.request("/foo", "POST", json=large).read()
+        client.request("/foo", "POST", json='{"a": 1}').read()
+        assert server.requests[0].headers["Content-Encoding"] == "gzip"
+        assert server.requests[0].headers["Transfer-Encoding"] == "chunked"
+        assert gzip.decompress(server.requests[0].body) == large.encode()
+        assert "Content-Encoding" not in server.requests[1].headers
+        assert server.requests[1].body == b'{"a": 1}'
+
+
+def test_async_client_compression_policy_compresses_request_bodies() -> None:
+    with http_test_server(
+        responses={("POST", "/foo"): Response(body=b"{}")}
+    ) as server:
+        client: AsyncClient = AsyncClient(
+            url=server.url,
+            compression_policy=CompressionPolicy("deflate", threshold=8),
+        )
+        asyncio.run(client.request("/foo", "POST", json='{"a": 1, "b": 2}'))
+        assert server.requests[0].headers["Content-Encoding"] == "deflate"
+        assert zlib.decompress(server.requests[0].body) == b'{"a": 1, "b": 2}'
+
+
+def test_client_compression_policy_echoes_uncompressed_data(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    with http_test_server(
+        responses={("POST", "/foo"): Response(body=b"{}")}
+    ) as server:
+        client: Client = Client(
+            url=server.url,
+            echo=True,
+            compression_policy=CompressionPolicy(threshold=8),
+        )
+        client.request("/foo", "POST", json='{"a": 1, "b": 2}').read()
+        assert """-d '{"a": 1, "b": 2}'""" in capsys.readouterr().out
+
+
+# endregion
+
+# region Client JSON codecs
+
+
+def test_client_json_codec_encodes_request_bodies() -> None:
+    pytest.importorskip("orjson")
+    with http_test_server(
+        responses={("POST", "/foo"): Response(body=b"{}")}
+    ) as server:
+        client: Client = Client(url=server.url, json_codec="orjson")
+        assert isinstance(client.json_codec, JSONCodec)
+        client.request("/foo", "POST", json=Reference(ref="#/x")).read()
+        assert server.requests[0].body == b'{"$ref":"#/x"}'
+        # The default codec is the standard library's, as used by `sob`
+        client = Client(url=server.url)
+        client.request("/foo", "POST", json=Reference(ref="#/x")).read()
+        assert server.requests[1].body == b'{"$ref": "#/x"}'
+
+
+def test_client_json_codec_is_pickled_and_validated() -> None:
+    pytest.importorskip("orjson")
+    client: Client = Client(json_codec="orjson")
+    unpickled: Client = pickle.loads(pickle.dumps(client))
+    assert unpickled.json_codec.name == "orjson"
+    with pytest.raises(ValueError, match="simplejson"):
+        Client(json_codec="simplejson")
+
+
+def test_client_module_json_codec_sets_the_generated_default(
+    generated_client_package: Callable[..., tuple[ModuleType, ModuleType]],
+) -> None:
+    pytest.importorskip("orjson")
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    model_module, client_module = generated_client_package(
+        open_api, json_codec="orjson"
+    )
+    assert (
+        inspect.signature(client_module.Client)
+        .parameters["json_codec"]
+        .default
+        == "orjson"
+    )
+    with http_test_server(
+        responses={("GET", "/pets"): _PETS_RESPONSE}
+    ) as server:
+        client = client_module.Client(url=server.url)
+        assert client.json_codec.name == "orjson"
+        pets = client.get_pets()
+    assert all(isinstance(pet, model_module.Pet) for pet in pets)
+    assert [pet.name for pet in pets] == ["Rex", "Tom"]
+
+
+def test_write_client_module_sets_the_json_codec(tmp_path: Path) -> None:
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    model_path: Path = tmp_path / "model.py"
+    model_path.write_text(str(ModelModule(open_api)))
+    client_path: Path = tmp_path / "client.py"
+    write_client_module(
+        client_path,
+        open_api=open_api,
+        model_path=model_path,
+        json_codec="json",
+    )
+    assert (
+        'json_codec: oapi.client.JSONCodec | str = "json",'
+        in client_path.read_text()
+    )
+
+
+def test_client_module_rejects_an_unknown_json_codec(tmp_path: Path) -> None:
+    model_path: Path = tmp_path / "model.py"
+    model_path.write_text("")
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    with pytest.raises(ValueError, match="simplejson"):
+        ClientModule(open_api, model_path=model_path, json_codec="simplejson")
+
+
+# endregion
+
+# region Client process pools
+
+
+def _get_worker_client_identity(client: Client, _: int) -> tuple[int, int]:
+    return os.getpid(), id(client)
+
+
+def _read_path(client: Client, path: str) -> str | bytes:
+    return client.request(path, "GET").read()
+
+
+def test_client_process_pool_unpickles_the_client_once_per_worker() -> None:
+    client: Client = Client(url="http://localhost")
+    with client.process_pool(max_workers=2) as pool:
+        identities: set[tuple[int, int]] = set(
+            pool.map(_get_worker_client_identity, range(20), chunksize=2)
+        )
+    process_ids: set[int] = {identity[0] for identity in identities}
+    assert os.getpid() not in process_ids
+    # Every task run by a worker process used the same client
+    assert len(identities) == len(process_ids) <= 2
+
+
+def test_client_process_pool_calls_functions() -> None:
+    with http_test_server(
+        responses={
+            ("GET", "/foo"): Response(body=b'{"foo": 1}'),
+            ("GET", "/bar"): Response(body=b'{"bar": 2}'),
+        }
+    ) as server:
+        client: Client = Client(url=server.url, headers={"X-Test": "yes"})
+        with client.process_pool(max_workers=2) as pool:
+            assert list(pool.map(_read_path, ["/foo", "/bar", "/foo"])) == [
+                b'{"foo": 1}',
+                b'{"bar": 2}',
+                b'{"foo": 1}',
+            ]
+            assert pool.submit(_read_path, path="/bar").result() == (
+                b'{"bar": 2}'
+            )
+    assert {request.headers["X-Test"] for request in server.requests} == {
+        "yes"
+    }
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_client_process_pool_calls_generated_client_methods(
+    generated_client_package: Callable[..., tuple[ModuleType, ModuleType]],
+    asynchronous: bool,
+) -> None:
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    model_module, client_module = generated_client_package(
+        open_api, asynchronous=asynchronous
+    )
+    with http_test_server(
+        responses={("GET", "/pets"): _PETS_RESPONSE}
+    ) as server:
+        client = client_module.Client(url=server.url)
+        with client.process_pool(max_workers=2) as pool:
+            futures: list[Future[typing.Any]] = [
+                pool.submit("get_pets") for _ in range(3)
+            ]
+            results: list[typing.Any] = [future.result() for future in futures]
+    assert len(results) == 3
+    for pets in results:
+        assert all(isinstance(pet, model_module.Pet) for pet in pets)
+        assert [pet.name for pet in pets] == ["Rex", "Tom"]
+
+
+# endregion
+
+# region Client pagination
+
+
+def _get_numbered_page(request: RecordedRequest) -> Response:
+    # Pages 1 through 3 each have 2 items, subsequent pages are empty
+    page: int = int(dict(parse_qsl(request.query)).get("page", 1))
+    items: list[int] = [page * 2 - 1, page * 2] if page <= 3 else []
+    return Response(body=json_module.dumps(items).encode())
+
+
+def _wait_for_requests(
+    requests: list[RecordedRequest], number_of_requests: int
+) -> None:
+    deadline: float = time.monotonic() + 5
+    while len(requests) < number_of_requests and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_client_iter_pages_yields_the_items_in_each_page(
+    prefetch: int,
+) -> None:
+    with http_test_server(
+        handlers={("GET", "/items"): _get_numbered_page}
+    ) as server:
+        client: Client = Client(url=server.url)
+        items: list[typing.Any] = list(
+            client.iter_pages(
+                Pagination("page", prefetch=prefetch),
+                (sob.Array,),
+                "/items",
+                "GET",
+                query={"limit": 2},
+            )
+        )
+    assert items == [1, 2, 3, 4, 5, 6]
+    assert [dict(parse_qsl(request.query)) for request in server.requests] == [
+        {"limit": "2"},
+        {"limit": "2", "page": "2"},
+        {"limit": "2", "page": "3"},
+        {"limit": "2", "page": "4"},
+    ]
+
+
+def test_client_iter_pages_prefetches_the_next_page() -> None:
+    with http_test_server(
+        handlers={("GET", "/items"): _get_numbered_page}
+    ) as server:
+        client: Client = Client(url=server.url)
+        items: collections.abc.Generator[typing.Any, None, None] = typing.cast(
+            "collections.abc.Generator[typing.Any, None, None]",
+            client.iter_pages(
+                Pagination("page"), (sob.Array,), "/items", "GET"
+            ),
+        )
+        assert next(items) == 1
+        # The second page is requested while the first is being consumed
+        _wait_for_requests(server.requests, 2)
+        assert len(server.requests) == 2
+        items.close()
+
+
+def test_client_iter_pages_without_prefetching() -> None:
+    with http_test_server(
+        handlers={("GET", "/items"): _get_numbered_page}
+    ) as server:
+        client: Client = Client(url=server.url)
+        items: collections.abc.Generator[typing.Any, None, None] = typing.cast(
+            "collections.abc.Generator[typing.Any, None, None]",
+            client.iter_pages(
+                Pagination("page", prefetch=0), (sob.Array,), "/items", "GET"
+            ),
+        )
+        assert next(items) == 1
+        assert next(items) == 2
+        time.sleep(0.1)
+        assert len(server.requests) == 1
+        items.close()
+
+
+def test_client_iter_pages_follows_link_headers() -> None:
+    with http_test_server(
+        responses={
+            ("GET", "/items"): Response(
+                headers={"Link": '</items/2?token=a>; rel="next"'},
+                body=b'{"data": [1, 2]}',
+            ),
+            ("GET", "/items/2"): Response(body=b'{"data": [3]}'),
+        }
+    ) as server:
+        client: Client = Client(url=server.url)
+        items: list[typing.Any] = list(
+            client.iter_pages(
+                Pagination("link", items="data"),
+                (sob.Dictionary,),
+                "/items",
+                "GET",
+                query={"limit": 2},
+            )
+        )
+    assert items == [1, 2, 3]
+    assert [(request.path, request.query) for request in server.requests] == [
+        ("/items", "limit=2"),
+        ("/items/2", "token=a"),
+    ]
+
+
+def test_client_iter_pages_raises_errors_from_prefetched_pages() -> None:
+    with http_test_server(
+        sequences={
+            ("GET", "/items"): [
+                Response(body=b"[1, 2]"),
+                Response(status=400, body=b"{}"),
+            ]
+        }
+    ) as server:
+        client: Client = Client(url=server.url, retry_number_of_attempts=1)
+        items: collections.abc.Generator[typing.Any, None, None] = typing.cast(
+            "collections.abc.Generator[typing.Any, None, None]",
+            client.iter_pages(
+                Pagination("page"), (sob.Array,), "/items", "GET"
+            ),
+        )
+        assert [next(items), next(items)] == [1, 2]
+        with pytest.raises(HTTPError):
+            next(items)
+
+
+class _PrefetchAborted(BaseException):
+    pass
+
+
+class _AbortingClient(Client):
+    """
+    A client for which requesting any page after the first raises an
+    exception which is not an `Exception`.
+    """
+
+    def _get_page(
+        self,
+        pagination: Pagination,
+        method: str,
+        request: tuple[str, dict[str, typing.Any]],
+    ) -> tuple[typing.Any, tuple[str, dict[str, typing.Any]] | None]:
+        if request[1].get("query"):
+            raise _PrefetchAborted
+        return super()._get_page(pagination, method, request)
+
+
+def test_client_iter_pages_raises_base_exceptions_from_prefetching() -> None:
+    with http_test_server(
+        handlers={("GET", "/items"): _get_numbered_page}
+    ) as server:
+        client: Client = _AbortingClient(url=server.url)
+
+        errors: list[BaseException] = []
+
+        def get_items() -> None:
+            try:
+                list(
+                    client.iter_pages(
+                        Pagination("page"), (sob.Array,), "/items", "GET"
+                    )
+                )
+            except BaseException as error:  # noqa: BLE001
+                errors.append(error)
+
+        # The consumer must not be left waiting for a page which will never
+        # arrive
+        thread: threading.Thread = threading.Thread(
+            target=get_items, daemon=True
+        )
+        thread.start()
+        thread.join(5)
+        assert not thread.is_alive()
+        assert len(errors) == 1
+        assert isinstance(errors[0], _PrefetchAborted)
+
+
+def test_async_client_iter_pages_yields_the_items_in_each_page() -> None:
+    async def get_items(url: str, prefetch: int) -> list[typing.Any]:
+        client: AsyncClient = AsyncClient(url=url)
+        return [
+            item
+            async for item in client.iter_pages(
+                Pagination("page", prefetch=prefetch),
+                (sob.Array,),
+                "/items",
+                "GET",
+            )
+        ]
+
+    with http_test_server(
+        handlers={("GET", "/items"): _get_numbered_page}
+    ) as server:
+        assert asyncio.run(get_items(server.url, 0)) == [1, 2, 3, 4, 5, 6]
+        assert asyncio.run(get_items(server.url, 2)) == [1, 2, 3, 4, 5, 6]
+
+
+# endregion
+# region Client batch execution
+
+
+class _ConcurrencyRecorder:
+    """
+    A request handler which responds (after a delay, given by the "delay"
+    query parameter) with the "id" query parameter, recording the maximum
+    number of requests handled concurrently.
+    """
+
+    def __init__(self) -> None:
+        self.concurrent: int = 0
+        self.maximum: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def __call__(self, request: RecordedRequest) -> Response:
+        query: dict[str, str] = dict(parse_qsl(request.query))
+        with self._lock:
+            self.concurrent += 1
+            self.maximum = max(self.maximum, self.concurrent)
+        time.sleep(float(query.get("delay", 0.05)))
+        with self._lock:
+            self.concurrent -= 1
+        if query.get("id") == "error":
+            return Response(status=400)
+        return Response(body=query.get("id", "").encode())
+
+
+def _get_item(client: Client, **query: typing.Any) -> str | bytes:
+    return client.request("/items", "GET", query=query).read()
+
+
+def test_client_map_yields_results_in_order_with_bounded_concurrency() -> None:
+    recorder: _ConcurrencyRecorder = _ConcurrencyRecorder()
+    with http_test_server(handlers={("GET", "/items"): recorder}) as server:
+        client: Client = Client(url=server.url)
+        results: list[typing.Any] = list(
+            client.map(
+                _get_item,
+                ({"id": index} for index in range(8)),
+                concurrency=3,
+            )
+        )
+    assert results == [str(index).encode() for index in range(8)]
+    assert recorder.maximum == 3
+
+
+def test_client_map_concurrency_is_not_bounded_by_connection_pool_size() -> (
+    None
+):
+    recorder: _ConcurrencyRecorder = _ConcurrencyRecorder()
+    with http_test_server(handlers={("GET", "/items"): recorder}) as server:
+        client: Client = Client(url=server.url, connection_pool_size=2)
+        results: list[typing.Any] = list(
+            client.map(
+                _get_item,
+                ({"id": index, "delay": 0.2} for index in range(8)),
+                concurrency=4,
+            )
+        )
+        client.close()
+    assert results == [str(index).encode() for index in range(8)]
+    assert recorder.maximum == 4
+
+
+def test_client_map_completes_when_the_client_is_closed() -> None:
+    with http_test_server(
+        handlers={("GET", "/items"): _ConcurrencyRecorder()}
+    ) as server:
+        client: Client = Client(url=server.url)
+        results: collections.abc.Iterator[typing.Any] = client.map(
+            _get_item, ({"id": index} for index in range(6)), concurrency=2
+        )
+        assert next(results) == b"0"
+        # Closing the client shuts down its thread pool, so the remaining
+        # calls are submitted to a new one
+        client.close()
+        assert list(results) == [str(index).encode() for index in range(1, 6)]
+        client.close()
+
+
+def test_client_map_reads_argument_sets_lazily() -> None:
+    read: list[int] = []
+
+    def iter_kwargs() -> collections.abc.Iterator[dict[str, typing.Any]]:
+        index: int
+        for index in range(100):
+            read.append(index)
+            yield {"id": index}
+
+    recorder: _ConcurrencyRecorder = _ConcurrencyRecorder()
+    with http_test_server(handlers={("GET", "/items"): recorder}) as server:
+        client: Client = Client(url=server.url)
+        results: collections.abc.Iterator[typing.Any] = client.map(
+            _get_item, iter_kwargs(), concurrency=2
+        )
+        assert next(results) == b"0"
+        # One more call is started as each result is yielded
+        assert read == [0, 1, 2]
+        client.close()
+
+
+def test_client_map_yields_unordered_results_as_calls_complete() -> None:
+    with http_test_server(
+        handlers={("GET", "/items"): _ConcurrencyRecorder()}
+    ) as server:
+        client: Client = Client(url=server.url)
+        results: list[typing.Any] = list(
+            client.map(
+                _get_item,
+                [{"id": "slow", "delay": 0.5}, {"id": "fast", "delay": 0}],
+                ordered=False,
+            )
+        )
+    assert results == [b"fast", b"slow"]
+
+
+def test_client_map_raises_or_returns_exceptions() -> None:
+    kwargs: list[dict[str, typing.Any]] = [
+        {"id": "a"},
+        {"id": "error"},
+        {"id": "b"},
+    ]
+    with http_test_server(
+        handlers={("GET", "/items"): _ConcurrencyRecorder()}
+    ) as server:
+        client: Client = Client(url=server.url, retry_number_of_attempts=1)
+        results: list[typing.Any] = list(
+            client.map(_get_item, kwargs, return_exceptions=True)
+        )
+        assert results[0] == b"a"
+        assert isinstance(results[1], HTTPError)
+        assert results[2] == b"b"
+        with pytest.raises(HTTPError):
+            list(client.map(_get_item, kwargs))
+
+
+def test_client_map_calls_generated_client_methods(
+    generated_client_package: Callable[..., tuple[ModuleType, ModuleType]],
+) -> None:
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    model_module, client_module = generated_client_package(open_api)
+    with http_test_server(
+        responses={("GET", "/pets"): _PETS_RESPONSE}
+    ) as server:
+        client = client_module.Client(url=server.url)
+        results: list[typing.Any] = list(client.map("get_pets", [{}] * 3))
+    assert len(results) == 3
+    for pets in results:
+        assert [pet.name for pet in pets] == ["Rex", "Tom"]
+        assert all(isinstance(pet, model_module.Pet) for pet in pets)
+
+
+def test_async_client_map_yields_results_with_bounded_concurrency() -> None:
+    async def get_item(client: AsyncClient, **query: typing.Any) -> bytes:
+        response: sob.abc.Readable = await client.request(
+            "/items", "GET", query=query
+        )
+        return typing.cast("bytes", response.read())
+
+    async def get_items(url: str, *, ordered: bool) -> list[typing.Any]:
+        client: AsyncClient = AsyncClient(url=url)
+        return [
+            result
+            async for result in client.map(
+                get_item,
+                [
+                    {"id": "slow", "delay": 0.3},
+                    {"id": "fast", "delay": 0},
+                    {"id": "last", "delay": 0},
+                ],
+                concurrency=2,
+                ordered=ordered,
+            )
+        ]
+
+    recorder: _ConcurrencyRecorder = _ConcurrencyRecorder()
+    with http_test_server(handlers={("GET", "/items"): recorder}) as server:
+        assert asyncio.run(get_items(server.url, ordered=True)) == [
+            b"slow",
+            b"fast",
+            b"last",
+        ]
+        assert asyncio.run(get_items(server.url, ordered=False)) == [
+            b"fast",
+            b"last",
+            b"slow",
+        ]
+    assert recorder.maximum == 2
+
+
+# endregion
+# region Client metrics
+
+
+def _get_phase_count(aggregator: MetricsAggregator, phase: str) -> float:
+    return aggregator.get_count(
+        "phase_duration_seconds", "getFoo", phase=phase
+    )
+
+
+def test_client_metrics_records_requests_phases_and_bytes() -> None:
+    aggregator: MetricsAggregator = MetricsAggregator()
+    body: bytes = json_module.dumps({"items": list(range(100))}).encode()
+    with http_test_server(
+        responses={
+            ("POST", "/foo"): Response(
+                headers={"Content-Encoding": "gzip"},
+                body=gzip.compress(body),
+            )
+        }
+    ) as server:
+        client: Client = Client(
+            url=server.url,
+            metrics=aggregator,
+            compression_policy=CompressionPolicy(threshold=8),
+        )
+        assert sob.marshal(
+            client.unmarshal_response(
+                client.request(
+                    "/foo", "POST", json=body.decode(), operation="getFoo"
+                ),
+                operation="getFoo",
+            )
+        ) == {"items": list(range(100))}
+    assert (
+        aggregator.get_count(
+            "requests_total", "getFoo", method="POST", status_class="2xx"
+        )
+        == 1
+    )
+    assert (
+        aggregator.get_count(
+            "request_duration_seconds", "getFoo", method="POST"
+        )
+        == 1
+    )
+    assert aggregator.get_count("retries_total", "getFoo", method="POST") == 0
+    assert all(
+        _get_phase_count(aggregator, phase) == 1
+        for phase in ("assembly", "network", "receive", "unmarshal")
+    )
+    assert aggregator.get_count(
+        "request_bytes_total", "getFoo", encoding="identity"
+    ) == len(body)
+    assert aggregator.get_count(
+        "request_bytes_total", "getFoo", encoding="encoded"
+    ) == len(server.requests[0].body)
+    assert aggregator.get_count(
+        "response_bytes_total", "getFoo", encoding="identity"
+    ) == len(body)
+    assert aggregator.get_count(
+        "response_bytes_total", "getFoo", encoding="encoded"
+    ) == len(gzip.compress(body))
+    assert (
+        'oapi_client_requests_total{operation="getFoo",method="POST",'
+        'status_class="2xx"} 1\n'
+    ) in aggregator.render()
+
+
+def test_client_metrics_counts_retries_and_errors_once_per_request() -> None:
+    aggregator: MetricsAggregator = MetricsAggregator()
+    with http_test_server(
+        sequences={
+            ("GET", "/foo"): [
+                Response(status=503),
+                Response(status=503),
+                Response(status=503),
+            ]
+        }
+    ) as server:
+        client: Client = Client(
+            url=server.url,
+            metrics=aggregator,
+            retry_policy=RetryPolicy(
+                number_of_attempts=3, base_delay=0, max_delay=0
+            ),
+        )
+        with (
+            pytest.raises(HTTPError),
+            pytest.warns(UserWarning, match="Attempt #"),
+        ):
+            client.request("/foo", "GET", operation="getFoo")
+    assert (
+        aggregator.get_count(
+            "requests_total", "getFoo", method="GET", status_class="5xx"
+        )
+        == 1
+    )
+    assert aggregator.get_count("retries_total", "getFoo", method="GET") == 2
+    assert _get_phase_count(aggregator, "network") == 3
+
+
+def test_async_client_metrics_records_requests() -> None:
+    aggregator: MetricsAggregator = MetricsAggregator()
+
+    async def get_foo(url: str) -> typing.Any:
+        client: AsyncClient = AsyncClient(url=url, metrics=aggregator)
+        return sob.marshal(
+            client.unmarshal_response(
+                await client.request("/foo", "GET", operation="getFoo"),
+                operation="getFoo",
+            )
+        )
+
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b'{"a": 1}')}
+    ) as server:
+        assert asyncio.run(get_foo(server.url)) == {"a": 1}
+    assert (
+        aggregator.get_count(
+            "requests_total", "getFoo", method="GET", status_class="2xx"
+        )
+        == 1
+    )
+    assert all(
+        _get_phase_count(aggregator, phase) == 1
+        for phase in ("assembly", "network", "receive", "unmarshal")
+    )
+    assert aggregator.get_count(
+        "response_bytes_total", "getFoo", encoding="identity"
+    ) == len(b'{"a": 1}')
+
+
+def test_generated_client_methods_label_metrics_by_operation_id(
+    generated_client_package: Callable[..., tuple[ModuleType, ModuleType]],
+) -> None:
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    model_module, client_module = generated_client_package(open_api)
+    aggregator: MetricsAggregator = MetricsAggregator()
+    with http_test_server(
+        responses={("GET", "/pets"): _PETS_RESPONSE}
+    ) as server:
+        client = client_module.Client(url=server.url, metrics=aggregator)
+        pets = client.get_pets()
+    assert all(isinstance(pet, model_module.Pet) for pet in pets)
+    assert (
+        aggregator.get_count(
+            "requests_total", "getPets", method="GET", status_class="2xx"
+        )
+        == 1
+    )
+    assert (
+        aggregator.get_count(
+            "phase_duration_seconds", "getPets", phase="unmarshal"
+        )
+        == 1
+    )
+
+
+# endregion
+# region Client request timing
+
+
+def test_client_timing_hook_receives_a_record_per_exchange() -> None:
+    timings: list[RequestTiming] = []
+    body: bytes = json_module.dumps({"items": list(range(1000))}).encode()
+    with http_test_server(
+        responses={
+            ("GET", "/foo"): Response(
+                headers={"Content-Encoding": "gzip"},
+                body=gzip.compress(body),
+            )
+        },
+        protocol_version="HTTP/1.1",
+    ) as server:
+        client: Client = Client(url=server.url, timing_hook=timings.append)
+        client.request("/foo", "GET", operation="getFoo").read()
+        assert len(timings) == 1
+        assert sob.marshal(
+            client.unmarshal_response(client.request("/foo", "GET"))
+        ) == {"items": list(range(1000))}
+        client.close()
+    assert len(timings) == 2
+    first: RequestTiming
+    second: RequestTiming
+    first, second = timings
+    assert (first.method, first.url, first.operation, first.status) == (
+        "GET",
+        f"{server.url}/foo",
+        "getFoo",
+        200,
+    )
+    assert not first.reused_connection
+    assert first.connect > 0
+    assert second.reused_connection
+    assert second.connect == 0
+    for timing in timings:
+        assert timing.assembly > 0
+        assert timing.write > 0
+        assert timing.wait > 0
+        assert timing.download > 0
+        assert timing.decompression > 0
+    # Only the response read by `unmarshal_response` is unmarshalled
+    assert first.unmarshal == 0
+    assert second.unmarshal > 0
+
+
+def test_client_timing_hook_receives_failed_requests() -> None:
+    timings: list[RequestTiming] = []
+    with http_test_server(
+        responses={("GET", "/foo"): Response(status=404)}
+    ) as server:
+        client: Client = Client(
+            url=server.url, connection_pool_size=0, timing_hook=timings.append
+        )
+        with pytest.raises(HTTPError):
+            client.request("/foo", "GET")
+    assert len(timings) == 1
+    assert timings[0].status == 404
+    assert isinstance(timings[0].error, HTTPError)
+    assert timings[0].connect > 0
+    assert timings[0].wait > 0
+
+
+def test_async_client_timing_hook_receives_a_record_per_exchange() -> None:
+    timings: list[RequestTiming] = []
+
+    async def get_foo(url: str) -> None:
+        client: AsyncClient = AsyncClient(url=url, timing_hook=timings.append)
+        client.unmarshal_response(await client.request("/foo", "GET"))
+        await client.aclose()
+
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b'{"a": 1}')},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        asyncio.run(get_foo(server.url))
+    assert len(timings) == 1
+    assert timings[0].status == 200
+    assert timings[0].connect > 0
+    assert timings[0].wait > 0
+    assert timings[0].download > 0
+    assert timings[0].unmarshal > 0
+
+
+def test_generated_client_methods_record_unmarshal_timing(
+    generated_client_package: Callable[..., tuple[ModuleType, ModuleType]],
+) -> None:
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    _, client_module = generated_client_package(open_api)
+    timings: list[RequestTiming] = []
+    with http_test_server(
+        responses={("GET", "/pets"): _PETS_RESPONSE}
+    ) as server:
+        client = client_module.Client(
+            url=server.url, timing_hook=timings.append
+        )
+        client.get_pets()
+    assert len(timings) == 1
+    assert timings[0].operation == "getPets"
+    assert timings[0].unmarshal > 0
+
+
+# endregion
+# region Client timeouts and deadlines
+
+
+def test_client_total_timeout_bounds_a_slowly_trickled_response() -> None:
+    body: bytes = json_module.dumps({"items": list(range(10))}).encode()
+    with http_test_server(
+        responses={
+            ("GET", "/foo"): Response(body=body, drip_interval=0.05),
+        }
+    ) as server:
+        # Each byte arrives well within the read timeout, but the response
+        # as a whole cannot be read within the total timeout
+        client: Client = Client(
+            url=server.url, timeout=Timeout(connect=1, read=1, total=0.3)
+        )
+        started: float = time.monotonic()
+        with (
+            pytest.raises(OAPITimeoutError),
+            client.request("/foo", "GET") as response,
+        ):
+            response.read()
+        assert time.monotonic() - started < 1
+        client.close()
+
+
+def test_client_deadline_prevents_retries_which_could_not_complete() -> None:
+    with http_test_server(
+        responses={("GET", "/foo"): Response(status=503)}
+    ) as server:
+        client: Client = Client(
+            url=server.url,
+            retry_policy=RetryPolicy(number_of_attempts=5, base_delay=1),
+        )
+        started: float = time.monotonic()
+        with (
+            pytest.raises(HTTPError),
+            pytest.warns(UserWarning, match="Attempt #"),
+        ):
+            client.request("/foo", "GET", deadline=1.5)
+        # The first retry began before the deadline, but the second could
+        # not have
+        assert len(server.requests) == 2
+        assert time.monotonic() - started < 1.5
+        with Deadline(0), pytest.raises(OAPITimeoutError):
+            client.request("/foo", "GET")
+        assert len(server.requests) == 2
+
+
+def test_client_deadline_clips_the_timeout_of_an_attempt() -> None:
+    def respond_slowly(request: RecordedRequest) -> Response:
+        time.sleep(2)
+        return Response()
+
+    with http_test_server(
+        handlers={("GET", "/foo"): respond_slowly}
+    ) as server:
+        client: Client = Client(url=server.url, timeout=10)
+        started: float = time.monotonic()
+        with Deadline(0.3), pytest.raises(OSError, match="timed out"):
+            client.request("/foo", "GET")
+        assert time.monotonic() - started < 1
+
+
+def test_async_client_deadline_clips_the_timeout_of_an_attempt() -> None:
+    def respond_slowly(request: RecordedRequest) -> Response:
+        time.sleep(2)
+        return Response()
+
+    async def get_foo(url: str) -> None:
+        client: AsyncClient = AsyncClient(url=url, timeout=Timeout(read=10))
+        try:
+            with Deadline(0.3):
+                await client.request("/foo", "GET")
+        finally:
+            await client.aclose()
+
+    with http_test_server(
+        handlers={("GET", "/foo"): respond_slowly}
+    ) as server:
+        started: float = time.monotonic()
+        with pytest.raises(TimeoutError):
+            asyncio.run(get_foo(server.url))
+        assert time.monotonic() - started < 1
+
+
+def test_client_map_calls_are_subject_to_an_enclosing_deadline() -> None:
+    with http_test_server() as server:
+        client: Client = Client(url=server.url)
+        with Deadline(0):
+            results: list[typing.Any] = list(
+                client.map(
+                    lambda client, path: client.request(path, "GET"),
+                    ({"path": "/foo"}, {"path": "/bar"}),
+                    return_exceptions=True,
+                )
+            )
+        assert all(isinstance(result, OAPITimeoutError) for result in results)
+        assert not server.requests
+        client.close()
+
+
+def test_generated_client_methods_respect_a_deadline(
+    generated_client_package: Callable[..., tuple[ModuleType, ModuleType]],
+) -> None:
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    _, client_module = generated_client_package(open_api)
+    with http_test_server(
+        responses={("GET", "/pets"): _PETS_RESPONSE}
+    ) as server:
+        client = client_module.Client(
+            url=server.url, timeout=Timeout(connect=1, read=5, total=10)
+        )
+        with Deadline(5):
+            client.get_pets()
+        with Deadline(0), pytest.raises(OAPITimeoutError):
+            client.get_pets()
+    assert len(server.requests) == 1
+
+
+# endregion
+# region Client DNS caching
+
+
+def test_generated_clients_can_be_pointed_at_a_pinned_host(
+    generated_client_package: Callable[..., tuple[ModuleType, ModuleType]],
+) -> None:
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    _, client_module = generated_client_package(open_api)
+    with http_test_server(
+        responses={("GET", "/pets"): _PETS_RESPONSE}
+    ) as server:
+        # The fictitious host is resolved to the local test server
+        dns_cache: DNSCache = DNSCache(
+            overrides={"pets.example.test": "127.0.0.1"}
+        )
+        url: str = server.url.replace("127.0.0.1", "pets.example.test")
+        client = client_module.Client(url=url, dns_cache=dns_cache)
+        client.get_pets()
+        client.close()
+
+        async def get_pets() -> None:
+            async_client: AsyncClient = AsyncClient(
+                url=url, dns_cache=dns_cache
+            )
+            await async_client.request("/pets", "GET")
+            async_client.close()
+
+        asyncio.run(get_pets())
+    assert len(server.requests) == 2
+    assert {request.headers["Host"] for request in server.requests} == {
+        url.partition("://")[2]
+    }
+
+
+def test_clients_share_a_dns_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    hosts: list[str] = []
+    getaddrinfo = socket.getaddrinfo
+
+    def record_getaddrinfo(
+        host: str, *args: typing.Any, **kwargs: typing.Any
+    ) -> list[tuple[typing.Any, ...]]:
+        hosts.append(host)
+        return getaddrinfo(host, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", record_getaddrinfo)
+    dns_cache: DNSCache = DNSCache()
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b"{}")}
+    ) as server:
+        url: str = server.url.replace("127.0.0.1", "localhost")
+        # Each short-lived client opens a new connection, but only the
+        # first resolves the host
+        for _ in range(3):
+            client: Client = Client(url=url, dns_cache=dns_cache)
+            assert client.request("/foo", "GET").read() == b"{}"
+            client.close()
+        # Pickled clients retain the DNS cache's settings
+        assert (
+            pickle.loads(pickle.dumps(client)).dns_cache.ttl == dns_cache.ttl
+        )
+    assert hosts == ["localhost"]
+
+
+# endregion
+# region Client OAuth2 flows and OIDC discovery
+
+
+def test_oauth2_password_flow_authenticates_and_caches_the_token() -> None:
+    with http_test_server(
+        responses={
+            ("POST", "/token"): Response(
+                status=200,
                 body=json_module.dumps(
                     {
                         "token_type": "Bearer",
@@ -1964,6 +4315,204 @@ def test_oauth2_password_flow_authenticates_and_caches_the_token() -> None:
         assert token_requests_after == token_requests_before
 
 
+def _oauth2_token_handler(
+    expires_in: int = 3600,
+) -> Callable[[RecordedRequest], Response]:
+    """
+    Return a token endpoint handler, which issues numbered access tokens
+    (with refresh tokens) for the password, client credentials and refresh
+    token grants.
+    """
+    lock: threading.Lock = threading.Lock()
+    tokens_issued: list[str] = []
+
+    def handler(request: RecordedRequest) -> Response:
+        time.sleep(0.02)
+        with lock:
+            tokens_issued.append(request.body.decode())
+            number: int = len(tokens_issued)
+        return Response(
+            body=json_module.dumps(
+                {
+                    "token_type": "Bearer",
+                    "access_token": f"tok-{number}",
+                    "refresh_token": f"refresh-{number}",
+                    "expires_in": expires_in,
+                }
+            ).encode()
+        )
+
+    return handler
+
+
+def test_oauth2_token_is_obtained_once_for_concurrent_requests() -> None:
+    with http_test_server(
+        handlers={("POST", "/token"): _oauth2_token_handler()},
+        responses={("GET", "/protected"): Response(body=b"{}")},
+    ) as server:
+        client: Client = Client(
+            url=server.url,
+            oauth2_client_id="cid",
+            oauth2_client_secret="csecret",
+            oauth2_token_url=server.url + "/token",
+        )
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(
+                executor.map(
+                    lambda _: client.request("/protected", "GET").read(),
+                    range(16),
+                )
+            )
+        assert [request.path for request in server.requests].count(
+            "/token"
+        ) == 1
+        assert {
+            request.headers["Authorization"]
+            for request in server.requests
+            if request.path == "/protected"
+        } == {"Bearer tok-1"}
+
+
+def test_oauth2_token_is_refreshed_using_its_refresh_token() -> None:
+    with http_test_server(
+        handlers={
+            ("POST", "/token"): _oauth2_token_handler(expires_in=1),
+            ("POST", "/refresh"): _oauth2_token_handler(),
+        },
+        responses={("GET", "/protected"): Response(body=b"{}")},
+    ) as server:
+        client: Client = Client(
+            url=server.url,
+            oauth2_client_id="cid",
+            oauth2_username="user1",
+            oauth2_password="pw1",
+            oauth2_token_url=server.url + "/token",
+            oauth2_refresh_url="/refresh",
+        )
+        client.request("/protected", "GET").read()
+        # The first token expires immediately, so is refreshed
+        client.request("/protected", "GET").read()
+        assert [request.path for request in server.requests] == [
+            "/token",
+            "/protected",
+            "/refresh",
+            "/protected",
+        ]
+        assert "grant_type=refresh_token" in server.requests[2].body.decode()
+        assert "refresh_token=refresh-1" in server.requests[2].body.decode()
+        assert server.requests[3].headers["Authorization"] == "Bearer tok-1"
+
+
+def test_oauth2_token_is_refreshed_in_the_background() -> None:
+    with http_test_server(
+        handlers={("POST", "/token"): _oauth2_token_handler(expires_in=101)},
+        responses={("GET", "/protected"): Response(body=b"{}")},
+    ) as server:
+        client: Client = Client(
+            url=server.url,
+            oauth2_client_id="cid",
+            oauth2_client_secret="csecret",
+            oauth2_token_url=server.url + "/token",
+        )
+        client.request("/protected", "GET").read()
+        # The token (which has a lifetime of 100 seconds) is now within
+        # `oauth2_refresh_skew` of its expiration
+        client.oauth2_refresh_skew = 99.9
+        time.sleep(0.2)
+        # The current token is used while a new token is obtained (using
+        # the refresh token) in the background
+        authorizations: list[str] = []
+        started: float = time.monotonic()
+        while "Bearer tok-2" not in authorizations:
+            assert time.monotonic() - started < 2
+            client.request("/protected", "GET").read()
+            authorizations.append(
+                next(
+                    request.headers["Authorization"]
+                    for request in reversed(server.requests)
+                    if request.path == "/protected"
+                )
+            )
+            time.sleep(0.01)
+        assert set(authorizations) == {"Bearer tok-1", "Bearer tok-2"}
+        token_requests: list[RecordedRequest] = [
+            request for request in server.requests if request.path == "/token"
+        ]
+        assert len(token_requests) == 2
+        assert "grant_type=refresh_token" in token_requests[1].body.decode()
+
+
+def test_oauth2_token_is_reused_by_a_pickled_client() -> None:
+    with http_test_server(
+        handlers={("POST", "/token"): _oauth2_token_handler()},
+        responses={("GET", "/protected"): Response(body=b"{}")},
+    ) as server:
+        client: Client = Client(
+            url=server.url,
+            oauth2_client_id="cid",
+            oauth2_client_secret="csecret",
+            oauth2_token_url=server.url + "/token",
+        )
+        client.request("/protected", "GET").read()
+        unpickled: Client = pickle.loads(pickle.dumps(client))
+        unpickled.request("/protected", "GET").read()
+        assert [request.path for request in server.requests].count(
+            "/token"
+        ) == 1
+        assert server.requests[-1].headers["Authorization"] == "Bearer tok-1"
+
+
+def test_oauth2_token_is_shared_through_a_token_store(
+    tmp_path: Path,
+) -> None:
+    def discovery_handler(request: RecordedRequest) -> Response:
+        token_endpoint: str = f"http://{request.headers['Host']}/token"
+        return Response(
+            body=json_module.dumps({"token_endpoint": token_endpoint}).encode()
+        )
+
+    with http_test_server(
+        handlers={
+            ("GET", "/.well-known/openid-configuration"): discovery_handler,
+            ("POST", "/token"): _oauth2_token_handler(),
+        },
+        responses={("GET", "/protected"): Response(body=b"{}")},
+    ) as server:
+        clients: list[Client] = [
+            Client(
+                url=server.url,
+                oauth2_client_id="cid",
+                oauth2_client_secret="csecret",
+                oauth2_token_store=FileOAuth2TokenStore(tmp_path),
+            )
+            for _ in range(3)
+        ]
+        client: Client
+        for client in clients:
+            client.request("/protected", "GET").read()
+        # The discovery document and token are each requested only once
+        assert [request.path for request in server.requests] == [
+            "/.well-known/openid-configuration",
+            "/token",
+            "/protected",
+            "/protected",
+            "/protected",
+        ]
+        assert {
+            request.headers["Authorization"]
+            for request in server.requests
+            if request.path == "/protected"
+        } == {"Bearer tok-1"}
+        # Tokens are not shared between different client IDs
+        Client(
+            url=server.url,
+            oauth2_client_id="other",
+            oauth2_client_secret="csecret",
+            oauth2_token_store=FileOAuth2TokenStore(tmp_path),
+        ).request("/protected", "GET").read()
+        assert server.requests[-1].headers["Authorization"] == "Bearer tok-2"
+
+
 def test_oauth2_password_flow_requires_a_username() -> None:
     client: Client = Client(
         oauth2_token_url="http://example.com/token",
@@ -2562,6 +5111,36 @@ def parameter_styles_client(
     return client_module
 
 
+def test_request_templates_are_compiled_when_the_class_is_created(
+    parameter_styles_client: ModuleType,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    assert isinstance(
+        parameter_styles_client.Client._get_path_simple_id_request_template,
+        RequestTemplate,
+    )
+
+    def get_argument_formatter(
+        *args: typing.Any, **kwargs: typing.Any
+    ) -> None:
+        raise AssertionError
+
+    # Argument formatters are only looked up when templates are compiled,
+    # not when requests are made
+    monkeypatch.setattr(
+        "oapi.client.get_argument_formatter", get_argument_formatter
+    )
+    monkeypatch.setattr(
+        "oapi.client.format_argument_value", get_argument_formatter
+    )
+    with http_test_server(
+        responses={("GET", "/path/simple/1,2,3"): Response(body=b"{}")}
+    ) as server:
+        client = parameter_styles_client.Client(url=server.url)
+        client.get_path_simple_id(id_=[1, 2, 3])
+        assert server.requests[0].path == "/path/simple/1,2,3"
+
+
 def test_path_simple_style(parameter_styles_client: ModuleType) -> None:
     with http_test_server(
         responses={("GET", "/path/simple/1,2,3"): Response(body=b"{}")}
@@ -2934,4 +5513,334 @@ def test_additional_properties_dictionary_response(
         assert dict(tags) == {"a": "1", "b": "2"}
 
 
+def test_response_is_unmarshalled_as_the_type_for_its_status_code(
+    generated_client_package: Callable[..., tuple[ModuleType, ModuleType]],
+) -> None:
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api_data: dict[str, typing.Any] = json_module.load(f)
+
+    def response(schema_name: str) -> dict[str, typing.Any]:
+        return {
+            "description": "",
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": f"#/components/schemas/{schema_name}"}
+                }
+            },
+        }
+
+    open_api_data["paths"]["/shape"] = {
+        "get": {
+            "operationId": "getShape",
+            "responses": {
+                "200": response("Circle"),
+                "201": response("Square"),
+                "2XX": response("Shape"),
+            },
+        }
+    }
+    model_module, client_module = generated_client_package(
+        OpenAPI(json_module.dumps(open_api_data))
+    )
+    # This response is a valid circle *and* square, so without dispatching
+    # on the status code it would be unmarshalled as the first matching
+    # type (a circle)
+    body: bytes = b'{"radius": 1, "side": 2}'
+    with http_test_server(
+        sequences={
+            ("GET", "/shape"): [
+                Response(status=200, body=body),
+                Response(status=201, body=body),
+                Response(status=202, body=body),
+            ]
+        }
+    ) as server:
+        client = client_module.Client(url=server.url)
+        assert isinstance(client.get_shape(), model_module.Circle)
+        assert isinstance(client.get_shape(), model_module.Square)
+        # Status codes without a specific response fall back to probing
+        # all response types
+        assert isinstance(
+            client.get_shape(), (model_module.Circle, model_module.Square)
+        )
+    # The mapping of status codes to response types is built once, when the
+    # class is created
+    assert client_module.Client._get_shape_status_response_types == {
+        200: (model_module.Circle,),
+        201: (model_module.Square,),
+    }
+    # Operations with only one response type don't dispatch on status codes
+    assert "get_response_types" not in inspect.getsource(
+        client_module.Client.get_shapes
+    )
+    assert not hasattr(
+        client_module.Client, "_get_shapes_status_response_types"
+    )
+
+
+# endregion
+
+# region ClientModule: asynchronous code generation
+
+
+@pytest.fixture
+def asynchronous_polymorphic_client(
+    generated_client_package: Callable[..., tuple[ModuleType, ModuleType]],
+) -> tuple[ModuleType, ModuleType]:
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    return generated_client_package(open_api, asynchronous=True)
+
+
+def test_asynchronous_client_module_generates_coroutine_methods(
+    asynchronous_polymorphic_client: tuple[ModuleType, ModuleType],
+) -> None:
+    _model_module, client_module = asynchronous_polymorphic_client
+    assert issubclass(client_module.Client, AsyncClient)
+    assert inspect.iscoroutinefunction(client_module.Client.get_pets)
+
+
+def test_asynchronous_client_module_method_unmarshals_the_response(
+    asynchronous_polymorphic_client: tuple[ModuleType, ModuleType],
+) -> None:
+    model_module, client_module = asynchronous_polymorphic_client
+    with http_test_server(
+        responses={
+            ("GET", "/pets"): Response(
+                status=200,
+                body=b'[{"name": "Rex", "species": "dog", "status": "sold"}]',
+            )
+        }
+    ) as server:
+        client = client_module.Client(url=server.url)
+        pets = asyncio.run(client.get_pets())
+        assert len(pets) == 1
+        assert isinstance(pets[0], model_module.Pet)
+        assert pets[0].name == "Rex"
+
+
+def test_asynchronous_client_module_rejects_a_synchronous_base_class(
+    tmp_path: Path,
+) -> None:
+    class SynchronousClient(Client):
+        pass
+
+    model_path: Path = tmp_path / "model.py"
+    model_path.write_text("")
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    with pytest.raises(TypeError, match="AsyncClient"):
+        ClientModule(
+            open_api,
+            model_path=model_path,
+            base_class=SynchronousClient,
+            asynchronous=True,
+        )
+
+
+# endregion
+
+# region ClientModule: iterable array response code generation
+
+
+_PETS_RESPONSE: Response = Response(
+    status=200,
+    body=(
+        b'[{"name": "Rex", "species": "dog", "status": "sold"},'
+        b' {"name": "Tom", "species": "cat", "status": "available"}]'
+    ),
+)
+
+
+def test_iterable_array_responses_generates_item_iterators(
+    generated_client_package: Callable[..., tuple[ModuleType, ModuleType]],
+) -> None:
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    model_module, client_module = generated_client_package(
+        open_api, iterable_array_responses=True
+    )
+    # Only operations responding with an array get an iterator
+    assert hasattr(client_module.Client, "iter_get_pets")
+    assert not hasattr(client_module.Client, "iter_get_shapes")
+    assert inspect.isgeneratorfunction(client_module.Client.iter_get_pets)
+    with http_test_server(
+        responses={("GET", "/pets"): _PETS_RESPONSE}
+    ) as server:
+        client = client_module.Client(url=server.url)
+        pets: list[typing.Any] = list(client.iter_get_pets())
+    assert all(isinstance(pet, model_module.Pet) for pet in pets)
+    assert [pet.name for pet in pets] == ["Rex", "Tom"]
+
+
+def test_iterable_array_responses_close_responses_consumed_in_part(
+    generated_client_package: Callable[..., tuple[ModuleType, ModuleType]],
+) -> None:
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    _, client_module = generated_client_package(
+        open_api, iterable_array_responses=True
+    )
+    pet: bytes = b'{"name": "Rex", "species": "dog", "status": "sold"}'
+    responses: list[typing.Any] = []
+    with http_test_server(
+        responses={
+            ("GET", "/pets"): Response(
+                body=b"[" + b", ".join([pet] * 10000) + b"]"
+            )
+        }
+    ) as server:
+        client = client_module.Client(url=server.url)
+        request: Callable[..., typing.Any] = client.request
+
+        def record_response(
+            *args: typing.Any, **kwargs: typing.Any
+        ) -> typing.Any:
+            response: typing.Any = request(*args, **kwargs)
+            responses.append(response)
+            return response
+
+        client.request = record_response
+        pets: collections.abc.Generator[typing.Any, None, None] = (
+            client.iter_get_pets()
+        )
+        assert next(pets).name == "Rex"
+        assert not responses[0].isclosed()
+        # Abandoning the iterator closes the response
+        pets.close()
+        assert responses[0].isclosed()
+
+
+def test_iterable_array_responses_are_not_generated_for_async_clients(
+    generated_client_package: Callable[..., tuple[ModuleType, ModuleType]],
+) -> None:
+    """
+    Asynchronous clients receive each response in full, so an item
+    iterator would not bound their memory use.
+    """
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    _, client_module = generated_client_package(
+        open_api, asynchronous=True, iterable_array_responses=True
+    )
+    assert hasattr(client_module.Client, "get_pets")
+    assert not hasattr(client_module.Client, "iter_get_pets")
+
+
+# endregion
+# region ClientModule: paginated iterator code generation
+
+
+def _get_pets_page(request: RecordedRequest) -> Response:
+    cursor: str | None = dict(parse_qsl(request.query)).get("cursor")
+    if cursor is None:
+        return Response(
+            body=(
+                b'{"items": [{"name": "Rex"}, {"name": "Tom"}],'
+                b' "next_cursor": "b"}'
+            )
+        )
+    return Response(body=b'{"items": [{"name": "Max"}]}')
+
+
+def test_pagination_generates_paginated_iterators(
+    generated_client_package: Callable[..., tuple[ModuleType, ModuleType]],
+) -> None:
+    with open("tests/input-data/polymorphic-schemas.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    model_module, client_module = generated_client_package(
+        open_api,
+        pagination={"getPets": Pagination("offset", parameter="skip")},
+        iterable_array_responses=True,
+    )
+    assert inspect.isgeneratorfunction(client_module.Client.iter_get_pets)
+    with http_test_server(
+        sequences={
+            ("GET", "/pets"): [
+                _PETS_RESPONSE,
+                Response(body=b"[]"),
+            ]
+        }
+    ) as server:
+        client = client_module.Client(url=server.url)
+        pets: list[typing.Any] = list(client.iter_get_pets())
+    assert all(isinstance(pet, model_module.Pet) for pet in pets)
+    assert [pet.name for pet in pets] == ["Rex", "Tom"]
+    assert [request.query for request in server.requests] == ["", "skip=2"]
+
+
+def test_detect_pagination_generates_paginated_iterators(
+    generated_client_package: Callable[..., tuple[ModuleType, ModuleType]],
+) -> None:
+    with open("tests/input-data/pagination.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    model_module, client_module = generated_client_package(
+        open_api, detect_pagination=True
+    )
+    assert typing.get_args(
+        typing.get_type_hints(client_module.Client.iter_get_pets)["return"]
+    ) == (model_module.Pet,)
+    assert hasattr(client_module.Client, "iter_get_events")
+    assert hasattr(client_module.Client, "iter_get_tags")
+    # Paginated methods share their operation's request template
+    assert isinstance(
+        client_module.Client._get_pets_request_template, RequestTemplate
+    )
+    assert not hasattr(client_module.Client, "_iter_get_pets_request_template")
+    # Operations without pagination parameters or headers are not paginated
+    assert not hasattr(client_module.Client, "iter_get_owners")
+    with http_test_server(
+        handlers={("GET", "/pets"): _get_pets_page}
+    ) as server:
+        client = client_module.Client(url=server.url)
+        pets: list[typing.Any] = list(client.iter_get_pets(limit=2))
+    assert all(isinstance(pet, model_module.Pet) for pet in pets)
+    assert [pet.name for pet in pets] == ["Rex", "Tom", "Max"]
+    assert [request.query for request in server.requests] == [
+        "limit=2",
+        "limit=2&cursor=b",
+    ]
+
+
+def test_write_client_module_generates_paginated_iterators(
+    tmp_path: Path,
+) -> None:
+    with open("tests/input-data/pagination.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    model_path: Path = tmp_path / "model.py"
+    model_path.write_text(str(ModelModule(open_api)))
+    client_path: Path = tmp_path / "client.py"
+    write_client_module(
+        client_path,
+        open_api=open_api,
+        model_path=model_path,
+        pagination={"getOwners": Pagination("page")},
+        detect_pagination=True,
+    )
+    source: str = client_path.read_text()
+    assert "def iter_get_owners(" in source
+    assert "def iter_get_pets(" in source
+
+
+def test_detect_pagination_generates_asynchronous_paginated_iterators(
+    generated_client_package: Callable[..., tuple[ModuleType, ModuleType]],
+) -> None:
+    with open("tests/input-data/pagination.json") as f:
+        open_api: OpenAPI = OpenAPI(f)
+    _, client_module = generated_client_package(
+        open_api, asynchronous=True, detect_pagination=True
+    )
+    assert inspect.isasyncgenfunction(client_module.Client.iter_get_pets)
+
+    async def get_pets(url: str) -> list[typing.Any]:
+        client = client_module.Client(url=url)
+        return [pet async for pet in client.iter_get_pets()]
+
+    with http_test_server(
+        handlers={("GET", "/pets"): _get_pets_page}
+    ) as server:
+        pets: list[typing.Any] = asyncio.run(get_pets(server.url))
+    assert [pet.name for pet in pets] == ["Rex", "Tom", "Max"]
+
+
 # endregion
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import gzip
+import pickle
+from urllib.request import Request
+
+import pytest
+
+from oapi._compression import CompressedBody, CompressionPolicy
+from oapi.client import _decode_content
+
+_DATA: bytes = b'{"key": "value"}' * 10000
+
+
+@pytest.mark.parametrize("content_encoding", ["gzip", "deflate", "zstd", "br"])
+def test_compressed_body(content_encoding: str) -> None:
+    body: CompressedBody = CompressedBody(
+        _DATA, content_encoding, chunk_size=1024
+    )
+    chunks: list[bytes] = list(body)
+    assert len(chunks) > 1 or content_encoding == "br"
+    assert _decode_content(b"".join(chunks), content_encoding) == _DATA
+    # The body can be iterated over again (such as when a request is
+    # retried)
+    assert b"".join(body) == b"".join(chunks)
+    assert _decode_content(bytes(body), content_encoding) == _DATA
+
+
+def test_compression_policy_compresses_large_bodies() -> None:
+    policy: CompressionPolicy = CompressionPolicy(level=9, threshold=1024)
+    request: Request = Request(
+        "http://example.com",
+        data=_DATA,
+        headers={"Content-length": str(len(_DATA))},
+    )
+    policy.compress(request)
+    assert isinstance(request.data, CompressedBody)
+    assert request.get_header("Content-encoding") == "gzip"
+    # The compressed length isn't known until the body has been sent, so
+    # the body is sent using "Transfer-Encoding: chunked"
+    assert not request.has_header("Content-length")
+    assert gzip.decompress(bytes(request.data)) == _DATA
+
+
+def test_compression_policy_skips_ineligible_bodies() -> None:
+    policy: CompressionPolicy = CompressionPolicy(threshold=1024)
+    request: Request = Request("http://example.com", data=b"{}")
+    policy.compress(request)
+    assert request.data == b"{}"
+    assert not request.has_header("Content-encoding")
+    request = Request(
+        "http://example.com",
+        data=_DATA,
+        headers={"Content-encoding": "identity"},
+    )
+    policy.compress(request)
+    assert request.data == _DATA
+    request = Request("http://example.com")
+    policy.compress(request)
+    assert request.data is None
+
+
+def test_compression_policy_validates_content_encoding() -> None:
+    with pytest.raises(ValueError, match="compress"):
+        CompressionPolicy("compress")  # type: ignore[arg-type]
+
+
+def test_compression_policy_pickling() -> None:
+    policy: CompressionPolicy = CompressionPolicy("zstd", level=3)
+    unpickled: CompressionPolicy = pickle.loads(pickle.dumps(policy))
+    assert unpickled.content_encoding == "zstd"
+    assert unpickled.level == 3
+    assert unpickled.threshold == policy.threshold
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import pickle
+import socket
+import typing
+
+import pytest
+
+from oapi import _dns
+from oapi._dns import DNSCache
+
+_ADDRESS_INFO: list[tuple[typing.Any, ...]] = [
+    (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.1", 80))
+]
+
+
+class _Resolver:
+    """
+    Stands in for `socket.getaddrinfo`, counting look-ups.
+    """
+
+    def __init__(self, error: socket.gaierror | None = None) -> None:
+        self.error: socket.gaierror | None = error
+        self.hosts: list[str] = []
+
+    def __call__(
+        self, host: str, *args: typing.Any, **kwargs: typing.Any
+    ) -> list[tuple[typing.Any, ...]]:
+        self.hosts.append(host)
+        if self.error is not None:
+            raise self.error
+        return _ADDRESS_INFO
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now: float = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    clock_: _Clock = _Clock()
+    monkeypatch.setattr(_dns, "monotonic", clock_)
+    return clock_
+
+
+def test_dns_cache_caches_resolutions_until_their_ttl_expires(
+    monkeypatch: pytest.MonkeyPatch, clock: _Clock
+) -> None:
+    resolver: _Resolver = _Resolver()
+    monkeypatch.setattr(socket, "getaddrinfo", resolver)
+    dns_cache: DNSCache = DNSCache(ttl=10)
+    for _ in range(3):
+        assert dns_cache.getaddrinfo("api.example.com", 80) == _ADDRESS_INFO
+    assert resolver.hosts == ["api.example.com"]
+    assert len(dns_cache) == 1
+    # Resolutions are cached per port, family, etc.
+    dns_cache.getaddrinfo("api.example.com", 443)
+    assert len(resolver.hosts) == 2
+    clock.now += 10
+    dns_cache.getaddrinfo("api.example.com", 80)
+    assert len(resolver.hosts) == 3
+    dns_cache.clear()
+    assert len(dns_cache) == 0
+    dns_cache.getaddrinfo("api.example.com", 80)
+    assert len(resolver.hosts) == 4
+
+
+def test_dns_cache_caches_failed_resolutions_for_its_negative_ttl(
+    monkeypatch: pytest.MonkeyPatch, clock: _Clock
+) -> None:
+    resolver: _Resolver = _Resolver(
+        socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+    )
+    monkeypatch.setattr(socket, "getaddrinfo", resolver)
+    dns_cache: DNSCache = DNSCache(ttl=60, negative_ttl=5)
+    for _ in range(3):
+        with pytest.raises(socket.gaierror, match="not known"):
+            dns_cache.getaddrinfo("missing.example.com", 80)
+    assert resolver.hosts == ["missing.example.com"]
+    clock.now += 5
+    resolver.error = None
+    assert dns_cache.getaddrinfo("missing.example.com", 80) == _ADDRESS_INFO
+    assert len(resolver.hosts) == 2
+    # With a negative TTL of 0, failures are not cached
+    resolver.error = socket.gaierror(socket.EAI_NONAME, "not known")
+    dns_cache = DNSCache(negative_ttl=0)
+    for _ in range(2):
+        with pytest.raises(socket.gaierror):
+            dns_cache.getaddrinfo("missing.example.com", 80)
+    assert len(resolver.hosts) == 4
+
+
+def test_dns_cache_resolves_pinned_hosts_without_looking_them_up() -> None:
+    dns_cache: DNSCache = DNSCache(overrides={"API.example.com": "127.0.0.1"})
+    dns_cache.pin("db.example.com", ("127.0.0.2", "::1"))
+    assert dns_cache.overrides == {
+        "api.example.com": ("127.0.0.1",),
+        "db.example.com": ("127.0.0.2", "::1"),
+    }
+    address_info: tuple[typing.Any, ...]
+    assert [
+        address_info[4][0]
+        for address_info in dns_cache.getaddrinfo(
+            "api.example.com", 8080, type=socket.SOCK_STREAM
+        )
+    ] == ["127.0.0.1"]
+    assert [
+        address_info[4][:2]
+        for address_info in dns_cache.getaddrinfo(
+            "db.example.com", 5432, type=socket.SOCK_STREAM
+        )
+    ] == [("127.0.0.2", 5432), ("::1", 5432)]
+    # Pinned hosts are not cached (so that they can be unpinned)
+    assert len(dns_cache) == 0
+    dns_cache.unpin("DB.example.com")
+    assert "db.example.com" not in dns_cache.overrides
+
+
+def test_dns_cache_resolves_asynchronously(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    resolver: _Resolver = _Resolver()
+    monkeypatch.setattr(socket, "getaddrinfo", resolver)
+    dns_cache: DNSCache = DNSCache()
+
+    async def resolve() -> list[list[tuple[typing.Any, ...]]]:
+        return [
+            await dns_cache.async_getaddrinfo("api.example.com", 80)
+            for _ in range(3)
+        ]
+
+    assert asyncio.run(resolve()) == [_ADDRESS_INFO] * 3
+    # The look-up (performed in the event loop's executor) is cached, and
+    # shared with synchronous look-ups
+    assert resolver.hosts == ["api.example.com"]
+    assert dns_cache.getaddrinfo("api.example.com", 80) == _ADDRESS_INFO
+    assert resolver.hosts == ["api.example.com"]
+
+
+def test_dns_cache_pickles_without_its_resolutions(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(socket, "getaddrinfo", _Resolver())
+    dns_cache: DNSCache = DNSCache(
+        ttl=30, negative_ttl=1, overrides={"api.example.com": "127.0.0.1"}
+    )
+    dns_cache.getaddrinfo("other.example.com", 80)
+    unpickled_dns_cache: DNSCache = pickle.loads(pickle.dumps(dns_cache))
+    assert unpickled_dns_cache.ttl == 30
+    assert unpickled_dns_cache.negative_ttl == 1
+    assert unpickled_dns_cache.overrides == dns_cache.overrides
+    assert len(unpickled_dns_cache) == 0
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pickle
+
+import pytest
+import sob
+from sob.errors import DeserializeError
+
+from oapi._json import JSONCodec, get_json_codec
+from oapi.oas.model import Reference
+
+
+@pytest.fixture(params=["json", "orjson", "msgspec"])
+def json_codec(request: pytest.FixtureRequest) -> JSONCodec:
+    pytest.importorskip(request.param)
+    return get_json_codec(request.param)
+
+
+def test_get_json_codec() -> None:
+    assert get_json_codec("json").name == "json"
+    assert get_json_codec().name in ("orjson", "msgspec", "ujson", "json")
+    with pytest.raises(ValueError, match="simplejson"):
+        get_json_codec("simplejson")
+
+
+def test_json_codec_round_trip(json_codec: JSONCodec) -> None:
+    value: dict[str, sob.abc.JSONTypes] = {
+        "a": [1, 2.5, True, None],
+        "b": "é中/",
+    }
+    data: bytes = json_codec.dumps(value)
+    assert isinstance(data, bytes)
+    assert json_codec.loads(data) == value
+    assert json_codec.loads(data.decode("utf-8")) == value
+
+
+def test_json_codec_falls_back_to_the_standard_library(
+    json_codec: JSONCodec,
+) -> None:
+    # Integers larger than 64 bits, and control characters in strings,
+    # aren't supported by every JSON library
+    assert json_codec.loads(json_codec.dumps(2**70)) == 2**70
+    assert json_codec.loads(b'"a\tb"') == "a\tb"
+
+
+def test_msgspec_json_codec_falls_back_to_the_standard_library() -> None:
+    msgspec = pytest.importorskip("msgspec")
+    json_codec: JSONCodec = get_json_codec("msgspec")
+
+    def encode(value: object) -> bytes:
+        # `msgspec.EncodeError` is not a `TypeError` or `ValueError`
+        message: str = f"unsupported: {value!r}"
+        raise msgspec.EncodeError(message)
+
+    json_codec._dumps = encode
+    assert json_codec.dumps({"a": 1}) == b'{"a": 1}'
+
+
+def test_json_codec_serializes_models(json_codec: JSONCodec) -> None:
+    reference: Reference = Reference(ref="#/x")
+    assert json_codec.loads(json_codec.dumps(reference)) == {"$ref": "#/x"}
+
+
+def test_json_codec_deserialize(json_codec: JSONCodec) -> None:
+    assert json_codec.deserialize(b'{"a": 1}') == {"a": 1}
+    assert json_codec.deserialize(b"not json", coerce_unparseable=bytes) == (
+        b"not json"
+    )
+    assert json_codec.deserialize(b"not json", coerce_unparseable=str) == (
+        "not json"
+    )
+    with pytest.raises(DeserializeError):
+        json_codec.deserialize(b"not json")
+
+
+def test_json_codec_pickling(json_codec: JSONCodec) -> None:
+    unpickled: JSONCodec = pickle.loads(pickle.dumps(json_codec))
+    assert unpickled.name == json_codec.name
+    assert unpickled.loads(b"[1]") == [1]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import threading
+
+from oapi._metrics import Metrics, MetricsAggregator, get_status_class
+
+
+def test_get_status_class() -> None:
+    assert get_status_class(200) == "2xx"
+    assert get_status_class(304) == "3xx"
+    assert get_status_class(429) == "4xx"
+    assert get_status_class(503) == "5xx"
+    assert get_status_class(0) == "error"
+
+
+def test_metrics_discards_metrics() -> None:
+    metrics: Metrics = Metrics()
+    metrics.increment("requests_total", "getPets", method="GET")
+    metrics.observe("request_duration_seconds", "getPets", 0.1)
+
+
+def test_metrics_aggregator_counts_by_operation_and_labels() -> None:
+    aggregator: MetricsAggregator = MetricsAggregator()
+    aggregator.increment("requests_total", "getPets", method="GET")
+    aggregator.increment("requests_total", "getPets", method="GET")
+    aggregator.increment("requests_total", "getPets", method="POST")
+    aggregator.increment("request_bytes_total", "addPet", 10)
+    assert aggregator.get_count("requests_total", "getPets", method="GET") == 2
+    assert (
+        aggregator.get_count("requests_total", "getPets", method="POST") == 1
+    )
+    assert aggregator.get_count("requests_total", "addPet", method="GET") == 0
+    assert aggregator.get_count("request_bytes_total", "addPet") == 10
+    aggregator.clear()
+    assert aggregator.get_count("requests_total", "getPets", method="GET") == 0
+
+
+def test_metrics_aggregator_is_thread_safe() -> None:
+    aggregator: MetricsAggregator = MetricsAggregator()
+
+    def increment() -> None:
+        for _ in range(1000):
+            aggregator.increment("requests_total", "getPets")
+            aggregator.observe("request_duration_seconds", "getPets", 0.01)
+
+    threads: list[threading.Thread] = [
+        threading.Thread(target=increment) for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert aggregator.get_count("requests_total", "getPets") == 4000
+    assert aggregator.get_count("request_duration_seconds", "getPets") == 4000
+
+
+def test_metrics_aggregator_renders_cumulative_histograms() -> None:
+    aggregator: MetricsAggregator = MetricsAggregator(
+        namespace="api", buckets=(0.5, 0.1)
+    )
+    assert aggregator.buckets == (0.1, 0.5)
+    aggregator.observe("request_duration_seconds", "getPets", 0.05)
+    aggregator.observe("request_duration_seconds", "getPets", 0.1)
+    aggregator.observe("request_duration_seconds", "getPets", 0.25)
+    aggregator.observe("request_duration_seconds", "getPets", 2)
+    assert aggregator.get_sum("request_duration_seconds", "getPets") == 2.4
+    assert aggregator.render().splitlines() == [
+        (
+            "# HELP api_request_duration_seconds Time from making a request "
+            "until response headers are received, including retries."
+        ),
+        "# TYPE api_request_duration_seconds histogram",
+        'api_request_duration_seconds_bucket{operation="getPets",le="0.1"} 2',
+        'api_request_duration_seconds_bucket{operation="getPets",le="0.5"} 3',
+        'api_request_duration_seconds_bucket{operation="getPets",le="+Inf"} 4',
+        'api_request_duration_seconds_sum{operation="getPets"} 2.4',
+        'api_request_duration_seconds_count{operation="getPets"} 4',
+    ]
+
+
+def test_metrics_aggregator_renders_counters_with_escaped_labels() -> None:
+    aggregator: MetricsAggregator = MetricsAggregator()
+    aggregator.increment(
+        "requests_total", 'get"Pets"', method="GET", status_class="2xx"
+    )
+    aggregator.increment("custom_total", "", 1.5)
+    assert aggregator.render() == (
+        "# TYPE oapi_client_custom_total counter\n"
+        'oapi_client_custom_total{operation=""} 1.5\n'
+        "# HELP oapi_client_requests_total Requests, by method and status "
+        "class.\n"
+        "# TYPE oapi_client_requests_total counter\n"
+        'oapi_client_requests_total{operation="get\\"Pets\\"",method="GET",'
+        'status_class="2xx"} 1\n'
+    )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
+import io
 import json
-import random
 from email.message import Message
 from email.parser import BytesParser
 from email.policy import compat32
@@ -14,6 +14,7 @@ from servers import RecordedRequest, Response, http_test_server
 from oapi._multipart_request import (
     Data,
     Headers,
+    MultipartBody,
     MultipartRequest,
     Part,
     Parts,
@@ -189,10 +190,9 @@ def test_part_boundary_does_not_collide_with_field_content() -> None:
     """
     Note: the boundary DOES appear in `top.data` -- it's the delimiter
     (`--{boundary}--`) between parts, by design. The real invariant is
-    that the computed boundary isn't a substring of any field's actual
-    content (which is what the `while boundary in data:` loop guards
-    against; see the collision test below for a direct exercise of
-    that loop).
+    that the boundary isn't a substring of any field's actual content
+    (which its 128 bits of randomness make vanishingly unlikely; see
+    below).
     """
     part_a: Part = Part(
         data=b"field-a-value",
@@ -215,32 +215,20 @@ def test_part_content_type_header_includes_boundary() -> None:
     )
 
 
-def test_part_boundary_retries_on_collision() -> None:
+def test_part_boundary_is_random_and_does_not_read_parts() -> None:
     """
-    Forces a real collision (not mocked): seed `random`, observe the
-    first 16-character candidate it would produce, then construct data
-    that literally contains that candidate. The real collision-avoidance
-    `while boundary in data` loop must then extend the boundary at least
-    one character -- proven by re-seeding identically and checking the
-    final boundary is longer than 16 bytes, starts with the original
-    candidate, and (still) does not appear in the data.
+    The boundary is 128 random bits (hex-encoded), so is generated without
+    scanning the parts for collisions (which would require reading them).
     """
-    random.seed(12345)
-    probe: Part = Part(data=b"irrelevant")
-    first_candidate: bytes = probe.boundary
-
-    random.seed(12345)
-    colliding_data: bytes = (
-        b"here is some data containing "
-        + first_candidate
-        + b" right in the middle"
-    )
-    part: Part = Part(data=colliding_data)
-    boundary: bytes = part.boundary
-
-    assert len(boundary) > 16
-    assert boundary.startswith(first_candidate)
-    assert boundary not in colliding_data
+    file: io.BytesIO = io.BytesIO(b"file-contents")
+    top: Part = Part(parts=[Part(data=file)])
+    file.seek(5)
+    boundary: bytes = top.boundary
+    assert len(boundary) == 32
+    assert int(boundary, 16) >= 0
+    assert Part(parts=[Part(data=b"x")]).boundary != boundary
+    # The file was not read
+    assert file.tell() == 5
 
 
 def test_part_boundary_deleter_forces_recalculation() -> None:
@@ -262,6 +250,70 @@ def test_part_data_property_returns_none_when_empty() -> None:
     assert part.data is None
 
 
+def test_multipart_body_and_length_are_cached_until_parts_change() -> None:
+    part_a: Part = Part(
+        data=b"a", headers={"Content-Disposition": 'form-data; name="a"'}
+    )
+    request: MultipartRequest = MultipartRequest(
+        "http://example.com/upload", method="POST", parts=[part_a]
+    )
+    length: str = _headers(request)["Content-length"]
+    body: bytes = bytes(cast("MultipartBody", request.data))
+    assert length == str(len(body))
+    # The cached body and length are used for subsequent header lookups
+    # and requests (modifying a part's data directly bypasses
+    # invalidation, so shows the cache is used)
+    part_a._data = b"abc"
+    assert _headers(request)["Content-length"] == length
+    assert bytes(cast("MultipartBody", request.data)) == body
+    # Modifying the parts, or the request's headers, invalidates the cache
+    _parts(request).append(Part(data=b"b"))
+    body = bytes(cast("MultipartBody", request.data))
+    assert b"abc" in body
+    assert _headers(request)["Content-length"] == str(len(body))
+    _headers(request)["X-custom"] = "1"
+    assert bytes(cast("MultipartBody", request.data)) != body
+
+
+def test_multipart_body_and_length_are_invalidated_by_modifying_a_part() -> (
+    None
+):
+    child: Part = Part(
+        data=b"a", headers={"Content-Disposition": 'form-data; name="a"'}
+    )
+    nested: Part = Part(parts=[child])
+    request: MultipartRequest = MultipartRequest(
+        "http://example.com/upload", method="POST", parts=[nested]
+    )
+    body: bytes = bytes(cast("MultipartBody", request.data))
+    assert _headers(request)["Content-length"] == str(len(body))
+    # Modifying the data or headers of a (nested) part invalidates the
+    # cached body and length of every part containing it
+    child.data = b"a" * 100
+    body = bytes(cast("MultipartBody", request.data))
+    assert b"a" * 100 in body
+    assert _headers(request)["Content-length"] == str(len(body))
+    _headers(child)["X-custom"] = "1"
+    body = bytes(cast("MultipartBody", request.data))
+    assert b"X-custom: 1" in body
+    assert _headers(request)["Content-length"] == str(len(body))
+    # Parts added after the request was created are also tracked
+    added: Part = Part(data=b"b")
+    _parts(nested).append(added)
+    bytes(cast("MultipartBody", request.data))
+    added.data = b"bcd"
+    assert b"bcd" in bytes(cast("MultipartBody", request.data))
+
+
+def test_multipart_body_with_a_file_is_not_cached() -> None:
+    file: io.BytesIO = io.BytesIO(b"abc")
+    top: Part = Part(parts=[Part(data=b"x"), Part(data=file)])
+    assert _data_bytes(top).endswith(b"abc\r\n--%s--" % top.boundary)
+    file.seek(0)
+    file.write(b"def")
+    assert _data_bytes(top).endswith(b"def\r\n--%s--" % top.boundary)
+
+
 def test_parts_append_invalidates_boundary_cache() -> None:
     top: Part = Part(parts=[Part(data=b"a")])
     _: bytes = top.boundary  # populate the cache
@@ -360,6 +412,79 @@ def test_assembled_multipart_data_parses_with_stdlib_email_parser() -> None:
     assert typed_payloads[1].get_payload(decode=True) == b"field-b-value"
 
 
+class _File(io.BytesIO):
+    """
+    A file which records the largest number of bytes read from it at once.
+    """
+
+    largest_read: int = 0
+
+    def read(self, size: int | None = -1) -> bytes:
+        data: bytes = super().read(size)
+        self.largest_read = max(self.largest_read, len(data))
+        return data
+
+
+def test_multipart_request_streams_files() -> None:
+    file: _File = _File(b"ignored" + (b"0123456789" * 20000))
+    file.seek(7)
+    request: MultipartRequest = MultipartRequest(
+        "http://example.com/upload",
+        method="POST",
+        parts=[
+            Part(
+                data=b"text",
+                headers={"Content-Disposition": 'form-data; name="a"'},
+            ),
+            Part(
+                data=file,
+                headers={
+                    "Content-Disposition": (
+                        'form-data; name="b"; filename="b.bin"'
+                    )
+                },
+            ),
+        ],
+    )
+    body: MultipartBody | bytes | None = request.data
+    assert isinstance(body, MultipartBody)
+    # The length is calculated without reading the file
+    assert _headers(request)["Content-length"] == str(len(body))
+    assert file.largest_read == 0
+    chunks: list[bytes] = list(body)
+    assert max(map(len, chunks)) <= 65536
+    assert file.largest_read <= 65536
+    assert len(b"".join(chunks)) == len(body)
+    # The body can be iterated over again, such as to retry the request
+    assert b"".join(body) == b"".join(chunks)
+    assert b"".join(chunks).count(b"0123456789") == 20000
+    assert b"ignored" not in b"".join(chunks)
+
+
+def test_part_data_without_a_trailing_line_break() -> None:
+    """
+    Trailing whitespace in a part's data is part of the data, so is kept.
+    """
+    top: Part = Part(parts=[Part(data=b"a\n"), Part(data=b"")])
+    data: bytes = _data_bytes(top)
+    assert len(data) == top.get_data_length()
+    boundary: bytes = top.boundary
+    assert data == (
+        b"\r\n--%s\r\n\r\na\n\r\n--%s\r\n\r\n\r\n--%s--"
+        % (boundary, boundary, boundary)
+    )
+
+
+def test_multipart_request_reads_unseekable_files_into_memory() -> None:
+    class Unseekable(io.BytesIO):
+        def seekable(self) -> bool:
+            return False
+
+    part: Part = Part(data=Unseekable(b"abc"))
+    assert part.data == b"abc"
+    assert part.get_data_length() == 3
+
+
 def test_request_sends_real_json_body_over_http() -> None:
     with http_test_server(
         responses={("POST", "/echo"): Response(status=200)}
@@ -380,6 +505,33 @@ def test_request_sends_real_json_body_over_http() -> None:
         assert recorded.headers["Content-Length"] == str(len(recorded.body))
 
 
+def test_multipart_request_streams_a_file_over_http() -> None:
+    with http_test_server(
+        responses={("POST", "/upload"): Response(status=200)}
+    ) as server:
+        contents: bytes = bytes(range(256)) * 1024
+        request: MultipartRequest = MultipartRequest(
+            f"{server.url}/upload",
+            method="POST",
+            parts=[
+                Part(
+                    data=io.BytesIO(contents),
+                    headers={
+                        "Content-Disposition": (
+                            'form-data; name="file"; filename="a.bin"'
+                        )
+                    },
+                )
+            ],
+        )
+        with urlopen(request) as response:
+            assert response.status == 200
+        recorded: RecordedRequest = server.requests[0]
+        assert "Transfer-Encoding" not in recorded.headers
+        assert recorded.headers["Content-Length"] == str(len(recorded.body))
+        assert contents in recorded.body
+
+
 def test_multipart_request_sends_real_multipart_body_over_http() -> None:
     with http_test_server(
         responses={("POST", "/upload"): Response(status=200)}
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import os
+import stat
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from oapi._oauth2 import (
+    FileOAuth2TokenStore,
+    MemoryOAuth2TokenStore,
+    OAuth2Token,
+    OAuth2TokenManager,
+    OAuth2TokenStore,
+    get_token_key,
+)
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 2) -> None:
+    started: float = time.monotonic()
+    while not condition():
+        assert time.monotonic() - started < timeout
+        time.sleep(0.005)
+
+
+# region OAuth2Token
+
+
+def test_token_from_response_data() -> None:
+    token: OAuth2Token = OAuth2Token.from_response_data(
+        {
+            "access_token": "a",
+            "token_type": "Bearer",
+            "expires_in": 3600,
+            "refresh_token": "r",
+        }
+    )
+    assert token.authorization == "Bearer a"
+    assert token.refresh_token == "r"
+    assert token.expires_at == pytest.approx(time.time() + 3599, abs=2)
+    assert not token.is_expired()
+    assert token.is_expired(token.expires_at)
+
+
+def test_token_from_response_data_retains_the_refresh_token() -> None:
+    token: OAuth2Token = OAuth2Token.from_response_data(
+        {"access_token": "a"}, refresh_token="r"
+    )
+    assert token.refresh_token == "r"
+    assert token.token_type == "Bearer"
+    # A token without an expiration never expires
+    assert not token.is_expired(time.time() + 10**9)
+
+
+def test_token_is_refreshed_before_it_expires() -> None:
+    token: OAuth2Token = OAuth2Token("a", expires_at=1000.0, issued_at=0.0)
+    assert token.get_refresh_at(60) == 940
+    # Tokens with a lifetime shorter than the skew are refreshed half-way
+    # through their lifetime
+    token = OAuth2Token("a", expires_at=100.0, issued_at=0.0)
+    assert token.get_refresh_at(60) == 40
+    assert token.get_refresh_at(100) == 50
+
+
+# endregion
+
+# region OAuth2TokenManager
+
+
+def test_token_manager_obtains_a_token_only_once_for_many_threads() -> None:
+    calls: list[int] = []
+
+    def request_token() -> OAuth2Token:
+        calls.append(1)
+        time.sleep(0.05)
+        return OAuth2Token("a", expires_at=time.time() + 3600)
+
+    token_manager: OAuth2TokenManager = OAuth2TokenManager(request_token)
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        tokens: list[OAuth2Token] = list(
+            executor.map(lambda _: token_manager.get_token(), range(20))
+        )
+    assert len(calls) == 1
+    assert {token.access_token for token in tokens} == {"a"}
+
+
+def test_token_manager_refreshes_in_the_background_before_expiry() -> None:
+    released: threading.Event = threading.Event()
+    access_tokens: list[str] = []
+
+    def request_token() -> OAuth2Token:
+        if access_tokens:
+            # Background refreshes wait, to show callers are not blocked
+            released.wait(2)
+        access_tokens.append(str(len(access_tokens)))
+        return OAuth2Token(
+            access_tokens[-1],
+            expires_at=time.time() + 30,
+            issued_at=time.time() - 3600,
+        )
+
+    token_manager: OAuth2TokenManager = OAuth2TokenManager(
+        request_token, skew=20
+    )
+    assert token_manager.get_token().access_token == "0"
+    token_manager.skew = 60
+    # The token is within its refresh window, so a refresh begins, but the
+    # current token is returned without waiting
+    assert token_manager.get_token().access_token == "0"
+    assert token_manager.get_token().access_token == "0"
+    released.set()
+    _wait_for(lambda: token_manager.token.access_token == "1")  # type: ignore[union-attr]
+    assert access_tokens == ["0", "1"]
+
+
+def test_token_manager_uses_refresh_tokens() -> None:
+    refreshed: list[str] = []
+
+    def request_token() -> OAuth2Token:
+        return OAuth2Token("a", expires_at=time.time() - 1, refresh_token="r")
+
+    def refresh_token(token: OAuth2Token) -> OAuth2Token:
+        assert token.refresh_token is not None
+        refreshed.append(token.refresh_token)
+        return OAuth2Token("b", expires_at=time.time() + 3600)
+
+    token_manager: OAuth2TokenManager = OAuth2TokenManager(
+        request_token, refresh_token
+    )
+    # The first token is already expired, so it is immediately refreshed
+    assert token_manager.get_token().access_token == "a"
+    assert token_manager.get_token().access_token == "b"
+    assert refreshed == ["r"]
+
+
+def test_token_manager_requests_a_new_token_if_refreshing_fails() -> None:
+    def request_token() -> OAuth2Token:
+        return OAuth2Token("a", expires_at=time.time() - 1, refresh_token="r")
+
+    def refresh_token(token: OAuth2Token) -> OAuth2Token:
+        message: str = "revoked"
+        raise ConnectionError(message)
+
+    token_manager: OAuth2TokenManager = OAuth2TokenManager(
+        request_token, refresh_token
+    )
+    token_manager.get_token()
+    assert token_manager.get_token().access_token == "a"
+
+
+# endregion
+
+# region Token stores
+
+
+def test_get_token_key() -> None:
+    assert get_token_key("http://a/token", "cid", ("b", "a")) == (
+        get_token_key("http://a/token", "cid", "a b")
+    )
+    assert get_token_key("http://a/token", "cid") != get_token_key(
+        "http://a/token", "cid", username="user"
+    )
+
+
+@pytest.fixture(params=["memory", "file"])
+def token_store(
+    request: pytest.FixtureRequest, tmp_path: Path
+) -> OAuth2TokenStore:
+    if request.param == "memory":
+        return MemoryOAuth2TokenStore(document_max_age=60)
+    return FileOAuth2TokenStore(tmp_path / "tokens", document_max_age=60)
+
+
+def test_token_store_stores_unexpired_tokens(
+    token_store: OAuth2TokenStore,
+) -> None:
+    assert token_store.get_token("k") is None
+    token_store.set_token(
+        "k", OAuth2Token("a", expires_at=time.time() + 60, refresh_token="r")
+    )
+    token: OAuth2Token | None = token_store.get_token("k")
+    assert token is not None
+    assert (token.access_token, token.refresh_token) == ("a", "r")
+    token_store.set_token("k", OAuth2Token("a", expires_at=time.time() - 1))
+    assert token_store.get_token("k") is None
+    token_store.set_token("k", OAuth2Token("a"))
+    token_store.delete_token("k")
+    assert token_store.get_token("k") is None
+
+
+def test_token_store_stores_discovery_documents(
+    token_store: OAuth2TokenStore,
+) -> None:
+    assert token_store.get_document("http://a/") is None
+    token_store.set_document("http://a/", {"token_endpoint": "http://a/t"})
+    assert token_store.get_document("http://a/") == {
+        "token_endpoint": "http://a/t"
+    }
+    token_store.document_max_age = 0
+    assert token_store.get_document("http://a/") is None
+
+
+def test_token_stores_must_implement_each_operation() -> None:
+    class IncompleteTokenStore(OAuth2TokenStore):
+        def get_token(self, key: str) -> OAuth2Token | None:
+            return None
+
+    with pytest.raises(TypeError, match="set_token"):
+        IncompleteTokenStore()  # type: ignore[abstract]
+
+
+def test_file_token_store_files_are_private(tmp_path: Path) -> None:
+    token_store: FileOAuth2TokenStore = FileOAuth2TokenStore(tmp_path)
+    token_store.set_token("k", OAuth2Token("a"))
+    path: Path
+    (path,) = tmp_path.glob("*.token.json")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+
+def test_token_manager_uses_a_token_from_the_store() -> None:
+    token_store: MemoryOAuth2TokenStore = MemoryOAuth2TokenStore()
+    token_store.set_token("k", OAuth2Token("a", expires_at=time.time() + 3600))
+
+    def request_token() -> OAuth2Token:
+        raise AssertionError
+
+    token_manager: OAuth2TokenManager = OAuth2TokenManager(
+        request_token, store=token_store, key="k"
+    )
+    assert token_manager.get_token().access_token == "a"
+    token_manager.clear()
+    assert token_store.get_token("k") is None
+
+
+def _request_token_once_per_host(directory: str) -> str:
+    def request_token() -> OAuth2Token:
+        with (Path(directory) / "requests").open("a") as file:
+            file.write(f"{os.getpid()}\n")
+        time.sleep(0.1)
+        return OAuth2Token(str(os.getpid()), expires_at=time.time() + 3600)
+
+    return (
+        OAuth2TokenManager(
+            request_token,
+            store=FileOAuth2TokenStore(directory),
+            key="k",
+        )
+        .get_token()
+        .access_token
+    )
+
+
+def test_file_token_store_shares_a_token_between_processes(
+    tmp_path: Path,
+) -> None:
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        access_tokens: list[str] = list(
+            executor.map(_request_token_once_per_host, [str(tmp_path)] * 8)
+        )
+    assert len((tmp_path / "requests").read_text().split()) == 1
+    assert len(set(access_tokens)) == 1
+
+
+# endregion
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from email.message import Message
+
+import pytest
+
+from oapi._pagination import Pagination, get_next_link
+
+
+def _headers(**headers: str) -> Message:
+    message: Message = Message()
+    name: str
+    value: str
+    for name, value in headers.items():
+        message[name.replace("_", "-")] = value
+    return message
+
+
+# region Link headers
+
+
+def test_get_next_link_finds_the_next_link_among_others() -> None:
+    assert (
+        get_next_link(
+            _headers(
+                link=(
+                    '<https://api.example.com/items?page=1>; rel="first", '
+                    '<https://api.example.com/items?page=3>; rel="next"'
+                )
+            )
+        )
+        == "https://api.example.com/items?page=3"
+    )
+
+
+def test_get_next_link_accepts_unquoted_and_multiple_relations() -> None:
+    assert get_next_link(_headers(link="</items?page=2>; rel=next")) == (
+        "/items?page=2"
+    )
+    assert get_next_link(
+        _headers(link='</items?page=2>; title="x"; rel="last next"')
+    ) == ("/items?page=2")
+
+
+def test_get_next_link_returns_none_without_a_next_link() -> None:
+    assert get_next_link(None) is None
+    assert get_next_link(_headers()) is None
+    assert get_next_link(_headers(link='</items?page=1>; rel="prev"')) is None
+
+
+# endregion
+# region Pagination
+
+
+def test_pagination_rejects_an_unknown_style() -> None:
+    with pytest.raises(ValueError):
+        Pagination("token")  # type: ignore[arg-type]
+
+
+def test_pagination_repr_only_includes_non_default_arguments() -> None:
+    assert repr(Pagination("page")) == "Pagination('page')"
+    assert repr(
+        Pagination("cursor", items="data", cursor="meta/next", prefetch=2)
+    ) == ("Pagination('cursor', items='data', cursor='meta/next', prefetch=2)")
+
+
+def test_pagination_get_items_follows_the_items_path() -> None:
+    pagination: Pagination = Pagination("cursor", items="data/items")
+    assert pagination.get_items({"data": {"items": [1, 2]}}) == [1, 2]
+    assert tuple(pagination.get_items({"data": {}})) == ()
+    assert tuple(pagination.get_items({"data": None})) == ()
+    assert Pagination("page").get_items([1, 2]) == [1, 2]
+
+
+def test_link_pagination_follows_the_next_link_without_the_query() -> None:
+    pagination: Pagination = Pagination("link")
+    assert pagination.get_next_request(
+        "/items",
+        "https://api.example.com/items?page=1",
+        {"method": "GET", "query": {"page": 1}, "headers": {"A": "b"}},
+        _headers(link='</items?page=2>; rel="next"'),
+        [1],
+    ) == (
+        "https://api.example.com/items?page=2",
+        {"method": "GET", "headers": {"A": "b"}},
+    )
+    assert (
+        pagination.get_next_request(
+            "/items", "https://api.example.com/items", {}, _headers(), [1]
+        )
+        is None
+    )
+
+
+def test_link_pagination_only_follows_links_on_the_same_origin() -> None:
+    pagination: Pagination = Pagination("link")
+    url: str = "https://api.example.com/items"
+    assert pagination.get_next_request(
+        "/items",
+        url,
+        {},
+        _headers(
+            link='<https://API.example.com:443/items?page=2>; rel="next"'
+        ),
+        [1],
+    ) == ("https://API.example.com:443/items?page=2", {})
+    link: str
+    for link in (
+        "https://other.example.com/items?page=2",
+        "http://api.example.com/items?page=2",
+        "https://api.example.com:8443/items?page=2",
+        "//other.example.com/items?page=2",
+    ):
+        with pytest.warns(UserWarning, match="same origin"):
+            assert (
+                pagination.get_next_request(
+                    "/items",
+                    url,
+                    {},
+                    _headers(link=f'<{link}>; rel="next"'),
+                    [1],
+                )
+                is None
+            )
+
+
+def test_cursor_pagination_passes_the_next_cursor() -> None:
+    pagination: Pagination = Pagination(
+        "cursor", items="items", parameter="after", cursor="meta/next"
+    )
+    assert pagination.get_next_request(
+        "/items",
+        "https://api.example.com/items",
+        {"method": "GET", "query": (("after", "a"), ("limit", 2))},
+        None,
+        {"items": [1, 2], "meta": {"next": "b"}},
+    ) == (
+        "/items",
+        {"method": "GET", "query": (("limit", 2), ("after", "b"))},
+    )
+    assert (
+        pagination.get_next_request(
+            "/items",
+            "https://api.example.com/items",
+            {},
+            None,
+            {"items": [1, 2], "meta": {"next": None}},
+        )
+        is None
+    )
+
+
+def test_page_pagination_increments_the_page_until_a_page_is_empty() -> None:
+    pagination: Pagination = Pagination("page", start=0)
+    assert pagination.get_next_request(
+        "/items", "", {"query": "limit=2"}, None, [1, 2]
+    ) == ("/items", {"query": (("limit", "2"), ("page", 1))})
+    assert pagination.get_next_request(
+        "/items", "", {"query": {"page": "4"}}, None, [1, 2]
+    ) == ("/items", {"query": (("page", 5),)})
+    assert pagination.get_next_request("/items", "", {}, None, []) is None
+
+
+def test_offset_pagination_increments_by_the_number_of_items() -> None:
+    pagination: Pagination = Pagination("offset", parameter="skip")
+    assert pagination.get_next_request("/items", "", {}, None, [1, 2, 3]) == (
+        "/items",
+        {"query": (("skip", 3),)},
+    )
+    assert pagination.get_next_request(
+        "/items", "", {"query": {"skip": 3}}, None, [4]
+    ) == ("/items", {"query": (("skip", 4),)})
+
+
+# endregion
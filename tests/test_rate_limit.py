@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from email.message import Message
+from urllib.request import Request
+
+import pytest
+
+from oapi._rate_limit import (
+    RateLimiter,
+    _parse_combined_rate_limit,
+    _TokenBucket,
+)
+from oapi.errors import OAPITimeoutError
+
+
+def _headers(**headers: str) -> Message:
+    message: Message = Message()
+    name: str
+    value: str
+    for name, value in headers.items():
+        message[name.replace("_", "-")] = value
+    return message
+
+
+# region Token buckets
+
+
+def test_token_bucket_allows_a_burst_then_paces_requests() -> None:
+    bucket: _TokenBucket = _TokenBucket(rate=10, capacity=2)
+    now: float = bucket.updated_at
+    assert bucket.reserve(now) == 0
+    assert bucket.reserve(now) == 0
+    assert bucket.reserve(now) == pytest.approx(0.1)
+    assert bucket.reserve(now) == pytest.approx(0.2)
+    # Tokens are replenished over time
+    assert bucket.reserve(now + 1) == 0
+
+
+def test_token_bucket_does_not_reserve_a_token_beyond_an_expiry() -> None:
+    bucket: _TokenBucket = _TokenBucket(rate=10, capacity=1)
+    now: float = bucket.updated_at
+    assert bucket.reserve(now, now + 0.01) == 0
+    with pytest.raises(OAPITimeoutError):
+        bucket.reserve(now, now + 0.1)
+    # No token was taken by the refused reservation
+    assert bucket.reserve(now, now + 0.11) == pytest.approx(0.1)
+
+
+def test_token_bucket_without_a_rate_is_unlimited_unless_blocked() -> None:
+    bucket: _TokenBucket = _TokenBucket(rate=0, capacity=1)
+    now: float = bucket.updated_at
+    for _ in range(10):
+        assert bucket.reserve(now) == 0
+    bucket.block(now, 5)
+    assert bucket.reserve(now + 1) == pytest.approx(4)
+    assert bucket.reserve(now + 5) == 0
+
+
+def test_token_bucket_paces_the_remaining_requests_until_reset() -> None:
+    bucket: _TokenBucket = _TokenBucket(rate=0, capacity=1)
+    now: float = bucket.updated_at
+    bucket.pace(now, remaining=10, reset=5)
+    assert bucket.rate == 2
+    assert bucket.reserve(now) == 0
+    assert bucket.reserve(now) == pytest.approx(0.5)
+    # When no requests remain, requests are delayed until the reset
+    bucket.pace(now, remaining=0, reset=3)
+    assert bucket.reserve(now) >= 3
+
+
+# endregion
+
+# region RateLimiter
+
+
+def test_parse_combined_rate_limit() -> None:
+    assert _parse_combined_rate_limit("limit=100, remaining=50, reset=5") == {
+        "limit": "100",
+        "remaining": "50",
+        "reset": "5",
+    }
+    assert _parse_combined_rate_limit('"default";r=50;t=5') == {
+        "remaining": "50",
+        "reset": "5",
+    }
+
+
+def test_rate_limiter_paces_requests_per_host() -> None:
+    rate_limiter: RateLimiter = RateLimiter(rate=10)
+    assert rate_limiter.reserve(Request("http://a.example.com/x")) == 0
+    assert rate_limiter.reserve(Request("http://a.example.com/y")) > 0
+    assert rate_limiter.reserve(Request("http://b.example.com/x")) == 0
+
+
+def test_rate_limiter_paces_requests_per_operation() -> None:
+    rate_limiter: RateLimiter = RateLimiter(rate=10, per_operation=True)
+    assert rate_limiter.reserve(Request("http://a.example.com/x")) == 0
+    assert rate_limiter.reserve(Request("http://a.example.com/y")) == 0
+    assert rate_limiter.reserve(Request("http://a.example.com/x?z=1")) > 0
+    assert (
+        rate_limiter.reserve(
+            Request("http://a.example.com/x", method="POST", data=b"")
+        )
+        == 0
+    )
+
+
+def test_rate_limiter_shares_a_bucket_between_an_operations_paths() -> None:
+    rate_limiter: RateLimiter = RateLimiter(rate=10, per_operation=True)
+    index: int
+    delays: list[float] = []
+    for index in range(3):
+        request: Request = Request(f"http://a.example.com/pets/{index}")
+        request.operation = "getPet"  # type: ignore[attr-defined]
+        delays.append(rate_limiter.reserve(request))
+    assert delays[0] == 0
+    assert 0 < delays[1] < delays[2]
+    assert len(rate_limiter._buckets) == 1
+
+
+def test_rate_limiter_discards_the_least_recently_used_buckets() -> None:
+    rate_limiter: RateLimiter = RateLimiter(
+        rate=10, per_operation=True, max_buckets=2
+    )
+    index: int
+    for index in range(1000):
+        rate_limiter.reserve(Request(f"http://a.example.com/{index}"))
+    assert list(rate_limiter._buckets) == [
+        ("a.example.com", "GET", "/998"),
+        ("a.example.com", "GET", "/999"),
+    ]
+    # Using a bucket makes it the most recently used
+    assert rate_limiter.reserve(Request("http://a.example.com/998")) > 0
+    rate_limiter.reserve(Request("http://a.example.com/x"))
+    assert ("a.example.com", "GET", "/998") in rate_limiter._buckets
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"RateLimit-Remaining": "10", "RateLimit-Reset": "5"},
+        {"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "5"},
+        {"RateLimit": "limit=100, remaining=10, reset=5"},
+    ],
+)
+def test_rate_limiter_adapts_to_rate_limit_headers(
+    headers: dict[str, str],
+) -> None:
+    rate_limiter: RateLimiter = RateLimiter()
+    request: Request = Request("http://example.com/x")
+    assert rate_limiter.reserve(request) == 0
+    assert rate_limiter.reserve(request) == 0
+    rate_limiter.update(request, 200, _headers(**headers))
+    assert rate_limiter.reserve(request) == 0
+    assert 0.3 < rate_limiter.reserve(request) <= 0.5
+
+
+def test_rate_limiter_accepts_a_reset_timestamp() -> None:
+    rate_limiter: RateLimiter = RateLimiter()
+    request: Request = Request("http://example.com/x")
+    rate_limiter.update(
+        request,
+        200,
+        _headers(
+            X_RateLimit_Remaining="0",
+            X_RateLimit_Reset=str(int(time.time()) + 30),
+        ),
+    )
+    assert 28 < rate_limiter.reserve(request) <= 30
+
+
+def test_rate_limiter_honors_retry_after() -> None:
+    rate_limiter: RateLimiter = RateLimiter()
+    request: Request = Request("http://example.com/x")
+    rate_limiter.update(request, 200, _headers(Retry_After="30"))
+    assert rate_limiter.reserve(request) == 0
+    rate_limiter.update(request, 429, _headers(Retry_After="30"))
+    assert 29 < rate_limiter.reserve(request) <= 30
+    rate_limiter.clear()
+    assert rate_limiter.reserve(request) == 0
+
+
+def test_rate_limiter_wait_sleeps_for_the_reserved_delay() -> None:
+    rate_limiter: RateLimiter = RateLimiter(rate=20)
+    request: Request = Request("http://example.com/x")
+    started: float = time.monotonic()
+    for _ in range(3):
+        rate_limiter.wait(request)
+    assert time.monotonic() - started >= 0.09
+
+    async def wait() -> None:
+        for _ in range(2):
+            await rate_limiter.async_wait(request)
+
+    started = time.monotonic()
+    asyncio.run(wait())
+    assert time.monotonic() - started >= 0.04
+
+
+# endregion
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import time
+
+import pytest
+
+from oapi._timeout import (
+    Deadline,
+    Timeout,
+    clip_timeout,
+    get_deadline_expiry,
+    get_timeout,
+)
+from oapi.errors import OAPITimeoutError
+
+
+def test_get_timeout_applies_a_number_to_connect_and_read() -> None:
+    timeout: Timeout = get_timeout(5)
+    assert (timeout.connect, timeout.read, timeout.total) == (5, 5, None)
+    timeout = get_timeout(0)
+    assert (timeout.connect, timeout.read, timeout.total) == (
+        None,
+        None,
+        None,
+    )
+    timeout = Timeout(connect=1, total=10)
+    assert get_timeout(timeout) is timeout
+
+
+def test_timeout_expiry_is_the_sooner_of_its_total_and_a_deadline() -> None:
+    assert Timeout().get_expiry() is None
+    now: float = time.monotonic()
+    assert Timeout().get_expiry(now + 1) == now + 1
+    expiry: float | None = Timeout(total=10).get_expiry()
+    assert expiry is not None
+    assert now + 10 <= expiry < now + 11
+    assert Timeout(total=10).get_expiry(now + 1) == now + 1
+
+
+def test_clip_timeout_limits_a_timeout_to_the_time_remaining() -> None:
+    assert clip_timeout(5, None) == 5
+    assert clip_timeout(None, None) is None
+    timeout: float | None = clip_timeout(5, time.monotonic() + 1)
+    assert timeout is not None
+    assert 0 < timeout <= 1
+    assert clip_timeout(0.5, time.monotonic() + 1) == 0.5
+    default_timeout: float | None = socket.getdefaulttimeout()
+    socket.setdefaulttimeout(0.25)
+    try:
+        assert clip_timeout(None, time.monotonic() + 1) == 0.25
+    finally:
+        socket.setdefaulttimeout(default_timeout)
+    with pytest.raises(OAPITimeoutError):
+        clip_timeout(5, time.monotonic())
+
+
+def test_nested_deadlines_cannot_extend_an_enclosing_deadline() -> None:
+    assert get_deadline_expiry() is None
+    with Deadline(1):
+        outer: float | None = get_deadline_expiry()
+        assert outer is not None
+        with Deadline(10):
+            assert get_deadline_expiry() == outer
+        with Deadline(0.5):
+            inner: float | None = get_deadline_expiry()
+            assert inner is not None
+            assert inner < outer
+            assert get_deadline_expiry(0.1) < inner  # type: ignore[operator]
+        assert get_deadline_expiry() == outer
+        assert get_deadline_expiry(10) == outer
+    assert get_deadline_expiry() is None
+
+
+def test_deadline_applies_to_the_current_task() -> None:
+    async def get_expiries() -> tuple[float | None, float | None]:
+        async def get_expiry() -> float | None:
+            return get_deadline_expiry()
+
+        with Deadline(1):
+            inherited: float | None = await asyncio.create_task(get_expiry())
+        task: asyncio.Task[float | None] = asyncio.create_task(get_expiry())
+        return inherited, await task
+
+    inherited: float | None
+    unrelated: float | None
+    inherited, unrelated = asyncio.run(get_expiries())
+    assert inherited is not None
+    assert unrelated is None
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from oapi._timing import RequestTiming
+
+
+def test_request_timing_phases_default_to_zero() -> None:
+    timing: RequestTiming = RequestTiming("GET", "https://example.com/pets")
+    assert timing.operation == ""
+    assert timing.status == 0
+    assert timing.error is None
+    assert not timing.reused_connection
+    assert timing.total == 0
+    assert set(timing.as_dict().values()) == {0.0}
+
+
+def test_request_timing_total_sums_phases_in_order() -> None:
+    timing: RequestTiming = RequestTiming(
+        "GET", "https://example.com/pets", "getPets"
+    )
+    timing.dns = 0.25
+    timing.wait = 0.5
+    timing.unmarshal = 1.0
+    assert timing.total == 1.75
+    assert tuple(timing.as_dict()) == (
+        "assembly",
+        "dns",
+        "connect",
+        "tls",
+        "write",
+        "wait",
+        "download",
+        "decompression",
+        "unmarshal",
+    )
+    assert repr(timing).startswith(
+        "<RequestTiming GET https://example.com/pets status=0 "
+        "assembly=0.000000, dns=0.250000, "
+    )
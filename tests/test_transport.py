@@ -0,0 +1,657 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import io
+import os
+import socket
+import ssl
+import time
+import typing
+from http.client import HTTPConnection, HTTPResponse, RemoteDisconnected
+from urllib.error import URLError
+from urllib.request import Request, build_opener
+
+import pytest
+from servers import Response, http_test_server
+
+from oapi._compression import CompressedBody
+from oapi._dns import DNSCache
+from oapi._multipart_request import MultipartRequest, Part
+from oapi._timing import RequestTiming
+from oapi._transport import (
+    AsyncConnectionPool,
+    ConnectionPool,
+    KeepAliveHTTPHandler,
+    TimedHTTPHandler,
+    TimedHTTPSHandler,
+    _BaseConnectionPool,
+    _is_connection_dropped,
+    _PooledHTTPConnection,
+    _read_response,
+    _serialize_request,
+    open_async,
+)
+
+# region ConnectionPool
+
+
+def _connect(url: str) -> _PooledHTTPConnection:
+    connection: _PooledHTTPConnection = _PooledHTTPConnection(
+        url.partition("://")[2]
+    )
+    connection.connect()
+    return connection
+
+
+def test_base_connection_pool_requires_connection_state_checks() -> None:
+    class IncompletePool(_BaseConnectionPool[HTTPConnection]):
+        def _is_closed(self, connection: HTTPConnection) -> bool:
+            return connection.sock is None
+
+    with pytest.raises(TypeError, match="_is_dropped"):
+        IncompletePool()  # type: ignore[abstract]
+
+
+def test_connection_pool_acquire_returns_none_when_empty() -> None:
+    pool: ConnectionPool = ConnectionPool()
+    assert pool.acquire(("http", "example.com")) is None
+
+
+def test_connection_pool_returns_a_released_connection() -> None:
+    with http_test_server(protocol_version="HTTP/1.1") as server:
+        pool: ConnectionPool = ConnectionPool()
+        connection: HTTPConnection = _connect(server.url)
+        pool.release(("http", "host"), connection)
+        assert len(pool) == 1
+        assert pool.acquire(("http", "host")) is connection
+        assert len(pool) == 0
+        connection.close()
+
+
+def test_connection_pool_closes_connections_beyond_its_size() -> None:
+    with http_test_server(protocol_version="HTTP/1.1") as server:
+        pool: ConnectionPool = ConnectionPool(size=1)
+        first: HTTPConnection = _connect(server.url)
+        second: HTTPConnection = _connect(server.url)
+        pool.release(("http", "host"), first)
+        pool.release(("http", "host"), second)
+        assert len(pool) == 1
+        assert second.sock is None
+        pool.clear()
+        assert first.sock is None
+
+
+def test_connection_pool_does_not_retain_unreusable_connections() -> None:
+    with http_test_server(protocol_version="HTTP/1.1") as server:
+        pool: ConnectionPool = ConnectionPool()
+        connection: HTTPConnection = _connect(server.url)
+        pool.release(("http", "host"), connection, reusable=False)
+        assert len(pool) == 0
+        assert connection.sock is None
+
+
+def test_connection_pool_retires_connections_after_their_lifetime() -> None:
+    with http_test_server(protocol_version="HTTP/1.1") as server:
+        pool: ConnectionPool = ConnectionPool(lifetime=1)
+        connection: _PooledHTTPConnection = _connect(server.url)
+        pool.release(("http", "host"), connection)
+        connection.created_at = time.monotonic() - 2
+        assert pool.acquire(("http", "host")) is None
+        assert connection.sock is None
+
+
+def test_is_connection_dropped_detects_a_server_side_close() -> None:
+    listener: socket.socket = socket.create_server(("127.0.0.1", 0))
+    try:
+        host, port = listener.getsockname()[:2]
+        connection: HTTPConnection = HTTPConnection(host, port)
+        connection.connect()
+        accepted, _ = listener.accept()
+        assert not _is_connection_dropped(connection)
+        accepted.close()
+        # Give the FIN a moment to arrive
+        time.sleep(0.05)
+        assert _is_connection_dropped(connection)
+        connection.close()
+        assert _is_connection_dropped(connection)
+    finally:
+        listener.close()
+
+
+def test_is_connection_dropped_handles_high_file_descriptors() -> None:
+    """
+    `select.select` cannot watch file descriptors numbered 1024 or above,
+    which a busy process may well have open.
+    """
+    listener: socket.socket = socket.create_server(("127.0.0.1", 0))
+    try:
+        connection: HTTPConnection = HTTPConnection(
+            *listener.getsockname()[:2]
+        )
+        connection.connect()
+        assert connection.sock is not None
+        accepted, _ = listener.accept()
+        file_descriptor: int = os.dup2(connection.sock.fileno(), 2048)
+        connection.sock.close()
+        connection.sock = socket.socket(fileno=file_descriptor)
+        assert not _is_connection_dropped(connection)
+        accepted.close()
+        time.sleep(0.05)
+        assert _is_connection_dropped(connection)
+        connection.close()
+    finally:
+        listener.close()
+
+
+# endregion
+
+# region KeepAliveHTTPHandler
+
+
+def test_keep_alive_handler_reuses_one_connection_for_many_requests() -> None:
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b'{"ok": true}')},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        pool: ConnectionPool = ConnectionPool()
+        opener = build_opener(KeepAliveHTTPHandler(pool))
+        for _ in range(3):
+            with opener.open(f"{server.url}/foo") as response:
+                assert response.read() == b'{"ok": true}'
+        assert len(pool) == 1
+        assert (
+            len({request.client_address for request in server.requests}) == 1
+        )
+        pool.clear()
+
+
+def test_keep_alive_handler_does_not_pool_connections_the_server_closes() -> (
+    None
+):
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b"{}")},
+        protocol_version="HTTP/1.0",
+    ) as server:
+        pool: ConnectionPool = ConnectionPool()
+        opener = build_opener(KeepAliveHTTPHandler(pool))
+        for _ in range(2):
+            with opener.open(f"{server.url}/foo") as response:
+                response.read()
+        assert len(pool) == 0
+        assert (
+            len({request.client_address for request in server.requests}) == 2
+        )
+
+
+def test_keep_alive_handler_discards_a_partially_read_response() -> None:
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b"0123456789")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        pool: ConnectionPool = ConnectionPool()
+        opener = build_opener(KeepAliveHTTPHandler(pool))
+        with opener.open(f"{server.url}/foo") as response:
+            assert response.read(2) == b"01"
+        assert len(pool) == 0
+        with opener.open(f"{server.url}/foo") as response:
+            assert response.read() == b"0123456789"
+        pool.clear()
+
+
+def test_keep_alive_handler_recovers_from_a_stale_pooled_connection(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    A server may close an idle connection at any moment, including between
+    the pool's liveness check and the request being sent. Here the liveness
+    check is disabled, so the stale connection is actually used, and the
+    handler must transparently retry on a fresh connection.
+    """
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b"{}")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        pool: ConnectionPool = ConnectionPool()
+        opener = build_opener(KeepAliveHTTPHandler(pool))
+        with opener.open(f"{server.url}/foo") as response:
+            response.read()
+        connection: HTTPConnection | None = pool.acquire(
+            ("http", server.url.partition("://")[2])
+        )
+        assert connection is not None and connection.sock is not None
+        # Simulate the server dropping the idle connection
+        connection.sock.shutdown(socket.SHUT_RDWR)
+        pool.release(("http", server.url.partition("://")[2]), connection)
+        monkeypatch.setattr(
+            "oapi._transport._is_connection_dropped", lambda connection: False
+        )
+        with opener.open(f"{server.url}/foo") as response:
+            assert response.read() == b"{}"
+        assert len(server.requests) == 2
+        pool.clear()
+
+
+def test_keep_alive_handler_does_not_replay_a_non_idempotent_request(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    The server may have acted on a request sent on a connection which was
+    then dropped, so a non-idempotent request is not retried.
+    """
+    with http_test_server(
+        responses={("POST", "/foo"): Response(body=b"{}")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        pool: ConnectionPool = ConnectionPool()
+        opener = build_opener(KeepAliveHTTPHandler(pool))
+        with opener.open(Request(f"{server.url}/foo", b"{}")) as response:
+            response.read()
+        connection: HTTPConnection | None = pool.acquire(
+            ("http", server.url.partition("://")[2])
+        )
+        assert connection is not None and connection.sock is not None
+        connection.sock.shutdown(socket.SHUT_RDWR)
+        pool.release(("http", server.url.partition("://")[2]), connection)
+        monkeypatch.setattr(
+            "oapi._transport._is_connection_dropped", lambda connection: False
+        )
+        with pytest.raises((URLError, ConnectionError)):
+            opener.open(Request(f"{server.url}/foo", b"{}"))
+        assert len(server.requests) == 1
+        pool.clear()
+
+
+def _timed_request(url: str) -> tuple[Request, RequestTiming]:
+    request: Request = Request(url)
+    timing: RequestTiming = RequestTiming("GET", url)
+    request.timing = timing  # type: ignore[attr-defined]
+    return request, timing
+
+
+def test_keep_alive_handler_records_timing_per_request() -> None:
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b"{}")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        pool: ConnectionPool = ConnectionPool()
+        opener = build_opener(KeepAliveHTTPHandler(pool))
+        timings: list[RequestTiming] = []
+        for _ in range(2):
+            request, timing = _timed_request(f"{server.url}/foo")
+            timings.append(timing)
+            with opener.open(request) as response:
+                assert response.read() == b"{}"
+        pool.clear()
+    # The first request establishes a connection, the second re-uses it
+    assert not timings[0].reused_connection
+    assert timings[0].connect > 0
+    assert timings[1].reused_connection
+    assert timings[1].dns == timings[1].connect == 0
+    for timing in timings:
+        assert timing.tls == 0
+        assert timing.write > 0
+        assert timing.wait > 0
+
+
+def test_timed_handler_records_timing_without_pooling() -> None:
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b"{}")}
+    ) as server:
+        opener = build_opener(TimedHTTPHandler())
+        request, timing = _timed_request(f"{server.url}/foo")
+        with opener.open(request) as response:
+            assert response.read() == b"{}"
+        # Requests without a timing record are unaffected
+        with opener.open(f"{server.url}/foo") as response:
+            assert response.read() == b"{}"
+    assert timing.connect > 0
+    assert timing.write > 0
+    assert timing.wait > 0
+
+
+def test_https_connections_resume_tls_sessions(
+    server_ssl_context: ssl.SSLContext,
+) -> None:
+    context: ssl.SSLContext = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    timings: list[RequestTiming] = []
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b"{}")},
+        ssl_context=server_ssl_context,
+    ) as server:
+        # Each request is sent over a new connection, but only the first
+        # performs a full handshake
+        opener = build_opener(TimedHTTPSHandler(context=context))
+        for _ in range(3):
+            request, timing = _timed_request(f"{server.url}/foo")
+            timings.append(timing)
+            with opener.open(request) as response:
+                assert response.read() == b"{}"
+    assert [timing.resumed_tls_session for timing in timings] == [
+        False,
+        True,
+        True,
+    ]
+    for timing in timings:
+        assert not timing.reused_connection
+        assert timing.tls > 0
+
+
+def _get_pinned_url(url: str, dns_cache: DNSCache) -> str:
+    """
+    Pin a fictitious host name to the (local) address of a test server URL,
+    and get the URL with that host name in place of the address.
+    """
+    dns_cache.pin("api.example.test", "127.0.0.1")
+    return url.replace("127.0.0.1", "api.example.test")
+
+
+def test_handlers_resolve_hosts_using_a_dns_cache() -> None:
+    dns_cache: DNSCache = DNSCache()
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b"{}")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        url: str = _get_pinned_url(f"{server.url}/foo", dns_cache)
+        pool: ConnectionPool = ConnectionPool()
+        handler: KeepAliveHTTPHandler | TimedHTTPHandler
+        for handler in (
+            KeepAliveHTTPHandler(pool, dns_cache=dns_cache),
+            TimedHTTPHandler(dns_cache=dns_cache),
+        ):
+            request, timing = _timed_request(url)
+            with build_opener(handler).open(request) as response:
+                assert response.read() == b"{}"
+            assert timing.connect > 0
+            # Requests without a timing record are also resolved using the
+            # DNS cache
+            with build_opener(handler).open(url) as response:
+                assert response.read() == b"{}"
+        pool.clear()
+        # Without the DNS cache, the fictitious host cannot be resolved
+        with pytest.raises(URLError):
+            build_opener(TimedHTTPHandler()).open(url, timeout=5)
+
+
+def test_keep_alive_handler_applies_a_connect_timeout_then_the_timeout(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    connect_timeouts: list[float | None] = []
+    create_connection = socket.create_connection
+
+    def record_create_connection(
+        address: tuple[str, int], timeout: float | None, *args: typing.Any
+    ) -> socket.socket:
+        connect_timeouts.append(timeout)
+        return create_connection(address, timeout, *args)
+
+    monkeypatch.setattr(socket, "create_connection", record_create_connection)
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b"{}")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        pool: ConnectionPool = ConnectionPool()
+        opener = build_opener(KeepAliveHTTPHandler(pool))
+        request: Request = Request(f"{server.url}/foo")
+        request.connect_timeout = 0.5  # type: ignore[attr-defined]
+        with opener.open(request, timeout=5) as response:
+            assert response.read() == b"{}"
+        connection: HTTPConnection = pool.acquire(("http", request.host))  # type: ignore[assignment]
+        assert connection.sock is not None
+        assert connection.sock.gettimeout() == 5
+        pool.release(("http", request.host), connection, reusable=True)
+        # With an expiry, timeouts are clipped to the time remaining
+        request = Request(f"{server.url}/foo")
+        request.expiry = time.monotonic() + 1  # type: ignore[attr-defined]
+        with opener.open(request, timeout=5) as response:
+            assert response.fp.raw._sock.gettimeout() <= 1  # type: ignore[union-attr]
+            assert response.read() == b"{}"
+        request = Request(f"{server.url}/foo")
+        request.expiry = time.monotonic()  # type: ignore[attr-defined]
+        with pytest.raises(URLError, match="timed out"):
+            opener.open(request, timeout=5)
+        pool.clear()
+    assert connect_timeouts == [0.5]
+
+
+# endregion
+
+# region open_async
+
+
+def _read(data: bytes, method: str = "GET") -> HTTPResponse:
+    async def read() -> HTTPResponse:
+        reader: asyncio.StreamReader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await _read_response(reader, method)
+
+    return asyncio.run(read())
+
+
+def test_read_response_with_a_content_length() -> None:
+    response: HTTPResponse = _read(
+        b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}HTTP/1.1 200 OK\r\n"
+    )
+    assert response.status == 200
+    assert response.read() == b"{}"
+    assert not response.will_close
+
+
+def test_read_response_with_a_chunked_body() -> None:
+    response: HTTPResponse = _read(
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+        b"3\r\n[1,\r\n2;extension\r\n2]\r\n0\r\nTrailer: x\r\n\r\n"
+    )
+    assert response.read() == b"[1,2]"
+
+
+def test_read_response_skips_a_continue_response() -> None:
+    response: HTTPResponse = _read(
+        b"HTTP/1.1 100 Continue\r\n\r\n"
+        b"HTTP/1.1 201 Created\r\nContent-Length: 0\r\n\r\n",
+        "POST",
+    )
+    assert response.status == 201
+
+
+def test_read_response_reads_an_undelimited_body_until_eof() -> None:
+    response: HTTPResponse = _read(b"HTTP/1.0 200 OK\r\n\r\n{}")
+    assert response.read() == b"{}"
+    assert response.will_close
+
+
+def test_read_response_without_a_body_for_head_requests() -> None:
+    response: HTTPResponse = _read(
+        b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n", "HEAD"
+    )
+    assert response.read() == b""
+
+
+def test_read_response_raises_remote_disconnected_for_no_response() -> None:
+    with pytest.raises(RemoteDisconnected):
+        _read(b"")
+
+
+def test_serialize_request_matches_http_client() -> None:
+    request: Request = Request(
+        "http://example.com/foo?bar=1", data=b"{}", method="POST"
+    )
+    request.add_unredirected_header("Host", "example.com")
+    request.add_unredirected_header("Content-length", "2")
+    assert _serialize_request(request) == (
+        b"POST /foo?bar=1 HTTP/1.1\r\n"
+        b"Accept-Encoding: identity\r\n"
+        b"Host: example.com\r\n"
+        b"Content-Length: 2\r\n\r\n{}"
+    )
+
+
+def test_open_async_reuses_connections_and_recovers_from_stale_ones() -> None:
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b"{}")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+
+        async def open_() -> None:
+            pool: AsyncConnectionPool = AsyncConnectionPool()
+            request: Request = Request(f"{server.url}/foo")
+            request.add_unredirected_header("Host", request.host)
+            for _ in range(2):
+                response: HTTPResponse = await open_async(request, pool)
+                assert response.read() == b"{}"
+            assert len(pool) == 1
+            # Simulate the server dropping the idle connection, without
+            # the pool being able to detect it
+            connection = pool.acquire(("http", request.host))
+            assert connection is not None
+            connection.socket.shutdown(socket.SHUT_WR)
+            pool.release(("http", request.host), connection)
+            response = await open_async(request, pool)
+            assert response.read() == b"{}"
+            pool.clear()
+            await asyncio.sleep(0)
+
+        asyncio.run(open_())
+        assert len(server.requests) == 3
+        assert (
+            len({request.client_address for request in server.requests}) == 2
+        )
+
+
+def test_open_async_does_not_replay_a_non_idempotent_request() -> None:
+    with http_test_server(
+        responses={("POST", "/foo"): Response(body=b"{}")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+
+        async def open_() -> None:
+            pool: AsyncConnectionPool = AsyncConnectionPool()
+            request: Request = Request(f"{server.url}/foo", b"{}")
+            request.add_unredirected_header("Host", request.host)
+            response: HTTPResponse = await open_async(request, pool)
+            assert response.read() == b"{}"
+            connection = pool.acquire(("http", request.host))
+            assert connection is not None
+            connection.socket.shutdown(socket.SHUT_WR)
+            pool.release(("http", request.host), connection)
+            try:
+                with pytest.raises((URLError, ConnectionError)):
+                    await open_async(request, pool)
+            finally:
+                pool.clear()
+                await asyncio.sleep(0)
+
+        asyncio.run(open_())
+        assert len(server.requests) == 1
+
+
+def test_open_async_streams_a_multipart_body() -> None:
+    contents: bytes = bytes(range(256)) * 1024
+    with http_test_server(
+        responses={("POST", "/upload"): Response(body=b"{}")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        request: MultipartRequest = MultipartRequest(
+            f"{server.url}/upload",
+            method="POST",
+            parts=[
+                Part(
+                    data=io.BytesIO(contents),
+                    headers={"Content-Disposition": 'form-data; name="file"'},
+                )
+            ],
+        )
+        request.add_unredirected_header("Host", request.host)
+
+        async def open_() -> None:
+            pool: AsyncConnectionPool = AsyncConnectionPool()
+            response: HTTPResponse = await open_async(request, pool)
+            assert response.read() == b"{}"
+            pool.clear()
+            await asyncio.sleep(0)
+
+        asyncio.run(open_())
+        assert server.requests[0].headers["Content-Length"] == str(
+            len(server.requests[0].body)
+        )
+        assert contents in server.requests[0].body
+
+
+def test_open_async_streams_a_compressed_body() -> None:
+    contents: bytes = b"0123456789" * 100000
+    with http_test_server(
+        responses={("POST", "/upload"): Response(body=b"{}")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        request: Request = Request(
+            f"{server.url}/upload",
+            data=CompressedBody(contents, "gzip"),  # type: ignore[arg-type]
+            method="POST",
+            headers={"Content-encoding": "gzip"},
+        )
+        request.add_unredirected_header("Host", request.host)
+        request.add_unredirected_header("Transfer-encoding", "chunked")
+
+        async def open_() -> None:
+            pool: AsyncConnectionPool = AsyncConnectionPool()
+            response: HTTPResponse = await open_async(request, pool)
+            assert response.read() == b"{}"
+            pool.clear()
+            await asyncio.sleep(0)
+
+        asyncio.run(open_())
+        assert "Content-Length" not in server.requests[0].headers
+        assert gzip.decompress(server.requests[0].body) == contents
+
+
+def test_open_async_resolves_hosts_using_a_dns_cache() -> None:
+    dns_cache: DNSCache = DNSCache()
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b"{}")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        request: Request = Request(
+            _get_pinned_url(f"{server.url}/foo", dns_cache)
+        )
+        request.add_unredirected_header("Host", request.host)
+
+        async def open_() -> None:
+            pool: AsyncConnectionPool = AsyncConnectionPool()
+            response: HTTPResponse = await open_async(
+                request, pool, dns_cache=dns_cache
+            )
+            assert response.read() == b"{}"
+            pool.clear()
+            await asyncio.sleep(0)
+
+        asyncio.run(open_())
+
+
+def test_open_async_records_timing() -> None:
+    with http_test_server(
+        responses={("GET", "/foo"): Response(body=b"{}")},
+        protocol_version="HTTP/1.1",
+    ) as server:
+        request, timing = _timed_request(f"{server.url}/foo")
+        request.add_unredirected_header("Host", request.host)
+
+        async def open_() -> None:
+            pool: AsyncConnectionPool = AsyncConnectionPool()
+            response: HTTPResponse = await open_async(request, pool)
+            assert response.read() == b"{}"
+            pool.clear()
+            await asyncio.sleep(0)
+
+        asyncio.run(open_())
+    assert not timing.reused_connection
+    assert timing.connect > 0
+    assert timing.tls == 0
+    assert timing.write > 0
+    assert timing.wait > 0
+    assert timing.download > 0
+
+
+# endregion